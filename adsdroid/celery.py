@@ -36,6 +36,10 @@ app.conf.beat_schedule = {
         "task": "apps.ads_api.tasks.update_books_launch_status",
         "schedule": crontab(hour=0, minute=30),
     },
+    "Prune report data rollups older than recent report data": {
+        "task": "apps.ads_api.tasks.refresh_report_data_rollups",
+        "schedule": crontab(hour=0, minute=5),
+    },
     "Process Sponsored Products tasks via Ads API": {
         "task": "apps.ads_api.data_exchange.sp_chain",
         "schedule": crontab(hour=0, minute=11),
@@ -404,6 +404,11 @@ CACHES = {
     }
 }
 
+# Access tokens are refreshed this many seconds before they expire, by one worker at a time
+AUTH_TOKEN_REFRESH_MARGIN = int(os.environ.get("AUTH_TOKEN_REFRESH_MARGIN", 5 * 60))
+AUTH_TOKEN_REFRESH_LOCK_TIMEOUT = int(os.environ.get("AUTH_TOKEN_REFRESH_LOCK_TIMEOUT", 30))
+AUTH_TOKEN_REFRESH_POLL_INTERVAL = float(os.environ.get("AUTH_TOKEN_REFRESH_POLL_INTERVAL", 0.2))
+
 # Books beam
 BOOKS_BEAM_EMAIL = os.environ.get("BOOKS_BEAM_EMAIL")
 BOOKS_BEAM_PASSWORD = os.environ.get("BOOKS_BEAM_PASSWORD")
@@ -412,6 +417,49 @@ BOOKS_BEAM_ACCESS_TOKEN_EXP_TIME = int(os.environ.get("BOOKS_BEAM_ACCESS_TOKEN_E
 # AMAZON ADS
 ADS_API_CLIENT_ID = os.environ.get("ADS_API_CLIENT_ID")
 ADS_API_CLIENT_SECRET = os.environ.get("ADS_API_CLIENT_SECRET")
+ADS_API_HTTP_POOL_CONNECTIONS = int(os.environ.get("ADS_API_HTTP_POOL_CONNECTIONS", 10))
+ADS_API_HTTP_POOL_MAXSIZE = int(os.environ.get("ADS_API_HTTP_POOL_MAXSIZE", 20))
+ADS_API_HTTP_KEEP_ALIVE = bool(strtobool(os.environ.get("ADS_API_HTTP_KEEP_ALIVE", "True")))
+ADS_API_REQUESTS_PER_SECOND = float(os.environ.get("ADS_API_REQUESTS_PER_SECOND", 5))
+ADS_API_RATE_LIMIT_BURST = int(os.environ.get("ADS_API_RATE_LIMIT_BURST", 10))
+ADS_API_RATE_LIMIT_MAX_RETRIES = int(os.environ.get("ADS_API_RATE_LIMIT_MAX_RETRIES", 5))
+ADS_API_LIST_WORKERS = int(os.environ.get("ADS_API_LIST_WORKERS", 4))
+ADS_API_RATE_LIMIT_BACKOFF_BASE = float(os.environ.get("ADS_API_RATE_LIMIT_BACKOFF_BASE", 1))
+ADS_API_RATE_LIMIT_BACKOFF_MAX = float(os.environ.get("ADS_API_RATE_LIMIT_BACKOFF_MAX", 60))
+
+# Reports download pipeline
+REPORTS_POLL_WORKERS = int(os.environ.get("REPORTS_POLL_WORKERS", 4))
+REPORTS_FETCH_WORKERS = int(os.environ.get("REPORTS_FETCH_WORKERS", 4))
+REPORTS_PARSE_WORKERS = int(os.environ.get("REPORTS_PARSE_WORKERS", 2))
+REPORTS_WRITE_WORKERS = int(os.environ.get("REPORTS_WRITE_WORKERS", 2))
+REPORTS_PIPELINE_QUEUE_SIZE = int(os.environ.get("REPORTS_PIPELINE_QUEUE_SIZE", 8))
+REPORTS_PARSE_BATCH_SIZE = int(os.environ.get("REPORTS_PARSE_BATCH_SIZE", 5000))
+REPORTS_POLL_INTERVAL_MIN = float(os.environ.get("REPORTS_POLL_INTERVAL_MIN", 15))
+REPORTS_POLL_INTERVAL_MAX = float(os.environ.get("REPORTS_POLL_INTERVAL_MAX", 300))
+REPORTS_POLL_TIMEOUT = float(os.environ.get("REPORTS_POLL_TIMEOUT", 60 * 60 * 3))
+
+# Reports requests planning
+# days of a report are final once downloaded at least this many days after them
+REPORTS_ATTRIBUTION_DAYS = int(os.environ.get("REPORTS_ATTRIBUTION_DAYS", 30))
+# not final days already requested this many hours ago aren't requested again
+REPORTS_REQUEST_REFRESH_HOURS = float(os.environ.get("REPORTS_REQUEST_REFRESH_HOURS", 12))
+REPORTS_MAX_DAYS_PER_REQUEST = int(os.environ.get("REPORTS_MAX_DAYS_PER_REQUEST", 31))
+
+# Bids update after reports sync
+SYNC_SP_BIDS_SHARDS_PER_REGION = int(os.environ.get("SYNC_SP_BIDS_SHARDS_PER_REGION", 8))
+SYNC_SP_BIDS_REGION_CONCURRENCY = int(os.environ.get("SYNC_SP_BIDS_REGION_CONCURRENCY", 2))
+SYNC_SP_BIDS_SHARD_TIMEOUT = int(os.environ.get("SYNC_SP_BIDS_SHARD_TIMEOUT", 60 * 60 * 2))
+SYNC_SP_BIDS_RETRY_COUNTDOWN = int(os.environ.get("SYNC_SP_BIDS_RETRY_COUNTDOWN", 60))
+
+# Placements update after bids, placement data older than the look back isn't considered
+SYNC_SP_PLACEMENTS_LOOK_BACK_DAYS = int(os.environ.get("SYNC_SP_PLACEMENTS_LOOK_BACK_DAYS", 60))
+SYNC_SP_PLACEMENTS_WORKERS_PER_REGION = int(os.environ.get("SYNC_SP_PLACEMENTS_WORKERS_PER_REGION", 4))
+
+# Keywords and targets sync skips entities not updated since the last sync, except for periodic full syncs
+SYNC_KEYWORDS_FULL_RESYNC_HOURS = int(os.environ.get("SYNC_KEYWORDS_FULL_RESYNC_HOURS", 24))
+
+# Campaigns, ad groups and product ads are upserted in batches of this size
+SYNC_ENTITIES_UPSERT_BATCH_SIZE = int(os.environ.get("SYNC_ENTITIES_UPSERT_BATCH_SIZE", 1000))
 
 # OPENAI API
 
@@ -1,13 +1,12 @@
 import logging
-import time
 from typing import Optional
 
 import requests
 from requests import Session, Response
-from requests.adapters import HTTPAdapter
-from urllib3 import Retry
 
-from adsdroid.settings import ADS_API_CLIENT_ID
+from adsdroid.settings import ADS_API_CLIENT_ID, ADS_API_RATE_LIMIT_MAX_RETRIES
+from apps.ads_api.adapters.amazon_ads.http_transport import AmazonAdsHttpTransport
+from apps.ads_api.adapters.amazon_ads.rate_limiter import AmazonAdsRateLimiter
 from apps.ads_api.authenticators.amazon_ads_authentificator import AmazonAuthenticator
 from apps.ads_api.constants import BaseURL, ServerLocation
 from apps.ads_api.entities.internal.token import Token
@@ -55,39 +54,65 @@ class BaseAmazonAdsAdapter(AuthenticatableInterface, TokenIdInterface):
         if extra_headers:
             headers.update(extra_headers)
 
-        try:
-            if method == "GET":
-                session = self._create_http_session()
-                response = session.get(url, headers=headers, params=params)
-            elif method == "POST":
-                response = requests.post(url, json=body, headers=headers)
-            elif method == "PUT":
-                response = requests.put(url, json=body, headers=headers)
+        session = self._get_http_session()
+        bucket = AmazonAdsRateLimiter.get_bucket(self.server, headers.get("Amazon-Advertising-API-Scope"))
+        for attempt in range(ADS_API_RATE_LIMIT_MAX_RETRIES + 1):
+            bucket.acquire()
+            try:
+                response = self._dispatch(session, method, url, headers, body, params)
+                response.raise_for_status()
+            except requests.exceptions.RequestException as e:
+                if e.response.status_code == 401:
+                    raise AuthFailed(f"Auth failed: {e.response.json()}")
+                elif e.response.status_code == 429:
+                    delay = AmazonAdsRateLimiter.get_retry_delay(e.response, attempt)
+                    bucket.penalize(delay)
+                    _logger.warning(
+                        "Too many requests to %s, retrying in %.2f seconds [%s/%s]",
+                        url,
+                        delay,
+                        attempt + 1,
+                        ADS_API_RATE_LIMIT_MAX_RETRIES,
+                    )
+                    continue
+                elif e.response.status_code == 400:
+                    logging.error(f"Error {e.response.json()}, body {body}, url {url}, method {method}")
+                    raise BaseAmazonAdsException(
+                        f"Error {e.response.json()['code']}: {e.response.json()['message']}"
+                    )
+                else:
+                    _logger.error(
+                        "Error code: %s. Details: %s, payload: %s, url: %s, method: %s, parameters: %s",
+                        e.response.status_code,
+                        e.response.json(),
+                        body,
+                        url,
+                        method,
+                        params,
+                    )
+                    return None
             else:
-                raise NotImplementedError("Request method not implemented")
-            response.raise_for_status()
-        except requests.exceptions.RequestException as e:
-            if e.response.status_code == 401:
-                raise AuthFailed(f"Auth failed: {e.response.json()}")
-            elif e.response.status_code == 429:
-                secs = 10
-                time.sleep(secs)
-                _logger.error("Too many requests so sleeping for %s seconds", secs)
-            elif e.response.status_code == 400:
-                logging.error(f"Error {e.response.json()}, body {body}, url {url}, method {method}")
-                raise BaseAmazonAdsException(f"Error {e.response.json()['code']}: {e.response.json()['message']}")
-            else:
-                _logger.error(
-                    "Error code: %s. Details: %s, payload: %s, url: %s, method: %s, parameters: %s",
-                    e.response.status_code,
-                    e.response.json(),
-                    body,
-                    url,
-                    method,
-                    params,
-                )
-        else:
-            return response
+                return response
+
+        _logger.error("Too many requests to %s, gave up after %s retries", url, ADS_API_RATE_LIMIT_MAX_RETRIES)
+        return None
+
+    @staticmethod
+    def _dispatch(
+        session: Session,
+        method: str,
+        url: str,
+        headers: dict,
+        body: Optional[dict],
+        params: Optional[dict],
+    ) -> Response:
+        if method == "GET":
+            return session.get(url, headers=headers, params=params)
+        elif method == "POST":
+            return session.post(url, json=body, headers=headers)
+        elif method == "PUT":
+            return session.put(url, json=body, headers=headers)
+        raise NotImplementedError("Request method not implemented")
 
     def _resolve_url(self, url) -> str:
         if "http" in url:
@@ -104,12 +129,6 @@ class BaseAmazonAdsAdapter(AuthenticatableInterface, TokenIdInterface):
         }
         return token_id[self.server]
 
-    @staticmethod
-    def _create_http_session() -> Session:
-        """Creates a new retry session for request"""
-        session = Session()
-        retry = Retry(connect=5, backoff_factor=0.5)
-        adapter = HTTPAdapter(max_retries=retry)
-        session.mount("http://", adapter)
-        session.mount("https://", adapter)
-        return session
+    def _get_http_session(self) -> Session:
+        """Returns pooled keep-alive retry session shared by all adapters of the region"""
+        return AmazonAdsHttpTransport.get_session(self.server)
@@ -0,0 +1,86 @@
+import logging
+import os
+import threading
+from typing import Optional
+from urllib.parse import urlparse
+
+from requests import Session
+from requests.adapters import HTTPAdapter
+from urllib3 import Retry
+
+from adsdroid.settings import (
+    ADS_API_HTTP_KEEP_ALIVE,
+    ADS_API_HTTP_POOL_CONNECTIONS,
+    ADS_API_HTTP_POOL_MAXSIZE,
+)
+from apps.ads_api.constants import ServerLocation
+
+_logger = logging.getLogger(__name__)
+
+
+class AmazonAdsHttpTransport:
+    """
+    Keeps one pooled keep-alive session per Amazon Ads region,
+    so requests to the same regional host reuse already opened connections.
+    Sessions are created lazily and recreated in forked worker processes.
+    """
+
+    _sessions: dict[ServerLocation, Session] = {}
+    _pid: Optional[int] = None
+    _lock = threading.Lock()
+
+    @classmethod
+    def get_session(cls, server: ServerLocation) -> Session:
+        with cls._lock:
+            if cls._pid != os.getpid():
+                # connections of the parent process must not be shared with forked workers
+                cls._sessions = {}
+                cls._pid = os.getpid()
+            session = cls._sessions.get(server)
+            if session is None:
+                session = cls._create_session()
+                cls._sessions[server] = session
+                _logger.debug("Created pooled http session for %s", server)
+        return session
+
+    @classmethod
+    def get_connections_stats(cls) -> dict[str, dict[str, int]]:
+        """
+        Returns per host counters: requests sent, connections opened and connections reused
+        """
+        stats = {}
+        for session in cls._sessions.values():
+            for adapter in set(session.adapters.values()):
+                for pool in adapter.poolmanager.pools._container.values():
+                    host_stats = stats.setdefault(pool.host, {"requests": 0, "connections": 0, "reused": 0})
+                    host_stats["requests"] += pool.num_requests
+                    host_stats["connections"] += pool.num_connections
+                    host_stats["reused"] += max(pool.num_requests - pool.num_connections, 0)
+        return stats
+
+    @classmethod
+    def get_host_stats(cls, url: str) -> dict[str, int]:
+        return cls.get_connections_stats().get(
+            urlparse(url).hostname, {"requests": 0, "connections": 0, "reused": 0}
+        )
+
+    @classmethod
+    def close(cls):
+        with cls._lock:
+            for session in cls._sessions.values():
+                session.close()
+            cls._sessions = {}
+
+    @staticmethod
+    def _create_session() -> Session:
+        session = Session()
+        retry = Retry(connect=5, backoff_factor=0.5)
+        adapter = HTTPAdapter(
+            pool_connections=ADS_API_HTTP_POOL_CONNECTIONS,
+            pool_maxsize=ADS_API_HTTP_POOL_MAXSIZE,
+            max_retries=retry,
+        )
+        session.mount("http://", adapter)
+        session.mount("https://", adapter)
+        session.headers["Connection"] = "keep-alive" if ADS_API_HTTP_KEEP_ALIVE else "close"
+        return session
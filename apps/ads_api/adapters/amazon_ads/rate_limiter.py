@@ -0,0 +1,96 @@
+import logging
+import random
+import threading
+import time
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from typing import Optional
+
+from requests import Response
+
+from adsdroid.settings import (
+    ADS_API_RATE_LIMIT_BACKOFF_BASE,
+    ADS_API_RATE_LIMIT_BACKOFF_MAX,
+    ADS_API_RATE_LIMIT_BURST,
+    ADS_API_REQUESTS_PER_SECOND,
+)
+from apps.ads_api.constants import ServerLocation
+
+_logger = logging.getLogger(__name__)
+
+
+class TokenBucket:
+    """
+    Thread safe token bucket. Tokens are refilled with `rate` per second up to `capacity`,
+    `penalize` blocks the bucket for all threads, e.g. when Amazon asked to retry later.
+    """
+
+    def __init__(self, rate: float, capacity: int):
+        self._rate = rate
+        self._capacity = capacity
+        self._tokens = float(capacity)
+        self._updated_at = time.monotonic()
+        self._blocked_until = 0.0
+        self._lock = threading.Lock()
+
+    def acquire(self):
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._refill(now)
+                if now >= self._blocked_until and self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                wait_for = max(self._blocked_until - now, (1 - self._tokens) / self._rate)
+            time.sleep(wait_for)
+
+    def penalize(self, seconds: float):
+        with self._lock:
+            self._blocked_until = max(self._blocked_until, time.monotonic() + seconds)
+            self._tokens = 0.0
+
+    def _refill(self, now: float):
+        self._tokens = min(self._capacity, self._tokens + (now - self._updated_at) * self._rate)
+        self._updated_at = now
+
+
+class AmazonAdsRateLimiter:
+    """Process wide registry of token buckets per region and advertising profile"""
+
+    _buckets: dict[tuple[ServerLocation, Optional[str]], TokenBucket] = {}
+    _lock = threading.Lock()
+
+    @classmethod
+    def get_bucket(cls, server: ServerLocation, profile_id: Optional[str] = None) -> TokenBucket:
+        key = (server, profile_id)
+        with cls._lock:
+            bucket = cls._buckets.get(key)
+            if bucket is None:
+                bucket = TokenBucket(rate=ADS_API_REQUESTS_PER_SECOND, capacity=ADS_API_RATE_LIMIT_BURST)
+                cls._buckets[key] = bucket
+        return bucket
+
+    @classmethod
+    def reset(cls):
+        with cls._lock:
+            cls._buckets = {}
+
+    @staticmethod
+    def get_retry_delay(response: Optional[Response], attempt: int) -> float:
+        """
+        Returns seconds to wait before the next attempt. Retry-After header is used if provided,
+        otherwise exponential backoff with full jitter.
+        """
+        retry_after = response.headers.get("Retry-After") if response is not None else None
+        if retry_after:
+            try:
+                return max(float(retry_after), 0.0)
+            except ValueError:
+                try:
+                    retry_at = parsedate_to_datetime(retry_after)
+                    return max((retry_at - datetime.now(timezone.utc)).total_seconds(), 0.0)
+                except (TypeError, ValueError):
+                    _logger.warning("Unexpected Retry-After header value: %s", retry_after)
+
+        backoff = min(ADS_API_RATE_LIMIT_BACKOFF_MAX, ADS_API_RATE_LIMIT_BACKOFF_BASE * 2**attempt)
+        return random.uniform(0, backoff)
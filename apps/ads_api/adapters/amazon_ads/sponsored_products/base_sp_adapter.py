@@ -1,9 +1,13 @@
 import logging
-from typing import List, Optional, Type, Union
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from queue import Empty, Full, Queue
+from typing import Iterable, Iterator, List, Optional, Type, Union
 
 from pydantic import BaseModel, parse_obj_as
 from requests import Response
 
+from adsdroid.settings import ADS_API_LIST_WORKERS
 from apps.ads_api.adapters.amazon_ads.base_amazon_ads_adapter import (
     BaseAmazonAdsAdapter,
 )
@@ -27,6 +31,23 @@ from apps.utils.chunks import chunker
 
 _logger = logging.getLogger(__name__)
 
+SearchFilter = Union[
+    CampaignSearchFilter,
+    ProductAdSearchFilter,
+    AdGroupSearchFilter,
+    KeywordSearchFilter,
+    TargetSearchFilter,
+    NegativeKeywordSearchFilter,
+    CampaignNegativeKeywordSearchFilter,
+    NegativeTargetSearchFilter,
+    CampaignNegativeTargetSearchFilter,
+]
+
+_DONE = object()
+# pages received ahead of the caller per worker, workers wait while the queue of pages is full
+_PREFETCH_PAGES_PER_WORKER = 2
+_PUT_TIMEOUT = 0.5
+
 
 class BaseSponsoredProductsAdapter(BaseAmazonAdsAdapter):
     HEADERS: dict
@@ -37,11 +58,11 @@ class BaseSponsoredProductsAdapter(BaseAmazonAdsAdapter):
 
     def __init__(self, profile: Profile):
         super().__init__(profile.profile_server)
-        self.HEADERS.update(
-            {
-                "Amazon-Advertising-API-Scope": str(profile.profile_id),
-            }
-        )
+        # headers of the class are shared by adapters of all profiles, so each adapter gets its own copy
+        self.HEADERS = {
+            **type(self).HEADERS,
+            "Amazon-Advertising-API-Scope": str(profile.profile_id),
+        }
         self.validate_all_data_provided()
 
     def create(self, object: dict) -> str:
@@ -64,31 +85,77 @@ class BaseSponsoredProductsAdapter(BaseAmazonAdsAdapter):
     def batch_update(self, objects: list[dict]):
         return self._bulk_create_or_update(objects, "PUT")
 
-    def list(
-        self,
-        search_filter: Optional[
-            Union[
-                CampaignSearchFilter,
-                ProductAdSearchFilter,
-                AdGroupSearchFilter,
-                KeywordSearchFilter,
-                TargetSearchFilter,
-                NegativeKeywordSearchFilter,
-                CampaignNegativeKeywordSearchFilter,
-                NegativeTargetSearchFilter,
-                CampaignNegativeTargetSearchFilter,
-            ]
-        ] = None,
-    ):
+    def list(self, search_filter: Optional[SearchFilter] = None):
+        return list(self.iter_list(search_filter))
+
+    def iter_list(self, search_filter: Optional[SearchFilter] = None) -> Iterator[BaseModel]:
+        """Yields entities page by page following nextToken"""
+        for page in self._iter_pages(search_filter):
+            yield from page
+
+    def iter_list_concurrently(
+        self, search_filters: Iterable[SearchFilter], workers: int = ADS_API_LIST_WORKERS
+    ) -> Iterator[BaseModel]:
+        """
+        Lists entities of many filters, e.g. of chunks of campaign ids, with `workers` filters paginated
+        concurrently. Entities are yielded page by page as soon as a page is received, in no particular order.
+        Requests are throttled by the rate limiter of the profile like any other request.
+        At most _PREFETCH_PAGES_PER_WORKER pages per worker are received ahead of the caller.
+        """
+        search_filters = list(search_filters)
+        if not search_filters:
+            return
+        pages = Queue(maxsize=workers * _PREFETCH_PAGES_PER_WORKER)
+        stopped = threading.Event()
+
+        def put(item) -> bool:
+            """Waits for room in the queue of pages, gives up once the caller stopped iterating"""
+            while not stopped.is_set():
+                try:
+                    pages.put(item, timeout=_PUT_TIMEOUT)
+                    return True
+                except Full:
+                    continue
+            return False
+
+        def list_pages(search_filter: SearchFilter):
+            try:
+                for page in self._iter_pages(search_filter):
+                    if not put(page) or stopped.is_set():
+                        break
+            except Exception as e:
+                put(e)
+            finally:
+                put(_DONE)
+
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            for search_filter in search_filters:
+                executor.submit(list_pages, search_filter)
+            try:
+                pending = len(search_filters)
+                while pending:
+                    page = pages.get()
+                    if page is _DONE:
+                        pending -= 1
+                    elif isinstance(page, Exception):
+                        raise page
+                    else:
+                        yield from page
+            finally:
+                # lets the workers finish early if the caller stopped iterating or listing failed,
+                # pages left in the queue are dropped so workers waiting to put a page are released
+                stopped.set()
+                while True:
+                    try:
+                        pages.get_nowait()
+                    except Empty:
+                        break
+
+    def _iter_pages(self, search_filter: Optional[SearchFilter] = None) -> Iterator[List[BaseModel]]:
         body = {}
-        next_token = True
-        objects = []
         if search_filter:
             body = search_filter.dict(exclude_none=True, by_alias=True)
-        while next_token:
-            if next_token and isinstance(next_token, str):
-                body["nextToken"] = next_token
-
+        while True:
             response = self.send_request(
                 url=f"{self.URL}/list",
                 method="POST",
@@ -103,20 +170,22 @@ class BaseSponsoredProductsAdapter(BaseAmazonAdsAdapter):
                     self.HEADERS,
                     self.ENTITY,
                 )
-                continue
+                return
 
+            response_data = response.json()
             if response.status_code != 200:
                 _logger.error(
                     "Request to %s was not successful. Details: %s",
                     self.URL,
-                    response.json(),
+                    response_data,
                 )
                 continue
 
-            objects += parse_obj_as(list[self.ENTITY], response.json()[self.RESPONSE_DATA_KEY])
-            next_token = response.json().get("nextToken")
-
-        return objects
+            yield parse_obj_as(list[self.ENTITY], response_data[self.RESPONSE_DATA_KEY])
+            next_token = response_data.get("nextToken")
+            if not next_token:
+                return
+            body["nextToken"] = next_token
 
     def delete(
         self,
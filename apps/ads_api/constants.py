@@ -415,6 +415,12 @@ BaseURL = {
     ServerLocation.FAR_EAST: "https://advertising-api-fe.amazon.com",
 }
 
+# local Ads API simulator (apps.ads_api.simulator) all regions are pointed at instead of Amazon, when set
+ADS_API_SIMULATOR_URL = os.environ.get("ADS_API_SIMULATOR_URL")
+if ADS_API_SIMULATOR_URL:
+    AuthURL = {server: f"{ADS_API_SIMULATOR_URL}/auth/o2/token" for server in ServerLocation}
+    BaseURL = {server: ADS_API_SIMULATOR_URL for server in ServerLocation}
+
 RefreshToken = {
     ServerLocation.NORTH_AMERICA: os.environ.get("ADS_API_REFRESH_TOKEN_US"),
     ServerLocation.EUROPE: os.environ.get("ADS_API_REFRESH_TOKEN_EU"),
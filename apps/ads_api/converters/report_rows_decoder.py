@@ -0,0 +1,126 @@
+from datetime import date
+from decimal import Decimal
+from enum import Enum
+from typing import Callable, Iterable, Optional, Type
+
+from pydantic.datetime_parse import parse_date
+
+from apps.ads_api.entities.amazon_ads.reports import BaseReportDataEntity
+from apps.ads_api.models import RecentReportData
+from apps.ads_api.repositories.report.recent_report_data_bulk_repository import COLUMNS
+
+
+class InvalidReportRow(ValueError):
+    pass
+
+
+def _to_str(value) -> str:
+    if isinstance(value, (int, float, Decimal, Enum)):
+        return str(value)
+    raise TypeError(f"str expected, got {type(value).__name__}")
+
+
+def _to_date(value) -> date:
+    if value.__class__ is date:
+        return value
+    if isinstance(value, str):
+        try:
+            return date.fromisoformat(value)
+        except ValueError:
+            pass
+    return parse_date(value)
+
+
+_CONVERTERS = {
+    int: "int({value})",
+    float: "float({value})",
+    str: "({value} if {value}.__class__ is str else _to_str({value}))",
+    date: "_to_date({value})",
+}
+
+
+class ReportRowsDecoder:
+    """
+    Decodes raw rows of a report file straight into rows of COLUMNS of RecentReportData,
+    the layout RecentReportDataBulkRepository.upsert_rows inserts, without a model instance per row.
+
+    The decoder is compiled from fields of the report's pydantic entity: aliases, types, defaults,
+    NON_NEGATIVE_FIELDS and LOWERCASE_FIELDS, so rows are decoded like the entity would validate them.
+    Columns missing in the entity get defaults of the model, "campaign_id" holds the Amazon campaign id.
+    """
+
+    _decoders: dict[Type[BaseReportDataEntity], "ReportRowsDecoder"] = {}
+
+    def __init__(self, entity_class: Type[BaseReportDataEntity]):
+        self.entity_class = entity_class
+        self._decode_rows = self._compile(entity_class)
+
+    @classmethod
+    def for_entity(cls, entity_class: Type[BaseReportDataEntity]) -> "ReportRowsDecoder":
+        decoder = cls._decoders.get(entity_class)
+        if decoder is None:
+            decoder = cls._decoders[entity_class] = cls(entity_class)
+        return decoder
+
+    def decode(self, raw_rows: Iterable[dict], report_type: Optional[str] = None) -> list[list]:
+        """
+        Rows of COLUMNS values, report_type is set to all rows if given.
+        Raises InvalidReportRow if a row doesn't match the entity
+        """
+        rows = []
+        try:
+            self._decode_rows(raw_rows, rows.append, report_type)
+        except (KeyError, TypeError, ValueError) as e:
+            raise InvalidReportRow(
+                f"Row {len(rows)} is not a valid {self.entity_class.__name__}: {e!r}"
+            ) from e
+        return rows
+
+    @staticmethod
+    def _compile(entity_class: Type[BaseReportDataEntity]) -> Callable:
+        fields = entity_class.__fields__
+        lines = ["def decode_rows(raw_rows, append, report_type):", "    for raw_row in raw_rows:"]
+        defaults = {}
+        for i, (name, field) in enumerate(fields.items()):
+            value = f"v{i}"
+            converted = _CONVERTERS[field.type_].format(value=value)
+            if name in entity_class.NON_NEGATIVE_FIELDS:
+                converted = f"max({converted}, 0)"
+            if name in entity_class.LOWERCASE_FIELDS:
+                converted = f"{converted}.lower()"
+            if field.required:
+                lines.append(f"        {value} = raw_row[{field.alias!r}]")
+            else:
+                defaults[f"d{i}"] = field.default
+                lines.append(f"        {value} = raw_row.get({field.alias!r}, d{i})")
+            if field.allow_none:
+                lines.append(f"        if {value} is not None:")
+                lines.append(f"            {value} = {converted}")
+            else:
+                lines.append(f"        {value} = {converted}")
+
+        field_values = {name: f"v{i}" for i, name in enumerate(fields)}
+        field_values[
+            "report_type"
+        ] = f"report_type if report_type is not None else {field_values['report_type']}"
+        for column in COLUMNS:
+            if column not in field_values:
+                defaults[f"default_{column}"] = RecentReportData._meta.get_field(column).get_default()
+        if entity_class.complete_values.__func__ is BaseReportDataEntity.complete_values.__func__:
+            row_values = [field_values.get(column, f"default_{column}") for column in COLUMNS]
+        else:
+            values = ", ".join(f"{name!r}: {value}" for name, value in field_values.items())
+            lines.append(f"        values = complete_values({{{values}}})")
+            row_values = [
+                f"values[{column!r}]" if column in field_values else f"default_{column}" for column in COLUMNS
+            ]
+        lines.append(f"        append([{', '.join(row_values)}])")
+
+        namespace = {
+            "_to_str": _to_str,
+            "_to_date": _to_date,
+            "complete_values": entity_class.complete_values,
+            **defaults,
+        }
+        exec(compile("\n".join(lines), f"<{entity_class.__name__} decoder>", "exec"), namespace)
+        return namespace["decode_rows"]
@@ -7,23 +7,23 @@ import re
 import time
 import traceback
 from collections import defaultdict
-from dataclasses import dataclass
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
 from decimal import Decimal
 from itertools import groupby
 from statistics import StatisticsError, mean
-from typing import Dict, List, Optional, Tuple, Union
+from typing import Dict, List, Optional, Tuple, Type, Union
 
 import requests
 from bs4 import BeautifulSoup
-from django.db.models import Count, DecimalField, Exists, OuterRef, Q, QuerySet, Sum
-from django.db.models import Value as V
+from django.db import connection
+from django.db.models import Count, Exists, OuterRef, Q, QuerySet, Sum
 from django.db.models.aggregates import Max
-from django.db.models.functions import Coalesce
 from django.utils import timezone
 from requests.exceptions import RequestException
 
 from adsdroid.celery import app, chain
+from adsdroid.settings import SYNC_SP_PLACEMENTS_LOOK_BACK_DAYS, SYNC_SP_PLACEMENTS_WORKERS_PER_REGION
 from apps.ads_api.adapters.amazon_ads.sponsored_products.ad_group_adapter import (
     AdGroupAdapter,
 )
@@ -37,6 +37,7 @@ from apps.ads_api.entities.amazon_ads.sponsored_products.campaign import (
     PlacementBidding,
 )
 from apps.ads_api.entities.amazon_ads.sponsored_products.keywords import KeywordEntity
+from apps.ads_api.entities.internal.ad_slice import AdSlice
 from apps.ads_api.google_sheets import GoogleSheet, _process_read_values
 from apps.ads_api.services.books.fill_with_negatives_services.fiil_with_negative_targets_service import (
     FillWithNegativeTargetsService,
@@ -71,17 +72,17 @@ from .entities.amazon_ads.sponsored_products.search_filters import (
     KeywordSearchFilter,
 )
 from .entities.amazon_ads.sponsored_products.targets import TargetEntity
+from .entities.internal.keywords_snapshot import KeywordsSnapshot
 from .exceptions.ads_api.base import BaseAmazonAdsException, ObjectNotCreatedError
-from .repositories.book.price_repository import BookPriceRepository
 from .repositories.campaign_repository import CampaignRepository
 from .repositories.profile_repository import ProfileRepository
+from .repositories.report.placements_repository import PlacementsRepository
+from .repositories.sync_watermark_repository import SyncWatermarkRepository
+from .services.bids.bid_planning_service import BidPlanningService
+from .services.books.book_prices_service import BookPricesService
 from .services.campaigns.build_campaign_entity_service import BuildCampaignEntityService
 from .services.keywords.cleaner_service import KeywordsCleanerService
-from .services.keywords.date_keywords_spends_service import DateKeywordsSpendsServce
-from .services.profiles.proven_budget_service import ProvenBudgetService
-from .services.profiles.remaining_daily_budget_service import (
-    RemainingDailyBudgetService,
-)
+from .services.keywords.duplicate_targets_service import DuplicateTargetsService
 from .tasks import (
     campaign_clean_up,
     get_profile_book_catalog,
@@ -111,6 +112,7 @@ from apps.ads_api.models import (
     RecentReportData,
     Relevance,
     Report,
+    ReportDataDailyRollup,
     Target,
 )
 
@@ -269,8 +271,13 @@ def sync_keywords(
     profile_ids: Optional[list[int]] = None,
     managed_campaigns_only: Optional[bool] = True,
     campaign_id_amazon_list: Optional[list] = None,
+    incremental: Optional[bool] = True,
 ):
-    """Sync keywords data for managed profiles"""
+    """
+    Sync keywords data for managed profiles.
+    Incremental syncs of managed campaigns process only keywords updated on Amazon since the previous sync,
+    a full sync is done if there wasn't one within SYNC_KEYWORDS_FULL_RESYNC_HOURS
+    """
     if profile_ids:
         profiles = Profile.objects.filter(id__in=profile_ids)
     else:
@@ -326,46 +333,80 @@ def sync_keywords(
                     continue
             elif campaign_id_amazon_list:
                 campaigns = campaign_id_amazon_list
-            all_profile_keywords = []
-            for campaign_batch_ids in chunker(campaigns, CAMPAIGNS_PER_TARGETS_REQUEST):
-                profile_keywords_batch = adapter.list(
-                    KeywordSearchFilter(
-                        campaign_id_filter=IdFilter(include=campaign_batch_ids),
-                    )
-                )
-                if profile_keywords_batch:
-                    all_profile_keywords.extend(
-                        [keyword.dict(exclude_none=True, by_alias=True) for keyword in profile_keywords_batch]
-                    )
+            search_filters = [
+                KeywordSearchFilter(campaign_id_filter=IdFilter(include=campaign_batch_ids))
+                for campaign_batch_ids in chunker(campaigns, CAMPAIGNS_PER_TARGETS_REQUEST)
+            ]
+            # keywords are converted while later pages of other campaign batches are still requested
+            all_profile_keywords = [
+                keyword.dict(exclude_none=True, by_alias=True)
+                for keyword in adapter.iter_list_concurrently(search_filters)
+            ]
             _logger.info(
                 f"{model.__name__}s returned from Amazon: {len(all_profile_keywords)} "
                 f"for profile {current_profile}"
             )
             if not all_profile_keywords:
                 continue
-            profile_keywords_in_db_dict = _get_profile_keywords_dict(
-                profile=current_profile, model=model, endpoint=endpoint
+            # the watermark covers all managed campaigns, syncs of other campaigns neither use nor move it
+            use_watermark = incremental and managed_campaigns_only
+            last_updated = (
+                SyncWatermarkRepository.get_last_updated(current_profile, endpoint) if use_watermark else None
+            )
+            newest_update = max(
+                (_get_last_updated_on_amazon(keyword) or 0 for keyword in all_profile_keywords), default=0
+            )
+            keyword_ids = campaign_ids = ad_group_ids = None
+            if last_updated is not None:
+                all_profile_keywords = _get_keywords_changed_since(
+                    all_profile_keywords,
+                    last_updated,
+                    model=model,
+                    endpoint=endpoint,
+                    profile=current_profile,
+                )
+                _logger.info(
+                    f"{model.__name__}s updated on Amazon since the last sync: {len(all_profile_keywords)} "
+                    f"for profile {current_profile}"
+                )
+                if not all_profile_keywords:
+                    SyncWatermarkRepository.save(current_profile, endpoint, newest_update, full_sync=False)
+                    continue
+                identifier = "keywordId" if model == Keyword else "targetId"
+                keyword_ids, campaign_ids, ad_group_ids = (
+                    {int(keyword[field]) for keyword in all_profile_keywords if keyword.get(field)}
+                    for field in (identifier, "campaignId", "adGroupId")
+                )
+            profile_keywords_snapshot = _get_profile_keywords_snapshot(
+                profile=current_profile, model=model, endpoint=endpoint, keyword_ids=keyword_ids
             )
             _logger.info(
-                f"{model.__name__}s in db count: {len(profile_keywords_in_db_dict)}"
+                f"{model.__name__}s in db count: {len(profile_keywords_snapshot)}"
                 f" for profile{current_profile}"
             )
-            profile_campaigns_dict = _get_campaigns_for_profile_dict(current_profile)
+            profile_campaigns_dict = _get_campaigns_for_profile_dict(
+                current_profile, campaign_ids=campaign_ids
+            )
             _logger.info(
-                f"Campaigns in db count: {len(profile_keywords_in_db_dict)} " f"for profile {current_profile}"
+                f"Campaigns in db count: {len(profile_keywords_snapshot)} " f"for profile {current_profile}"
             )
             if not profile_campaigns_dict:
                 continue
-            profile_ad_groups_dict = _get_ad_groups_for_profile_dict(current_profile)
+            # campaign negatives of an incremental sync don't refer to any ad groups
+            profile_ad_groups_dict = (
+                _get_ad_groups_for_profile_dict(current_profile, ad_group_ids=ad_group_ids)
+                if ad_group_ids != set()
+                else {}
+            )
             _logger.info(
-                f"Ad groups in db count: {len(profile_keywords_in_db_dict)} " f"for profile {current_profile}"
+                f"Ad groups in db count: {len(profile_keywords_snapshot)} " f"for profile {current_profile}"
             )
 
-            if not profile_ad_groups_dict:
+            if profile_ad_groups_dict is None:
                 continue
             keywords_to_update, keywords_to_create = _sort_keywords_create_update(
                 all_profile_keywords,
-                profile_keywords_in_db_dict,
+                profile_keywords_snapshot,
                 profile_campaigns_dict,
                 profile_ad_groups_dict,
                 model=model,
@@ -384,10 +425,48 @@ def sync_keywords(
                 )
                 model.objects.bulk_update(keywords_to_update, fields, batch_size=1000)
 
+            if use_watermark:
+                SyncWatermarkRepository.save(
+                    current_profile, endpoint, newest_update, full_sync=last_updated is None
+                )
+
             objects_count = model.objects.filter(campaign__profile=current_profile).count()
             _logger.info(f"{current_profile} has {objects_count} in the end of sync [{model.__name__}]")
 
 
+def _get_last_updated_on_amazon(keyword_target_dict: dict) -> Optional[int]:
+    """Epoch time in ms of the last update on Amazon, None if extended data wasn't returned"""
+    last_update = (keyword_target_dict.get("extendedData") or {}).get("lastUpdateDateTime")
+    if not last_update:
+        return None
+    return IsoToEpochConverter().iso_to_epoch(last_update, convert_to=TimeUnit.MILLISECOND)
+
+
+def _get_keywords_changed_since(
+    all_profile_keywords: list, last_updated: int, model, endpoint: SpEndpoint, profile: Profile
+) -> list:
+    """
+    Keeps keywords updated on Amazon since last_updated (epoch time in ms) and keywords of campaigns
+    with none of them in the DB yet, e.g. campaigns which became managed after the previous sync
+    """
+    synced_campaign_ids = set(
+        model.objects.filter(campaign__profile=profile, keyword_type=_get_keyword_type(endpoint))
+        .values_list("campaign__campaign_id_amazon", flat=True)
+        .distinct()
+        .order_by()
+    )
+    changed_keywords = []
+    for keyword in all_profile_keywords:
+        keyword_last_updated = _get_last_updated_on_amazon(keyword)
+        if (
+            keyword_last_updated is None
+            or keyword_last_updated >= last_updated
+            or int(keyword.get("campaignId") or 0) not in synced_campaign_ids
+        ):
+            changed_keywords.append(keyword)
+    return changed_keywords
+
+
 def _get_fields_to_update(endpoint: SpEndpoint):
     """Helper function to get model field to update"""
     fields = ["state", "serving_status", "last_updated_date_on_amazon"]
@@ -418,25 +497,25 @@ def _get_model_from_endpoint(endpoint: SpEndpoint):
 
 def _sort_keywords_create_update(
     all_profile_keywords: list,
-    profile_keywords_in_db_dict,
-    profile_campaigns_dict,
-    profile_ad_groups_dict,
+    keywords_snapshot: KeywordsSnapshot,
+    campaign_pks: dict[int, int],
+    ad_group_default_bids: dict[int, Optional[Decimal]],
     endpoint: SpEndpoint,
     model,
     profile: Profile,
 ):
     """
     Takes Amazon API response list of dictionaries of keywords, targets etc and
-    cached DB dictionaries to create lists of keywords to update and create.
+    a snapshot of stored ones to create lists of keywords to update and create.
+    Model instances are built only for keywords which are new or changed on Amazon.
     """
     # set up some container variables
     missing_campaigns = set()
     keywords_to_update = []
     keywords_to_create = []
-    current_keyword_in_db = None
-    total_keywords_in_profile_db = len(profile_keywords_in_db_dict)
     identifier = "keywordId" if model._meta.model_name == "keyword" else "targetId"
     model_entry_identifier = "keyword_id" if model._meta.model_name == "keyword" else "target_id"
+    has_bid = endpoint in [SpEndpoint.KEYWORDS, SpEndpoint.TARGETS]
     for current_keyword in all_profile_keywords:
         if not current_keyword.get(identifier):
             continue
@@ -448,47 +527,43 @@ def _sort_keywords_create_update(
             int(current_keyword.get("adGroupId")) if current_keyword.get("adGroupId") else None
         )
 
-        if keyword_campaign_id not in profile_campaigns_dict:
+        if keyword_campaign_id not in campaign_pks:
             missing_campaigns.add(keyword_campaign_id)
             continue
 
+        bid = None
+        # "bid" will not be in keywords & targets which will use the ad group default bid
+        if has_bid:
+            bid = current_keyword.get("bid")
+            if bid is None:
+                bid = ad_group_default_bids.get(keyword_ad_group_id) or DEFAULT_BID
+
+        keyword_pk = keywords_snapshot.get_pk(keyword_id)
+        if keyword_pk is not None and not keywords_snapshot.differs(
+            keyword_id,
+            state=current_keyword.get("state"),
+            serving_status=(current_keyword.get("extendedData") or {}).get("servingStatus"),
+            last_updated=_get_last_updated_on_amazon(current_keyword),
+            bid=bid,
+        ):
+            continue
+
         defaults = _set_keyword_target_defaults(endpoint=endpoint, keyword_target_dict=current_keyword)
-        campaign = profile_campaigns_dict[keyword_campaign_id]
-        ad_group = profile_ad_groups_dict.get(keyword_ad_group_id)
         new_data = model(
-            campaign=campaign,
+            campaign_id=campaign_pks[keyword_campaign_id],
             **defaults,
         )
         setattr(new_data, model_entry_identifier, keyword_id)
+        if has_bid:
+            new_data.bid = bid
         if endpoint != SpEndpoint.CAMPAIGN_NEGATIVE_KEYWORDS:
-            new_data.ad_group_id = int(current_keyword.get("adGroupId"))
-
-        if total_keywords_in_profile_db != 0:
-            current_keyword_in_db = profile_keywords_in_db_dict.get(keyword_id)
-        if current_keyword_in_db:
-            for amazon_field, db_field in VARIABLE_KEYWORD_FIELDS.items():
-                value_db = getattr(current_keyword_in_db, db_field)
-                value_amazon = current_keyword.get(amazon_field, 0)
-                # "bid" will not be in keywords & targets which will use the ad group default bid
-                if endpoint in [SpEndpoint.KEYWORDS, SpEndpoint.TARGETS] and amazon_field == "bid":
-                    if "bid" not in current_keyword:
-                        value_amazon = ad_group.default_bid if ad_group.default_bid else DEFAULT_BID
-                        new_data.bid = value_amazon
-                    if value_db is None:
-                        value_db = 0
-                    bid_difference = abs(float(value_amazon) - float(value_db))
-                    if bid_difference < 0.011:
-                        continue
-                if value_amazon != value_db:
-                    id = current_keyword_in_db.id
-                    new_data.id = int(id)  # type:ignore
-                    keywords_to_update.append(new_data)
-                    break
+            new_data.ad_group_id = keyword_ad_group_id
+
+        if keyword_pk is not None:
+            new_data.id = keyword_pk
+            keywords_to_update.append(new_data)
         else:
-            if endpoint in [SpEndpoint.KEYWORDS, SpEndpoint.TARGETS] and "bid" not in current_keyword:
-                new_data.bid = ad_group.default_bid if ad_group.default_bid else DEFAULT_BID
             keywords_to_create.append(new_data)
-        # temporary reporting functionality.
     if len(missing_campaigns) > 0:
         _logger.info(f"Profile: {profile} DB is missing campaigns with Amazon ids: {missing_campaigns}")
     return keywords_to_update, keywords_to_create
@@ -517,8 +592,8 @@ def _get_profile_data_from_API(profile, endpoint: SpEndpoint, campaigns: Optiona
     return all_profile_data
 
 
-def _get_profile_keywords_dict(profile, model, endpoint: SpEndpoint):
-    keyword_type = (
+def _get_keyword_type(endpoint: SpEndpoint) -> str:
+    return (
         "Negative"
         if endpoint
         in [
@@ -528,42 +603,39 @@ def _get_profile_keywords_dict(profile, model, endpoint: SpEndpoint):
         ]
         else "Positive"
     )
+
+
+def _get_profile_keywords_snapshot(
+    profile, model, endpoint: SpEndpoint, keyword_ids: Optional[set] = None
+) -> KeywordsSnapshot:
+    keyword_type = _get_keyword_type(endpoint)
+    column = "keyword_id" if model._meta.model_name == "keyword" else "target_id"
     profile_keywords_in_db = model.objects.filter(campaign__profile=profile, keyword_type=keyword_type)
+    if keyword_ids is not None:
+        profile_keywords_in_db = profile_keywords_in_db.filter(**{f"{column}__in": keyword_ids})
     # additional filter to differentiate between negative keywords and campaign negatives which will have a blank Ad Group id
     if endpoint == SpEndpoint.CAMPAIGN_NEGATIVE_KEYWORDS:
         profile_keywords_in_db.filter(ad_group_id__isnull=True)
-    # create a dictionary to hold all profile keywords to avoid hitting the db
-    profile_keywords_in_db_dict = {}
-    if profile_keywords_in_db.exists():
-        bool(profile_keywords_in_db)
-        column = "keyword_id" if model._meta.model_name == "keyword" else "target_id"
-        for temp_keyword in profile_keywords_in_db:
-            profile_keywords_in_db_dict[getattr(temp_keyword, column)] = temp_keyword
-    return profile_keywords_in_db_dict
-
-
-def _get_campaigns_for_profile_dict(current_profile):
-    # create a dictionary to hold all profile campaigns to avoid hitting the db
+    # compact columns of all profile keywords to avoid hitting the db
+    return KeywordsSnapshot.from_queryset(profile_keywords_in_db, id_field=column)
+
+
+def _get_campaigns_for_profile_dict(current_profile, campaign_ids: Optional[set] = None):
+    """Primary keys of the profile campaigns by their Amazon ids"""
     profile_campaigns = Campaign.objects.filter(profile=current_profile, sponsoring_type="sponsoredProducts")
-    if not profile_campaigns.exists():
-        return None
-    profile_campaigns_dict = {}
-    bool(profile_campaigns)
-    for temp_campaign in profile_campaigns:
-        profile_campaigns_dict[temp_campaign.campaign_id_amazon] = temp_campaign
-    return profile_campaigns_dict
+    if campaign_ids is not None:
+        profile_campaigns = profile_campaigns.filter(campaign_id_amazon__in=campaign_ids)
+    profile_campaigns_dict = dict(profile_campaigns.values_list("campaign_id_amazon", "id").order_by())
+    return profile_campaigns_dict or None
 
 
-def _get_ad_groups_for_profile_dict(current_profile):
-    # create a dictionary to hold all profile ad groups to avoid hitting the db
+def _get_ad_groups_for_profile_dict(current_profile, ad_group_ids: Optional[set] = None):
+    """Default bids of the profile ad groups by their Amazon ids"""
     profile_ad_groups = AdGroup.objects.filter(campaign__profile=current_profile)
-    if not profile_ad_groups.exists():
-        return None
-    profile_ad_groups_dict = {}
-    bool(profile_ad_groups)
-    for temp_ad_group in profile_ad_groups:
-        profile_ad_groups_dict[temp_ad_group.ad_group_id] = temp_ad_group
-    return profile_ad_groups_dict
+    if ad_group_ids is not None:
+        profile_ad_groups = profile_ad_groups.filter(ad_group_id__in=ad_group_ids)
+    profile_ad_groups_dict = dict(profile_ad_groups.values_list("ad_group_id", "default_bid").order_by())
+    return profile_ad_groups_dict or None
 
 
 def _get_campaign_from_keyword_dict(campaign, current_keyword) -> Campaign:
@@ -616,27 +688,6 @@ def _set_keyword_target_defaults(endpoint: SpEndpoint, keyword_target_dict: dict
     return keyword_defaults
 
 
-@dataclass
-class AdSlice:
-    """Data class used to represent a performance slice of a keyword or campaign placement"""
-
-    sales: float = 0.0
-    spend: float = 0.0
-    kenp_royalties: int = 0
-    impressions: int = 0
-    clicks: int = 0
-    orders: int = 0
-    attributed_conversions_30d: int = 0
-
-    def add(self, new_data):
-        self.sales = self.sales + float(new_data.sales)
-        self.spend = self.spend + float(new_data.spend)
-        self.kenp_royalties = self.kenp_royalties + new_data.kenp_royalties
-        self.impressions = self.impressions + new_data.impressions
-        self.clicks = self.clicks + new_data.clicks
-        self.orders = self.orders + new_data.orders
-
-
 def _calculate_bid_good_sellers(slice_list, target_acos):
     """Helper function to calculate bid of targets which are selling well"""
     sales_peg = 0.0
@@ -748,8 +799,6 @@ def update_sp_bids_status(
 ):
     """Update bids and status for managed campaigns of managed profiles"""
     # TODO: add never negatives list
-    GP_PURPOSES = [CampaignPurpose.GP, CampaignPurpose.Auto_GP]
-
     if profile_pks:
         managed_profiles = Profile.objects.filter(id__in=profile_pks)
     else:
@@ -770,9 +819,9 @@ def update_sp_bids_status(
         profile_id: list(books) for profile_id, books in groupby(all_books, key=lambda book: book.profile_id)
     }
 
+    # prices are resolved once per book for the whole run
+    book_prices_service = BookPricesService()
     for profile in managed_profiles:
-        keywords = {}
-        report_data_per_keyword = {}
         be_acos_per_book = {
             book.asin: BookData(
                 asin=book.asin,
@@ -785,84 +834,17 @@ def update_sp_bids_status(
         if not be_acos_per_book:
             continue
 
-        for model, report_type, identifier in [
-            (Keyword, SpReportType.KEYWORD, "keyword_id"),
-            (Target, SpReportType.TARGET, "target_id"),
-        ]:
-            # Get all keywords where campaign is managed, keyword is serving and hasn't been updated in the last 24 hrs
-            keywords[identifier]: [Union[QuerySet[Keyword], QuerySet[Target]]] = (
-                model.objects.prefetch_related("campaign__books")
-                .select_related("campaign")
-                .filter(
-                    campaign__profile=profile,
-                    campaign__managed=True,
-                    serving_status__in=TARGETS_VALID_STATUSES,
-                    last_updated_date_on_amazon__lt=mod_limit_epoch_ms,
-                    keyword_type="Positive",
-                )
-                .exclude(
-                    Q(campaign__campaign_purpose__in=GP_PURPOSES)
-                    | Q(campaign__campaign_name__regex=r"(-|_)GP(-|_)|Auto-GP(-|$)"),
-                )
-                .exclude(
-                    campaign__books__asin__isnull=True,
-                    bid__isnull=True,
-                )
-                .values(
-                    identifier,
-                    "campaign__profile_id",
-                    "bid",
-                    "campaign__target_acos",
-                    "campaign__books__asin",
-                    "campaign__books__pk",
-                )
-                .order_by("campaign__profile_id")
-            )
-
-            report_data_per_keyword[identifier] = (
-                RecentReportData.objects.select_related("campaign")
-                .filter(
-                    report_type=report_type,
-                    campaign__profile=profile,
-                    campaign__managed=True,
-                    date__gte=date_from,
-                    **{f"{identifier}__in": keywords[identifier].values(identifier)},
-                )
-                .exclude(
-                    Q(campaign__campaign_purpose__in=GP_PURPOSES)
-                    | Q(campaign__campaign_name__regex=r"(-|_)GP(-|_)|Auto-GP(-|$)")
-                )
-                .values(identifier)
-                .annotate(sales_sum=Sum("sales"))
-                .annotate(spend_sum=Sum("spend"))
-                .annotate(kenp_royalties_sum=Sum("kenp_royalties"))
-                .annotate(impressions_sum=Sum("impressions"))
-                .annotate(clicks_sum=Sum("clicks"))
-                .annotate(orders_sum=Sum("orders"))
-                .annotate(attributed_conversions_30d_sum=Sum("attributed_conversions_30d"))
-                .annotate(
-                    book_launch=Exists(Book.objects.filter(campaigns=OuterRef("campaign"), launch=True))
-                )
-                .order_by("-sales_sum", "-book_launch", "spend_sum")
-            )
-
-            # excluding December 5th to 25th if we are in Q1
-            if 1 <= datetime.today().month <= 3:
-                excluded_year = datetime.today().year - 1
-                exclude_date_from = datetime(excluded_year, 12, 5)
-                exclude_date_to = datetime(excluded_year, 12, 25)
-
-                report_data_per_keyword[identifier] = report_data_per_keyword[identifier].exclude(
-                    date__range=[exclude_date_from, exclude_date_to]
-                )
-
-        bid_change_and_pause_per_keyword = get_bid_change_and_pause_per_keyword(
-            be_acos_per_book,
-            profile,
-            report_data_per_keyword,
-            keywords,
+        keywords, report_data_per_keyword = _get_keywords_and_report_data_for_bids(
+            profile, date_from, mod_limit_epoch_ms
         )
-        _logger.info("[%s] %s", profile, f"{model.__name__}s")
+        bid_planning_service = BidPlanningService(
+            profile=profile,
+            be_acos_per_book=be_acos_per_book,
+            report_data_per_keyword=report_data_per_keyword,
+            managed_keywords=keywords,
+            book_prices_service=book_prices_service,
+        )
+        bid_change_and_pause_per_keyword = bid_planning_service.plan()
 
         for identifier, keywords_data in bid_change_and_pause_per_keyword.items():
             Entity = KeywordEntity if identifier == "keywordId" else TargetEntity
@@ -908,193 +890,83 @@ def update_sp_bids_status(
         # print(f"Targets updated: {kw_count}. Profile: {current_profile.nickname} [{current_profile.country_code}]")
 
 
-def get_bid_change_and_pause_per_keyword(
-    be_acos_per_book,
-    profile,
-    report_data_per_keyword,
-    managed_keywords,
-):
-    # create a dictionary with all the keyword / target data aggregated for all managed keywords
-    profile_id = profile.profile_id
-    date_of_spend = datetime.today() - timedelta(days=1)
-    bid_change_and_pause_per_keyword = {}
-
-    proven_keywords_ids = {identifier: [] for identifier in managed_keywords.keys()}
-    for identifier, reports_data in report_data_per_keyword.items():
-        identifier_amazon = "keywordId" if identifier == "keyword_id" else "targetId"
-        bid_change_and_pause_per_keyword[identifier_amazon] = []
-        for report_data in reports_data:
-            keyword = (
-                managed_keywords[identifier].filter(**{f"{identifier}": report_data[identifier]}).first()
+def _get_keywords_and_report_data_for_bids(profile: Profile, date_from: datetime, mod_limit_epoch_ms: float):
+    """Builds managed keywords / targets and their aggregated report data querysets per identifier"""
+    GP_PURPOSES = [CampaignPurpose.GP, CampaignPurpose.Auto_GP]
+
+    keywords = {}
+    report_data_per_keyword = {}
+    for model, report_type, identifier in [
+        (Keyword, SpReportType.KEYWORD, "keyword_id"),
+        (Target, SpReportType.TARGET, "target_id"),
+    ]:
+        # Get all keywords where campaign is managed, keyword is serving and hasn't been updated in the last 24 hrs
+        keywords[identifier]: [Union[QuerySet[Keyword], QuerySet[Target]]] = (
+            model.objects.prefetch_related("campaign__books")
+            .select_related("campaign")
+            .filter(
+                campaign__profile=profile,
+                campaign__managed=True,
+                serving_status__in=TARGETS_VALID_STATUSES,
+                last_updated_date_on_amazon__lt=mod_limit_epoch_ms,
+                keyword_type="Positive",
             )
-            keyword_id = keyword[identifier]
-            current_bid = keyword.get("bid")
-            target_acos = keyword.get("campaign__target_acos")
-            asin = keyword["campaign__books__asin"]
-            book_id = keyword["campaign__books__pk"]
-
-            if target_acos == 0:
-                target_acos = be_acos_per_book[asin].be_acos if asin in be_acos_per_book else DEFAULT_BE_ACOS
-
-            try:
-                book_price_repo = BookPriceRepository(book_id)
-                book_price = book_price_repo.get_actual_price()
-            except (TypeError, AttributeError):
-                book_price = DEFAULT_BOOK_PRICE
-
-            book_reviews = be_acos_per_book[asin].reviews if asin else 0
-
-            bid_change, pause = _campaign_adjust_keywords(
-                report_data=report_data,
-                target_acos=target_acos,
-                current_val=current_bid,
-                book_price=book_price,
-                book_reviews=book_reviews,
+            .exclude(
+                Q(campaign__campaign_purpose__in=GP_PURPOSES)
+                | Q(campaign__campaign_name__regex=r"(-|_)GP(-|_)|Auto-GP(-|$)"),
             )
-            if report_data["sales_sum"] > 0:
-                proven_keywords_ids[identifier].append(keyword_id)
-
-            bid_change_and_pause_per_keyword[identifier_amazon].append(
-                {
-                    "external_id": keyword_id,
-                    "current_bid": current_bid,
-                    "bid_change": bid_change,
-                    "pause": pause,
-                    "is_proven": bool(report_data["sales_sum"] > 0),
-                }
+            .exclude(
+                campaign__books__asin__isnull=True,
+                bid__isnull=True,
             )
-
-    outstanding_daily_budget_service = RemainingDailyBudgetService(profile_id)
-    outstanding_daily_budget = outstanding_daily_budget_service.calculate()
-    _logger.info(
-        "Outstanding daily budget for profile %s equals %s",
-        profile,
-        outstanding_daily_budget,
-    )
-
-    proven_budget_service = ProvenBudgetService(profile)
-    proven_budget = proven_budget_service.calculate()
-    unproven_budget = outstanding_daily_budget - proven_budget
-    _logger.info(
-        "Budget for profile %s equals proven=%s unproven=%s",
-        profile,
-        proven_budget,
-        unproven_budget,
-    )
-
-    proven_spend = 0
-    unproven_spend = 0
-    proven_keywords_count = 0
-    unproven_keywords_count = 0
-    for identifier, keywords in managed_keywords.items():
-        # adopte for target
-        proven_keywords = keywords.filter(**{f"{identifier}__in": proven_keywords_ids[identifier]})
-        unproven_keywords = keywords.exclude(**{f"{identifier}__in": proven_keywords_ids[identifier]})
-        proven_keywords_count += proven_keywords.count()
-        unproven_keywords_count += unproven_keywords.count()
-        proven_spends_service = DateKeywordsSpendsServce(date_of_spend, proven_keywords)
-        proven_spend += proven_spends_service.calculate_spends()
-        unproven_spends_service = DateKeywordsSpendsServce(date_of_spend, unproven_keywords)
-        unproven_spend += unproven_spends_service.calculate_spends()
-
-    total_spend = proven_spend + unproven_spend
-    _logger.info(
-        "Spend for date %s for profile %s equals proven=%s, unproven=%s",
-        date_of_spend,
-        profile,
-        proven_spend,
-        unproven_spend,
-    )
-
-    overspend = total_spend > outstanding_daily_budget
-    # assume 10% overspend or 10% underspend
-    predicted_modifier = 0.9 if overspend else 1.1
-
-    predicted_proven_spend = float(proven_spend) * predicted_modifier
-    predicted_unproven_spend = float(unproven_spend) * predicted_modifier
-    _logger.info(
-        "Predicted spend for profile %s equals proven=%s, unproven=%s",
-        profile,
-        predicted_proven_spend,
-        predicted_unproven_spend,
-    )
-
-    surplus_budget = outstanding_daily_budget - predicted_proven_spend - predicted_unproven_spend
-
-    _logger.info("Surples budget for profile %s equals %s", profile, surplus_budget)
-    if surplus_budget < 0:
-        proven_percentage_to_min = (
-            (1 - proven_budget / predicted_proven_spend) if predicted_proven_spend > 0 else 0
-        )
-        proven_count_to_min = round(proven_keywords_count * proven_percentage_to_min)
-
-        unproven_percentage_to_min = (
-            (1 - unproven_budget / predicted_unproven_spend) if predicted_unproven_spend > 0 else 0
-        )
-
-        unproven_count_to_min = round(unproven_keywords_count * unproven_percentage_to_min)
-
-        _logger.info(
-            "proven_percentage_to_min=%s, proven_count_to_min=%s,"
-            " unproven_percentage_to_min=%s, unproven_count_to_min=%s",
-            proven_percentage_to_min,
-            proven_count_to_min,
-            unproven_percentage_to_min,
-            unproven_count_to_min,
+            .values(
+                identifier,
+                "campaign__profile_id",
+                "bid",
+                "campaign__target_acos",
+                "campaign__books__asin",
+                "campaign__books__pk",
+            )
+            .order_by("campaign__profile_id")
         )
 
-        proven_keywords_to_min = []
-        for identifier, _ in managed_keywords.items():
-            proven_keywords_to_min += report_data_per_keyword[identifier].filter(sales_sum__gt=0)
-
-        proven_keywords_to_min.sort(key=lambda k: (k["sales_sum"], -k["spend_sum"], k["book_launch"]))
-
-        for report_data in proven_keywords_to_min[:proven_count_to_min]:
-            identifier = "keyword_id" if "keyword_id" in report_data.keys() else "target_id"
-            identifier_amazon = "keywordId" if identifier == "keyword_id" else "targetId"
-
-            keyword = (
-                managed_keywords[identifier].filter(**{f"{identifier}": report_data[identifier]}).first()
+        report_data_per_keyword[identifier] = (
+            ReportDataDailyRollup.objects.filter(
+                report_type=report_type,
+                campaign__profile=profile,
+                campaign__managed=True,
+                date__gte=date_from,
+                **{f"{identifier}__in": keywords[identifier].values(identifier)},
             )
-            current_bid = float(keyword["bid"])
-
-            keyword_data = list(
-                filter(
-                    lambda k: k["external_id"] == report_data[identifier],
-                    bid_change_and_pause_per_keyword[identifier_amazon],
-                )
-            )[0]
-            keyword_data["bid_change"] = DEFAULT_MIN_BID - current_bid
-
-        unproven_keywords_to_min = []
-        for identifier, _ in managed_keywords.items():
-            unproven_keywords_to_min += report_data_per_keyword[identifier].filter(sales_sum=0)
-
-        unproven_keywords_to_min.sort(key=lambda k: (-k["book_launch"], -k["spend_sum"]))
-
-        for report_data in unproven_keywords_to_min[:unproven_count_to_min]:
-            identifier = "keyword_id" if "keyword_id" in report_data.keys() else "target_id"
-            identifier_amazon = "keywordId" if identifier == "keyword_id" else "targetId"
-
-            keyword = (
-                managed_keywords[identifier].filter(**{f"{identifier}": report_data[identifier]}).first()
+            .exclude(
+                Q(campaign__campaign_purpose__in=GP_PURPOSES)
+                | Q(campaign__campaign_name__regex=r"(-|_)GP(-|_)|Auto-GP(-|$)")
             )
-            current_bid = float(keyword["bid"])
-
-            keyword_data = list(
-                filter(
-                    lambda k: k["external_id"] == report_data[identifier],
-                    bid_change_and_pause_per_keyword[identifier_amazon],
-                )
-            )[0]
-            keyword_data["bid_change"] = DEFAULT_MIN_BID - current_bid
+            .values(identifier)
+            .annotate(sales_sum=Sum("sales"))
+            .annotate(spend_sum=Sum("spend"))
+            .annotate(kenp_royalties_sum=Sum("kenp_royalties"))
+            .annotate(impressions_sum=Sum("impressions"))
+            .annotate(clicks_sum=Sum("clicks"))
+            .annotate(orders_sum=Sum("orders"))
+            .annotate(attributed_conversions_30d_sum=Sum("attributed_conversions_30d"))
+            .annotate(
+                book_launch=Exists(Book.objects.filter(campaigns=OuterRef("campaign"), launch=True))
+            )
+            .order_by("-sales_sum", "-book_launch", "spend_sum")
+        )
 
-        surplus_budget = 0
+        # excluding December 5th to 25th if we are in Q1
+        if 1 <= datetime.today().month <= 3:
+            excluded_year = datetime.today().year - 1
+            exclude_date_from = datetime(excluded_year, 12, 5)
+            exclude_date_to = datetime(excluded_year, 12, 25)
 
-    profile.surplus_budget = surplus_budget
-    profile.save()
+            report_data_per_keyword[identifier] = report_data_per_keyword[identifier].exclude(
+                date__range=[exclude_date_from, exclude_date_to]
+            )
 
-    return bid_change_and_pause_per_keyword
+    return keywords, report_data_per_keyword
 
 
 def _adjust_bid_by_placement(placement_data_single, current_keyword, bid):
@@ -1169,93 +1041,6 @@ def _calculate_combined_placement(current_profile: Profile, date_from: datetime,
     return placement_data_single
 
 
-def _campaign_adjust_keywords(
-    report_data: dict,
-    current_val,
-    target_acos=DEFAULT_BE_ACOS,
-    book_price=DEFAULT_BOOK_PRICE,
-    book_reviews: Optional[int] = None,
-):
-    """Bid and placement multiplier adjustment decision tree"""
-    val_change = 0.0
-    pause = False
-    spend = float(report_data["spend_sum"])
-    clicks = float(report_data["clicks_sum"])
-    if spend == 0:
-        cpc = 0.0
-    elif clicks < 1:
-        cpc = DEFAULT_CPC
-    else:
-        cpc = round(spend / clicks, 2)
-    pause_threshold = book_price if book_price < PAUSE_TRESHOLD else PAUSE_TRESHOLD
-    default_max_bid = DEFAULT_MAX_BID
-    target_acos = float(target_acos)
-    default_min_bid = DEFAULT_MIN_BID if spend < (book_price * target_acos) else DEFAULT_MAX_BID_CONSERVATIVE
-
-    if book_price == 0:
-        book_price = DEFAULT_BOOK_PRICE
-    if book_reviews is not None and book_reviews < MIN_BOOK_REVIEWS:
-        default_max_bid = DEFAULT_MAX_BID_CONSERVATIVE
-        default_min_bid = DEFAULT_MIN_BID
-    # allow for kenp royalties by offsetting the spend
-    if report_data["kenp_royalties_sum"] > spend:
-        spend = 0.01  # this will result in a positive & very low ACOS => increase in bid
-    elif report_data["kenp_royalties_sum"] > 0:
-        spend = spend - report_data["kenp_royalties_sum"]
-    # main multiplier change decision tree starts
-    # 2 different decision trees are used for with and without sales
-    # keyword_sales = 0 so check on profile mode then research if allowed
-    if report_data["sales_sum"] == 0:
-        if spend > pause_threshold:
-            pause = True
-        # if there are no spend, then do more research
-        elif spend == 0:
-            if report_data["impressions_sum"] >= IMP_TRESHOLD and current_val > default_min_bid:
-                val_change = -1 * SML_BID_CHANGE
-            elif (
-                report_data["impressions_sum"] < IMP_TRESHOLD
-                and default_min_bid < current_val < default_max_bid
-            ):
-                val_change = SML_BID_CHANGE
-        # if there is spend then decide on how much more research to do
-        else:
-            # look at the research spend threshold which is obtained from the book price and target ACOS
-            research_spend_threshold = round(target_acos * float(book_price) * RESEARCH_MARGIN_MULTIPLIER, 2)
-            # if bid can be decreased and spend > 1.25 x 40% x 10
-            if spend >= research_spend_threshold and current_val > default_min_bid:
-                phantom_acos = round(spend / float(book_price), 2)
-                # work around to align with functionality of the other code, using val change, not the full bid.
-                bid_to_return = round(cpc / (phantom_acos / target_acos), 2) if cpc > 0 else 0.0
-                val_change = round(bid_to_return - float(current_val), 2)
-                if val_change >= 0:
-                    val_change = -2 * BIG_BID_CHANGE
-                # if it's going to be lower than Min Bid, just set Min Bid
-                if float(current_val) + val_change < default_min_bid:
-                    val_change = round(default_min_bid - float(current_val), 2)
-            # do more research
-            if (
-                spend < research_spend_threshold
-                and current_val < BID_UPPER_THRESHOLD * cpc
-                and current_val < default_max_bid
-            ):
-                # next click could possibly get a good ACOS sale
-                val_change = SML_BID_CHANGE
-    else:  # there are sales, use a formula to work out the new bid based on the CPC
-        acos = spend / float(report_data["sales_sum"])
-        if acos == 0:
-            _logger.error(f'ACOS is zero error, spend was: {spend}, sales was: {report_data["sales_sum"]}')
-            return 0.0, False
-        acos_ratio = acos / target_acos
-        bid_cpc_multiplier = -0.1219 * acos_ratio**2 - 0.3564 * acos_ratio + 1.703
-        bid_to_return = round(bid_cpc_multiplier * cpc, 2)
-        bid_to_return = min(
-            max(bid_to_return, DEFAULT_MIN_BID), default_max_bid
-        )  # Using the ALL CAPS DEFAULT_MIN_BID is correct
-        val_change = round(bid_to_return - float(current_val), 2)
-
-    return val_change, pause
-
-
 def _campaign_adjust(
     slice: AdSlice,
     current_val,
@@ -1392,136 +1177,50 @@ def _add_up_ad_slice(slice_list: List[RecentReportData]) -> AdSlice:
 
 @app.task
 def udpate_sp_placements(profile_pks: list[int]):
-    """Update placements for managed profiles"""
+    """
+    Update placements for managed profiles. Profiles of a region are updated by
+    SYNC_SP_PLACEMENTS_WORKERS_PER_REGION workers, regions are updated concurrently
+    """
     # Only run for managed profiles
     if profile_pks:
-        managed_profiles = Profile.objects.filter(id__in=profile_pks).prefetch_related("book_set")
+        managed_profiles = Profile.objects.filter(id__in=profile_pks)
     else:
-        managed_profiles = Profile.objects.filter(managed=True).prefetch_related("book_set")
-
-    # Consider keywords fromt he last 30 days, excluding the last two days.
-    today = datetime.today()
-    date_min_data = datetime.date(today - timedelta(days=7))
-    # date_from = today - timedelta(days=DEFAULT_DATA_TIMEFRAME_DAYS)
-    # date_to = today - timedelta(days=DEFAULT_DATA_ACCURACY_CUTOFF_DAYS)
-    mod_limit_date = today - timedelta(days=0.8)
-    # get the epoch time of 24 hours ago to ensure bid changes are not made too often
-    mod_limit_epoch_ms = mod_limit_date.timestamp() * 1000
-    # temporary ACOS settings and other inputs
-    for current_profile in managed_profiles:
-        profile_id = current_profile.profile_id
-        profile_server = current_profile.profile_server
-
-        be_acos_per_book = {
-            book.asin: BookData(
-                asin=book.asin,
-                price=book.price,
-                be_acos=book.be_acos,
-                reviews=book.reviews,
-            )
-            for book in current_profile.book_set.all()  # type:ignore
-        }
-        if be_acos_per_book is None:
-            pass
+        managed_profiles = Profile.objects.filter(managed=True)
+    profiles_per_region = defaultdict(list)
+    for profile in managed_profiles:
+        profiles_per_region[profile.profile_server].append(profile)
 
-        campaigns_to_update = []
-        managed_campaigns = (
-            Campaign.objects.filter(
-                profile=current_profile,
-                managed=True,
-                state=SpState.ENABLED.value,
-                last_updated_date_on_amazon__lt=mod_limit_epoch_ms,
-                sponsoring_type="sponsoredProducts",
-            )
-            .exclude(campaign_name__contains="-GP-")
-            .exclude(campaign_purpose=CampaignPurpose.GP)
-            .exclude(campaign_purpose=CampaignPurpose.Auto_GP)
+    executors = [
+        ThreadPoolExecutor(
+            max_workers=SYNC_SP_PLACEMENTS_WORKERS_PER_REGION, thread_name_prefix=f"placements-{region}"
+        )
+        for region in profiles_per_region
+    ]
+    futures = {}
+    try:
+        for executor, profiles in zip(executors, profiles_per_region.values()):
+            for profile in profiles:
+                futures[executor.submit(_update_profile_placements, profile)] = profile
+    finally:
+        for executor in executors:
+            executor.shutdown()
+
+    failed_profiles = []
+    for future, profile in futures.items():
+        error = future.exception()
+        if error is not None:
+            _logger.error("Placements of profile %s were not updated: %s", profile.profile_id, error)
+            failed_profiles.append(profile.profile_id)
+    if failed_profiles:
+        raise BaseAmazonAdsException(
+            f"Placements of profiles {failed_profiles} were not updated. To see additional information, "
+            f"please refer to the logs. Time - {datetime.now()}"
         )
-        if not managed_campaigns.exists():
-            continue
-        campaign_data = (
-            RecentReportData.objects.filter(
-                report_type=SpReportType.PLACEMENT,
-                campaign__profile=current_profile,
-                campaign__managed=True,
-            )
-            .exclude(campaign__campaign_name__contains="-GP-")
-            .exclude(campaign__campaign_purpose=CampaignPurpose.GP)
-            .exclude(campaign__campaign_purpose=CampaignPurpose.Auto_GP)
-        ).order_by("-date")
-        if not campaign_data.exists():
-            continue
-        # create a dictionary with all the campaign data aggregated for all managed campaigns
-        campaign_data_mem_tos: Dict[int, AdSlice] = {}
-        campaign_data_mem_pp: Dict[int, AdSlice] = {}
-        for datum in campaign_data:
-            campaign_id = getattr(datum, "campaign_id")
-            if datum.placement == PlacementsOnAmazon.TOS:
-                campaign_data_mem_tos = _process_report_datum(
-                    datum=datum,
-                    datum_id=campaign_id,
-                    data_mem=campaign_data_mem_tos,
-                    date_min_data=date_min_data,
-                )
-            elif datum.placement == PlacementsOnAmazon.PP:
-                campaign_data_mem_pp = _process_report_datum(
-                    datum=datum,
-                    datum_id=campaign_id,
-                    data_mem=campaign_data_mem_pp,
-                    date_min_data=date_min_data,
-                )
-            else:
-                continue
 
-        for current_campaign in managed_campaigns:
-            campaign_id = getattr(current_campaign, "id")
-            # get the real break even acos
-            book_price = DEFAULT_BOOK_PRICE
-            try:
-                asin = current_campaign.asins[0]
-                be_acos = be_acos_per_book[asin].be_acos if asin in be_acos_per_book else DEFAULT_BE_ACOS
-                book_price = be_acos_per_book[asin].price if asin in be_acos_per_book else DEFAULT_BOOK_PRICE
-            except:
-                be_acos = DEFAULT_BE_ACOS
-            adjustments = []
-            for campaign_data_mem, placement_type_mult, predicate in [
-                (
-                    campaign_data_mem_tos,
-                    "placement_tos_mult",
-                    SponsoredProductsPlacement.PLACEMENT_TOP,
-                ),
-                (
-                    campaign_data_mem_pp,
-                    "placement_pp_mult",
-                    SponsoredProductsPlacement.PLACEMENT_PRODUCT_PAGE,
-                ),
-            ]:
-                ad_slice = (
-                    campaign_data_mem[campaign_id]
-                    if campaign_id in campaign_data_mem
-                    else AdSlice(0.0, 0.0, 0, 0, 0, 0)
-                )
-                current_placement_mult = getattr(current_campaign, placement_type_mult)
-                placement_change, pause = _campaign_adjust(
-                    slice=ad_slice,
-                    target_acos=be_acos,
-                    current_val=current_placement_mult,
-                    book_price=book_price,
-                )
-                if placement_change != 0:
-                    adjustments.append(
-                        PlacementBidding(
-                            percentage=current_placement_mult + placement_change,
-                            placement=predicate,
-                        )
-                    )
-            if len(adjustments) > 0:
-                campaigns_to_update.append(
-                    CampaignEntity(
-                        external_id=current_campaign.campaign_id_amazon,
-                        dynamic_bidding=DynamicBidding(placement_bidding=adjustments),
-                    ).dict(exclude_none=True, by_alias=True)
-                )
+
+def _update_profile_placements(current_profile: Profile):
+    try:
+        campaigns_to_update = _get_placement_updates(current_profile)
         # execute the update function
         if len(campaigns_to_update) > 0:
             campaign_adapter = CampaignAdapter(current_profile)
@@ -1537,31 +1236,96 @@ def udpate_sp_placements(profile_pks: list[int]):
                     "Some campaigns were not updated. To see additional information, please "
                     f"refer to the logs. Time - {datetime.now()}"
                 )
-            # print(f"Updated {len(campaigns_to_update)} campaign placements on {current_profile.nickname} [{current_profile.country_code}]")
+    finally:
+        # the profile is updated in a worker thread with its own connection
+        connection.close()
 
 
-def _process_report_datum(datum, datum_id, data_mem, date_min_data):
-    """Helper function to create or add key report data for keywords, targets, placements"""
-    if datum_id in data_mem:
-        single_entry_data = data_mem[datum_id]
-        # check if sufficient data has been gathered, if not, add more data to the mem storage
-        datum_date = getattr(datum, "date")
-        entry_orders = float(getattr(single_entry_data, "orders"))
-        if datum_date >= date_min_data or entry_orders < MIN_SALES_FOR_BID_CHANGE_DATA:
-            for metric in AdSlice.__dataclass_fields__:
-                updated_val = getattr(single_entry_data, metric) + float(getattr(datum, metric))
-                setattr(single_entry_data, metric, updated_val)
-            data_mem[datum_id] = single_entry_data
-    else:
-        data_mem[datum_id] = AdSlice(
-            float(datum.sales),
-            float(datum.spend),
-            datum.kenp_royalties,
-            datum.impressions,
-            datum.clicks,
-            datum.orders,
+def _get_placement_updates(current_profile: Profile) -> list[dict]:
+    """Placement multipliers of managed campaigns of the profile to update on Amazon"""
+    # Placement data of the last week is considered, older days are added if there were few orders
+    today = datetime.today()
+    date_min_data = datetime.date(today - timedelta(days=7))
+    date_from = datetime.date(today - timedelta(days=SYNC_SP_PLACEMENTS_LOOK_BACK_DAYS))
+    mod_limit_date = today - timedelta(days=0.8)
+    # get the epoch time of 24 hours ago to ensure bid changes are not made too often
+    mod_limit_epoch_ms = mod_limit_date.timestamp() * 1000
+
+    managed_campaigns = list(
+        Campaign.objects.filter(
+            profile=current_profile,
+            managed=True,
+            state=SpState.ENABLED.value,
+            last_updated_date_on_amazon__lt=mod_limit_epoch_ms,
+            sponsoring_type="sponsoredProducts",
         )
-    return data_mem
+        .exclude(campaign_name__contains="-GP-")
+        .exclude(campaign_purpose=CampaignPurpose.GP)
+        .exclude(campaign_purpose=CampaignPurpose.Auto_GP)
+        .values("id", "campaign_id_amazon", "asins", "placement_tos_mult", "placement_pp_mult")
+    )
+    if not managed_campaigns:
+        return []
+    placement_slices = PlacementsRepository.get_slices_with_look_back(
+        campaign_ids=[campaign["id"] for campaign in managed_campaigns],
+        placements=(PlacementsOnAmazon.TOS.value, PlacementsOnAmazon.PP.value),
+        date_from=date_from,
+        date_min=date_min_data,
+        min_orders=MIN_SALES_FOR_BID_CHANGE_DATA,
+    )
+    if not placement_slices:
+        return []
+    be_acos_per_book = {
+        asin: (be_acos, price)
+        for asin, be_acos, price in Book.objects.filter(profile=current_profile).values_list(
+            "asin", "be_acos", "price"
+        )
+    }
+
+    campaigns_to_update = []
+    for current_campaign in managed_campaigns:
+        campaign_id = current_campaign["id"]
+        # get the real break even acos
+        asins = current_campaign["asins"]
+        be_acos, book_price = DEFAULT_BE_ACOS, DEFAULT_BOOK_PRICE
+        if asins and asins[0] in be_acos_per_book:
+            be_acos, book_price = be_acos_per_book[asins[0]]
+        adjustments = []
+        for placement, placement_type_mult, predicate in [
+            (
+                PlacementsOnAmazon.TOS.value,
+                "placement_tos_mult",
+                SponsoredProductsPlacement.PLACEMENT_TOP,
+            ),
+            (
+                PlacementsOnAmazon.PP.value,
+                "placement_pp_mult",
+                SponsoredProductsPlacement.PLACEMENT_PRODUCT_PAGE,
+            ),
+        ]:
+            ad_slice = placement_slices.get((campaign_id, placement), AdSlice(0.0, 0.0, 0, 0, 0, 0))
+            current_placement_mult = current_campaign[placement_type_mult]
+            placement_change, pause = _campaign_adjust(
+                slice=ad_slice,
+                target_acos=be_acos,
+                current_val=current_placement_mult,
+                book_price=book_price,
+            )
+            if placement_change != 0:
+                adjustments.append(
+                    PlacementBidding(
+                        percentage=current_placement_mult + placement_change,
+                        placement=predicate,
+                    )
+                )
+        if len(adjustments) > 0:
+            campaigns_to_update.append(
+                CampaignEntity(
+                    external_id=current_campaign["campaign_id_amazon"],
+                    dynamic_bidding=DynamicBidding(placement_bidding=adjustments),
+                ).dict(exclude_none=True, by_alias=True)
+            )
+    return campaigns_to_update
 
 
 def create_multiple_sp_product_ads(
@@ -1937,17 +1701,7 @@ def _get_negatives_per_book(profile: Profile, profile_books, query: QueryData) -
         model = Target
         filter_by = "resolved_expression_text"
     model_filters = dict(keyword_type="Negative", campaign__profile=profile, state=SpState.ENABLED.value)
-    negatives_per_book = {
-        book.asin: list(
-            model.objects.filter(campaign__asins__contains=[book.asin], **model_filters)
-            .order_by(filter_by)
-            .values_list(filter_by, flat=True)
-            .distinct(filter_by)
-        )
-        for book in profile_books
-        if model.objects.filter(campaign__asins__contains=[book.asin], **model_filters).exists()
-    }
-    return negatives_per_book
+    return _get_keywords_texts_per_book(model, model_filters, filter_by, profile_books)
 
 
 def archive_never_negatives():
@@ -1978,17 +1732,56 @@ def _get_positive_exacts_per_book(
         model_filters["targeting_type"] = SpExpressionType.MANUAL.value
     if campaign_name_snippet is not None:
         model_filters["campaign__campaign_name__contains"] = campaign_name_snippet
-    positives_per_book = {
-        book.asin: list(
-            model.objects.filter(campaign__asins__contains=[book.asin], **model_filters)
-            .order_by(filter_by)
-            .values_list(filter_by, flat=True)
-            .distinct(filter_by)
+    return _get_keywords_texts_per_book(model, model_filters, filter_by, profile_books)
+
+
+def _get_keywords_texts_per_book(
+    model: Union[Type[Keyword], Type[Target]], model_filters: Dict, filter_by: str, profile_books
+) -> Dict[str, List[str]]:
+    """Distinct texts of keywords or targets per asin of the books, loaded with one query"""
+    asins = {book.asin for book in profile_books}
+    texts_per_book = defaultdict(set)
+    for campaign_asins, text in (
+        model.objects.filter(campaign__asins__overlap=list(asins), **model_filters)
+        .values_list("campaign__asins", filter_by)
+        .distinct()
+    ):
+        for asin in asins.intersection(campaign_asins):
+            texts_per_book[asin].add(text)
+    return {asin: sorted(texts) for asin, texts in texts_per_book.items()}
+
+
+def _sum_search_terms_per_book(profile: Profile, asins: List[str]) -> Dict[str, Dict[str, AdSlice]]:
+    """
+    Report data of search terms of the books summed per asin and search term. Rows are grouped by
+    campaign asins and search term in one query, a campaign's rows count for each of its books
+    """
+    search_terms_per_book: Dict[str, Dict[str, AdSlice]] = defaultdict(dict)
+    for search_term_total in (
+        RecentReportData.objects.filter(
+            campaign__profile=profile, campaign__asins__overlap=asins, query__isnull=False
         )
-        for book in profile_books
-        if model.objects.filter(campaign__asins__contains=[book.asin], **model_filters).exists()
-    }
-    return positives_per_book
+        .exclude(query="")
+        .values("campaign__asins", "query")
+        .annotate(
+            sales_sum=Sum("sales"),
+            spend_sum=Sum("spend"),
+            kenp_royalties_sum=Sum("kenp_royalties"),
+            impressions_sum=Sum("impressions"),
+            clicks_sum=Sum("clicks"),
+        )
+        .order_by()
+    ):
+        for asin in set(asins).intersection(search_term_total["campaign__asins"]):
+            search_term_slice = search_terms_per_book[asin].setdefault(
+                search_term_total["query"], AdSlice()
+            )
+            search_term_slice.sales += float(search_term_total["sales_sum"] or 0)
+            search_term_slice.spend += float(search_term_total["spend_sum"] or 0)
+            search_term_slice.kenp_royalties += search_term_total["kenp_royalties_sum"] or 0
+            search_term_slice.impressions += search_term_total["impressions_sum"] or 0
+            search_term_slice.clicks += search_term_total["clicks_sum"] or 0
+    return search_terms_per_book
 
 
 def _sort_asins(all_unique_keywords, query_report):
@@ -2019,50 +1812,37 @@ def _move_search_terms(
     profile_positives: Dict[str, List[str]] = {}
     profile_negatives: Dict[str, List[str]] = {}
 
+    # search terms and existing negatives / positives of all books are loaded once per profile
+    search_terms_per_book = _sum_search_terms_per_book(
+        profile=profile, asins=[book.asin for book in book_data]
+    )
+    existing_negatives = _get_negatives_per_book(profile=profile, profile_books=book_data, query=query)
+    existing_positive_exacts = _get_positive_exacts_per_book(
+        profile=profile, profile_books=book_data, query=query
+    )
+
     for asin, price, be_acos, _ in book_data:
         # initialise positive and negative keywords / targets Lists to be passed onto the generator Class and then onto POST request
         positives: List[str] = []
         negatives: List[str] = []
-        # get search term (query) data for ASIN
-        query_data = RecentReportData.objects.filter(
-            # report_type=query.query_report,
-            campaign__asins__contains=[asin],
-            campaign__profile=profile,
-            # date__gte=date_from,
-            # date__lte=date_to,
-        )
-        if not query_data.exists():
+        search_terms = search_terms_per_book.get(asin)
+        if not search_terms:
             continue
-        # returns an iterable Queryset of keywords / targets
-        all_unique_keywords = list(
-            query_data.order_by("query").values_list("query", flat=True).distinct("query")
-        )
-        unique_keywords = _sort_asins(all_unique_keywords, query.query_report)
+        unique_keywords = _sort_asins(sorted(search_terms), query.query_report)
         if len(unique_keywords) == 0:
             continue
-        book = Book.objects.filter(asin=asin, profile=profile)
-        # get existing negatives per asin to prevent multiple DB calls
-        # returns a QuerySet flat list
-        existing_negatives = _get_negatives_per_book(profile=profile, profile_books=book, query=query)
-        existing_positive_exacts = _get_positive_exacts_per_book(
-            profile=profile, profile_books=book, query=query
-        )
+        # if keyword is already in local negative keywords DB for this asin skip it, it should not be added as a negative or positive
+        # even if it's not in all ad groups, it'll be propagated by the fill out negatives function:
+        # def fill_out_sp_negatives():
+        # Also check if the current keyword is already a keyword / target
+        skipped_keywords = set(existing_negatives.get(asin, [])) | set(existing_positive_exacts.get(asin, []))
         for current_keyword in unique_keywords:
-            # if keyword is already in local negative keywords DB for this asin skip it, it should not be added as a negative or positive
-            # even if it's not in all ad groups, it'll be propagated by the fill out negatives function:
-            # def fill_out_sp_negatives():
-            # Also check if the current keyword is already a keyword / target (after the OR)
-            if current_keyword in existing_negatives.get(
-                asin, []
-            ) or current_keyword in existing_positive_exacts.get(asin, []):
+            if current_keyword in skipped_keywords:
                 continue
             # check against criteria to see if the search term graduates
             # get the search term's aggregate sales, spend => ACOS
-            current_query = _sum_report_data(
-                query_data=query_data, query_data_filters=dict(query=current_keyword)
-            )
             positives, negatives = _process_search_term(
-                price, be_acos, positives, negatives, current_keyword, current_query
+                price, be_acos, positives, negatives, current_keyword, search_terms[current_keyword]
             )
 
         # Add the positives list per asin to the profile positives list
@@ -4642,69 +4422,6 @@ def negate_exacts_in_research_campaigns(profiles: Optional[QuerySet[Profile]] =
                 )  # type: ignore
 
 
-def _sum_report_data(query_data: QuerySet[RecentReportData], query_data_filters: Dict) -> AdSlice:
-    """Produce a sum of ReportData as an AdSlice dataclass"""
-    current_query_total = query_data.filter(**query_data_filters).aggregate(
-        sales=Coalesce(Sum("sales"), V(0), output_field=DecimalField()),
-        spend=Coalesce(Sum("spend"), V(0), output_field=DecimalField()),
-        kenp_royalties=Coalesce(Sum("kenp_royalties"), V(0), output_field=DecimalField()),
-        impressions=Coalesce(Sum("impressions"), V(0), output_field=DecimalField()),
-        clicks=Coalesce(Sum("clicks"), V(0), output_field=DecimalField()),
-    )
-    current_query_summary = AdSlice(
-        float(current_query_total["sales"]),
-        float(current_query_total["spend"]),
-        current_query_total["kenp_royalties"],
-        current_query_total["impressions"],
-        current_query_total["clicks"],
-        0,
-    )
-    return current_query_summary
-
-
-def _rank_targets(ids: List[int], all_ad_slices: Dict[int, AdSlice]):
-    """Takes ids of targets and compares their performance returning the best target id as int and the rest as a list of ints"""
-    all_target_data = {}
-    for current_id in sorted(ids):
-        if current_id == 0:
-            best_id = 0
-            ids.remove(0)
-            return best_id, ids
-        target_summary = all_ad_slices[current_id]
-        all_target_data[current_id] = target_summary
-    data_list = []
-    for current_id, data in sorted(all_target_data.items()):
-        data_list.append(data.sales)
-    max_sales = max(data_list)
-    count = data_list.count(max_sales)
-    best_index = data_list.index(max_sales)
-    if count > 1:
-        i = 0
-        sales_positions = defaultdict(list)
-        for v in data_list:
-            sales_positions[v].append(i)
-            i += 1
-        best_pos_list = sales_positions[max_sales]
-        spends = []
-        i = 0
-        for current_id, data in sorted(all_target_data.items()):
-            if i in best_pos_list:
-                spends.append(data.spend)
-            i += 1
-        index_spend = spends.index(min(spends)) if max_sales > 0 else spends.index(max(spends))
-        best_index = best_pos_list[index_spend]
-    i = 0
-    best_id = 0
-    others = []
-    for current_id, data in sorted(all_target_data.items()):
-        if i == best_index:
-            best_id = current_id
-        else:
-            others.append(current_id)
-        i += 1
-    return best_id, others
-
-
 @app.task
 def deduplicate_targets(profile_ids: Optional[list[int]] = None):
     """Pauses lower performance duplicate targets for profile"""
@@ -4714,99 +4431,8 @@ def deduplicate_targets(profile_ids: Optional[list[int]] = None):
         profiles = Profile.objects.filter(managed=True)
 
     for profile in profiles:
-        for model, endpoint, type, text, ident, identifier_amazon in [
-            (
-                Keyword,
-                SpEndpoint.KEYWORDS,
-                "match_type",
-                "keyword_text",
-                "keyword_id",
-                "keywordId",
-            ),
-            (
-                Target,
-                SpEndpoint.TARGETS,
-                "resolved_expression_type",
-                "resolved_expression_text",
-                "target_id",
-                "targetId",
-            ),
-        ]:
-            # get all targets
-            targets = (
-                model.objects.filter(  # type: ignore
-                    campaign__profile=profile,
-                    state=SpState.ENABLED.value,
-                    serving_status__in=TARGETS_VALID_STATUSES,
-                    keyword_type="Positive",
-                )
-                .exclude(campaign__campaign_purpose=CampaignPurpose.GP)
-                .exclude(campaign__campaign_purpose=CampaignPurpose.Auto_GP)
-                .exclude(campaign__campaign_name__contains="-GP-")
-                .prefetch_related("campaign")
-            )
-            # strucutre ASIN, Match Type, Keyword text, keyword id
-            grouped_targets = defaultdict(list)
-            for target in targets:
-                db_ident = (
-                    0
-                    if target.campaign.campaign_purpose
-                    in [
-                        CampaignPurpose.Broad_Research_Single,
-                        CampaignPurpose.Exact_Scale_Single,
-                    ]
-                    or "-Single" in target.campaign.campaign_name
-                    else getattr(target, ident)
-                )
-                asins = target.campaign.asins  # Django caches the DB query
-                for asin in asins:
-                    grouped_targets[f"{asin}-{getattr(target, type)}-{getattr(target, text)}"].append(
-                        db_ident
-                    )
-            ids_to_pause = []
-            _logger.info(
-                "%ss to analyse on %s: %s",
-                model._meta.model_name,
-                profile,
-                len(grouped_targets),
-            )  # type: ignore
-            all_ids = []
-            for info, ids in grouped_targets.items():
-                if len(ids) > 1 and 0 not in ids:
-                    all_ids.extend(ids)
-            if len(all_ids) == 0:
-                continue
-            additional_filter = {ident + "__in": all_ids}
-            query_data = RecentReportData.objects.filter(
-                Q(sales__gt=0)
-                | Q(spend__gt=0)
-                | Q(kenp_royalties__gt=0)
-                | Q(impressions__gt=0)
-                | Q(clicks__gt=0)
-                | Q(orders__gt=0),
-                campaign__profile=profile,
-                **additional_filter,
-            )
-            all_ad_slices: Dict[int, AdSlice] = defaultdict(AdSlice)
-            for report_datum in query_data:
-                all_ad_slices[getattr(report_datum, ident)].add(
-                    AdSlice(
-                        sales=report_datum.sales,
-                        spend=report_datum.spend,
-                        kenp_royalties=report_datum.kenp_royalties,
-                        impressions=report_datum.impressions,
-                        clicks=report_datum.clicks,
-                        orders=report_datum.orders,
-                    )
-                )
-            empty_slice = AdSlice(0.0, 0.0, 0, 0, 0, 0)
-            for id in all_ids:
-                all_ad_slices[id].add(empty_slice)
-            for info, ids in grouped_targets.items():
-                if len(ids) > 1:
-                    # analyse performance of Keywords or Targets
-                    best, others = _rank_targets(ids=ids, all_ad_slices=all_ad_slices)
-                    ids_to_pause.extend(others)
+        for model in (Keyword, Target):
+            ids_to_pause = DuplicateTargetsService(profile, model).get_ids_to_pause()
             if len(ids_to_pause) > 0:
                 targets_to_pause = []
                 Entity, Adapter = (
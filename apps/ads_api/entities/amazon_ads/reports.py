@@ -1,4 +1,4 @@
-from typing import Iterator, Optional
+from typing import ClassVar, Iterator, Optional
 
 from pydantic import BaseModel, Field, root_validator, validator
 from pydantic.types import date
@@ -38,6 +38,21 @@ class ReportListEntity(BaseModel):
 
 
 class BaseReportDataEntity(BaseModel):
+    """
+    A row of a report file. Fields and validators of the entities are also compiled
+    into fast decoders of whole report files, see ReportRowsDecoder
+    """
+
+    # negative values are replaced with 0
+    NON_NEGATIVE_FIELDS: ClassVar[tuple[str, ...]] = (
+        "orders",
+        "kenp_royalties",
+        "attributed_conversions_30d",
+        "impressions",
+        "clicks",
+    )
+    LOWERCASE_FIELDS: ClassVar[tuple[str, ...]] = ()
+
     orders: int = Field(alias="unitsSoldClicks30d")
     sales: float = Field(alias="sales30d")
     kenp_royalties: int = Field(alias="kindleEditionNormalizedPagesRoyalties14d")
@@ -64,25 +79,14 @@ class BaseReportDataEntity(BaseModel):
     target_text: str = Field(alias="targeting", default="")
     target_type: str = Field(alias="keywordType", default="")
 
-    @validator("orders")
-    def replace_negative_orders(cls, v: int):
-        return v if v >= 0 else 0
-
-    @validator("kenp_royalties")
-    def replace_negative_kenp_royalties(cls, v: int):
-        return v if v >= 0 else 0
-
-    @validator("attributed_conversions_30d")
-    def replace_negative_attributed_conversions_30d(cls, v: int):
-        return v if v >= 0 else 0
-
-    @validator("impressions")
-    def replace_negative_impressions(cls, v: int):
+    @validator(*NON_NEGATIVE_FIELDS)
+    def replace_negative(cls, v: int):
         return v if v >= 0 else 0
 
-    @validator("clicks")
-    def replace_negative_clicks(cls, v: int):
-        return v if v >= 0 else 0
+    @classmethod
+    def complete_values(cls, values: dict) -> dict:
+        """Fills values missing in the report from other values of the row"""
+        return values
 
     class Config:
         allow_population_by_field_name = True
@@ -103,13 +107,15 @@ class KeywordQueryReportDataEntity(BaseReportDataEntity):
 
 
 class KeywordsReportDataEntity(BaseReportDataEntity):
+    LOWERCASE_FIELDS: ClassVar[tuple[str, ...]] = ("match_type",)
+
     keyword_id: int = Field(alias="keywordId")
     ad_group_name: str = Field(alias="adGroupName")
     match_type: str = Field(alias="matchType")
     ad_group_id: int = Field(alias="adGroupId")
     keyword_text: Optional[str] = Field(alias="keyword", default="")
 
-    @validator("match_type")
+    @validator(*LOWERCASE_FIELDS)
     def country_code_to_lower(cls, v: str):
         return v.lower()
 
@@ -126,6 +132,11 @@ class ProductAdsReportData(BaseReportDataEntity):
 
     @root_validator
     def replace_none_with_blank(cls, values):
+        return cls.complete_values(values)
+
+    @classmethod
+    def complete_values(cls, values: dict) -> dict:
+        """Asin of the ad is taken from its ad group name or the stored product ad if not reported"""
         if values.get("asin") is None:
             ad_group_name: str = values.get("ad_group_name")
             try:
@@ -0,0 +1,22 @@
+from dataclasses import dataclass
+
+
+@dataclass
+class AdSlice:
+    """Data class used to represent a performance slice of a keyword or campaign placement"""
+
+    sales: float = 0.0
+    spend: float = 0.0
+    kenp_royalties: int = 0
+    impressions: int = 0
+    clicks: int = 0
+    orders: int = 0
+    attributed_conversions_30d: int = 0
+
+    def add(self, new_data):
+        self.sales = self.sales + float(new_data.sales)
+        self.spend = self.spend + float(new_data.spend)
+        self.kenp_royalties = self.kenp_royalties + new_data.kenp_royalties
+        self.impressions = self.impressions + new_data.impressions
+        self.clicks = self.clicks + new_data.clicks
+        self.orders = self.orders + new_data.orders
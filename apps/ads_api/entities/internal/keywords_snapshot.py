@@ -0,0 +1,85 @@
+import math
+from array import array
+from typing import Optional
+
+from django.db.models import QuerySet
+
+# bids closer than this are considered equal, Amazon rounds them to cents
+BID_TOLERANCE = 0.011
+
+
+class KeywordsSnapshot:
+    """
+    Compact columns of stored keywords or targets: primary key, state, serving status, bid
+    and last update on Amazon, looked up by the Amazon id of a keyword or target.
+    Numbers are kept in arrays, states and serving statuses as codes of their few distinct values,
+    so large profiles can be diffed against Amazon without loading model instances.
+    """
+
+    COLUMNS = ("id", "state", "serving_status", "bid", "last_updated_date_on_amazon")
+
+    def __init__(self):
+        self._rows: dict[int, int] = {}
+        self._pks = array("q")
+        self._states = array("H")
+        self._serving_statuses = array("H")
+        self._bids = array("d")
+        self._last_updated = array("q")
+        self._values: list[Optional[str]] = []
+        self._value_codes: dict[Optional[str], int] = {}
+
+    @classmethod
+    def from_queryset(cls, queryset: QuerySet, id_field: str) -> "KeywordsSnapshot":
+        snapshot = cls()
+        for row in queryset.values_list(id_field, *cls.COLUMNS).order_by().iterator(chunk_size=10_000):
+            snapshot.append(*row)
+        return snapshot
+
+    def append(self, external_id: int, pk: int, state, serving_status, bid, last_updated: Optional[int]):
+        # the last of duplicated Amazon ids wins, like in a dict of model instances
+        self._rows[external_id] = len(self._pks)
+        self._pks.append(pk)
+        self._states.append(self._encode(state))
+        self._serving_statuses.append(self._encode(serving_status))
+        self._bids.append(math.nan if bid is None else float(bid))
+        self._last_updated.append(last_updated or 0)
+
+    def get_pk(self, external_id: int) -> Optional[int]:
+        row = self._rows.get(external_id)
+        return None if row is None else self._pks[row]
+
+    def differs(
+        self,
+        external_id: int,
+        state: Optional[str],
+        serving_status: Optional[str],
+        last_updated: Optional[int],
+        bid: Optional[float] = None,
+    ) -> bool:
+        """Whether Amazon values differ from the stored ones, bids are compared only if given"""
+        row = self._rows[external_id]
+        if (
+            self._states[row] != self._value_codes.get(state)
+            or self._serving_statuses[row] != self._value_codes.get(serving_status)
+            or self._last_updated[row] != (last_updated or 0)
+        ):
+            return True
+        if bid is None:
+            return False
+        stored_bid = self._bids[row]
+        if math.isnan(stored_bid):
+            stored_bid = 0
+        return abs(float(bid) - stored_bid) >= BID_TOLERANCE
+
+    def __len__(self):
+        return len(self._rows)
+
+    def __contains__(self, external_id: int):
+        return external_id in self._rows
+
+    def _encode(self, value: Optional[str]) -> int:
+        code = self._value_codes.get(value)
+        if code is None:
+            code = self._value_codes[value] = len(self._values)
+            self._values.append(value)
+        return code
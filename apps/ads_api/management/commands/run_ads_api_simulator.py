@@ -0,0 +1,63 @@
+import logging
+
+from django.core.management.base import BaseCommand
+
+from apps.ads_api.simulator.fixtures import SimulatorFixtures
+from apps.ads_api.simulator.server import AdsApiSimulator, SimulatorConfig
+
+_logger = logging.getLogger(__name__)
+
+
+class Command(BaseCommand):
+    help = (
+        "Runs the local Amazon Ads API simulator. "
+        "Point workers at it with ADS_API_SIMULATOR_URL=http://<host>:<port>."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--host", type=str, default="127.0.0.1")
+        parser.add_argument("--port", type=int, default=8765)
+        parser.add_argument(
+            "--fixtures", type=str, help="JSON file of profiles to serve instead of generated ones"
+        )
+        parser.add_argument("--profiles", type=int, nargs="+", default=[1], help="ids of generated profiles")
+        parser.add_argument("--campaigns", type=int, default=10, help="generated campaigns per profile")
+        parser.add_argument("--keywords-per-campaign", type=int, default=20)
+        parser.add_argument("--targets-per-campaign", type=int, default=10)
+        parser.add_argument("--seed", type=int)
+        parser.add_argument("--latency", type=float, default=0.0, help="seconds every response is delayed by")
+        parser.add_argument("--latency-jitter", type=float, default=0.0)
+        parser.add_argument("--page-size", type=int, default=100)
+        parser.add_argument("--rps", type=float, help="requests per second per profile before answering 429")
+        parser.add_argument("--burst", type=int, default=10)
+        parser.add_argument("--retry-after", type=float, default=1.0)
+        parser.add_argument("--report-generation-seconds", type=float, default=0.0)
+        parser.add_argument("--report-active-share", type=float, default=1.0)
+
+    def handle(self, *args, **options):
+        if options["fixtures"]:
+            fixtures = SimulatorFixtures.load(options["fixtures"])
+        else:
+            fixtures = SimulatorFixtures.generate(
+                options["profiles"],
+                campaigns=options["campaigns"],
+                keywords_per_campaign=options["keywords_per_campaign"],
+                targets_per_campaign=options["targets_per_campaign"],
+                seed=options["seed"],
+            )
+        config = SimulatorConfig(
+            latency=options["latency"],
+            latency_jitter=options["latency_jitter"],
+            page_size=options["page_size"],
+            requests_per_second=options["rps"],
+            burst=options["burst"],
+            retry_after=options["retry_after"],
+            report_generation_seconds=options["report_generation_seconds"],
+            report_active_share=options["report_active_share"],
+        )
+        simulator = AdsApiSimulator(fixtures, config, host=options["host"], port=options["port"])
+        _logger.info("Serving profiles %s", sorted(fixtures.profiles))
+        try:
+            simulator.serve_forever()
+        except KeyboardInterrupt:
+            _logger.info("Ads API simulator stopped, requests served: %s", dict(simulator.stats))
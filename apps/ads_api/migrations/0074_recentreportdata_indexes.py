@@ -0,0 +1,53 @@
+# Generated by Django 4.2 on 2026-10-18 11:25
+
+from django.contrib.postgres.operations import AddIndexConcurrently
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    # indexes are built without locking writes to the table
+    atomic = False
+
+    dependencies = [
+        ("ads_api", "0073_auto_20230718_1514"),
+    ]
+
+    operations = [
+        AddIndexConcurrently(
+            model_name="recentreportdata",
+            index=models.Index(
+                fields=["report_type", "campaign", "date"],
+                name="rrd_type_campaign_date_idx",
+            ),
+        ),
+        AddIndexConcurrently(
+            model_name="recentreportdata",
+            index=models.Index(
+                fields=["campaign", "date"], name="rrd_campaign_date_idx"
+            ),
+        ),
+        AddIndexConcurrently(
+            model_name="recentreportdata",
+            index=models.Index(
+                condition=models.Q(("keyword_id__isnull", False)),
+                fields=["keyword_id", "date"],
+                name="rrd_keyword_date_idx",
+            ),
+        ),
+        AddIndexConcurrently(
+            model_name="recentreportdata",
+            index=models.Index(
+                condition=models.Q(("target_id__isnull", False)),
+                fields=["target_id", "date"],
+                name="rrd_target_date_idx",
+            ),
+        ),
+        AddIndexConcurrently(
+            model_name="recentreportdata",
+            index=models.Index(
+                condition=models.Q(("query", ""), _negated=True),
+                fields=["campaign", "query"],
+                name="rrd_campaign_query_idx",
+            ),
+        ),
+    ]
@@ -0,0 +1,78 @@
+# Generated by Django 4.2 on 2026-10-18 11:31
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("ads_api", "0074_recentreportdata_indexes"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="ReportDataDailyRollup",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("report_type", models.CharField(max_length=99)),
+                ("keyword_id", models.PositiveBigIntegerField(null=True)),
+                ("target_id", models.PositiveBigIntegerField(null=True)),
+                ("date", models.DateField()),
+                ("impressions", models.PositiveBigIntegerField(default=0)),
+                ("clicks", models.PositiveBigIntegerField(default=0)),
+                (
+                    "spend",
+                    models.DecimalField(decimal_places=2, default=0, max_digits=12),
+                ),
+                (
+                    "sales",
+                    models.DecimalField(decimal_places=2, default=0, max_digits=12),
+                ),
+                ("orders", models.PositiveBigIntegerField(default=0)),
+                ("kenp_royalties", models.PositiveBigIntegerField(default=0)),
+                (
+                    "attributed_conversions_30d",
+                    models.PositiveBigIntegerField(default=0),
+                ),
+                (
+                    "campaign",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        to="ads_api.campaign",
+                    ),
+                ),
+            ],
+        ),
+        migrations.AddIndex(
+            model_name="reportdatadailyrollup",
+            index=models.Index(
+                fields=["report_type", "campaign", "date"],
+                name="rollup_type_campaign_date_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="reportdatadailyrollup",
+            index=models.Index(
+                condition=models.Q(("keyword_id__isnull", False)),
+                fields=["keyword_id", "date"],
+                name="rollup_keyword_date_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="reportdatadailyrollup",
+            index=models.Index(
+                condition=models.Q(("target_id__isnull", False)),
+                fields=["target_id", "date"],
+                name="rollup_target_date_idx",
+            ),
+        ),
+    ]
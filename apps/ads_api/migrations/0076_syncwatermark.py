@@ -0,0 +1,48 @@
+# Generated by Django 4.2 on 2026-10-18 11:39
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("ads_api", "0075_report_data_rollups"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="SyncWatermark",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("created_at", models.DateTimeField(auto_now_add=True)),
+                ("updated_at", models.DateTimeField(auto_now=True)),
+                ("endpoint", models.CharField(max_length=99)),
+                (
+                    "last_updated_date_on_amazon",
+                    models.PositiveBigIntegerField(default=0),
+                ),
+                ("full_synced_at", models.DateTimeField(null=True)),
+                (
+                    "profile",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        to="ads_api.profile",
+                        verbose_name="Profile",
+                    ),
+                ),
+            ],
+        ),
+        migrations.AddConstraint(
+            model_name="syncwatermark",
+            constraint=models.UniqueConstraint(fields=("profile", "endpoint"), name="unique_sync_watermark"),
+        ),
+    ]
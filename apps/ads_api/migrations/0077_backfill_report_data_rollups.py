@@ -0,0 +1,54 @@
+# Generated by Django 4.2 on 2026-10-18 13:38
+
+from datetime import date, timedelta
+
+from django.db import migrations
+
+# days of report data kept in RecentReportData, MAX_DATA_TIMEFRAME_DAYS
+BACKFILL_DAYS = 90
+METRIC_FIELDS = (
+    "impressions",
+    "clicks",
+    "spend",
+    "sales",
+    "orders",
+    "kenp_royalties",
+    "attributed_conversions_30d",
+)
+# field identifying an entity in rows of each rolled up report type, as in ReportDataRollupRepository
+ROLLUP_ENTITY_FIELDS = {
+    "keywords": "keyword_id",
+    "targets": "target_id",
+}
+
+
+def backfill_daily_rollups(apps, schema_editor):
+    """Rolls up report data already stored, later reports keep the rollups up to date"""
+    report_data_table = apps.get_model("ads_api", "RecentReportData")._meta.db_table
+    rollups = apps.get_model("ads_api", "ReportDataDailyRollup")
+    date_from = date.today() - timedelta(days=BACKFILL_DAYS)
+
+    rollups.objects.all().delete()
+    with schema_editor.connection.cursor() as cursor:
+        for report_type, entity_field in ROLLUP_ENTITY_FIELDS.items():
+            cursor.execute(
+                f"INSERT INTO {rollups._meta.db_table} "
+                f"(campaign_id, report_type, date, {entity_field}, {', '.join(METRIC_FIELDS)}) "
+                f"SELECT campaign_id, report_type, date, {entity_field}, "
+                + ", ".join(f"COALESCE(SUM({metric}), 0)" for metric in METRIC_FIELDS)
+                + f" FROM {report_data_table} "
+                "WHERE report_type = %s AND campaign_id IS NOT NULL AND date >= %s "
+                f"GROUP BY campaign_id, report_type, date, {entity_field}",
+                (report_type, date_from),
+            )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("ads_api", "0076_syncwatermark"),
+    ]
+
+    operations = [
+        migrations.RunPython(backfill_daily_rollups, migrations.RunPython.noop),
+    ]
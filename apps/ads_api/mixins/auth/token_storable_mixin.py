@@ -22,7 +22,8 @@ class TokenStorableMixin:
     @staticmethod
     def store_token(token_id: str, value: str, token_exp_time: int):
         timeout = token_exp_time - datetime.datetime.now().timestamp()
-        cache.add(
+        # replaces the previous token, it could still be in the cache while it's being refreshed
+        cache.set(
             key=token_id,
             value={"value": value, "expired": token_exp_time},
             timeout=timeout,
@@ -470,6 +470,65 @@ class RecentReportData(BaseModel):
                 name="unique_recent_report_data",
             ),
         )
+        indexes = (
+            # report type data of profile campaigns for a period: bids, placements, budgets
+            models.Index(fields=("report_type", "campaign", "date"), name="rrd_type_campaign_date_idx"),
+            # removal of the previously downloaded data of report campaigns for a period
+            models.Index(fields=("campaign", "date"), name="rrd_campaign_date_idx"),
+            models.Index(
+                fields=("keyword_id", "date"),
+                name="rrd_keyword_date_idx",
+                condition=models.Q(keyword_id__isnull=False),
+            ),
+            models.Index(
+                fields=("target_id", "date"),
+                name="rrd_target_date_idx",
+                condition=models.Q(target_id__isnull=False),
+            ),
+            # search terms of campaigns
+            models.Index(
+                fields=("campaign", "query"),
+                name="rrd_campaign_query_idx",
+                condition=~models.Q(query=""),
+            ),
+        )
+
+
+class ReportDataDailyRollup(models.Model):
+    """
+    Performance of a keyword or target of a campaign per day summed up from RecentReportData,
+    maintained after each downloaded report. Entity fields have the same names as in RecentReportData,
+    so the same lookups work on both
+    """
+
+    campaign = models.ForeignKey("Campaign", on_delete=models.CASCADE)
+    report_type = models.CharField(max_length=99)  # SpReportType
+    keyword_id = models.PositiveBigIntegerField(null=True)
+    target_id = models.PositiveBigIntegerField(null=True)
+    date = models.DateField()
+
+    impressions = models.PositiveBigIntegerField(default=0)
+    clicks = models.PositiveBigIntegerField(default=0)
+    spend = models.DecimalField(max_digits=12, decimal_places=2, default=0)
+    sales = models.DecimalField(max_digits=12, decimal_places=2, default=0)
+    orders = models.PositiveBigIntegerField(default=0)
+    kenp_royalties = models.PositiveBigIntegerField(default=0)
+    attributed_conversions_30d = models.PositiveBigIntegerField(default=0)
+
+    class Meta:
+        indexes = (
+            models.Index(fields=("report_type", "campaign", "date"), name="rollup_type_campaign_date_idx"),
+            models.Index(
+                fields=("keyword_id", "date"),
+                name="rollup_keyword_date_idx",
+                condition=models.Q(keyword_id__isnull=False),
+            ),
+            models.Index(
+                fields=("target_id", "date"),
+                name="rollup_target_date_idx",
+                condition=models.Q(target_id__isnull=False),
+            ),
+        )
 
 
 class Report(BaseModel):
@@ -579,6 +638,23 @@ class Target(BaseModel):
     last_updated_date_on_amazon = models.PositiveBigIntegerField(default=0, null=True)  # in epoch time
 
 
+class SyncWatermark(BaseModel):
+    """
+    High-water mark of an Amazon SP list endpoint per profile: the latest lastUpdateDateTime of synced
+    entities, entities not updated on Amazon since can be skipped by the next sync
+    """
+
+    profile = models.ForeignKey("Profile", verbose_name=("Profile"), on_delete=models.CASCADE)
+    endpoint = models.CharField(max_length=99)
+    last_updated_date_on_amazon = models.PositiveBigIntegerField(default=0)  # in epoch time
+    full_synced_at = models.DateTimeField(null=True)
+
+    class Meta:
+        constraints = (
+            models.UniqueConstraint(fields=("profile", "endpoint"), name="unique_sync_watermark"),
+        )
+
+
 class Book(BaseModel):
     """
     Books information for eBooks, paperbacks and hardbacks
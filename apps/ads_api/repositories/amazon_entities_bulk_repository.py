@@ -0,0 +1,121 @@
+from dataclasses import dataclass
+from typing import Iterable, Type
+
+from django.db.models import Model
+
+from adsdroid.settings import SYNC_ENTITIES_UPSERT_BATCH_SIZE
+from apps.ads_api.models import AdGroup, Campaign, ProductAd
+from apps.utils.chunks import chunker
+
+
+@dataclass
+class UpsertCounts:
+    created: int = 0
+    updated: int = 0
+    unchanged: int = 0
+
+
+class AmazonEntitiesBulkRepository:
+    """
+    Upserts synced Amazon entities in bulk: rows stored for the given entities are loaded once,
+    unchanged entities are skipped and the rest are written with INSERT ... ON CONFLICT DO UPDATE,
+    instead of an update_or_create per entity.
+    """
+
+    model: Type[Model]
+    # fields of a unique constraint of the model, the first one being the Amazon id
+    unique_fields: tuple[str, ...]
+    # fields taken from Amazon, updated in stored rows
+    update_fields: tuple[str, ...]
+
+    @classmethod
+    def upsert(cls, objects: Iterable[Model]) -> UpsertCounts:
+        counts = UpsertCounts()
+        # the last of duplicated entities wins, a single INSERT can't update a row twice
+        objects_by_key = {cls._unique_key(obj): obj for obj in objects}
+        stored_values = cls._get_stored_values({key[0] for key in objects_by_key})
+
+        to_write = []
+        for key, obj in objects_by_key.items():
+            values = stored_values.get(key)
+            if values is None:
+                counts.created += 1
+            elif values == cls._update_values(obj):
+                counts.unchanged += 1
+                continue
+            else:
+                counts.updated += 1
+            to_write.append(obj)
+
+        cls.model.objects.bulk_create(
+            to_write,
+            batch_size=SYNC_ENTITIES_UPSERT_BATCH_SIZE,
+            update_conflicts=True,
+            unique_fields=cls.unique_fields,
+            update_fields=cls.update_fields + ("updated_at",),
+        )
+        return counts
+
+    @classmethod
+    def _unique_key(cls, obj: Model) -> tuple:
+        return cls._values(obj, cls.unique_fields)
+
+    @classmethod
+    def _update_values(cls, obj: Model) -> tuple:
+        return cls._values(obj, cls.update_fields)
+
+    @classmethod
+    def _values(cls, obj: Model, fields: tuple[str, ...]) -> tuple:
+        # values are compared as they are read back, e.g. ids given as strings as ints, bids as Decimals
+        return tuple(
+            cls.model._meta.get_field(field).to_python(getattr(obj, attname))
+            for field, attname in zip(fields, cls._attnames(fields))
+        )
+
+    @classmethod
+    def _get_stored_values(cls, amazon_ids: set[int]) -> dict[tuple, tuple]:
+        unique_attnames = cls._attnames(cls.unique_fields)
+        stored_values = {}
+        for amazon_ids_batch in chunker(list(amazon_ids), SYNC_ENTITIES_UPSERT_BATCH_SIZE):
+            rows = cls.model.objects.filter(**{f"{unique_attnames[0]}__in": amazon_ids_batch}).values_list(
+                *unique_attnames, *cls._attnames(cls.update_fields)
+            )
+            for row in rows:
+                stored_values[row[: len(unique_attnames)]] = row[len(unique_attnames) :]
+        return stored_values
+
+    @classmethod
+    def _attnames(cls, fields: tuple[str, ...]) -> tuple[str, ...]:
+        return tuple(cls.model._meta.get_field(field).attname for field in fields)
+
+
+class CampaignsBulkRepository(AmazonEntitiesBulkRepository):
+    model = Campaign
+    unique_fields = ("campaign_id_amazon",)
+    update_fields = (
+        "profile",
+        "portfolio_id",
+        "targeting_type",
+        "serving_status",
+        "last_updated_date_on_amazon",
+        "campaign_name",
+        "state",
+        "placement_tos_mult",
+        "placement_pp_mult",
+        "bidding_strategy",
+        "premium_bid_adjustment",
+        "daily_budget",
+        "campaign_purpose",
+    )
+
+
+class AdGroupsBulkRepository(AmazonEntitiesBulkRepository):
+    model = AdGroup
+    unique_fields = ("ad_group_id", "campaign")
+    update_fields = ("ad_group_name", "state", "serving_status", "last_updated_date_on_amazon", "default_bid")
+
+
+class ProductAdsBulkRepository(AmazonEntitiesBulkRepository):
+    model = ProductAd
+    unique_fields = ("product_ad_id", "campaign", "ad_group")
+    update_fields = ("asin", "state", "serving_status", "last_updated_date_on_amazon")
@@ -1,5 +1,9 @@
 import datetime
 from datetime import date
+from typing import Iterable
+
+from django.db.models import F, Q, Window
+from django.db.models.functions import Lead
 
 from apps.ads_api.constants import DEFAULT_BOOK_PRICE
 from apps.ads_api.interfaces.repositories.book.price_repository_interface import (
@@ -42,3 +46,49 @@ class BookPriceRepository(BookPriceRepositoryInterface):
             price = DEFAULT_BOOK_PRICE
 
         return float(price)
+
+    @classmethod
+    def get_actual_prices(cls, book_ids: Iterable[int]) -> dict[int, float]:
+        """
+        Returns actual price per book id with one query, missing prices are stored as default for today
+        """
+        book_ids = {book_id for book_id in book_ids if book_id is not None}
+        today = datetime.date.today()
+        prices = {
+            book_id: history[-1][1]
+            for book_id, history in cls.get_effective_prices(book_ids, today, today).items()
+        }
+
+        books_without_price = book_ids - prices.keys()
+        if books_without_price:
+            cls.create_default_prices(books_without_price, today)
+            prices.update({book_id: float(DEFAULT_BOOK_PRICE) for book_id in books_without_price})
+
+        return prices
+
+    @staticmethod
+    def get_effective_prices(
+        book_ids: Iterable[int], date_from: date, date_to: date
+    ) -> dict[int, list[tuple[date, float]]]:
+        """
+        Returns (date, price) changes per book id, oldest first, effective between date_from and date_to:
+        the last price set on or before date_from and the ones set later up to date_to.
+        Books without a price set until date_to are missing
+        """
+        prices = {}
+        for book_id, price_date, price in (
+            DateBookPrice.objects.filter(book_id__in=set(book_ids), date__lte=date_to)
+            .annotate(next_date=Window(Lead("date"), partition_by=F("book_id"), order_by=F("date").asc()))
+            .filter(Q(next_date__isnull=True) | Q(next_date__gt=date_from))
+            .order_by("book_id", "date")
+            .values_list("book_id", "date", "price")
+        ):
+            prices.setdefault(book_id, []).append((price_date, float(price)))
+        return prices
+
+    @staticmethod
+    def create_default_prices(book_ids: Iterable[int], for_date: date):
+        DateBookPrice.objects.bulk_create(
+            [DateBookPrice(book_id=book_id, date=for_date, price=DEFAULT_BOOK_PRICE) for book_id in book_ids],
+            ignore_conflicts=True,
+        )
@@ -1,7 +1,7 @@
 import logging
-from typing import Iterable, List
+from typing import Iterable, List, Optional
 
-from django.db.models import QuerySet
+from django.db.models import Count, Q, QuerySet
 
 from apps.ads_api.constants import AdStatus
 from apps.ads_api.interfaces.repositories.campaign_repository_interface import (
@@ -99,3 +99,27 @@ class CampaignRepository(CampaignRepositoryInterface):
     @classmethod
     def set_managed_false_for_profiles(cls, profile_pks: List[int]):
         Campaign.objects.filter(managed=True, profile__id__in=profile_pks).update(managed=False)
+
+    @classmethod
+    def annotate_ads_serving_status_counts(
+        cls,
+        campaigns: QuerySet[Campaign],
+        ad_group_statuses: Optional[Iterable[str]] = None,
+        product_ad_statuses: Optional[Iterable[str]] = None,
+    ) -> QuerySet[Campaign]:
+        """
+        Annotates campaigns with counts of their ad groups and product ads in and not in the given serving
+        statuses: ad_groups_in_statuses, other_ad_groups, product_ads_in_statuses, other_product_ads.
+        Counts are computed with conditional aggregation in the query selecting the campaigns,
+        ad groups or product ads are only counted if their statuses are given.
+        """
+        counts = {}
+        if ad_group_statuses is not None:
+            in_statuses = Q(ad_groups__serving_status__in=list(ad_group_statuses))
+            counts["ad_groups_in_statuses"] = Count("ad_groups", filter=in_statuses, distinct=True)
+            counts["other_ad_groups"] = Count("ad_groups", filter=~in_statuses, distinct=True)
+        if product_ad_statuses is not None:
+            in_statuses = Q(product_ads__serving_status__in=list(product_ad_statuses))
+            counts["product_ads_in_statuses"] = Count("product_ads", filter=in_statuses, distinct=True)
+            counts["other_product_ads"] = Count("product_ads", filter=~in_statuses, distinct=True)
+        return campaigns.annotate(**counts)
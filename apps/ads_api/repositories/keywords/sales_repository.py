@@ -1,11 +1,10 @@
-from datetime import datetime
-
-from django.db.models import F
+from django.db.models import Min
 
 from apps.ads_api.interfaces.repositories.sales_calculatable_interface import (
     SalesCalculatableInterface,
 )
-from apps.ads_api.models import Keyword
+from apps.ads_api.models import Book, Keyword
+from apps.ads_api.repositories.book.price_repository import BookPriceRepository
 
 
 class KeywordSelesRepository(SalesCalculatableInterface):
@@ -13,21 +12,23 @@ class KeywordSelesRepository(SalesCalculatableInterface):
         self._keywords_ids = keywords_ids
 
     def get_sales_for_date(self, date):
-        sales = 0
-        for keyword in (
+        """Attributed conversions of the date times the actual price of the first book of each campaign"""
+        conversions_per_campaign = list(
             Keyword.objects.filter(
                 keyword_id__in=self._keywords_ids, campaign__reportdata__date=date
+            ).values_list("campaign_id", "campaign__reportdata__attributed_conversions_30d")
+        )
+        book_per_campaign = dict(
+            Book.campaigns.through.objects.filter(
+                campaign_id__in={campaign_id for campaign_id, _ in conversions_per_campaign}
             )
-            .prefetch_related("campaign__books", "campaign__books__datebookprice_set")
-            .annotate(conversions=F("campaign__reportdata__attributed_conversions_30d"))
-            .iterator()
-        ):
-            book_price = (
-                keyword.campaign.books.first()
-                .datebookprice_set.filter(date__lte=datetime.today())
-                .order_by("-date")
-                .first()
-                .price
-            )
-            sales += book_price * keyword.conversions
-        return sales
+            .values("campaign_id")
+            .annotate(first_book_id=Min("book_id"))
+            .values_list("campaign_id", "first_book_id")
+        )
+        book_prices = BookPriceRepository.get_actual_prices(book_per_campaign.values())
+        return sum(
+            book_prices[book_per_campaign[campaign_id]] * (conversions or 0)
+            for campaign_id, conversions in conversions_per_campaign
+            if campaign_id in book_per_campaign
+        )
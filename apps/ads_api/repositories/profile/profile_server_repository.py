@@ -1,5 +1,9 @@
+from collections import Counter
+
+from django.db.models import Count
+
 from apps.ads_api.constants import ServerLocation
-from apps.ads_api.models import Profile
+from apps.ads_api.models import Keyword, Profile, Target
 
 
 class ProfileServerRepository:
@@ -19,3 +23,21 @@ class ProfileServerRepository:
                 managed=True, profile_server=self._server_location
             ).values_list("profile_id", flat=True)
         )
+
+    def get_keywords_count_per_primary_key(self) -> dict[int, int]:
+        """Number of keywords and targets of each managed profile, profiles without them have 0"""
+        keywords_count = Counter(dict.fromkeys(self.get_primary_keys_list(), 0))
+        for model in (Keyword, Target):
+            keywords_count.update(
+                dict(
+                    model.objects.filter(
+                        campaign__profile__managed=True,
+                        campaign__profile__profile_server=self._server_location,
+                    )
+                    .values("campaign__profile_id")
+                    .annotate(count=Count("id"))
+                    .values_list("campaign__profile_id", "count")
+                    .order_by()
+                )
+            )
+        return dict(keywords_count)
@@ -0,0 +1,93 @@
+from datetime import date
+from typing import Iterable
+
+from django.db import connection
+from django.db.models import Sum
+
+from apps.ads_api.constants import SpReportType
+from apps.ads_api.entities.internal.ad_slice import AdSlice
+from apps.ads_api.models import RecentReportData
+
+METRIC_FIELDS = (
+    "sales",
+    "spend",
+    "kenp_royalties",
+    "impressions",
+    "clicks",
+    "orders",
+    "attributed_conversions_30d",
+)
+
+
+class PlacementsRepository:
+    @staticmethod
+    def get_slices_with_look_back(
+        campaign_ids: Iterable[int],
+        placements: Iterable[str],
+        date_from: date,
+        date_min: date,
+        min_orders: int,
+    ) -> dict[tuple[int, str], AdSlice]:
+        """
+        Sums placement report data per campaign and placement from date_min on,
+        older days down to date_from are added newest first while the placement has less than min_orders orders,
+        so placements with few recent orders are judged on enough data. The last day with data is always included
+        """
+        campaign_ids = list(campaign_ids)
+        if not campaign_ids:
+            return {}
+
+        daily_totals = (
+            RecentReportData.objects.filter(
+                report_type=SpReportType.PLACEMENT,
+                campaign_id__in=campaign_ids,
+                placement__in=list(placements),
+                date__gte=date_from,
+            )
+            .values("campaign_id", "placement", "date")
+            .annotate(**{f"{metric}_total": Sum(metric) for metric in METRIC_FIELDS})
+            .order_by()
+        )
+        daily_totals_sql, params = daily_totals.query.sql_with_params()
+        metrics_sql = ", ".join(f"SUM(COALESCE({metric}_total, 0))" for metric in METRIC_FIELDS)
+        # days are ordered newest first, a day is included while orders of the newer days are below min_orders
+        sql = f"""
+            SELECT campaign_id, placement, {metrics_sql}
+            FROM (
+                SELECT
+                    daily_totals.*,
+                    ROW_NUMBER() OVER days AS day_number,
+                    SUM(COALESCE(orders_total, 0)) OVER (
+                        days ROWS BETWEEN UNBOUNDED PRECEDING AND 1 PRECEDING
+                    ) AS newer_days_orders
+                FROM ({daily_totals_sql}) daily_totals
+                WINDOW days AS (PARTITION BY campaign_id, placement ORDER BY date DESC)
+            ) ranked_days
+            WHERE day_number = 1 OR date >= %s OR newer_days_orders < %s
+            GROUP BY campaign_id, placement
+        """
+        with connection.cursor() as cursor:
+            cursor.execute(sql, (*params, date_min, min_orders))
+            return {
+                (campaign_id, placement): AdSlice(
+                    sales=float(sales),
+                    spend=float(spend),
+                    # SUM of integers is numeric in Postgres
+                    kenp_royalties=int(kenp_royalties),
+                    impressions=int(impressions),
+                    clicks=int(clicks),
+                    orders=int(orders),
+                    attributed_conversions_30d=int(attributed_conversions_30d),
+                )
+                for (
+                    campaign_id,
+                    placement,
+                    sales,
+                    spend,
+                    kenp_royalties,
+                    impressions,
+                    clicks,
+                    orders,
+                    attributed_conversions_30d,
+                ) in cursor.fetchall()
+            }
@@ -0,0 +1,259 @@
+import io
+import logging
+from datetime import date, datetime
+from typing import Iterable, Optional, Sequence
+
+from django.db import connection, transaction
+from django.utils import timezone
+
+from apps.ads_api.constants import DEFAULT_BOOK_PRICE
+from apps.ads_api.models import Book, DateBookPrice, Keyword, RecentReportData, Target
+from apps.ads_api.repositories.book.price_repository import BookPriceRepository
+
+_logger = logging.getLogger(__name__)
+
+UNIQUE_FIELDS = (
+    "ad_id",
+    "keyword_id",
+    "target_id",
+    "asin",
+    "query",
+    "placement",
+    "campaign_id",
+    "date",
+    "report_type",
+)
+VALUE_FIELDS = (
+    "impressions",
+    "clicks",
+    "spend",
+    "sales",
+    "orders",
+    "kenp_royalties",
+    "top_of_search_impression_share",
+    "ad_group_id",
+    "ad_group_name",
+    "keyword_text",
+    "match_type",
+    "target_expression",
+    "target_text",
+    "target_type",
+    "units_sold_14d",
+    "attributed_conversions_30d",
+)
+# fields of the unique key always set in report data, matched by equality in the merge
+INDEXED_KEY_FIELDS = ("campaign_id", "date", "report_type")
+# layout of rows passed to upsert_rows
+COLUMNS = UNIQUE_FIELDS + VALUE_FIELDS
+STAGING_TABLE = "tmp_recent_report_data"
+
+
+class RecentReportDataBulkRepository:
+    """
+    Bulk upsert of RecentReportData rows. On PostgreSQL rows are staged with COPY into a temporary table
+    and merged with set based statements, other databases (sqlite in tests) use the ORM with the same result.
+
+    Rows are matched by the fields of the unique_recent_report_data constraint. Most of them are nullable,
+    so rows are matched null safely before the INSERT ... ON CONFLICT,
+    which handles only rows without NULLs in the key. Rows must have a campaign, date and report type.
+    """
+
+    @classmethod
+    def upsert(cls, reports_data: Iterable[RecentReportData], recalculate_sales: bool = True) -> int:
+        """
+        Creates or updates given rows, returns number of processed rows.
+        If recalculate_sales, sales are at least attributed conversions times the actual book price.
+        """
+        return cls.upsert_rows(
+            ([getattr(report_data, column) for column in COLUMNS] for report_data in reports_data),
+            recalculate_sales,
+        )
+
+    @classmethod
+    def upsert_rows(cls, rows: Iterable[Sequence], recalculate_sales: bool = True) -> int:
+        """Same as upsert for rows of COLUMNS values, e.g. decoded by ReportRowsDecoder"""
+        rows = cls._unique_rows(rows)
+        if not rows:
+            return 0
+        if connection.vendor == "postgresql":
+            cls._upsert_with_copy(rows, recalculate_sales)
+        else:
+            cls._upsert_with_orm(
+                [RecentReportData(**dict(zip(COLUMNS, row))) for row in rows], recalculate_sales
+            )
+        return len(rows)
+
+    @staticmethod
+    def _unique_rows(rows: Iterable[Sequence]) -> list[Sequence]:
+        """Keeps the last row of the rows with the same unique key"""
+        key_length = len(UNIQUE_FIELDS)
+        unique_rows = {}
+        for row in rows:
+            unique_rows[tuple(row[:key_length])] = row
+        return list(unique_rows.values())
+
+    @classmethod
+    def _upsert_with_copy(cls, rows: list[Sequence], recalculate_sales: bool):
+        table = RecentReportData._meta.db_table
+        columns_sql = ", ".join(COLUMNS)
+        key_match_sql = cls._key_match_sql()
+        sales_sql = cls._recalculated_sales_sql() if recalculate_sales else "s.sales"
+        select_sql = ", ".join(
+            f"{sales_sql} AS sales" if field == "sales" else f"s.{field}" for field in COLUMNS
+        )
+
+        with transaction.atomic(), connection.cursor() as cursor:
+            # staging tables live until the outermost transaction is committed
+            cursor.execute(f"DROP TABLE IF EXISTS {STAGING_TABLE}, {STAGING_TABLE}_merged")
+            cursor.execute(
+                f"CREATE TEMPORARY TABLE {STAGING_TABLE} ON COMMIT DROP AS "
+                f"SELECT {columns_sql} FROM {table} WITH NO DATA"
+            )
+            cursor.copy_expert(
+                f"COPY {STAGING_TABLE} ({columns_sql}) FROM STDIN WITH (FORMAT csv)",
+                cls._to_csv(rows),
+            )
+            cursor.execute(
+                f"CREATE TEMPORARY TABLE {STAGING_TABLE}_merged ON COMMIT DROP AS "
+                f"SELECT {select_sql} FROM {STAGING_TABLE} s"
+            )
+            cursor.execute(f"ANALYZE {STAGING_TABLE}_merged")
+            cursor.execute(
+                f"UPDATE {table} t SET "
+                + ", ".join(f"{field} = s.{field}" for field in VALUE_FIELDS)
+                + f", updated_at = now() FROM {STAGING_TABLE}_merged s WHERE {key_match_sql}"
+            )
+            cursor.execute(
+                f"INSERT INTO {table} ({columns_sql}, created_at, updated_at) "
+                f"SELECT {columns_sql}, now(), now() FROM {STAGING_TABLE}_merged s "
+                f"WHERE NOT EXISTS (SELECT 1 FROM {table} t WHERE {key_match_sql}) "
+                f"ON CONFLICT ON CONSTRAINT unique_recent_report_data DO UPDATE SET "
+                + ", ".join(f"{field} = EXCLUDED.{field}" for field in VALUE_FIELDS)
+                + ", updated_at = now()"
+            )
+
+    @staticmethod
+    def _key_match_sql() -> str:
+        """
+        Match of the unique key. Report type, campaign and date are matched with equalities,
+        so stored rows are looked up with the (report_type, campaign, date) index,
+        the nullable rest of the key null safely with IS NOT DISTINCT FROM
+        """
+        return " AND ".join(
+            f"t.{field} = s.{field}"
+            if field in INDEXED_KEY_FIELDS
+            else f"t.{field} IS NOT DISTINCT FROM s.{field}"
+            for field in UNIQUE_FIELDS
+        )
+
+    @staticmethod
+    def _recalculated_sales_sql() -> str:
+        """
+        Sales of a row, at least attributed conversions times the actual price
+        of the first book of the keyword's / target's campaign
+        """
+        book_campaigns = Book.campaigns.through._meta.db_table
+        keywords = Keyword._meta.db_table
+        targets = Target._meta.db_table
+        prices = DateBookPrice._meta.db_table
+        book_sql = (
+            f"(SELECT b.book_id FROM ("
+            f"SELECT k.campaign_id, bc.book_id FROM {keywords} k "
+            f"JOIN {book_campaigns} bc ON bc.campaign_id = k.campaign_id "
+            f"WHERE s.keyword_id IS NOT NULL AND k.keyword_id = s.keyword_id "
+            f"UNION ALL "
+            f"SELECT k.campaign_id, bc.book_id FROM {targets} k "
+            f"JOIN {book_campaigns} bc ON bc.campaign_id = k.campaign_id "
+            f"WHERE s.keyword_id IS NULL AND k.target_id = s.target_id"
+            f") b ORDER BY b.campaign_id, b.book_id LIMIT 1)"
+        )
+        price_sql = (
+            f"(SELECT p.price FROM {prices} p WHERE p.book_id = {book_sql} "
+            f"AND p.date <= CURRENT_DATE ORDER BY p.date DESC LIMIT 1)"
+        )
+        return (
+            f"GREATEST(s.sales, ROUND(COALESCE({price_sql}, {DEFAULT_BOOK_PRICE}) "
+            f"* COALESCE(s.attributed_conversions_30d, 0), 2))"
+        )
+
+    @staticmethod
+    def _to_csv(rows: list[Sequence]) -> io.StringIO:
+        """CSV for COPY, NULLs are unquoted empty values, other values are always quoted"""
+        buffer = io.StringIO()
+        for row in rows:
+            values = []
+            for value in row:
+                if value is None:
+                    values.append("")
+                else:
+                    if isinstance(value, (date, datetime)):
+                        value = value.isoformat()
+                    values.append('"' + str(value).replace('"', '""') + '"')
+            buffer.write(",".join(values))
+            buffer.write("\n")
+        buffer.seek(0)
+        return buffer
+
+    @classmethod
+    def _upsert_with_orm(cls, rows: list[RecentReportData], recalculate_sales: bool):
+        if recalculate_sales:
+            book_prices = cls._get_book_prices(rows)
+            for row in rows:
+                price = book_prices.get(
+                    ("keyword_id", row.keyword_id) if row.keyword_id else ("target_id", row.target_id)
+                )
+                sales = round(float(price or DEFAULT_BOOK_PRICE) * (row.attributed_conversions_30d or 0), 2)
+                row.sales = max(float(row.sales or 0), sales)
+
+        existing = {
+            tuple(getattr(report_data, field) for field in UNIQUE_FIELDS): report_data
+            for report_data in RecentReportData.objects.filter(
+                campaign_id__in={row.campaign_id for row in rows},
+                date__in={row.date for row in rows},
+                report_type__in={row.report_type for row in rows},
+            )
+        }
+
+        to_create = []
+        to_update = []
+        now = timezone.now()
+        for row in rows:
+            stored = existing.get(tuple(getattr(row, field) for field in UNIQUE_FIELDS))
+            if stored is None:
+                to_create.append(row)
+                continue
+            for field in VALUE_FIELDS:
+                setattr(stored, field, getattr(row, field))
+            stored.updated_at = now
+            to_update.append(stored)
+
+        with transaction.atomic():
+            RecentReportData.objects.bulk_update(to_update, VALUE_FIELDS + ("updated_at",), batch_size=1000)
+            RecentReportData.objects.bulk_create(to_create, batch_size=1000)
+
+    @staticmethod
+    def _get_book_prices(rows: list[RecentReportData]) -> dict[tuple[str, Optional[int]], float]:
+        """Actual book price per ("keyword_id" | "target_id", id) of the rows"""
+        entities_ids = {
+            "keyword_id": {row.keyword_id for row in rows if row.keyword_id},
+            "target_id": {row.target_id for row in rows if not row.keyword_id and row.target_id},
+        }
+        book_per_entity = {}
+        for model, identifier in ((Keyword, "keyword_id"), (Target, "target_id")):
+            for entity_id, book_id in (
+                model.objects.filter(
+                    **{f"{identifier}__in": entities_ids[identifier]}, campaign__books__isnull=False
+                )
+                .order_by(identifier, "campaign_id", "campaign__books__id")
+                .values_list(identifier, "campaign__books__id")
+            ):
+                book_per_entity.setdefault((identifier, entity_id), book_id)
+
+        today = date.today()
+        actual_prices = {
+            book_id: history[-1][1]
+            for book_id, history in BookPriceRepository.get_effective_prices(
+                book_per_entity.values(), today, today
+            ).items()
+        }
+        return {key: actual_prices.get(book_id) for key, book_id in book_per_entity.items()}
@@ -0,0 +1,96 @@
+import logging
+from datetime import date
+from typing import Iterable
+
+from django.db import transaction
+from django.db.models import Sum
+
+from apps.ads_api.constants import SpReportType
+from apps.ads_api.models import RecentReportData, ReportDataDailyRollup
+
+_logger = logging.getLogger(__name__)
+
+METRIC_FIELDS = (
+    "impressions",
+    "clicks",
+    "spend",
+    "sales",
+    "orders",
+    "kenp_royalties",
+    "attributed_conversions_30d",
+)
+# field identifying an entity in rows of each rolled up report type,
+# search terms and placements are summed from RecentReportData so their reports are not rolled up
+ROLLUP_ENTITY_FIELDS = {
+    SpReportType.KEYWORD.value: "keyword_id",
+    SpReportType.TARGET.value: "target_id",
+}
+
+
+class ReportDataRollupRepository:
+    """
+    Maintains pre-aggregated RecentReportData: daily rows per keyword and target
+    """
+
+    @classmethod
+    def refresh(cls, campaign_ids: Iterable[int], report_type: str, date_from: date, date_to: date) -> int:
+        """
+        Rebuilds daily rollups of the campaigns for the dates from report data,
+        returns number of daily rollups created
+        """
+        entity_field = ROLLUP_ENTITY_FIELDS.get(str(report_type))
+        campaign_ids = list(campaign_ids)
+        if entity_field is None or not campaign_ids:
+            return 0
+
+        daily_totals = (
+            RecentReportData.objects.filter(
+                campaign_id__in=campaign_ids,
+                report_type=report_type,
+                date__range=(date_from, date_to),
+            )
+            .values("campaign_id", "date", entity_field)
+            .annotate(**{f"{metric}_total": Sum(metric) for metric in METRIC_FIELDS})
+            .order_by()
+        )
+        with transaction.atomic():
+            ReportDataDailyRollup.objects.filter(
+                campaign_id__in=campaign_ids,
+                report_type=report_type,
+                date__range=(date_from, date_to),
+            ).delete()
+            created = ReportDataDailyRollup.objects.bulk_create(
+                (
+                    ReportDataDailyRollup(
+                        report_type=report_type,
+                        campaign_id=totals["campaign_id"],
+                        date=totals["date"],
+                        **{entity_field: totals[entity_field]},
+                        **{metric: totals[f"{metric}_total"] or 0 for metric in METRIC_FIELDS},
+                    )
+                    for totals in daily_totals.iterator()
+                ),
+                batch_size=5000,
+            )
+        _logger.info(
+            "%s daily %s rollups refreshed for %s campaigns", len(created), report_type, len(campaign_ids)
+        )
+        return len(created)
+
+    @classmethod
+    def refresh_all(cls, date_from: date, date_to: date):
+        """Rebuilds rollups of all campaigns with report data for the dates, e.g. to backfill them"""
+        for report_type in ROLLUP_ENTITY_FIELDS:
+            campaign_ids = (
+                RecentReportData.objects.filter(report_type=report_type, campaign_id__isnull=False)
+                .values_list("campaign_id", flat=True)
+                .distinct()
+                .order_by()
+            )
+            cls.refresh(campaign_ids, report_type, date_from, date_to)
+
+    @staticmethod
+    def prune(date_to: date) -> int:
+        """Deletes daily rollups up to date_to inclusive, when their report data leaves RecentReportData"""
+        deleted, _ = ReportDataDailyRollup.objects.filter(date__lte=date_to).delete()
+        return deleted
@@ -1,5 +1,5 @@
-from datetime import datetime
-from typing import Iterator, Iterable
+from datetime import date, datetime
+from typing import Iterator, Iterable, Optional
 
 from apps.ads_api.constants import (
     EMPTY_REPORT_BYTES,
@@ -41,14 +41,18 @@ class ReportStatusRepository:
         return count
 
     @classmethod
-    def retrieve_reports_to_download_iterator(cls) -> Iterator[ReportEntity]:
+    def retrieve_reports_to_download_iterator(
+        cls, profile_ids: Optional[Iterable[int]] = None
+    ) -> Iterator[ReportEntity]:
+        reports = Report.objects.filter(
+            report_status__in=[
+                status.value for status in AmazonReportStatuses.PENDING
+            ]
+        )
+        if profile_ids is not None:
+            reports = reports.filter(profile_id__in=profile_ids)
         reports_iterator = (
-            Report.objects.filter(
-                report_status__in=[
-                    status.value for status in AmazonReportStatuses.PENDING
-                ]
-            )
-            .order_by("updated_at")
+            reports.order_by("updated_at")
             .values(
                 "report_id",
                 "profile_id",
@@ -110,3 +114,48 @@ class ReportStatusRepository:
             .exclude(report_status__contains=ReportStatus.FAILURE.value)
             .exists()
         )
+
+    @classmethod
+    def retrieve_requested_ranges(
+        cls, profile_ids: Iterable[int], report_types: Iterable[str], date_from: date, date_to: date
+    ) -> Iterator[tuple[int, str, date, date, datetime, bool]]:
+        """
+        Yields profile_id, report_type, start_date, end_date, the last update time of not failed reports
+        overlapping the dates and whether the report is processed, i.e. its data was saved or it was empty
+        """
+        processed_statuses = {ReportStatus.INTERNAL_PROCESSED.value, ReportStatus.EMPTY.value}
+        for profile_id, report_type, start_date, end_date, updated_at, report_status in (
+            Report.objects.filter(
+                profile_id__in=profile_ids,
+                report_type__in=report_types,
+                start_date__lte=date_to,
+                end_date__gte=date_from,
+            )
+            .exclude(report_status__in=[ReportStatus.FAILURE.value, ReportStatus.INTERNAL_FAILURE.value])
+            .values_list("profile_id", "report_type", "start_date", "end_date", "updated_at", "report_status")
+            .iterator()
+        ):
+            processed = report_status in processed_statuses
+            yield profile_id, report_type, start_date, end_date, updated_at, processed
+
+    @classmethod
+    def get_profile_ids_with_reports_in_progress(
+        cls, profile_ids: Iterable[int], requested_since: datetime
+    ) -> set[int]:
+        """
+        Profiles having reports requested since the time which are still generated by Amazon
+        or completed but not saved yet
+        """
+        return set(
+            Report.objects.filter(
+                profile_id__in=profile_ids,
+                created_at__gte=requested_since,
+                report_status__in=[
+                    ReportStatus.PENDING.value,
+                    ReportStatus.PROCESSING.value,
+                    ReportStatus.COMPLETED.value,
+                ],
+            )
+            .values_list("profile_id", flat=True)
+            .distinct()
+        )
@@ -1,99 +1,63 @@
 import logging
-from datetime import datetime, timedelta
+from datetime import date, datetime, timedelta
+from typing import Iterable
 
-from apps.ads_api.constants import DEFAULT_BOOK_PRICE
+from django.db.models import Min
+
+from apps.ads_api.converters.report_data_entity_converter import (
+    ReportDataEntityConverter,
+)
 from apps.ads_api.entities.amazon_ads.reports import BaseReportDataEntity
 from apps.ads_api.interfaces.repositories.report_data_repository_interface import (
     ReportDataInterface,
 )
 from apps.ads_api.models import Campaign, RecentReportData, ReportData
+from apps.ads_api.repositories.report.recent_report_data_bulk_repository import (
+    RecentReportDataBulkRepository,
+)
 
 _logger = logging.getLogger(__name__)
 
 
 class ReportDataRepository(ReportDataInterface):
     def create_or_update(self, report_data: BaseReportDataEntity):
-        campaign = Campaign.objects.filter(
-            campaign_id_amazon=report_data.campaign_id
-        ).first()
-        filter_fields = {
-            "ad_id": report_data.ad_id,
-            "keyword_id": report_data.keyword_id,
-            "target_id": report_data.target_id,
-            "asin": report_data.asin,
-            "query": report_data.query,
-            "placement": report_data.placement,
-            "campaign": campaign,
-            "date": report_data.date,
-            "report_type": report_data.report_type,
-        }
-        try:
-            report_to_save = RecentReportData.objects.get(**filter_fields)
-        except RecentReportData.MultipleObjectsReturned:
-            _logger.warning("Multiple object returned")
-            report_to_save = self._get_first_and_delete_dublicates(filter_fields)
-        except RecentReportData.DoesNotExist:
-            report_to_save = RecentReportData(**filter_fields)
-
-        report_to_save.ad_group_name = report_data.ad_group_name
-        report_to_save.ad_group_id = report_data.ad_group_id
-        report_to_save.keyword_text = report_data.keyword_text
-        report_to_save.match_type = report_data.match_type
-        report_to_save.target_expression = report_data.target_expression
-        report_to_save.target_text = report_data.target_text
-        report_to_save.target_type = report_data.target_type
-        report_to_save.impressions = report_data.impressions
-        report_to_save.clicks = report_data.clicks
-        report_to_save.spend = report_data.spend
-        report_to_save.sales = self._recalculate_sales(report_data)
-        report_to_save.orders = report_data.orders
-        report_to_save.kenp_royalties = report_data.kenp_royalties
-        report_to_save.attributed_conversions_30d = (
-            report_data.attributed_conversions_30d
-        )
-        report_to_save.save()
+        self.bulk_create_or_update([report_data])
 
-    @staticmethod
-    def _get_first_and_delete_dublicates(filter_fields: dict) -> RecentReportData:
-        dublicated_reports = RecentReportData.objects.filter(**filter_fields).order_by(
-            "id"
+    @classmethod
+    def bulk_create_or_update(cls, reports_data: Iterable[BaseReportDataEntity]) -> int:
+        """
+        Creates or updates recent report data with sales recalculated from the actual book price
+        """
+        reports_data = list(reports_data)
+        campaigns_ids = dict(
+            Campaign.objects.filter(
+                campaign_id_amazon__in={report_data.campaign_id for report_data in reports_data}
+            ).values_list("campaign_id_amazon", "id")
         )
-
-        ids = list(dublicated_reports.values_list("pk", flat=True))
-        _logger.warning("Dublcicates ids are %s", ids)
-
-        report_to_save = dublicated_reports.first()
-
-        for report_to_delete in dublicated_reports[1:]:
-            id_ = report_to_delete.id
-            report_to_delete.delete()
-            _logger.warning("Dublcicate with id %s is deleted", id_)
-
-        return report_to_save
-
-    @staticmethod
-    def _recalculate_sales(report_data: BaseReportDataEntity):
-        identifier = "keyword_id" if report_data.keyword_id else "target_id"
-        keyword_id = f"{identifier[:-3]}__{identifier}"
-        try:
-            book_price = (
-                Campaign.objects.filter(
-                    **{keyword_id: getattr(report_data, identifier)}
-                )
-                .first()
-                .books.first()
-                .datebookprice_set.filter(date__lte=datetime.today())
-                .order_by("-date")
-                .first()
-                .price
+        return RecentReportDataBulkRepository.upsert(
+            ReportDataEntityConverter.convert_to_django_model(
+                report_data,
+                override_fields={"campaign_id": campaigns_ids.get(report_data.campaign_id)},
             )
-        except AttributeError:
-            book_price = DEFAULT_BOOK_PRICE
-        sales = float(book_price) * report_data.attributed_conversions_30d
+            for report_data in reports_data
+        )
 
-        if report_data.sales > sales:
-            sales = report_data.sales
-        return sales
+    @classmethod
+    def get_downloaded_at_per_day(
+        cls, profile_ids: Iterable[int], report_types: Iterable[str], date_from: date, date_to: date
+    ) -> dict[tuple[int, str, date], datetime]:
+        """When report data of each day was saved per (profile_id, report_type, date)"""
+        return {
+            (row["campaign__profile__profile_id"], row["report_type"], row["date"]): row["downloaded_at"]
+            for row in RecentReportData.objects.filter(
+                campaign__profile__profile_id__in=profile_ids,
+                report_type__in=report_types,
+                date__range=(date_from, date_to),
+            )
+            .values("campaign__profile__profile_id", "report_type", "date")
+            .annotate(downloaded_at=Min("created_at"))
+            .order_by()
+        }
 
     @classmethod
     def create_from_kwargs(cls, **kwargs):
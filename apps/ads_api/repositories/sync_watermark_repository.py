@@ -0,0 +1,36 @@
+from datetime import timedelta
+from typing import Optional
+
+from django.utils import timezone
+
+from apps.ads_api.constants import SpEndpoint
+from apps.ads_api.models import Profile, SyncWatermark
+from adsdroid.settings import SYNC_KEYWORDS_FULL_RESYNC_HOURS
+
+
+class SyncWatermarkRepository:
+    @staticmethod
+    def get_last_updated(profile: Profile, endpoint: SpEndpoint) -> Optional[int]:
+        """
+        Epoch time in ms entities of the endpoint were synced up to,
+        None if the profile has no full sync within SYNC_KEYWORDS_FULL_RESYNC_HOURS
+        """
+        full_synced_after = timezone.now() - timedelta(hours=SYNC_KEYWORDS_FULL_RESYNC_HOURS)
+        return (
+            SyncWatermark.objects.filter(
+                profile=profile, endpoint=SpEndpoint(endpoint).value, full_synced_at__gt=full_synced_after
+            )
+            .values_list("last_updated_date_on_amazon", flat=True)
+            .first()
+        )
+
+    @staticmethod
+    def save(profile: Profile, endpoint: SpEndpoint, last_updated: int, full_sync: bool):
+        """Moves the watermark forward to last_updated, never back"""
+        watermark, _ = SyncWatermark.objects.get_or_create(
+            profile=profile, endpoint=SpEndpoint(endpoint).value
+        )
+        watermark.last_updated_date_on_amazon = max(watermark.last_updated_date_on_amazon, last_updated)
+        if full_sync:
+            watermark.full_synced_at = timezone.now()
+        watermark.save()
@@ -1,7 +1,6 @@
+import logging
 from typing import Optional
 
-from django.db import IntegrityError
-
 from apps.ads_api.adapters.amazon_ads.sponsored_products.ad_group_adapter import (
     AdGroupAdapter,
 )
@@ -11,8 +10,13 @@ from apps.ads_api.entities.amazon_ads.sponsored_products.search_filters import (
     AdGroupSearchFilter,
 )
 from apps.ads_api.models import AdGroup, Campaign, Profile
+from apps.ads_api.repositories.amazon_entities_bulk_repository import (
+    AdGroupsBulkRepository,
+)
 from apps.utils.iso_to_epoch_converter import IsoToEpochConverter
 
+_logger = logging.getLogger(__name__)
+
 
 class SyncAdGroupsService:
     def __init__(self, profile_ids: Optional[list[int]] = None):
@@ -48,57 +52,43 @@ class SyncAdGroupsService:
             campaign["campaign_id_amazon"]: campaign["id"]
             for campaign in all_profile_campaigns
         }
+        converter = IsoToEpochConverter()
 
         for current_profile in self._profiles:
             profile_ad_groups = self.get_ad_groups_from_adapter(current_profile)
             if not profile_ad_groups:
                 continue
 
+            ad_groups = []
             for current_ad_group in profile_ad_groups:
                 current_ad_group.internal_id = campaigns_by_campaign_id.get(
                     int(current_ad_group.campaign_id)
                 )
                 if not current_ad_group.internal_id:
                     continue
-                self._update_or_create(ad_group=current_ad_group)
+                ad_groups.append(self._to_model(ad_group=current_ad_group, converter=converter))
 
-    @staticmethod
-    def _update_or_create(ad_group: AdGroupEntity):
-        converter = IsoToEpochConverter()
-        try:
-            AdGroup.objects.update_or_create(
-                campaign_id=ad_group.internal_id,
-                ad_group_id=int(ad_group.external_id),
-                defaults={
-                    "ad_group_name": ad_group.name,
-                    "state": ad_group.state,
-                    "serving_status": ad_group.extended_data.serving_status,
-                    "last_updated_date_on_amazon":
-                        converter.iso_to_epoch(
-                            ad_group.extended_data.last_update_date_time,
-                            convert_to=TimeUnit.MILLISECOND
-                        ),
-                    "default_bid": ad_group.bid,
-                },
-            )
-        except IntegrityError:
-            AdGroup.objects.filter(ad_group_id=ad_group.external_id).delete()
-            AdGroup.objects.update_or_create(
-                campaign_id=ad_group.internal_id,
-                ad_group_id=int(ad_group.external_id),
-                defaults={
-                    "ad_group_name": ad_group.name,
-                    "state": ad_group.state,
-                    "serving_status": ad_group.extended_data.serving_status,
-                    "last_updated_date_on_amazon":
-                        converter.iso_to_epoch(
-                            ad_group.extended_data.last_update_date_time,
-                            convert_to=TimeUnit.MILLISECOND
-                        ),
-                    "default_bid": ad_group.bid,
-                },
+            counts = AdGroupsBulkRepository.upsert(ad_groups)
+            _logger.info(
+                f"{len(ad_groups)} ad groups synced for profile: {current_profile}, created: {counts.created}, "
+                f"updated: {counts.updated}, unchanged: {counts.unchanged}"
             )
 
+    @staticmethod
+    def _to_model(ad_group: AdGroupEntity, converter: IsoToEpochConverter) -> AdGroup:
+        return AdGroup(
+            campaign_id=ad_group.internal_id,
+            ad_group_id=int(ad_group.external_id),
+            ad_group_name=ad_group.name,
+            state=ad_group.state,
+            serving_status=ad_group.extended_data.serving_status,
+            last_updated_date_on_amazon=converter.iso_to_epoch(
+                ad_group.extended_data.last_update_date_time,
+                convert_to=TimeUnit.MILLISECOND
+            ),
+            default_bid=ad_group.bid,
+        )
+
     def get_campaigns_for_managed_profiles(self) -> list[dict]:
         return list(
             Campaign.objects.filter(
@@ -1,11 +1,14 @@
-import gzip
 import json
 import logging
+import zlib
+from typing import Iterator
 
 import requests
-from pydantic import parse_obj_as, ValidationError
+from requests import RequestException, Response
 
+from adsdroid.settings import REPORTS_PARSE_BATCH_SIZE
 from apps.ads_api.constants import SpReportType
+from apps.ads_api.converters.report_rows_decoder import InvalidReportRow, ReportRowsDecoder
 from apps.ads_api.entities.amazon_ads.reports import (
     CampaignsReportDataEntity,
     KeywordQueryReportDataEntity,
@@ -14,14 +17,14 @@ from apps.ads_api.entities.amazon_ads.reports import (
     ProductAdsReportData,
     TargetQueryReportDataEntity,
     TargetsReportData,
-    BaseReportDataEntity,
     ReportEntity,
 )
 from apps.ads_api.exceptions.ads_api.reports import NoReportDataReturned
 from apps.ads_api.interfaces.services.amazon.reports.download_report_interface import (
     DowloadReportInterface,
 )
-from apps.utils.gzip import GzipExtracter
+from apps.utils.chunks import ichunker
+from apps.utils.gzip import GzipJsonArrayStream
 
 _logger = logging.getLogger(__name__)
 
@@ -30,27 +33,42 @@ class DownloadReportService(DowloadReportInterface):
     def download(
         self,
         report: ReportEntity,
-    ) -> list[BaseReportDataEntity]:
-        response = requests.get(report.report_location)
+    ) -> list[list]:
+        response = self.fetch(report)
+        return [report_data for batch in self.parse_batches(report, response) for report_data in batch]
+
+    @staticmethod
+    def fetch(report: ReportEntity) -> Response:
+        """Requests the report file, the body is not loaded until it's read"""
+        response = requests.get(report.report_location, stream=True)
         if not response:
             raise NoReportDataReturned()
+        return response
 
-        gzip_extracter = GzipExtracter(response)
-
-        try:
-            response_data = gzip_extracter.extract()
-        except gzip.BadGzipFile:
-            response_data = json.loads(response.text)
-
-        ReportDataEntity = self._resolve_entity_class(report_type=report.report_type)
+    def parse_batches(
+        self,
+        report: ReportEntity,
+        response: Response,
+        batch_size: int = REPORTS_PARSE_BATCH_SIZE,
+    ) -> Iterator[list[list]]:
+        """
+        Streams the report file and yields batches of validated report rows
+        decoded into RecentReportData COLUMNS, see ReportRowsDecoder
+        """
+        decoder = ReportRowsDecoder.for_entity(self._resolve_entity_class(report_type=report.report_type))
+        rows = GzipJsonArrayStream.from_response(response)
 
         try:
-            report_data_list = parse_obj_as(list[ReportDataEntity], response_data)
-        except ValidationError as e:
-            _logger.error(e.json())
+            for batch in ichunker(rows, batch_size):
+                yield decoder.decode(batch, report.report_type)
+        except InvalidReportRow as e:
+            _logger.error("Report %s has invalid rows: %s", report.report_id, e)
             raise NoReportDataReturned()
-
-        return report_data_list
+        except (json.JSONDecodeError, zlib.error, RequestException) as e:
+            _logger.error("Report %s can't be read: %s", report.report_id, e)
+            raise NoReportDataReturned()
+        finally:
+            response.close()
 
     @staticmethod
     def _resolve_entity_class(report_type: SpReportType):
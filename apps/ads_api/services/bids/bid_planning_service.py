@@ -0,0 +1,332 @@
+import logging
+from datetime import datetime, timedelta
+from typing import Optional
+
+from django.db.models import QuerySet
+
+from apps.ads_api.constants import (
+    BID_UPPER_THRESHOLD,
+    BIG_BID_CHANGE,
+    DEFAULT_BE_ACOS,
+    DEFAULT_BOOK_PRICE,
+    DEFAULT_CPC,
+    DEFAULT_MAX_BID,
+    DEFAULT_MAX_BID_CONSERVATIVE,
+    DEFAULT_MIN_BID,
+    IMP_TRESHOLD,
+    MIN_BOOK_REVIEWS,
+    PAUSE_TRESHOLD,
+    RESEARCH_MARGIN_MULTIPLIER,
+    SML_BID_CHANGE,
+    BookData,
+)
+from apps.ads_api.models import Profile
+from apps.ads_api.services.books.book_prices_service import BookPricesService
+from apps.ads_api.services.keywords.date_keywords_spends_service import (
+    DateKeywordsSpendsServce,
+)
+from apps.ads_api.services.profiles.proven_budget_service import ProvenBudgetService
+from apps.ads_api.services.profiles.remaining_daily_budget_service import (
+    RemainingDailyBudgetService,
+)
+
+_logger = logging.getLogger(__name__)
+
+
+def calculate_keyword_bid_change(
+    report_data: dict,
+    current_val,
+    target_acos=DEFAULT_BE_ACOS,
+    book_price=DEFAULT_BOOK_PRICE,
+    book_reviews: Optional[int] = None,
+):
+    """Bid and placement multiplier adjustment decision tree"""
+    val_change = 0.0
+    pause = False
+    spend = float(report_data["spend_sum"])
+    clicks = float(report_data["clicks_sum"])
+    if spend == 0:
+        cpc = 0.0
+    elif clicks < 1:
+        cpc = DEFAULT_CPC
+    else:
+        cpc = round(spend / clicks, 2)
+    pause_threshold = book_price if book_price < PAUSE_TRESHOLD else PAUSE_TRESHOLD
+    default_max_bid = DEFAULT_MAX_BID
+    target_acos = float(target_acos)
+    default_min_bid = DEFAULT_MIN_BID if spend < (book_price * target_acos) else DEFAULT_MAX_BID_CONSERVATIVE
+
+    if book_price == 0:
+        book_price = DEFAULT_BOOK_PRICE
+    if book_reviews is not None and book_reviews < MIN_BOOK_REVIEWS:
+        default_max_bid = DEFAULT_MAX_BID_CONSERVATIVE
+        default_min_bid = DEFAULT_MIN_BID
+    # allow for kenp royalties by offsetting the spend
+    if report_data["kenp_royalties_sum"] > spend:
+        spend = 0.01  # this will result in a positive & very low ACOS => increase in bid
+    elif report_data["kenp_royalties_sum"] > 0:
+        spend = spend - report_data["kenp_royalties_sum"]
+    # main multiplier change decision tree starts
+    # 2 different decision trees are used for with and without sales
+    # keyword_sales = 0 so check on profile mode then research if allowed
+    if report_data["sales_sum"] == 0:
+        if spend > pause_threshold:
+            pause = True
+        # if there are no spend, then do more research
+        elif spend == 0:
+            if report_data["impressions_sum"] >= IMP_TRESHOLD and current_val > default_min_bid:
+                val_change = -1 * SML_BID_CHANGE
+            elif (
+                report_data["impressions_sum"] < IMP_TRESHOLD
+                and default_min_bid < current_val < default_max_bid
+            ):
+                val_change = SML_BID_CHANGE
+        # if there is spend then decide on how much more research to do
+        else:
+            # look at the research spend threshold which is obtained from the book price and target ACOS
+            research_spend_threshold = round(target_acos * float(book_price) * RESEARCH_MARGIN_MULTIPLIER, 2)
+            # if bid can be decreased and spend > 1.25 x 40% x 10
+            if spend >= research_spend_threshold and current_val > default_min_bid:
+                phantom_acos = round(spend / float(book_price), 2)
+                # work around to align with functionality of the other code, using val change, not the full bid.
+                bid_to_return = round(cpc / (phantom_acos / target_acos), 2) if cpc > 0 else 0.0
+                val_change = round(bid_to_return - float(current_val), 2)
+                if val_change >= 0:
+                    val_change = -2 * BIG_BID_CHANGE
+                # if it's going to be lower than Min Bid, just set Min Bid
+                if float(current_val) + val_change < default_min_bid:
+                    val_change = round(default_min_bid - float(current_val), 2)
+            # do more research
+            if (
+                spend < research_spend_threshold
+                and current_val < BID_UPPER_THRESHOLD * cpc
+                and current_val < default_max_bid
+            ):
+                # next click could possibly get a good ACOS sale
+                val_change = SML_BID_CHANGE
+    else:  # there are sales, use a formula to work out the new bid based on the CPC
+        acos = spend / float(report_data["sales_sum"])
+        if acos == 0:
+            _logger.error(f'ACOS is zero error, spend was: {spend}, sales was: {report_data["sales_sum"]}')
+            return 0.0, False
+        acos_ratio = acos / target_acos
+        bid_cpc_multiplier = -0.1219 * acos_ratio**2 - 0.3564 * acos_ratio + 1.703
+        bid_to_return = round(bid_cpc_multiplier * cpc, 2)
+        bid_to_return = min(
+            max(bid_to_return, DEFAULT_MIN_BID), default_max_bid
+        )  # Using the ALL CAPS DEFAULT_MIN_BID is correct
+        val_change = round(bid_to_return - float(current_val), 2)
+
+    return val_change, pause
+
+
+class BidPlanningService:
+    """
+    Plans bid changes and pauses for all managed keywords and targets of a profile.
+
+    Keywords, aggregated report rows and actual book prices are loaded once into
+    dictionaries keyed by keyword/target id, so the number of queries does not grow
+    with the number of keywords.
+    """
+
+    def __init__(
+        self,
+        profile: Profile,
+        be_acos_per_book: dict[str, BookData],
+        report_data_per_keyword: dict[str, QuerySet],
+        managed_keywords: dict[str, QuerySet],
+        book_prices_service: Optional[BookPricesService] = None,
+    ):
+        self._profile = profile
+        self._be_acos_per_book = be_acos_per_book
+        self._report_data_querysets = report_data_per_keyword
+        self._keywords_querysets = managed_keywords
+        self._book_prices_service = book_prices_service or BookPricesService()
+
+    def plan(self) -> dict[str, list[dict]]:
+        """
+        Returns bid changes per amazon identifier ("keywordId", "targetId"),
+        each item has external_id, current_bid, bid_change, pause and is_proven keys
+        """
+        keywords_rows = {identifier: list(keywords) for identifier, keywords in self._keywords_querysets.items()}
+        keywords_per_id = {
+            identifier: self._index_first_by(rows, identifier) for identifier, rows in keywords_rows.items()
+        }
+        report_rows = {identifier: list(rows) for identifier, rows in self._report_data_querysets.items()}
+        book_prices = self._book_prices_service.get_prices(
+            keywords_per_id[identifier][report_data[identifier]]["campaign__books__pk"]
+            for identifier, rows in report_rows.items()
+            for report_data in rows
+        )
+
+        bid_change_and_pause_per_keyword = {}
+        planned_per_id = {}
+        proven_keywords_ids = {identifier: set() for identifier in self._keywords_querysets.keys()}
+        for identifier, rows in report_rows.items():
+            identifier_amazon = self._to_amazon_identifier(identifier)
+            bid_change_and_pause_per_keyword[identifier_amazon] = []
+            for report_data in rows:
+                keyword = keywords_per_id[identifier][report_data[identifier]]
+                keyword_id = keyword[identifier]
+                current_bid = keyword.get("bid")
+                target_acos = keyword.get("campaign__target_acos")
+                asin = keyword["campaign__books__asin"]
+
+                if target_acos == 0:
+                    target_acos = (
+                        self._be_acos_per_book[asin].be_acos if asin in self._be_acos_per_book else DEFAULT_BE_ACOS
+                    )
+                book_price = book_prices.get(keyword["campaign__books__pk"], DEFAULT_BOOK_PRICE)
+                book_reviews = self._be_acos_per_book[asin].reviews if asin else 0
+
+                bid_change, pause = calculate_keyword_bid_change(
+                    report_data=report_data,
+                    target_acos=target_acos,
+                    current_val=current_bid,
+                    book_price=book_price,
+                    book_reviews=book_reviews,
+                )
+                is_proven = bool(report_data["sales_sum"] > 0)
+                if is_proven:
+                    proven_keywords_ids[identifier].add(keyword_id)
+
+                planned = {
+                    "external_id": keyword_id,
+                    "current_bid": current_bid,
+                    "bid_change": bid_change,
+                    "pause": pause,
+                    "is_proven": is_proven,
+                }
+                bid_change_and_pause_per_keyword[identifier_amazon].append(planned)
+                planned_per_id.setdefault((identifier, keyword_id), planned)
+
+        surplus_budget = self._apply_budget_limits(
+            keywords_rows, keywords_per_id, report_rows, proven_keywords_ids, planned_per_id
+        )
+
+        self._profile.surplus_budget = surplus_budget
+        self._profile.save()
+
+        return bid_change_and_pause_per_keyword
+
+    def _apply_budget_limits(
+        self,
+        keywords_rows: dict[str, list[dict]],
+        keywords_per_id: dict[str, dict[int, dict]],
+        report_rows: dict[str, list[dict]],
+        proven_keywords_ids: dict[str, set],
+        planned_per_id: dict[tuple, dict],
+    ) -> float:
+        """
+        Sets the min bid for the worst proven and unproven keywords if the predicted spend
+        is over the outstanding daily budget. Returns surplus budget.
+        """
+        date_of_spend = datetime.today() - timedelta(days=1)
+        outstanding_daily_budget = RemainingDailyBudgetService(self._profile.profile_id).calculate()
+        _logger.info(
+            "Outstanding daily budget for profile %s equals %s",
+            self._profile,
+            outstanding_daily_budget,
+        )
+
+        proven_budget = ProvenBudgetService(self._profile).calculate()
+        unproven_budget = outstanding_daily_budget - proven_budget
+        _logger.info(
+            "Budget for profile %s equals proven=%s unproven=%s",
+            self._profile,
+            proven_budget,
+            unproven_budget,
+        )
+
+        proven_spend = 0
+        unproven_spend = 0
+        proven_keywords_count = 0
+        unproven_keywords_count = 0
+        for identifier, keywords in self._keywords_querysets.items():
+            proven_ids = proven_keywords_ids[identifier]
+            proven_keywords_count += sum(1 for row in keywords_rows[identifier] if row[identifier] in proven_ids)
+            unproven_keywords_count += sum(
+                1 for row in keywords_rows[identifier] if row[identifier] not in proven_ids
+            )
+            proven_keywords = keywords.filter(**{f"{identifier}__in": proven_ids})
+            unproven_keywords = keywords.exclude(**{f"{identifier}__in": proven_ids})
+            proven_spend += DateKeywordsSpendsServce(date_of_spend, proven_keywords).calculate_spends()
+            unproven_spend += DateKeywordsSpendsServce(date_of_spend, unproven_keywords).calculate_spends()
+
+        _logger.info(
+            "Spend for date %s for profile %s equals proven=%s, unproven=%s",
+            date_of_spend,
+            self._profile,
+            proven_spend,
+            unproven_spend,
+        )
+
+        total_spend = proven_spend + unproven_spend
+        overspend = total_spend > outstanding_daily_budget
+        # assume 10% overspend or 10% underspend
+        predicted_modifier = 0.9 if overspend else 1.1
+
+        predicted_proven_spend = float(proven_spend) * predicted_modifier
+        predicted_unproven_spend = float(unproven_spend) * predicted_modifier
+        _logger.info(
+            "Predicted spend for profile %s equals proven=%s, unproven=%s",
+            self._profile,
+            predicted_proven_spend,
+            predicted_unproven_spend,
+        )
+
+        surplus_budget = outstanding_daily_budget - predicted_proven_spend - predicted_unproven_spend
+        _logger.info("Surples budget for profile %s equals %s", self._profile, surplus_budget)
+        if surplus_budget >= 0:
+            return surplus_budget
+
+        proven_percentage_to_min = (1 - proven_budget / predicted_proven_spend) if predicted_proven_spend > 0 else 0
+        proven_count_to_min = round(proven_keywords_count * proven_percentage_to_min)
+        unproven_percentage_to_min = (
+            (1 - unproven_budget / predicted_unproven_spend) if predicted_unproven_spend > 0 else 0
+        )
+        unproven_count_to_min = round(unproven_keywords_count * unproven_percentage_to_min)
+        _logger.info(
+            "proven_percentage_to_min=%s, proven_count_to_min=%s,"
+            " unproven_percentage_to_min=%s, unproven_count_to_min=%s",
+            proven_percentage_to_min,
+            proven_count_to_min,
+            unproven_percentage_to_min,
+            unproven_count_to_min,
+        )
+
+        proven_keywords_to_min = [
+            (identifier, report_data)
+            for identifier in self._keywords_querysets.keys()
+            for report_data in report_rows[identifier]
+            if report_data["sales_sum"] > 0
+        ]
+        proven_keywords_to_min.sort(
+            key=lambda item: (item[1]["sales_sum"], -item[1]["spend_sum"], item[1]["book_launch"])
+        )
+        unproven_keywords_to_min = [
+            (identifier, report_data)
+            for identifier in self._keywords_querysets.keys()
+            for report_data in report_rows[identifier]
+            if report_data["sales_sum"] == 0
+        ]
+        unproven_keywords_to_min.sort(key=lambda item: (-item[1]["book_launch"], -item[1]["spend_sum"]))
+
+        for identifier, report_data in (
+            proven_keywords_to_min[:proven_count_to_min] + unproven_keywords_to_min[:unproven_count_to_min]
+        ):
+            current_bid = float(keywords_per_id[identifier][report_data[identifier]]["bid"])
+            planned_per_id[(identifier, report_data[identifier])]["bid_change"] = DEFAULT_MIN_BID - current_bid
+
+        return 0
+
+    @staticmethod
+    def _index_first_by(rows: list[dict], key: str) -> dict:
+        index = {}
+        for row in rows:
+            index.setdefault(row[key], row)
+        return index
+
+    @staticmethod
+    def _to_amazon_identifier(identifier: str) -> str:
+        return "keywordId" if identifier == "keyword_id" else "targetId"
@@ -0,0 +1,62 @@
+import datetime
+from bisect import bisect_right
+from datetime import date
+from typing import Iterable, Optional
+
+from apps.ads_api.constants import DEFAULT_BOOK_PRICE
+from apps.ads_api.repositories.book.price_repository import BookPriceRepository
+
+
+class BookPricesService:
+    """
+    Resolves effective book prices of many books at once, prices are loaded with one query per
+    requested period and kept for the life of the instance, so one instance is created per task run.
+    Books without any price get the default one, it's stored for today like BookPriceRepository.get_actual_price
+    does, unless store_defaults is off.
+    """
+
+    def __init__(self, store_defaults: bool = True):
+        self._store_defaults = store_defaults
+        self._prices_per_period: dict[tuple[date, date], dict[int, list[tuple[date, float]]]] = {}
+
+    def get_prices(
+        self, book_ids: Iterable[Optional[int]], for_date: Optional[date] = None
+    ) -> dict[int, float]:
+        """Price per book id effective on for_date, today by default"""
+        for_date = for_date or datetime.date.today()
+        return {
+            book_id: history[-1][1]
+            for book_id, history in self._get_effective_prices(book_ids, for_date, for_date).items()
+        }
+
+    def get_prices_for_range(
+        self, book_ids: Iterable[Optional[int]], date_from: date, date_to: date
+    ) -> dict[int, dict[date, float]]:
+        """Price per date from date_from to date_to per book id"""
+        days = [date_from + datetime.timedelta(days=i) for i in range((date_to - date_from).days + 1)]
+        prices = {}
+        for book_id, history in self._get_effective_prices(book_ids, date_from, date_to).items():
+            changes = [price_date for price_date, _ in history]
+            prices[book_id] = {}
+            for day in days:
+                change = bisect_right(changes, day) - 1
+                # prices set after date_from of books without an earlier price apply only from their date on
+                prices[book_id][day] = history[change][1] if change >= 0 else float(DEFAULT_BOOK_PRICE)
+        return prices
+
+    def _get_effective_prices(
+        self, book_ids: Iterable[Optional[int]], date_from: date, date_to: date
+    ) -> dict[int, list[tuple[date, float]]]:
+        book_ids = {book_id for book_id in book_ids if book_id is not None}
+        period_prices = self._prices_per_period.setdefault((date_from, date_to), {})
+        not_loaded = book_ids - period_prices.keys()
+        if not_loaded:
+            loaded = BookPriceRepository.get_effective_prices(not_loaded, date_from, date_to)
+            without_price = not_loaded - loaded.keys()
+            if without_price and self._store_defaults and date_to >= datetime.date.today():
+                BookPriceRepository.create_default_prices(without_price, datetime.date.today())
+            period_prices.update(loaded)
+            period_prices.update(
+                {book_id: [(date_from, float(DEFAULT_BOOK_PRICE))] for book_id in without_price}
+            )
+        return {book_id: period_prices[book_id] for book_id in book_ids}
@@ -13,6 +13,9 @@ from apps.ads_api.entities.amazon_ads.sponsored_products.search_filters import (
     CampaignSearchFilter,
 )
 from apps.ads_api.models import Profile, Campaign
+from apps.ads_api.repositories.amazon_entities_bulk_repository import (
+    CampaignsBulkRepository,
+)
 from apps.ads_api.services.campaigns.identify_campaign_purpose_service import (
     IdentifyCampaignPurpose,
 )
@@ -36,41 +39,39 @@ class SyncCampaignsService:
         for profile in self.profiles_iterator():
             campaigns = self.get_campaigns_from_adapter(profile)
 
-            for campaign in campaigns:
-                placement_top, placement_product_pages = self.get_placements(campaign)
-                Campaign.objects.update_or_create(
-                    campaign_id_amazon=campaign.external_id,
-                    defaults=dict(
-                        profile=profile,
-                        portfolio_id=campaign.portfolio_id,
-                        targeting_type=campaign.targeting_type,
-                        serving_status=campaign.extended_data.serving_status,
-                        last_updated_date_on_amazon=
-                        converter.iso_to_epoch(
-                            campaign.extended_data.last_update_date_time,
-                            convert_to=TimeUnit.MILLISECOND
-                        ),
-                        campaign_name=campaign.name,
-                        state=campaign.state,
-                        placement_tos_mult=placement_top,
-                        placement_pp_mult=placement_product_pages,
-                        bidding_strategy=campaign.dynamic_bidding.strategy
-                        if campaign.dynamic_bidding.strategy
-                        else BiddingStrategies.DOWN_ONLY.value,
-                        premium_bid_adjustment=campaign.bid_adjustment
-                        if campaign.bid_adjustment
-                        else False,
-                        daily_budget=Decimal(campaign.budget.budget),
-                        campaign_purpose=IdentifyCampaignPurpose.identify_campaign_purpose(
-                            campaign.name
-                        ),
-                    )
-                )
+            counts = CampaignsBulkRepository.upsert(
+                self.to_model(campaign, profile, converter) for campaign in campaigns
+            )
 
             _logger.info(
-                f"{len(campaigns)} campaigns synced for profile: {profile.nickname} [{profile.country_code}]"
+                f"{len(campaigns)} campaigns synced for profile: {profile.nickname} [{profile.country_code}], "
+                f"created: {counts.created}, updated: {counts.updated}, unchanged: {counts.unchanged}"
             )
 
+    @classmethod
+    def to_model(cls, campaign: CampaignEntity, profile: Profile, converter: IsoToEpochConverter) -> Campaign:
+        placement_top, placement_product_pages = cls.get_placements(campaign)
+        return Campaign(
+            campaign_id_amazon=campaign.external_id,
+            profile=profile,
+            portfolio_id=campaign.portfolio_id,
+            targeting_type=campaign.targeting_type,
+            serving_status=campaign.extended_data.serving_status,
+            last_updated_date_on_amazon=converter.iso_to_epoch(
+                campaign.extended_data.last_update_date_time, convert_to=TimeUnit.MILLISECOND
+            ),
+            campaign_name=campaign.name,
+            state=campaign.state,
+            placement_tos_mult=placement_top,
+            placement_pp_mult=placement_product_pages,
+            bidding_strategy=campaign.dynamic_bidding.strategy
+            if campaign.dynamic_bidding.strategy
+            else BiddingStrategies.DOWN_ONLY.value,
+            premium_bid_adjustment=campaign.bid_adjustment if campaign.bid_adjustment else False,
+            daily_budget=Decimal(campaign.budget.budget),
+            campaign_purpose=IdentifyCampaignPurpose.identify_campaign_purpose(campaign.name),
+        )
+
     def profiles_iterator(self) -> Iterator[Profile]:
         """
         Retrieves profiles from db by given ids. If no IDs
@@ -0,0 +1,119 @@
+from typing import NamedTuple, Type, Union
+
+from django.db.models import Sum
+
+from apps.ads_api.constants import TARGETS_VALID_STATUSES, SpReportType, SpState
+from apps.ads_api.models import CampaignPurpose, Keyword, Profile, ReportDataDailyRollup, Target
+
+SINGLE_CAMPAIGN_PURPOSES = (CampaignPurpose.Broad_Research_Single, CampaignPurpose.Exact_Scale_Single)
+
+
+class _Candidate(NamedTuple):
+    external_id: int
+    sales: float
+    spend: float
+
+
+class DuplicateTargetsService:
+    """
+    Finds enabled positive keywords or targets of a profile duplicated for a book,
+    i.e. with the same asin, match / expression type and text, and picks the ones to pause.
+
+    Targets are read as columns with one query and grouped in a single pass, metrics of the duplicated ones
+    are summed from daily rollups with one grouped query. In each group the target with the most sales
+    is kept, ties are broken by the lowest spend, or by the highest spend when none of them sold.
+    Groups with a target of a single keyword campaign keep only that one.
+    """
+
+    def __init__(self, profile: Profile, model: Union[Type[Keyword], Type[Target]]):
+        self._profile = profile
+        self._model = model
+        if model is Keyword:
+            self._identifier, self._type, self._text = "keyword_id", "match_type", "keyword_text"
+            self._report_type = SpReportType.KEYWORD
+        else:
+            self._identifier, self._type = "target_id", "resolved_expression_type"
+            self._text = "resolved_expression_text"
+            self._report_type = SpReportType.TARGET
+
+    def get_ids_to_pause(self) -> list[int]:
+        groups = self._get_duplicated_groups()
+        contested_ids = {external_id for ids, has_single in groups if not has_single for external_id in ids}
+        metrics = self._get_metrics(contested_ids) if contested_ids else {}
+
+        ids_to_pause = {}
+        for ids, has_single in groups:
+            if has_single:
+                # targets of single keyword campaigns are kept, others are paused regardless of performance
+                kept_id = None
+            else:
+                kept_id = self._rank(ids, metrics)
+            for external_id in ids:
+                if external_id != kept_id:
+                    ids_to_pause[external_id] = None
+        return list(ids_to_pause)
+
+    def _get_duplicated_groups(self) -> list[tuple[list[int], bool]]:
+        """Ids of targets not in single campaigns and whether a single campaign target is in the group"""
+        groups: dict[tuple, tuple[list[int], list[bool]]] = {}
+        for external_id, target_type, text, asins, campaign_purpose, campaign_name in (
+            self._model.objects.filter(
+                campaign__profile=self._profile,
+                state=SpState.ENABLED.value,
+                serving_status__in=TARGETS_VALID_STATUSES,
+                keyword_type="Positive",
+            )
+            .exclude(campaign__campaign_purpose=CampaignPurpose.GP)
+            .exclude(campaign__campaign_purpose=CampaignPurpose.Auto_GP)
+            .exclude(campaign__campaign_name__contains="-GP-")
+            .values_list(
+                self._identifier,
+                self._type,
+                self._text,
+                "campaign__asins",
+                "campaign__campaign_purpose",
+                "campaign__campaign_name",
+            )
+            .order_by(self._identifier)
+            .iterator(chunk_size=10_000)
+        ):
+            is_single = campaign_purpose in SINGLE_CAMPAIGN_PURPOSES or "-Single" in (campaign_name or "")
+            for asin in asins:
+                ids, singles = groups.setdefault((asin, target_type, text), ([], []))
+                if is_single:
+                    singles.append(True)
+                else:
+                    ids.append(external_id)
+        return [
+            (ids, bool(singles)) for ids, singles in groups.values() if len(ids) + len(singles) > 1 and ids
+        ]
+
+    def _get_metrics(self, external_ids: set[int]) -> dict[int, tuple[float, float]]:
+        return {
+            external_id: (float(sales or 0), float(spend or 0))
+            for external_id, sales, spend in ReportDataDailyRollup.objects.filter(
+                campaign__profile=self._profile,
+                report_type=self._report_type,
+                **{f"{self._identifier}__in": external_ids},
+            )
+            .values(self._identifier)
+            .annotate(sales_total=Sum("sales"), spend_total=Sum("spend"))
+            .values_list(self._identifier, "sales_total", "spend_total")
+            .order_by()
+        }
+
+    @staticmethod
+    def _rank(ids: list[int], metrics: dict[int, tuple[float, float]]) -> int:
+        """Id of the best performing target, ids are in ascending order so the lowest id wins full ties"""
+        best = None
+        for external_id in ids:
+            candidate = _Candidate(external_id, *metrics.get(external_id, (0.0, 0.0)))
+            if best is None or candidate.sales > best.sales:
+                best = candidate
+            elif candidate.sales == best.sales:
+                spend_is_better = (
+                    candidate.spend < best.spend if best.sales > 0 else candidate.spend > best.spend
+                )
+                if spend_is_better:
+                    best = candidate
+        return best.external_id
@@ -11,6 +11,9 @@ from apps.ads_api.entities.amazon_ads.sponsored_products.search_filters import (
     ProductAdSearchFilter,
 )
 from apps.ads_api.models import AdGroup, Campaign, ProductAd, Profile
+from apps.ads_api.repositories.amazon_entities_bulk_repository import (
+    ProductAdsBulkRepository,
+)
 from apps.utils.iso_to_epoch_converter import IsoToEpochConverter
 
 
@@ -25,7 +28,6 @@ class SyncProductAdsService:
         product_ad_adapter = ProductAdAdapter(self._profile)
         product_ads: list[ProductAdEntity] = product_ad_adapter.list(ProductAdSearchFilter())
         converter = IsoToEpochConverter()
-        synced_count = 0
 
         campaign_ids: dict[int, int] = {
             campaign_id_amazon: id_
@@ -41,6 +43,7 @@ class SyncProductAdsService:
             )
         }
 
+        to_upsert = []
         for product_ad in product_ads:
             if not (
                 int(product_ad.campaign_id)
@@ -49,22 +52,25 @@ class SyncProductAdsService:
             ):
                 continue
 
-            ProductAd.objects.update_or_create(
-                campaign_id=campaign_ids[int(product_ad.campaign_id)],
-                ad_group_id=ad_group_ids[int(product_ad.ad_group_id)],
-                product_ad_id=int(product_ad.external_id),
-                defaults={
-                    "asin": self._get_asin(product_ad),
-                    "state": product_ad.state,
-                    "serving_status": product_ad.extended_data.serving_status,
-                    "last_updated_date_on_amazon": converter.iso_to_epoch(
+            to_upsert.append(
+                ProductAd(
+                    campaign_id=campaign_ids[int(product_ad.campaign_id)],
+                    ad_group_id=ad_group_ids[int(product_ad.ad_group_id)],
+                    product_ad_id=int(product_ad.external_id),
+                    asin=self._get_asin(product_ad),
+                    state=product_ad.state,
+                    serving_status=product_ad.extended_data.serving_status,
+                    last_updated_date_on_amazon=converter.iso_to_epoch(
                         product_ad.extended_data.last_update_date_time,
                         convert_to=TimeUnit.MILLISECOND,
                     ),
-                },
+                )
             )
-            synced_count += 1
-        _logger.info(f"Synced product ads for profile {self._profile} count: {synced_count}")
+        counts = ProductAdsBulkRepository.upsert(to_upsert)
+        _logger.info(
+            f"Synced product ads for profile {self._profile} count: {len(to_upsert)}, created: {counts.created}, "
+            f"updated: {counts.updated}, unchanged: {counts.unchanged}"
+        )
 
     @staticmethod
     def _get_asin(product_ad: ProductAdEntity):
@@ -1,13 +1,27 @@
 import logging
-from itertools import groupby
-from time import sleep
-from typing import Iterable
+from concurrent.futures import ThreadPoolExecutor
+from queue import Full, Queue
+from threading import Event, Thread
+from time import monotonic, sleep
+from types import GeneratorType
+from typing import Callable, Iterable, Iterator, Optional
 
-from apps.ads_api.constants import EMPTY_REPORT_BYTES, ReportStatus, SpReportType
-from apps.ads_api.converters.report_data_entity_converter import (
-    ReportDataEntityConverter,
+from django.db import connection, transaction
+from requests import Response
+
+from adsdroid.settings import (
+    REPORTS_FETCH_WORKERS,
+    REPORTS_PARSE_WORKERS,
+    REPORTS_PIPELINE_QUEUE_SIZE,
+    REPORTS_POLL_INTERVAL_MAX,
+    REPORTS_POLL_INTERVAL_MIN,
+    REPORTS_POLL_TIMEOUT,
+    REPORTS_POLL_WORKERS,
+    REPORTS_WRITE_WORKERS,
 )
-from apps.ads_api.entities.amazon_ads.reports import BaseReportDataEntity, ReportEntity
+
+from apps.ads_api.constants import EMPTY_REPORT_BYTES, ReportStatus, SpReportType
+from apps.ads_api.entities.amazon_ads.reports import ReportEntity
 from apps.ads_api.exceptions.ads_api.reports import (
     BaseRefreshingReportException,
     EmptyReportDataReturned,
@@ -18,6 +32,13 @@ from apps.ads_api.interfaces.services.reports.download_reports_interface import
 )
 from apps.ads_api.models import Campaign, RecentReportData
 from apps.ads_api.repositories.campaign_repository import CampaignRepository
+from apps.ads_api.repositories.report.recent_report_data_bulk_repository import (
+    COLUMNS,
+    RecentReportDataBulkRepository,
+)
+from apps.ads_api.repositories.report.report_data_rollup_repository import (
+    ReportDataRollupRepository,
+)
 from apps.ads_api.repositories.report.status_repository import ReportStatusRepository
 from apps.ads_api.repositories.report_data_repository import ReportDataRepository
 from apps.ads_api.repositories.report_repository import ReportRepository
@@ -29,50 +50,248 @@ from apps.ads_api.services.reports.refresh_report_service import RefreshReportSe
 _logger = logging.getLogger(__name__)
 
 
+_STOP = object()
+_FAILED = object()
+# seconds a parser waits for room in the batches queue before checking if their writer is still there
+_PUT_TIMEOUT = 0.5
+_CAMPAIGN_ID = COLUMNS.index("campaign_id")
+_REPORT_TYPE = COLUMNS.index("report_type")
+# a row is saved if any of these is greater than zero
+_NEW_DATA_COLUMNS = tuple(
+    COLUMNS.index(column) for column in ("orders", "sales", "kenp_royalties", "impressions", "clicks")
+)
+
+
 class DownloadReportsService(DownloadReportsInterface):
-    def __init__(self):
+    """
+    Downloads pending reports with a pipeline of concurrent stages connected by bounded queues:
+    status polling -> fetching -> parsing -> saving to DB.
+    A report goes to the next stage as soon as Amazon marks it as completed,
+    still generating reports are polled again with a growing interval.
+    """
+
+    def __init__(
+        self,
+        poll_workers: int = REPORTS_POLL_WORKERS,
+        fetch_workers: int = REPORTS_FETCH_WORKERS,
+        parse_workers: int = REPORTS_PARSE_WORKERS,
+        write_workers: int = REPORTS_WRITE_WORKERS,
+        queue_size: int = REPORTS_PIPELINE_QUEUE_SIZE,
+        poll_interval_min: float = REPORTS_POLL_INTERVAL_MIN,
+        poll_interval_max: float = REPORTS_POLL_INTERVAL_MAX,
+        poll_timeout: float = REPORTS_POLL_TIMEOUT,
+    ):
         self._reports_repository = ReportRepository()
         self._campaigns_repository = CampaignRepository()
         self._report_data_repository = ReportDataRepository()
         self._download_reports_data_service = DownloadReportService()
+        self._poll_workers = poll_workers
+        self._fetch_workers = fetch_workers
+        self._parse_workers = parse_workers
+        self._write_workers = write_workers
+        self._queue_size = queue_size
+        self._poll_interval_min = poll_interval_min
+        self._poll_interval_max = poll_interval_max
+        self._poll_timeout = poll_timeout
 
     def download(self):
-        timeout = 5
-        retries = 0
         _logger.info("Downloading started")
-        reports_to_download_count = ReportStatusRepository.count_by_status(ReportStatus.PENDING)
+        fetch_queue = Queue(maxsize=self._queue_size)
+        parse_queue = Queue(maxsize=self._queue_size)
+        write_queue = Queue(maxsize=self._queue_size)
+        stages = [
+            (self._fetch_stage, fetch_queue, parse_queue, self._fetch_workers),
+            (self._parse_stage, parse_queue, write_queue, self._parse_workers),
+            (self._write_stage, write_queue, None, self._write_workers),
+        ]
+        stage_threads = []
+        for stage, input_queue, output_queue, workers_count in stages:
+            threads = [
+                Thread(
+                    target=self._run_stage,
+                    args=(stage, input_queue, output_queue),
+                    name=f"{stage.__name__}-{i}",
+                    daemon=True,
+                )
+                for i in range(workers_count)
+            ]
+            for thread in threads:
+                thread.start()
+            stage_threads.append((threads, input_queue))
 
-        while reports_to_download_count > 0 or retries < timeout:
-            reports_to_download = ReportStatusRepository.retrieve_reports_to_download_iterator()
+        try:
+            self._poll(fetch_queue)
+        finally:
+            for threads, input_queue in stage_threads:
+                for _ in threads:
+                    input_queue.put(_STOP)
+                for thread in threads:
+                    thread.join()
 
-            _logger.info("Reports to process: %s", reports_to_download_count)
-            for report in reports_to_download:
-                try:
-                    refreshed_report = self._refresh_report(report)
-                except EmptyReportDataReturned:
-                    self._reports_repository.update_by(report.report_id, report_status=ReportStatus.EMPTY.value)
-                    continue
-                except BaseRefreshingReportException:
-                    continue
+        _logger.info("sp_process_reports is done")
 
-                try:
-                    reports_data = self._download_reports_data_service.download(refreshed_report)
-                except NoReportDataReturned:
-                    self._reports_repository.update_by(
-                        report.report_id,
-                        report_status=ReportStatus.INTERNAL_FAILURE.value,
+    def poll(self, reports: list[ReportEntity]) -> list[ReportEntity]:
+        """Refreshes statuses of the reports once, returns the ones ready to be downloaded"""
+        with ThreadPoolExecutor(max_workers=self._poll_workers) as executor:
+            return [report for report in executor.map(self._poll_report, reports) if report is not None]
+
+    def download_report(self, report: ReportEntity):
+        """
+        Fetches, parses and saves a single completed report in the calling thread.
+        The report is marked as failed if it can't be saved, so it isn't waited for anymore
+        """
+        try:
+            item = self._fetch_stage(report)
+            if item is not None:
+                self._save_reports_data(self._download_reports_data_service.parse_batches(*item), report)
+        except NoReportDataReturned:
+            self._reports_repository.update_by(
+                report.report_id,
+                report_status=ReportStatus.INTERNAL_FAILURE.value,
+            )
+        except Exception:
+            self._reports_repository.update_by(
+                report.report_id,
+                report_status=ReportStatus.INTERNAL_FAILURE.value,
+            )
+            raise
+
+    def _poll(self, fetch_queue: Queue):
+        """
+        Refreshes statuses of pending reports and passes completed ones to the fetch stage
+        """
+        deadline = monotonic() + self._poll_timeout
+        poll_intervals = {}
+        next_poll_at = {}
+        with ThreadPoolExecutor(max_workers=self._poll_workers) as executor:
+            while True:
+                now = monotonic()
+                pending_reports = list(ReportStatusRepository.retrieve_reports_to_download_iterator())
+                if not pending_reports:
+                    break
+                if now >= deadline:
+                    _logger.warning("Stopped polling, %s reports are still pending", len(pending_reports))
+                    break
+
+                due_reports = [
+                    report for report in pending_reports if next_poll_at.get(report.report_id, now) <= now
+                ]
+                _logger.info("Reports to process: %s, polled now: %s", len(pending_reports), len(due_reports))
+                for report, refreshed_report in zip(
+                    due_reports, executor.map(self._poll_report, due_reports)
+                ):
+                    if refreshed_report is not None:
+                        fetch_queue.put(refreshed_report)
+                        continue
+                    interval = min(
+                        poll_intervals.get(report.report_id, self._poll_interval_min / 2) * 2,
+                        self._poll_interval_max,
                     )
-                    continue
+                    poll_intervals[report.report_id] = interval
+                    next_poll_at[report.report_id] = monotonic() + interval
 
-                self._save_reports_data(reports_data, refreshed_report)
+                waiting_reports = [
+                    next_poll_at[r.report_id] for r in pending_reports if r.report_id in next_poll_at
+                ]
+                if waiting_reports:
+                    sleep(max(min(min(waiting_reports), deadline) - monotonic(), 0))
 
-            reports_to_download_count = ReportStatusRepository.count_by_status(ReportStatus.PENDING)
-            if reports_to_download_count > 0:
-                sleep(60 * 30)  # 30 minutes
+    def _poll_report(self, report: ReportEntity) -> Optional[ReportEntity]:
+        """Returns refreshed report if it's ready to be downloaded"""
+        try:
+            return self._refresh_report(report)
+        except EmptyReportDataReturned:
+            self._reports_repository.update_by(report.report_id, report_status=ReportStatus.EMPTY.value)
+        except BaseRefreshingReportException:
+            pass
+        except Exception as e:
+            _logger.exception("Refreshing report %s failed: %s", report.report_id, e)
+        finally:
+            connection.close()
 
-            retries += 1
+    def _fetch_stage(self, report: ReportEntity):
+        try:
+            return report, self._download_reports_data_service.fetch(report)
+        except NoReportDataReturned:
+            self._reports_repository.update_by(
+                report.report_id,
+                report_status=ReportStatus.INTERNAL_FAILURE.value,
+            )
 
-        _logger.info("sp_process_reports is done")
+    def _parse_stage(self, item: tuple[ReportEntity, Response]):
+        """
+        Passes a bounded queue of parsed batches to the write stage and fills it while the report is streamed.
+        Parsing stops if the writer of the report stops reading the batches
+        """
+        report, response = item
+        batches = Queue(maxsize=self._queue_size)
+        writer_done = Event()
+        yield report, batches, writer_done
+        try:
+            for batch in self._download_reports_data_service.parse_batches(report, response):
+                if not self._put_batch(batches, batch, writer_done):
+                    _logger.warning("Parsing of report %s stopped, its data wasn't saved", report.report_id)
+                    return
+        except NoReportDataReturned:
+            self._reports_repository.update_by(
+                report.report_id,
+                report_status=ReportStatus.INTERNAL_FAILURE.value,
+            )
+            self._put_batch(batches, _FAILED, writer_done)
+        except Exception:
+            self._put_batch(batches, _FAILED, writer_done)
+            raise
+        else:
+            self._put_batch(batches, _STOP, writer_done)
+
+    @staticmethod
+    def _put_batch(batches: Queue, batch, writer_done: Event) -> bool:
+        """Waits for room in the queue while the writer reads it, returns False if the writer is done"""
+        while not writer_done.is_set():
+            try:
+                batches.put(batch, timeout=_PUT_TIMEOUT)
+                return True
+            except Full:
+                pass
+        return False
+
+    def _write_stage(self, item: tuple[ReportEntity, Queue, Event]):
+        report, batches, writer_done = item
+        try:
+            self._save_reports_data(self._iter_batches(batches), report)
+        except Exception:
+            self._reports_repository.update_by(
+                report.report_id,
+                report_status=ReportStatus.INTERNAL_FAILURE.value,
+            )
+            raise
+        finally:
+            writer_done.set()
+
+    @staticmethod
+    def _iter_batches(batches: Queue) -> Iterator[list[list]]:
+        while (batch := batches.get()) is not _STOP:
+            if batch is _FAILED:
+                raise NoReportDataReturned()
+            yield batch
+
+    @staticmethod
+    def _run_stage(stage: Callable, input_queue: Queue, output_queue: Optional[Queue]):
+        try:
+            while True:
+                item = input_queue.get()
+                if item is _STOP:
+                    break
+                try:
+                    result = stage(item)
+                    results = result if isinstance(result, GeneratorType) else [result]
+                    for result in results:
+                        if result is not None and output_queue is not None:
+                            output_queue.put(result)
+                except Exception as e:
+                    _logger.exception("Stage %s failed: %s", stage.__name__, e)
+        finally:
+            connection.close()
 
     @staticmethod
     def _refresh_report(report: ReportEntity) -> ReportEntity:
@@ -85,60 +304,56 @@ class DownloadReportsService(DownloadReportsInterface):
 
         return refreshed_report
 
-    def _save_reports_data(self, reports_data: list[BaseReportDataEntity], report: ReportEntity):
-        reports_data_to_save = []
-        campaigns_data = {
-            campaign["campaign_id_amazon"]: campaign["id"]
-            for campaign in Campaign.objects.filter(
-                campaign_id_amazon__in={report.campaign_id for report in reports_data}
-            ).values("id", "campaign_id_amazon")
-        }
+    def _save_reports_data(self, reports_data_batches: Iterable[list[list]], report: ReportEntity):
+        """
+        Replaces stored report data of the report's campaigns with new rows batch by batch,
+        existing data of a campaign is deleted before its first batch is saved.
+        Rows are decoded in COLUMNS of RecentReportData with Amazon campaign ids, see ReportRowsDecoder.
+        Rollups of the report's campaigns are refreshed once all batches are saved.
+        The report is saved in one transaction, so stored data is kept if the stream breaks halfway
+        """
+        with transaction.atomic():
+            campaigns_data = {}
+            seen_campaigns_external_ids = set()
+            for reports_data in reports_data_batches:
+                new_campaigns_external_ids = {
+                    report_data[_CAMPAIGN_ID] for report_data in reports_data
+                } - seen_campaigns_external_ids
+                seen_campaigns_external_ids |= new_campaigns_external_ids
+                new_campaigns_data = {
+                    campaign["campaign_id_amazon"]: campaign["id"]
+                    for campaign in Campaign.objects.filter(
+                        campaign_id_amazon__in=new_campaigns_external_ids
+                    ).values("id", "campaign_id_amazon")
+                }
+                if new_campaigns_data:
+                    self._delete_existing_report_data(report, new_campaigns_data.values())
+                    campaigns_data.update(new_campaigns_data)
 
-        reports_data = sorted(reports_data, key=lambda x: x.campaign_id)
-        grouped_data = {
-            campaign_external_id: list(report_data)
-            for campaign_external_id, report_data in groupby(reports_data, key=lambda x: x.campaign_id)
-            if campaign_external_id in campaigns_data
-        }
+                rows = []
+                for report_data in reports_data:
+                    campaign_id = campaigns_data.get(report_data[_CAMPAIGN_ID])
+                    if campaign_id is not None and self._report_has_new_data(report_data):
+                        report_data[_CAMPAIGN_ID] = campaign_id
+                        report_data[_REPORT_TYPE] = report.report_type
+                        rows.append(report_data)
+                RecentReportDataBulkRepository.upsert_rows(rows, recalculate_sales=False)
 
-        reports_data_to_save.extend(
-            [
-                ReportDataEntityConverter.convert_to_django_model(
-                    report_data,
-                    override_fields={
-                        "report_type": report.report_type,
-                        "campaign_id_amazon": campaign_external_id,
-                        "campaign_id": campaigns_data[campaign_external_id],
-                    },
+            if campaigns_data and report.start_date and report.end_date:
+                ReportDataRollupRepository.refresh(
+                    campaigns_data.values(), report.report_type, report.start_date, report.end_date
                 )
-                for campaign_external_id, reports_data in grouped_data.items()
-                for report_data in reports_data
-                if self._report_has_new_data(report_data)
-            ]
-        )
-        campaign_ids = campaigns_data.values()
-        self._delete_existing_report_data(report, campaign_ids)
-
-        RecentReportData.objects.bulk_create(reports_data_to_save)
-
-        self._reports_repository.remove(report.report_id)
+            # processed reports are kept, so their days aren't requested again, see ReportRequestsPlanner
+            self._reports_repository.update_by(
+                report.report_id, report_status=ReportStatus.INTERNAL_PROCESSED.value
+            )
 
     @staticmethod
-    def _report_has_new_data(report: BaseReportDataEntity) -> bool:
+    def _report_has_new_data(report_data: list) -> bool:
         """
         Returns True if there's any data greater then zero
         """
-        return any(
-            field > 0
-            for field in (
-                report.orders,
-                report.sales,
-                report.kenp_royalties,
-                report.sales,
-                report.impressions,
-                report.clicks,
-            )
-        )
+        return any(report_data[column] > 0 for column in _NEW_DATA_COLUMNS)
 
     def _delete_existing_report_data(self, report: ReportEntity, campaign_ids: Iterable[int]):
         type_filter, type_exclude_filter = self._map_report_data_type_filter(report)
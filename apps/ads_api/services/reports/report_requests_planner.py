@@ -0,0 +1,137 @@
+import logging
+from datetime import date, datetime, timedelta
+from typing import Iterable, NamedTuple
+
+from django.utils import timezone
+
+from adsdroid.settings import (
+    REPORTS_ATTRIBUTION_DAYS,
+    REPORTS_MAX_DAYS_PER_REQUEST,
+    REPORTS_REQUEST_REFRESH_HOURS,
+)
+from apps.ads_api.constants import SpReportType
+from apps.ads_api.repositories.report.status_repository import ReportStatusRepository
+from apps.ads_api.repositories.report_data_repository import ReportDataRepository
+
+_logger = logging.getLogger(__name__)
+
+
+class PlannedReportRequest(NamedTuple):
+    profile_id: int
+    report_type: SpReportType
+    start_date: date
+    end_date: date
+
+
+class _Fetch(NamedTuple):
+    at: datetime
+    # data of the day was saved, or the report was empty
+    processed: bool
+
+
+class ReportRequestsPlanner:
+    """
+    Plans the smallest set of report requests covering the days still missing for profiles and report types.
+
+    A day is final once a report covering it was processed or its data was saved REPORTS_ATTRIBUTION_DAYS
+    after it, Amazon doesn't attribute more conversions to it, so it's never requested again.
+    Other days are re-requested unless a report covering them was requested or downloaded
+    in the last REPORTS_REQUEST_REFRESH_HOURS, so overlapping windows of the same run are requested once.
+    Reports still in flight never make a day final, if they get stuck their days are requested again.
+    Missing days are merged into consecutive ranges of at most REPORTS_MAX_DAYS_PER_REQUEST days.
+    """
+
+    def __init__(
+        self,
+        attribution_days: int = REPORTS_ATTRIBUTION_DAYS,
+        refresh_hours: float = REPORTS_REQUEST_REFRESH_HOURS,
+        max_days_per_request: int = REPORTS_MAX_DAYS_PER_REQUEST,
+    ):
+        self._attribution_days = attribution_days
+        self._refresh_hours = refresh_hours
+        self._max_days_per_request = max_days_per_request
+
+    def plan(
+        self,
+        profile_ids: Iterable[int],
+        report_types: Iterable[SpReportType],
+        start_date: date,
+        end_date: date,
+    ) -> list[PlannedReportRequest]:
+        profile_ids = list(profile_ids)
+        report_types = [SpReportType(report_type) for report_type in report_types]
+        fetched_at = self._get_fetched_at_per_day(profile_ids, report_types, start_date, end_date)
+        refreshed_after = timezone.now() - timedelta(hours=self._refresh_hours)
+
+        requests = []
+        days = [start_date + timedelta(days=i) for i in range((end_date - start_date).days + 1)]
+        for profile_id in profile_ids:
+            for report_type in report_types:
+                missing_days = [
+                    day
+                    for day in days
+                    if not self._is_covered(
+                        fetched_at.get((profile_id, report_type.value, day), []), day, refreshed_after
+                    )
+                ]
+                requests.extend(
+                    PlannedReportRequest(profile_id, report_type, range_start, range_end)
+                    for range_start, range_end in self._to_ranges(missing_days)
+                )
+        _logger.info(
+            "Planned %s report requests of %s profiles from %s to %s",
+            len(requests),
+            len(profile_ids),
+            start_date,
+            end_date,
+        )
+        return requests
+
+    def _is_covered(self, fetched_at: list[_Fetch], day: date, refreshed_after: datetime) -> bool:
+        final_from = day + timedelta(days=self._attribution_days)
+        return any(
+            moment >= refreshed_after or (processed and timezone.localdate(moment) >= final_from)
+            for moment, processed in fetched_at
+        )
+
+    def _to_ranges(self, days: list[date]) -> list[tuple[date, date]]:
+        ranges = []
+        for day in days:
+            if (
+                ranges
+                and ranges[-1][1] + timedelta(days=1) == day
+                and (day - ranges[-1][0]).days < self._max_days_per_request
+            ):
+                ranges[-1][1] = day
+            else:
+                ranges.append([day, day])
+        return [(range_start, range_end) for range_start, range_end in ranges]
+
+    @staticmethod
+    def _get_fetched_at_per_day(
+        profile_ids: list[int], report_types: list[SpReportType], start_date: date, end_date: date
+    ) -> dict[tuple[int, str, date], list[_Fetch]]:
+        """Times reports of each day were requested or processed and their data was saved"""
+        report_types = [report_type.value for report_type in report_types]
+        fetched_at = {}
+        for (
+            profile_id,
+            report_type,
+            range_start,
+            range_end,
+            requested_at,
+            processed,
+        ) in ReportStatusRepository.retrieve_requested_ranges(
+            profile_ids, report_types, start_date, end_date
+        ):
+            day = max(range_start, start_date)
+            while day <= min(range_end, end_date):
+                fetched_at.setdefault((profile_id, report_type, day), []).append(
+                    _Fetch(requested_at, processed)
+                )
+                day += timedelta(days=1)
+        for key, downloaded_at in ReportDataRepository.get_downloaded_at_per_day(
+            profile_ids, report_types, start_date, end_date
+        ).items():
+            fetched_at.setdefault(key, []).append(_Fetch(downloaded_at, True))
+        return fetched_at
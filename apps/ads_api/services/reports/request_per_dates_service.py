@@ -1,7 +1,6 @@
 import logging
 from datetime import date, datetime
-from time import sleep
-from typing import Optional
+from typing import Optional, Union
 
 from django.core.exceptions import MultipleObjectsReturned
 
@@ -13,6 +12,7 @@ from apps.ads_api.interfaces.services.reports.request_per_dates_intefrace import
 )
 from apps.ads_api.repositories.profile_repository import ProfileRepository
 from apps.ads_api.repositories.report_repository import ReportRepository
+from apps.ads_api.services.reports.report_requests_planner import ReportRequestsPlanner
 
 _logger = logging.getLogger(__name__)
 
@@ -24,7 +24,6 @@ class RequestPerDatesService(RequestPerDatesInterface):
         end_date: datetime,
         managed_profiles_ids: list[int],
         report_types: list[SpReportType] = SP_REPORT_TYPES,
-        requests_interval: float = 0.5,
         ad_status_filter: Optional[list[AdStatus]] = None,
     ):
         self._start_date = start_date
@@ -34,60 +33,72 @@ class RequestPerDatesService(RequestPerDatesInterface):
         self._managed_profiles_ids = (
             managed_profiles_ids if managed_profiles_ids else []
         )
-        self._requests_interval = requests_interval
         self._report_types = report_types
         self._ad_status_filter = ad_status_filter
 
     def request(self):
+        """Requests reports of the days not downloaded yet, see ReportRequestsPlanner"""
         _logger.info(
             "Requesting reports for profiles with profile_id in %s",
             self._managed_profiles_ids,
         )
-        for profile_id in self._managed_profiles_ids:
-            server = self._profile_repository.get_server_by_profile_id(
-                profile_id=profile_id
-            )
+        planned_requests = ReportRequestsPlanner().plan(
+            profile_ids=self._managed_profiles_ids,
+            report_types=self._report_types,
+            start_date=self._as_date(self._start_date),
+            end_date=self._as_date(self._end_date),
+        )
+        servers = {}
+        for planned_request in planned_requests:
+            profile_id = planned_request.profile_id
+            if profile_id not in servers:
+                servers[profile_id] = self._profile_repository.get_server_by_profile_id(
+                    profile_id=profile_id
+                )
+            server = servers[profile_id]
             if not server:
                 continue
 
-            for report_type in self._report_types:
-                report_adapter = ReportsAdapter(
-                    report_type=report_type,
-                    server=server,
-                    start_date=self._start_date,
-                    end_date=self._end_date,
-                    ad_status_filter=self._ad_status_filter,
+            report_adapter = ReportsAdapter(
+                report_type=planned_request.report_type,
+                server=server,
+                start_date=planned_request.start_date,
+                end_date=planned_request.end_date,
+                ad_status_filter=self._ad_status_filter,
+            )
+            try:
+                report = report_adapter.create_report_request_for_profile(
+                    profile_id=profile_id
+                )
+            except CreatingReportRequestException:
+                _logger.error(
+                    "Got creating report error. Details: profile_id: %s, report_type: %s, dates: %s - %s",
+                    profile_id,
+                    planned_request.report_type,
+                    planned_request.start_date,
+                    planned_request.end_date,
                 )
-                try:
-                    report = report_adapter.create_report_request_for_profile(
-                        profile_id=profile_id
-                    )
-                except CreatingReportRequestException:
-                    _logger.error(
-                        "Got creating report error. Details: profile_id: %s, report_type: %s, date: %s",
-                        profile_id,
-                        report_type,
-                        date,
-                    )
-                    continue
+                continue
 
-                try:
-                    self._report_repository.update_or_create_from_report(report)
-                except MultipleObjectsReturned as e:
-                    _logger.error(
-                        "Error for %s, %s, %s, %s",
-                        report.report_type,
-                        report.start_date,
-                        report.end_date,
-                        report.profile_id,
-                        e,
-                    )
+            try:
+                self._report_repository.update_or_create_from_report(report)
+            except MultipleObjectsReturned as e:
+                _logger.error(
+                    "Error for %s, %s, %s, %s",
+                    report.report_type,
+                    report.start_date,
+                    report.end_date,
+                    report.profile_id,
+                    e,
+                )
 
-                sleep(self._requests_interval)
+        _logger.info(
+            "Reports were requested from %s to %s, requests - %s",
+            self._as_date(self._start_date),
+            self._as_date(self._end_date),
+            len(planned_requests),
+        )
 
-            _logger.info(
-                "Reports were updated from %s to %s, profile id - %s",
-                self._start_date.date(),
-                self._end_date.date(),
-                profile_id,
-            )
+    @staticmethod
+    def _as_date(value: Union[date, datetime]) -> date:
+        return value.date() if isinstance(value, datetime) else value
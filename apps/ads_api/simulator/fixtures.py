@@ -0,0 +1,171 @@
+import json
+import random
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Iterable, Optional
+
+# list endpoints of the simulator: path under /sp/ -> key of entities in requests and responses, id field
+SP_ENDPOINTS = {
+    "campaigns": ("campaigns", "campaignId"),
+    "adGroups": ("adGroups", "adGroupId"),
+    "productAds": ("productAds", "adId"),
+    "keywords": ("keywords", "keywordId"),
+    "targets": ("targetingClauses", "targetId"),
+}
+MATCH_TYPES = ("EXACT", "PHRASE", "BROAD")
+# expressions of auto targets: close-match, loose-match, substitutes and complements
+AUTO_TARGET_TYPES = (
+    "QUERY_HIGH_REL_MATCHES",
+    "QUERY_BROAD_REL_MATCHES",
+    "ASIN_SUBSTITUTE_RELATED",
+    "ASIN_ACCESSORY_RELATED",
+)
+# ids of entities of a profile are counted from profile_id * ID_RANGE
+ID_RANGE = 10**9
+
+
+def _extended_data(serving_status: str, last_update: datetime) -> dict:
+    timestamp = last_update.strftime("%Y-%m-%dT%H:%M:%SZ")
+    return {
+        "servingStatus": serving_status,
+        "lastUpdateDateTime": timestamp,
+        "creationDateTime": timestamp,
+    }
+
+
+class SimulatorFixtures:
+    """
+    Synthetic Sponsored Products entities of profiles served by the Ads API simulator,
+    kept in the shape of Ads API v3 responses, by profile id and endpoint.
+    Fixtures are generated or read from JSON files of the same shape: {"profiles": [{"profileId": ..., ...}]}
+    """
+
+    def __init__(self, profiles: Iterable[dict] = ()):
+        self.profiles: dict[int, dict] = {}
+        for profile in profiles:
+            self.add_profile(profile)
+
+    def add_profile(self, profile: dict):
+        profile = {"profileId": int(profile["profileId"]), **{key: [] for key in SP_ENDPOINTS}, **profile}
+        self.profiles[profile["profileId"]] = profile
+
+    def entities(self, profile_id: int, endpoint: str) -> list[dict]:
+        profile = self.profiles.get(profile_id)
+        return profile[endpoint] if profile else []
+
+    @classmethod
+    def load(cls, path: str) -> "SimulatorFixtures":
+        with open(path) as fixtures_file:
+            return cls(json.load(fixtures_file)["profiles"])
+
+    def dump(self, path: str):
+        Path(path).write_text(json.dumps({"profiles": list(self.profiles.values())}))
+
+    @classmethod
+    def generate(
+        cls,
+        profile_ids: Iterable[int],
+        campaigns: int = 10,
+        keywords_per_campaign: int = 20,
+        targets_per_campaign: int = 10,
+        campaigns_per_book: int = 1,
+        seed: Optional[int] = None,
+    ) -> "SimulatorFixtures":
+        """
+        Profiles with `campaigns` campaigns each, half of them keyword and half auto campaigns,
+        every campaign with one ad group and one product ad. Every fifth keyword and auto campaign is a GP one.
+        Campaigns of a book advertise the same asin, so its keyword and auto campaigns have the same targets
+        """
+        rng = random.Random(seed)
+        last_update = datetime(2023, 7, 1, tzinfo=timezone.utc)
+        fixtures = cls()
+        for profile_id in profile_ids:
+            fixtures.add_profile({"profileId": profile_id})
+            profile = fixtures.profiles[profile_id]
+            next_id = iter(range(profile_id * ID_RANGE + 1, (profile_id + 1) * ID_RANGE))
+            asin = None
+            for campaign_number in range(campaigns):
+                campaign_id = str(next(next_id))
+                ad_group_id = str(next(next_id))
+                book_number = campaign_number // campaigns_per_book
+                if campaign_number % campaigns_per_book == 0:
+                    asin = f"B{rng.randrange(10**9):09d}"
+                manual_keywords = campaign_number % 2 == 0
+                if manual_keywords:
+                    purpose = "GP" if campaign_number % 10 == 0 else "Exact-Scale"
+                else:
+                    purpose = "Auto-GP" if campaign_number % 10 == 1 else "Auto-Discovery"
+                profile["campaigns"].append(
+                    {
+                        "campaignId": campaign_id,
+                        "name": f"SIMULATED-SP-{purpose}-{campaign_number}-{asin}-Kindle",
+                        "state": "ENABLED",
+                        "targetingType": "MANUAL" if manual_keywords else "AUTO",
+                        "budget": {"budget": float(rng.choice((5, 10, 20))), "budgetType": "DAILY"},
+                        "dynamicBidding": {
+                            "strategy": "LEGACY_FOR_SALES",
+                            "placementBidding": [
+                                {"placement": "PLACEMENT_TOP", "percentage": rng.randrange(0, 100)},
+                                {"placement": "PLACEMENT_PRODUCT_PAGE", "percentage": rng.randrange(0, 100)},
+                            ],
+                        },
+                        "startDate": "2023-01-01",
+                        "extendedData": _extended_data("CAMPAIGN_STATUS_ENABLED", last_update),
+                    }
+                )
+                profile["adGroups"].append(
+                    {
+                        "adGroupId": ad_group_id,
+                        "campaignId": campaign_id,
+                        "name": f"SIMULATED-{campaign_number}",
+                        "state": "ENABLED",
+                        "defaultBid": 0.45,
+                        "extendedData": _extended_data("AD_GROUP_STATUS_ENABLED", last_update),
+                    }
+                )
+                profile["productAds"].append(
+                    {
+                        "adId": str(next(next_id)),
+                        "adGroupId": ad_group_id,
+                        "campaignId": campaign_id,
+                        "asin": asin,
+                        "state": "ENABLED",
+                        "extendedData": _extended_data("AD_STATUS_LIVE", last_update),
+                    }
+                )
+                if manual_keywords:
+                    for keyword_number in range(keywords_per_campaign):
+                        profile["keywords"].append(
+                            {
+                                "keywordId": str(next(next_id)),
+                                "adGroupId": ad_group_id,
+                                "campaignId": campaign_id,
+                                "keywordText": f"simulated keyword {book_number} {keyword_number}",
+                                "matchType": MATCH_TYPES[keyword_number % len(MATCH_TYPES)],
+                                "state": "ENABLED",
+                                "bid": round(rng.uniform(0.2, 1.5), 2),
+                                "extendedData": _extended_data("TARGETING_CLAUSE_STATUS_LIVE", last_update),
+                            }
+                        )
+                else:
+                    for target_number in range(targets_per_campaign):
+                        if target_number < len(AUTO_TARGET_TYPES):
+                            expression_type = "AUTO"
+                            expression = [{"type": AUTO_TARGET_TYPES[target_number]}]
+                        else:
+                            expression_type = "MANUAL"
+                            expression = [{"type": "ASIN_SAME_AS", "value": f"B{rng.randrange(10**9):09d}"}]
+                        profile["targets"].append(
+                            {
+                                "targetId": str(next(next_id)),
+                                "adGroupId": ad_group_id,
+                                "campaignId": campaign_id,
+                                "expression": expression,
+                                "resolvedExpression": expression,
+                                "expressionType": expression_type,
+                                "state": "ENABLED",
+                                "bid": round(rng.uniform(0.2, 1.5), 2),
+                                "extendedData": _extended_data("TARGETING_CLAUSE_STATUS_LIVE", last_update),
+                            }
+                        )
+        return fixtures
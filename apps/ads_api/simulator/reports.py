@@ -0,0 +1,150 @@
+import gzip
+import io
+import json
+import random
+from datetime import date, timedelta
+from typing import Iterator
+
+from apps.ads_api.simulator.fixtures import AUTO_TARGET_TYPES, SimulatorFixtures
+
+PLACEMENTS = ("Top of Search on-Amazon", "Detail Page on-Amazon", "Other on-Amazon")
+KEYWORD_MATCH_TYPES = {"BROAD", "PHRASE", "EXACT"}
+AUTO_TARGET_TEXTS = dict(zip(AUTO_TARGET_TYPES, ("close-match", "loose-match", "substitutes", "complements")))
+
+
+def _target_text(target: dict) -> str:
+    expression = target["expression"][0]
+    if expression["type"] in AUTO_TARGET_TEXTS:
+        return AUTO_TARGET_TEXTS[expression["type"]]
+    return f'asin="{expression["value"]}"'
+
+
+class SimulatedReport:
+    """
+    Daily rows of a report requested from the simulator, one row per day and entity the report is grouped by,
+    with the columns of the request and random metrics. Like Amazon, reports have no rows of entities
+    without impressions, only `active_share` of the entities have them on a day
+    """
+
+    def __init__(
+        self,
+        fixtures: SimulatorFixtures,
+        profile_id: int,
+        request: dict,
+        seed: int,
+        active_share: float = 1.0,
+    ):
+        self._fixtures = fixtures
+        self._profile_id = profile_id
+        self._configuration = request["configuration"]
+        self._start_date = date.fromisoformat(request["startDate"])
+        self._end_date = date.fromisoformat(request["endDate"])
+        self._seed = seed
+        self._active_share = active_share
+
+    def to_gzip_json(self) -> bytes:
+        """The report file: a gzipped JSON array of rows, written row by row"""
+        buffer = io.BytesIO()
+        with gzip.GzipFile(fileobj=buffer, mode="wb") as report_file:
+            report_file.write(b"[")
+            for i, row in enumerate(self.rows()):
+                report_file.write(b"," if i else b"")
+                report_file.write(json.dumps(row).encode())
+            report_file.write(b"]")
+        return buffer.getvalue()
+
+    def rows(self) -> Iterator[dict]:
+        rng = random.Random(self._seed)
+        columns = self._configuration["columns"]
+        entities = list(self._entities())
+        day = self._start_date
+        while day <= self._end_date:
+            for entity in entities:
+                if self._active_share < 1 and rng.random() >= self._active_share:
+                    continue
+                row = {**entity, **self._metrics(rng), "date": day.isoformat()}
+                yield {column: row.get(column) for column in columns}
+            day += timedelta(days=1)
+
+    def _entities(self) -> Iterator[dict]:
+        """Values of the columns describing each entity the report is grouped by"""
+        campaigns = {
+            campaign["campaignId"]: campaign
+            for campaign in self._fixtures.entities(self._profile_id, "campaigns")
+        }
+        ad_groups = {
+            ad_group["adGroupId"]: ad_group
+            for ad_group in self._fixtures.entities(self._profile_id, "adGroups")
+        }
+        report_type_id = self._configuration["reportTypeId"]
+        group_by = self._configuration.get("groupBy", [])
+
+        if report_type_id == "spCampaigns":
+            placements = PLACEMENTS if "campaignPlacement" in group_by else (None,)
+            for campaign_id in campaigns:
+                for placement in placements:
+                    yield {
+                        "campaignId": int(campaign_id),
+                        "placementClassification": placement,
+                        "topOfSearchImpressionShare": 0.1,
+                    }
+        elif report_type_id == "spAdvertisedProduct":
+            for product_ad in self._fixtures.entities(self._profile_id, "productAds"):
+                yield {
+                    **self._ad_group_columns(product_ad, ad_groups),
+                    "adId": int(product_ad["adId"]),
+                    "advertisedAsin": product_ad["asin"],
+                }
+        elif self._keyword_types() & KEYWORD_MATCH_TYPES:
+            for keyword in self._fixtures.entities(self._profile_id, "keywords"):
+                yield {
+                    **self._ad_group_columns(keyword, ad_groups),
+                    "keywordId": int(keyword["keywordId"]),
+                    "keyword": keyword["keywordText"],
+                    "matchType": keyword["matchType"],
+                    "searchTerm": keyword["keywordText"],
+                }
+        else:
+            for target in self._fixtures.entities(self._profile_id, "targets"):
+                text = _target_text(target)
+                yield {
+                    **self._ad_group_columns(target, ad_groups),
+                    "keywordId": int(target["targetId"]),
+                    "keyword": text,
+                    "targeting": text,
+                    "keywordType": "TARGETING_EXPRESSION_PREDEFINED"
+                    if target["expressionType"] == "AUTO"
+                    else "TARGETING_EXPRESSION",
+                    "searchTerm": text.lower(),
+                }
+
+    def _keyword_types(self) -> set[str]:
+        return {
+            value
+            for report_filter in self._configuration.get("filters", [])
+            if report_filter["field"] == "keywordType"
+            for value in report_filter["values"]
+        }
+
+    @staticmethod
+    def _ad_group_columns(entity: dict, ad_groups: dict) -> dict:
+        return {
+            "campaignId": int(entity["campaignId"]),
+            "adGroupId": int(entity["adGroupId"]),
+            "adGroupName": ad_groups.get(entity["adGroupId"], {}).get("name", ""),
+        }
+
+    @staticmethod
+    def _metrics(rng: random.Random) -> dict:
+        impressions = rng.randrange(1, 500)
+        clicks = rng.randrange(0, 1 + impressions // 50)
+        orders = 1 if clicks and rng.random() < 0.1 else 0
+        return {
+            "impressions": impressions,
+            "clicks": clicks,
+            "cost": round(clicks * rng.uniform(0.2, 0.8), 2),
+            "purchases30d": orders,
+            "unitsSoldClicks30d": orders,
+            "sales30d": round(orders * 5.99, 2),
+            "kindleEditionNormalizedPagesRoyalties14d": rng.randrange(0, 3) if orders else 0,
+        }
@@ -0,0 +1,325 @@
+import json
+import logging
+import random
+import re
+import threading
+import time
+import uuid
+from collections import Counter
+from dataclasses import dataclass
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Optional
+
+from apps.ads_api.constants import ServerLocation
+from apps.ads_api.simulator.fixtures import SP_ENDPOINTS, SimulatorFixtures
+from apps.ads_api.simulator.reports import SimulatedReport
+
+_logger = logging.getLogger(__name__)
+
+_SP_LIST = re.compile(r"^/sp/(\w+)/list$")
+_SP_UPDATE = re.compile(r"^/sp/(\w+)$")
+_REPORT = re.compile(r"^/reporting/reports/([\w-]+)$")
+_REPORT_FILE = re.compile(r"^/reports/([\w-]+)\.json\.gz$")
+
+
+@dataclass
+class SimulatorConfig:
+    # seconds every response is delayed by, plus a random jitter of up to latency_jitter seconds
+    latency: float = 0.0
+    latency_jitter: float = 0.0
+    # entities per page of list responses, unless the request asks for fewer with maxResults
+    page_size: int = 100
+    # requests per second allowed per profile and burst of them, None to never answer 429
+    requests_per_second: Optional[float] = None
+    burst: int = 10
+    # Retry-After header of 429 responses, None to leave it out
+    retry_after: Optional[float] = 1.0
+    # seconds reports stay pending after they are requested
+    report_generation_seconds: float = 0.0
+    # share of entities with a row in reports of a day
+    report_active_share: float = 1.0
+
+
+class _Quota:
+    """Token bucket of a profile, requests beyond it are answered with 429"""
+
+    def __init__(self, rate: float, capacity: int):
+        self._rate = rate
+        self._capacity = capacity
+        self._tokens = float(capacity)
+        self._updated_at = time.monotonic()
+        self._lock = threading.Lock()
+
+    def take(self) -> bool:
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self._capacity, self._tokens + (now - self._updated_at) * self._rate)
+            self._updated_at = now
+            if self._tokens < 1:
+                return False
+            self._tokens -= 1
+            return True
+
+
+class AdsApiSimulator:
+    """
+    Local stand-in of the Amazon Ads API for load and latency testing. Serves the LWA token endpoint,
+    Sponsored Products list and update endpoints of campaigns, ad groups, product ads, keywords and targets
+    with nextToken pagination, report requests and gzip report files, from synthetic SimulatorFixtures.
+
+    Adapters are pointed at it with ADS_API_SIMULATOR_URL, or by patching BaseURL and AuthURL with url_maps().
+    Responses are delayed and throttled as configured in SimulatorConfig.
+    """
+
+    def __init__(
+        self,
+        fixtures: SimulatorFixtures,
+        config: Optional[SimulatorConfig] = None,
+        host: str = "127.0.0.1",
+        port: int = 0,
+    ):
+        self.fixtures = fixtures
+        self.config = config or SimulatorConfig()
+        self.stats: Counter = Counter()
+        self._reports: dict[str, dict] = {}
+        self._quotas: dict[str, _Quota] = {}
+        self._lock = threading.Lock()
+        self._server = ThreadingHTTPServer((host, port), _SimulatorRequestHandler)
+        self._server.daemon_threads = True
+        self._server.simulator = self
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def url(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def url_maps(self) -> tuple[dict, dict]:
+        """BaseURL and AuthURL of all regions pointing at the simulator"""
+        return (
+            {server: self.url for server in ServerLocation},
+            {server: f"{self.url}/auth/o2/token" for server in ServerLocation},
+        )
+
+    def start(self) -> "AdsApiSimulator":
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+        _logger.info("Ads API simulator is listening on %s", self.url)
+        return self
+
+    def serve_forever(self):
+        _logger.info("Ads API simulator is listening on %s", self.url)
+        self._server.serve_forever()
+
+    def stop(self):
+        self._server.shutdown()
+        self._server.server_close()
+        if self._thread:
+            self._thread.join()
+
+    def __enter__(self) -> "AdsApiSimulator":
+        return self.start()
+
+    def __exit__(self, *exc_info):
+        self.stop()
+
+    def is_throttled(self, scope: str) -> bool:
+        if self.config.requests_per_second is None:
+            return False
+        with self._lock:
+            quota = self._quotas.get(scope)
+            if quota is None:
+                quota = self._quotas[scope] = _Quota(self.config.requests_per_second, self.config.burst)
+        return not quota.take()
+
+    def list_entities(self, profile_id: int, endpoint: str, body: dict) -> dict:
+        key, id_field = SP_ENDPOINTS[endpoint]
+        entities = self.fixtures.entities(profile_id, endpoint)
+        filters = {
+            "campaignId": body.get("campaignIdFilter"),
+            "adGroupId": body.get("adGroupIdFilter"),
+            id_field: body.get(f"{id_field}Filter"),
+        }
+        for field, id_filter in filters.items():
+            if id_filter and id_filter.get("include") is not None:
+                included = set(map(str, id_filter["include"]))
+                entities = [entity for entity in entities if entity.get(field) in included]
+        state_filter = body.get("stateFilter")
+        if state_filter and state_filter.get("include"):
+            entities = [entity for entity in entities if entity.get("state") in state_filter["include"]]
+
+        start = int(body.get("nextToken") or 0)
+        page_size = min(int(body.get("maxResults") or self.config.page_size), self.config.page_size)
+        end = start + page_size
+        response = {key: entities[start:end], "totalResults": len(entities)}
+        if end < len(entities):
+            response["nextToken"] = str(end)
+        return response
+
+    def update_entities(self, profile_id: int, endpoint: str, body: dict) -> dict:
+        key, id_field = SP_ENDPOINTS[endpoint]
+        stored = {entity[id_field]: entity for entity in self.fixtures.entities(profile_id, endpoint)}
+        success, error = [], []
+        with self._lock:
+            for index, update in enumerate(body.get(key, [])):
+                entity = stored.get(str(update.get(id_field)))
+                if entity is None:
+                    error.append(
+                        {
+                            "index": index,
+                            "errors": [
+                                {"errorType": "entityNotFoundError", "errorValue": {"message": "not found"}}
+                            ],
+                        }
+                    )
+                    continue
+                entity.update({field: value for field, value in update.items() if field != id_field})
+                success.append({"index": index, id_field: entity[id_field]})
+        return {key: {"success": success, "error": error}}
+
+    def create_report(self, profile_id: int, request: dict) -> dict:
+        report_id = str(uuid.uuid4())
+        report = {
+            "reportId": report_id,
+            "status": "PENDING",
+            "startDate": request["startDate"],
+            "endDate": request["endDate"],
+            "configuration": request["configuration"],
+            "url": None,
+            "fileSize": None,
+        }
+        with self._lock:
+            self._reports[report_id] = {
+                "report": report,
+                "profile_id": profile_id,
+                "request": request,
+                "ready_at": time.monotonic() + self.config.report_generation_seconds,
+                "file": None,
+            }
+        return report
+
+    def get_report(self, report_id: str, base_url: str) -> Optional[dict]:
+        stored = self._reports.get(report_id)
+        if stored is None:
+            return None
+        if stored["file"] is None and time.monotonic() >= stored["ready_at"]:
+            report_file = SimulatedReport(
+                self.fixtures,
+                stored["profile_id"],
+                stored["request"],
+                seed=hash(report_id),
+                active_share=self.config.report_active_share,
+            ).to_gzip_json()
+            with self._lock:
+                stored["file"] = report_file
+                stored["report"].update(
+                    status="COMPLETED",
+                    url=f"{base_url}/reports/{report_id}.json.gz",
+                    fileSize=len(report_file),
+                )
+        return stored["report"]
+
+    def get_report_file(self, report_id: str) -> Optional[bytes]:
+        stored = self._reports.get(report_id)
+        return stored["file"] if stored else None
+
+    def delay(self):
+        seconds = self.config.latency + random.uniform(0, self.config.latency_jitter)
+        if seconds > 0:
+            time.sleep(seconds)
+
+
+class _SimulatorRequestHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    @property
+    def simulator(self) -> AdsApiSimulator:
+        return self.server.simulator
+
+    def log_message(self, format, *args):
+        _logger.debug("%s - %s", self.address_string(), format % args)
+
+    def do_GET(self):
+        self._handle("GET")
+
+    def do_POST(self):
+        self._handle("POST")
+
+    def do_PUT(self):
+        self._handle("PUT")
+
+    def _handle(self, method: str):
+        body = self._read_body()
+        self.simulator.delay()
+        self.simulator.stats[f"{method} {self._route()}"] += 1
+
+        if method == "POST" and self.path == "/auth/o2/token":
+            return self._send_json(
+                200,
+                {
+                    "access_token": f"Atza|simulated-{uuid.uuid4().hex}",
+                    "refresh_token": "Atzr|simulated",
+                    "token_type": "bearer",
+                    "expires_in": 3600,
+                },
+            )
+        if method == "GET" and (match := _REPORT_FILE.match(self.path)):
+            report_file = self.simulator.get_report_file(match.group(1))
+            if report_file is None:
+                return self._send_error(404, "NOT_FOUND", "Report file not found")
+            return self._send(200, report_file, "application/octet-stream")
+
+        if not self.headers.get("Authorization", "").startswith("Bearer "):
+            return self._send_error(401, "UNAUTHORIZED", "Not authorized")
+        scope = self.headers.get("Amazon-Advertising-API-Scope")
+        if scope is None or not scope.isdigit():
+            return self._send_error(400, "INVALID_ARGUMENT", "Amazon-Advertising-API-Scope header is missing")
+        if self.simulator.is_throttled(scope):
+            self.simulator.stats["throttled"] += 1
+            headers = {}
+            if self.simulator.config.retry_after is not None:
+                headers["Retry-After"] = str(self.simulator.config.retry_after)
+            return self._send_error(429, "TOO_MANY_REQUESTS", "Too Many Requests", headers)
+
+        profile_id = int(scope)
+        if method == "POST" and (match := _SP_LIST.match(self.path)) and match.group(1) in SP_ENDPOINTS:
+            return self._send_json(200, self.simulator.list_entities(profile_id, match.group(1), body))
+        if method == "PUT" and (match := _SP_UPDATE.match(self.path)) and match.group(1) in SP_ENDPOINTS:
+            return self._send_json(207, self.simulator.update_entities(profile_id, match.group(1), body))
+        if method == "POST" and self.path == "/reporting/reports":
+            return self._send_json(200, self.simulator.create_report(profile_id, body))
+        if method == "GET" and (match := _REPORT.match(self.path)):
+            report = self.simulator.get_report(match.group(1), f"http://{self.headers['Host']}")
+            if report is None:
+                return self._send_error(404, "NOT_FOUND", "Report not found")
+            return self._send_json(200, report)
+        return self._send_error(404, "NOT_FOUND", f"{method} {self.path} is not simulated")
+
+    def _route(self) -> str:
+        """Path with ids replaced, to count requests per endpoint"""
+        path = _REPORT.sub("/reporting/reports/{reportId}", self.path)
+        return _REPORT_FILE.sub("/reports/{reportId}.json.gz", path)
+
+    def _read_body(self) -> dict:
+        length = int(self.headers.get("Content-Length") or 0)
+        if not length:
+            return {}
+        raw_body = self.rfile.read(length)
+        if self.headers.get("Content-Type", "").startswith("application/x-www-form-urlencoded"):
+            return {}
+        return json.loads(raw_body)
+
+    def _send_json(self, status: int, data: dict, headers: Optional[dict] = None):
+        self._send(status, json.dumps(data).encode(), "application/json", headers)
+
+    def _send_error(self, status: int, code: str, message: str, headers: Optional[dict] = None):
+        self._send_json(status, {"code": code, "message": message}, headers)
+
+    def _send(self, status: int, body: bytes, content_type: str, headers: Optional[dict] = None):
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(body)
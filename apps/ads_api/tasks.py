@@ -5,12 +5,22 @@ from collections import defaultdict
 from datetime import datetime, timedelta
 from typing import Dict, List, Optional, Set, Union
 
-from celery import chain, group
-from django.db.models import F, Q
+from celery import chain, chord, group, maybe_signature
+from django.db.models import Case, F, Q, Value, When
+from django.utils import timezone
 from sp_api.api import Catalog, CatalogItems
 from sp_api.base import Marketplaces
 
 from adsdroid.celery import app
+from adsdroid.settings import (
+    REPORTS_POLL_INTERVAL_MAX,
+    REPORTS_POLL_INTERVAL_MIN,
+    REPORTS_POLL_TIMEOUT,
+    SYNC_SP_BIDS_REGION_CONCURRENCY,
+    SYNC_SP_BIDS_RETRY_COUNTDOWN,
+    SYNC_SP_BIDS_SHARD_TIMEOUT,
+    SYNC_SP_BIDS_SHARDS_PER_REGION,
+)
 from apps.ads_api.adapters.amazon_ads.book_catalog_adapter import BookCatalogAdapter
 from apps.ads_api.adapters.amazon_ads.sponsored_products.campaigns_adapter import (
     CampaignAdapter,
@@ -47,6 +57,7 @@ from apps.ads_api.constants import (
     DEFAULT_MAX_BID,
     DEFAULT_MAX_BID_CONSERVATIVE,
     DEFAULT_REQUESTED_DATE_RANGE_FOR_REPORTS,
+    MAX_DATA_TIMEFRAME_DAYS,
     MIN_BOOK_REVIEWS,
     BaseServingStatus,
     CampaignRetryStrategy,
@@ -61,6 +72,7 @@ from apps.ads_api.constants import (
     TargetingExpressionPredicateType,
     country_languages,
 )
+from apps.ads_api.entities.amazon_ads.reports import ReportEntity
 from apps.ads_api.entities.amazon_ads.sponsored_products.campaign import (
     Budget,
     CampaignEntity,
@@ -100,11 +112,16 @@ from apps.ads_api.models import (
 )
 from apps.ads_api.repositories.book.book_catalog_repository import BookCatalogRepository
 from apps.ads_api.repositories.book.book_repository import BookRepository
+from apps.ads_api.repositories.campaign_repository import CampaignRepository
 from apps.ads_api.repositories.keywords.keywords_repository import KeywordsRepository
 from apps.ads_api.repositories.profile.profile_server_repository import (
     ProfileServerRepository,
 )
 from apps.ads_api.repositories.profile_repository import ProfileRepository
+from apps.ads_api.repositories.report.report_data_rollup_repository import (
+    ReportDataRollupRepository,
+)
+from apps.ads_api.repositories.report.status_repository import ReportStatusRepository
 from apps.ads_api.repositories.report_data_repository import ReportDataRepository
 from apps.ads_api.repositories.targets.recreate_targets_repository import (
     RecreateTargetsRepository,
@@ -156,8 +173,8 @@ from apps.sp_api.asin_finder import ASINFinder
 from apps.sp_api.book_search import BookSearch
 from apps.sp_api.constants import classificationIds
 from apps.sp_api.credentials import credentials
-from apps.utils.celery_task_locker import CeleryTaskLocker
-from apps.utils.chunks import split
+from apps.utils.celery_task_locker import CeleryTaskLocker, CeleryTaskSemaphore
+from apps.utils.chunks import split_weighted
 
 _logger = logging.getLogger(__name__)
 
@@ -241,7 +258,6 @@ def sp_request_reports(
     managed_profiles_ids: list[int],
     start_date: str,
     end_date: str,
-    seconds_sleep_after_complete: int = None,
 ):
     _logger.info("sp_request_reports is started")
     time_formats = ("%Y-%m-%dT%H:%M:%S.%f", "%Y-%m-%d", "%Y-%m-%dT%H:%M:%S")
@@ -265,9 +281,6 @@ def sp_request_reports(
         service.request()
     else:
         _logger.info("No profile ids were passed")
-    if seconds_sleep_after_complete:
-        _logger.info("All reports are requested. Sleeping for %s", seconds_sleep_after_complete)
-        time.sleep(seconds_sleep_after_complete)
     _logger.info("sp_request_reports is complete")
 
 
@@ -285,6 +298,49 @@ def sp_process_reports():
     _logger.info("sp_process_reports is complete")
 
 
+@app.task(bind=True, max_retries=None)
+def sp_poll_reports(
+    self, managed_profiles_ids: list[int], requested_at: str, on_complete: Optional[dict] = None
+):
+    """
+    Refreshes statuses of pending reports of the profiles once and enqueues downloading of completed ones.
+    The task is retried with a growing countdown instead of sleeping while Amazon generates reports,
+    `on_complete` is applied once all reports of the profiles requested from `requested_at` on are saved
+    or REPORTS_POLL_TIMEOUT is exceeded
+    """
+    requested_at = datetime.fromisoformat(requested_at)
+    pending_reports = list(ReportStatusRepository.retrieve_reports_to_download_iterator(managed_profiles_ids))
+    for report in DownloadReportsService().poll(pending_reports):
+        sp_download_report.delay(report.json())
+
+    # reports requested before the poll timeout are given up, they don't hold new runs
+    profile_ids_in_progress = ReportStatusRepository.get_profile_ids_with_reports_in_progress(
+        managed_profiles_ids, requested_since=requested_at - timedelta(seconds=REPORTS_POLL_TIMEOUT)
+    )
+    if profile_ids_in_progress:
+        if (timezone.now() - requested_at).total_seconds() < REPORTS_POLL_TIMEOUT:
+            _logger.info(
+                "Reports of %s profiles are in progress, pending: %s",
+                len(profile_ids_in_progress),
+                len(pending_reports),
+            )
+            raise self.retry(
+                countdown=min(REPORTS_POLL_INTERVAL_MIN * 2**self.request.retries, REPORTS_POLL_INTERVAL_MAX)
+            )
+        _logger.warning(
+            "Stopped polling, reports of profiles %s are still in progress", sorted(profile_ids_in_progress)
+        )
+
+    _logger.info("sp_poll_reports is complete")
+    if on_complete:
+        maybe_signature(on_complete, app=app).apply_async()
+
+
+@app.task
+def sp_download_report(report: str):
+    DownloadReportsService().download_report(ReportEntity.parse_raw(report))
+
+
 @app.task
 def sp_data_sync_all():
     # Run all reports for all managed profiles for 2 days ago
@@ -312,9 +368,8 @@ def report_chain(profiles_ids: int):
             start_date=start_date,
             end_date=end_date,
             managed_profiles_ids=profiles_ids,
-            seconds_sleep_after_complete=1800,
         )
-        | sp_process_reports.si()
+        | sp_poll_reports.si(managed_profiles_ids=profiles_ids, requested_at=timezone.now().isoformat())
     )
     chain(tasks).apply_async()
     _logger.info("report_chain is complete")
@@ -325,21 +380,56 @@ def transfer_90_days_recent_report_data_to_report_data():
     ReportDataRepository.transfere_90_days_recent_report_data_to_report_data()
 
 
+@app.task
+def refresh_report_data_rollups(backfill_days: Optional[int] = None):
+    """
+    Prunes daily rollups of days older than report data kept in RecentReportData,
+    rebuilds daily rollups of the last `backfill_days` if given
+    """
+    date_to = datetime.today().date()
+    ReportDataRollupRepository.prune(date_to - timedelta(days=MAX_DATA_TIMEFRAME_DAYS))
+    if backfill_days:
+        ReportDataRollupRepository.refresh_all(date_to - timedelta(days=backfill_days), date_to)
+
+
+@app.task(bind=True, max_retries=None)
+def update_sp_bids_status_shard(self, profile_pks: list[int], server_location: ServerLocation):
+    """Updates bids of a shard of profiles, at most SYNC_SP_BIDS_REGION_CONCURRENCY shards of a region at a time"""
+    from apps.ads_api.data_exchange import update_sp_bids_status
+
+    with CeleryTaskSemaphore(
+        name=f"{update_sp_bids_status_shard.__name__}-{server_location}",
+        limit=SYNC_SP_BIDS_REGION_CONCURRENCY,
+        oid=self.request.id or app.oid,
+        lock_expire=SYNC_SP_BIDS_SHARD_TIMEOUT,
+    ) as acquired:
+        if not acquired:
+            raise self.retry(countdown=SYNC_SP_BIDS_RETRY_COUNTDOWN)
+        update_sp_bids_status(profile_pks)
+
+
 @app.task
 def sync_sp_data(server_locations: list[ServerLocation]):
     _logger.info("sync_sp_data is started")
-    from apps.ads_api.data_exchange import (
-        reset_gp_bids,
-        udpate_sp_placements,
-        update_sp_bids_status,
-    )
+    from apps.ads_api.data_exchange import reset_gp_bids, udpate_sp_placements
 
     profile_ids = []
     profile_pks = []
+    bids_update_tasks = []
     for location in server_locations:
         profile_server_repo = ProfileServerRepository(location)
         profile_ids += profile_server_repo.get_profile_ids_list()
-        profile_pks += profile_server_repo.get_primary_keys_list()
+        keywords_count_per_pk = profile_server_repo.get_keywords_count_per_primary_key()
+        profile_pks += keywords_count_per_pk.keys()
+        # profiles with more keywords take longer, shards are balanced by the number of keywords
+        bids_update_tasks += [
+            update_sp_bids_status_shard.si(shard, location)
+            for shard in split_weighted(
+                list(keywords_count_per_pk.keys()),
+                list(keywords_count_per_pk.values()),
+                SYNC_SP_BIDS_SHARDS_PER_REGION,
+            )
+        ]
 
     post_reports_tasks = (
         udpate_sp_placements.si(profile_pks),
@@ -347,26 +437,24 @@ def sync_sp_data(server_locations: list[ServerLocation]):
         # process_sp_queries.si(profile_pks),
     )
 
-    split_pks = list(split(profile_pks, 4))
-
     tasks = (
         sp_request_reports.si(
             start_date=datetime.today() - timedelta(days=DEFAULT_REQUESTED_DATE_RANGE_FOR_REPORTS),
             end_date=datetime.today(),
             managed_profiles_ids=profile_ids,
-            seconds_sleep_after_complete=1800,
         )
         | sp_request_reports.si(
             start_date=datetime.today() - timedelta(days=30),
             end_date=datetime.today() - timedelta(days=30),
             managed_profiles_ids=profile_ids,
         )
-        | sp_process_reports.si()
-        | update_sp_bids_status.si(split_pks[0])
-        | update_sp_bids_status.si(split_pks[1])
-        | update_sp_bids_status.si(split_pks[2])
-        | update_sp_bids_status.si(split_pks[3])
-        | group(post_reports_tasks)
+        | sp_poll_reports.si(
+            managed_profiles_ids=profile_ids,
+            requested_at=timezone.now().isoformat(),
+            # bids are updated once reports of all profiles are saved,
+            # placements and GP bids once bids of all profiles are updated
+            on_complete=chord(bids_update_tasks, group(post_reports_tasks)),
+        )
     )
 
     chain(tasks).apply_async()
@@ -887,28 +975,42 @@ class RetryServiceForCampaignsWithInvalidStatus:
         _logger.info("Campaigns creation_retries_count increased for %s campaigns", updated_count)
 
     def _retrieve_invalid_campaigns(self, profile: Profile):
-        return Campaign.objects.filter(
-            Q(serving_status__in=self.campaign_serving_statuses_to_retry)
-            | Q(product_ads__serving_status__in=self.product_ad_serving_statuses_to_retry),
-            creation_retries_count__lt=5,
-            state=SpState.ENABLED.value,
-            profile=profile,
-        ).values(
-            "campaign_id_amazon",
-            "campaign_name",
-            "serving_status",
-            "campaign_purpose",
-            "bidding_strategy",
-            "placement_tos_mult",
-            "placement_pp_mult",
-            "id",
-            "ad_groups__default_bid",
-            "ad_groups__ad_group_id",
-            "product_ads__product_ad_id",
-            "product_ads__serving_status",
-            "product_ads__asin",
-            "profile__country_code",
-            "books",
+        campaigns_to_retry = CampaignRepository.annotate_ads_serving_status_counts(
+            Campaign.objects.filter(
+                creation_retries_count__lt=5,
+                state=SpState.ENABLED.value,
+                profile=profile,
+            ),
+            product_ad_statuses=self.product_ad_serving_statuses_to_retry,
+        ).filter(
+            Q(serving_status__in=self.campaign_serving_statuses_to_retry) | Q(product_ads_in_statuses__gt=0)
+        )
+        # a single row per campaign, with its product ad to retry first, so campaigns are recreated once
+        product_ad_to_retry_first = Case(
+            When(product_ads__serving_status__in=self.product_ad_serving_statuses_to_retry, then=Value(0)),
+            default=Value(1),
+        )
+        return (
+            Campaign.objects.filter(id__in=campaigns_to_retry.values("id"))
+            .order_by("id", product_ad_to_retry_first, "ad_groups__id", "product_ads__id")
+            .distinct("id")
+            .values(
+                "campaign_id_amazon",
+                "campaign_name",
+                "serving_status",
+                "campaign_purpose",
+                "bidding_strategy",
+                "placement_tos_mult",
+                "placement_pp_mult",
+                "id",
+                "ad_groups__default_bid",
+                "ad_groups__ad_group_id",
+                "product_ads__product_ad_id",
+                "product_ads__serving_status",
+                "product_ads__asin",
+                "profile__country_code",
+                "books",
+            )
         )
 
     def _resolve_retry_strategy(self, campaign: dict) -> CampaignRetryStrategy:
@@ -32,6 +32,36 @@ class CeleryTaskLocker:
             cache.delete(self._lock_id)
 
 
+class CeleryTaskSemaphore:
+    """
+    Allows at most `limit` holders of `name` at a time across workers.
+    Each holder takes one of the `limit` slot locks, the slot expires after `lock_expire` seconds.
+    """
+
+    def __init__(self, name: str, limit: int, oid: str, lock_expire: int = 10 * 60):
+        self._name = name
+        self._limit = limit
+        self._oid = oid
+        self._lock_expire = lock_expire
+        self._slot_id = None
+        self._timeout_at = None
+
+    def __enter__(self):
+        self._timeout_at = time.monotonic() + self._lock_expire - 3
+        for slot in range(self._limit):
+            slot_id = f"{self._name}-slot-{slot}"
+            # cache.add fails if the key already exists
+            if cache.add(slot_id, self._oid, self._lock_expire):
+                self._slot_id = slot_id
+                return True
+        return False
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        # don't release an expired slot, it could be taken by someone else already
+        if self._slot_id and time.monotonic() < self._timeout_at:
+            cache.delete(self._slot_id)
+
+
 
 
 
@@ -1,3 +1,7 @@
+import heapq
+from itertools import islice
+
+
 def split(lst, n):
     """
     Splits a list into n roughly equal-sized sublists.
@@ -13,6 +17,27 @@ def split(lst, n):
     return (lst[i * k + min(i, m):(i + 1) * k + min(i + 1, m)] for i in range(n))
 
 
+def split_weighted(items, weights, n):
+    """
+    Splits items into at most n sublists with roughly equal total weight.
+    The heaviest items are placed first, each into the currently lightest sublist.
+
+    Args:
+        items (list): The items to be split.
+        weights (list): The weight of each item.
+        n (int): The maximum number of sublists.
+
+    Returns:
+        list: Non-empty sublists, the heaviest first.
+    """
+    shards = [(0, i, []) for i in range(min(n, len(items)))]
+    for weight, item in sorted(zip(weights, items), key=lambda pair: pair[0], reverse=True):
+        total, i, shard = heapq.heappop(shards)
+        shard.append(item)
+        heapq.heappush(shards, (total + weight, i, shard))
+    return [shard for _, _, shard in sorted(shards, key=lambda entry: entry[0], reverse=True)]
+
+
 def chunker(seq, size):
     """
     Splits a sequence into chunks of a given size.
@@ -26,3 +51,19 @@ def chunker(seq, size):
     """
     seq = list(seq)
     return (seq[pos: pos + size] for pos in range(0, len(seq), size))
+
+
+def ichunker(iterable, size):
+    """
+    Lazily splits an iterable into chunks of a given size without materializing it.
+
+    Args:
+        iterable (iterable): The iterable to be chunked.
+        size (int): The size of each chunk.
+
+    Returns:
+        generator: A generator of lists with up to size items each.
+    """
+    iterator = iter(iterable)
+    while chunk := list(islice(iterator, size)):
+        yield chunk
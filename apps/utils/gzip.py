@@ -1,12 +1,17 @@
+import codecs
 import gzip
 import io
 import json
 import logging
+import zlib
+from typing import Any, Iterable, Iterator
 
 from requests import Response
 
 _logger = logging.getLogger(__name__)
 
+GZIP_MAGIC_NUMBER = b"\x1f\x8b"
+
 
 class GzipExtracter:
     def __init__(self, response: Response):
@@ -20,3 +25,102 @@ class GzipExtracter:
                 report_content = compressed_report.read()
                 report_content_array = json.loads(report_content)
         return report_content_array
+
+
+class JsonArrayStreamParser:
+    """
+    Incremental parser of a top level JSON array, items are returned as soon as they are complete,
+    so only the current item is kept in memory
+    """
+
+    def __init__(self):
+        self._decoder = json.JSONDecoder()
+        self._buffer = ""
+        self._position = 0
+        self._started = False
+        self._finished = False
+        self._expect_item = True
+
+    def feed(self, text: str) -> Iterator[Any]:
+        self._buffer = self._buffer[self._position :] + text
+        self._position = 0
+        yield from self._parse(final=False)
+
+    def close(self) -> Iterator[Any]:
+        yield from self._parse(final=True)
+        self._skip_whitespaces()
+        if not self._finished or self._position < len(self._buffer):
+            raise json.JSONDecodeError("Unexpected end of JSON array", self._buffer, self._position)
+
+    def _parse(self, final: bool) -> Iterator[Any]:
+        while not self._finished:
+            self._skip_whitespaces()
+            if self._position >= len(self._buffer):
+                return
+
+            char = self._buffer[self._position]
+            if not self._started:
+                if char != "[":
+                    raise json.JSONDecodeError("Expected JSON array", self._buffer, self._position)
+                self._started = True
+                self._position += 1
+            elif char == "]":
+                self._finished = True
+                self._position += 1
+            elif not self._expect_item:
+                if char != ",":
+                    raise json.JSONDecodeError("Expected ',' delimiter", self._buffer, self._position)
+                self._expect_item = True
+                self._position += 1
+            else:
+                try:
+                    item, end = self._decoder.raw_decode(self._buffer, self._position)
+                except json.JSONDecodeError:
+                    if final:
+                        raise
+                    return
+                if end == len(self._buffer) and not final:
+                    # scalar items like numbers could continue in the next chunk
+                    return
+                self._position = end
+                self._expect_item = False
+                yield item
+
+    def _skip_whitespaces(self):
+        while self._position < len(self._buffer) and self._buffer[self._position] in " \t\n\r":
+            self._position += 1
+
+
+class GzipJsonArrayStream:
+    """
+    Iterates over items of a (optionally gzipped) JSON array received in chunks of bytes,
+    decompressing and parsing it incrementally
+    """
+
+    def __init__(self, chunks: Iterable[bytes]):
+        self._chunks = chunks
+
+    @classmethod
+    def from_response(cls, response: Response, chunk_size: int = 64 * 1024) -> "GzipJsonArrayStream":
+        return cls(response.iter_content(chunk_size=chunk_size))
+
+    def __iter__(self) -> Iterator[Any]:
+        parser = JsonArrayStreamParser()
+        text_decoder = codecs.getincrementaldecoder("utf-8")()
+        decompressor = None
+        head = b""
+        for chunk in self._chunks:
+            if decompressor is None:
+                # wait for enough bytes to check whether the content is gzipped
+                head += chunk
+                if len(head) < len(GZIP_MAGIC_NUMBER):
+                    continue
+                chunk, head = head, b""
+                is_gzipped = chunk.startswith(GZIP_MAGIC_NUMBER)
+                decompressor = zlib.decompressobj(16 + zlib.MAX_WBITS) if is_gzipped else False
+            data = decompressor.decompress(chunk) if decompressor else chunk
+            yield from parser.feed(text_decoder.decode(data))
+
+        tail = decompressor.flush() if decompressor else head
+        yield from parser.feed(text_decoder.decode(tail, final=True))
+        yield from parser.close()
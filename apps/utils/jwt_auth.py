@@ -1,12 +1,20 @@
-import datetime
+import logging
+import os
+import threading
+import time
 
 from functools import wraps
 
+from adsdroid.settings import AUTH_TOKEN_REFRESH_LOCK_TIMEOUT, AUTH_TOKEN_REFRESH_POLL_INTERVAL
 from apps.ads_api.entities.internal.token import Token
-from apps.ads_api.exceptions.auth.token import TokenNotFoundException, TokenExpiredException
+from apps.ads_api.exceptions.auth.token import AuthFailed, TokenNotFoundException, TokenExpiredException
 from apps.ads_api.interfaces.auth.jwt_auth_interface import JWTAuthInterface
 from apps.ads_api.interfaces.auth.token_id_interface import TokenIdInterface
 from apps.ads_api.mixins.auth.jwt_storable_mixin import JWTStorableMixin
+from apps.utils.celery_task_locker import memcache_lock
+from apps.utils.token_holder import TokenHolder
+
+_logger = logging.getLogger(__name__)
 
 
 class JWTAuth(JWTStorableMixin):
@@ -15,9 +23,6 @@ class JWTAuth(JWTStorableMixin):
         def refresh_token_wrapper(decorated):
             @wraps(decorated)
             def wrapper(adapter_instance, *args, **kwargs):
-                authenticator = adapter_instance.authenticator
-                if not isinstance(authenticator, JWTAuthInterface):
-                    raise NotImplementedError("Authenticator class does not implement JWTAuthInterface")
                 if not isinstance(adapter_instance, TokenIdInterface):
                     raise NotImplementedError(
                         f"The TokenIdInterface interface is not implemented in the adapter class {adapter_instance}"
@@ -25,20 +30,17 @@ class JWTAuth(JWTStorableMixin):
 
                 token_id = adapter_instance.token_id
 
-                try:
-                    cls.check_token_expired(token_id)
-                except TokenNotFoundException:
-                    access_token, refresh_token, exp_time = authenticator.get_access_token()
-                    cls.store_access_token(token_id, access_token, exp_time)
-                    cls.store_refresh_token(token_id, access_token, exp_time + 100_000)
-                except TokenExpiredException:
-                    access_token, refresh_token, exp_time = authenticator.refresh_access_token()
-                    cls.store_access_token(token_id, access_token, exp_time)
-                    cls.store_refresh_token(token_id, access_token, exp_time + 100_000)
-
-                access_token = cls.get_access_token(token_id)
+                access_token = TokenHolder.get(token_id)
+                if access_token is None:
+                    access_token = cls._get_shared_access_token(token_id, adapter_instance)
+                    TokenHolder.keep(token_id, access_token)
 
-                return decorated(adapter_instance, access_token=access_token, *args, **kwargs)
+                try:
+                    return decorated(adapter_instance, access_token=access_token, *args, **kwargs)
+                except AuthFailed:
+                    # the token could be revoked, the retry takes it from the cache or refreshes it again
+                    TokenHolder.forget(token_id)
+                    raise
 
             return wrapper
 
@@ -57,4 +59,57 @@ class JWTAuth(JWTStorableMixin):
 
     @classmethod
     def _expired(cls, token: Token):
-        return token.expired < datetime.datetime.now().timestamp()
+        return not TokenHolder.is_fresh(token)
+
+    @classmethod
+    def _get_shared_access_token(cls, token_id: str, adapter_instance) -> Token:
+        """
+        Returns the access token from the cache. If it's missing or about to expire, only one worker
+        gets a new one, others wait for it to appear in the cache.
+        """
+        try:
+            cls.check_token_expired(token_id)
+        except AuthFailed:
+            pass
+        else:
+            TokenHolder.count("cache_hits")
+            return cls.get_access_token(token_id)
+
+        authenticator = adapter_instance.authenticator
+        if not isinstance(authenticator, JWTAuthInterface):
+            raise NotImplementedError("Authenticator class does not implement JWTAuthInterface")
+
+        lock_id = f"refresh_lock_{token_id}"
+        lock_owner = f"{os.getpid()}-{threading.get_ident()}"
+        while True:
+            with memcache_lock(lock_id, lock_owner, expire=AUTH_TOKEN_REFRESH_LOCK_TIMEOUT) as acquired:
+                if acquired:
+                    return cls._obtain_access_token(token_id, authenticator)
+            TokenHolder.count("refresh_waits")
+            # the lock expires if its owner didn't manage to refresh the token
+            time.sleep(AUTH_TOKEN_REFRESH_POLL_INTERVAL)
+            try:
+                cls.check_token_expired(token_id)
+            except AuthFailed:
+                continue
+            TokenHolder.count("cache_hits")
+            return cls.get_access_token(token_id)
+
+    @classmethod
+    def _obtain_access_token(cls, token_id: str, authenticator: JWTAuthInterface) -> Token:
+        """Gets a new access token from the authenticator unless it was just refreshed by another worker"""
+        try:
+            cls.check_token_expired(token_id)
+        except TokenNotFoundException:
+            access_token, refresh_token, exp_time = authenticator.get_access_token()
+        except TokenExpiredException:
+            access_token, refresh_token, exp_time = authenticator.refresh_access_token()
+        else:
+            TokenHolder.count("cache_hits")
+            return cls.get_access_token(token_id)
+
+        TokenHolder.count("refreshes")
+        _logger.info("Access token %s refreshed", token_id)
+        cls.store_access_token(token_id, access_token, exp_time)
+        cls.store_refresh_token(token_id, refresh_token, exp_time + 100_000)
+        return Token(value=access_token, expired=exp_time)
@@ -0,0 +1,58 @@
+import datetime
+import threading
+from collections import Counter
+from typing import Optional
+
+from adsdroid.settings import AUTH_TOKEN_REFRESH_MARGIN
+from apps.ads_api.entities.internal.token import Token
+
+
+class TokenHolder:
+    """
+    Process wide in-memory copy of access tokens stored in the cache.
+    Tokens are handed out until AUTH_TOKEN_REFRESH_MARGIN seconds before they expire.
+    """
+
+    _tokens: dict[str, Token] = {}
+    _stats: Counter = Counter()
+    _lock = threading.Lock()
+
+    @classmethod
+    def get(cls, token_id: str) -> Optional[Token]:
+        with cls._lock:
+            token = cls._tokens.get(token_id)
+            if token is None or not cls.is_fresh(token):
+                return None
+            cls._stats["memory_hits"] += 1
+        return token
+
+    @classmethod
+    def keep(cls, token_id: str, token: Token):
+        with cls._lock:
+            cls._tokens[token_id] = token
+
+    @classmethod
+    def forget(cls, token_id: str):
+        with cls._lock:
+            cls._tokens.pop(token_id, None)
+
+    @classmethod
+    def count(cls, event: str):
+        """Counts events of getting tokens, e.g. "cache_hits" or "refreshes" """
+        with cls._lock:
+            cls._stats[event] += 1
+
+    @classmethod
+    def get_stats(cls) -> dict[str, int]:
+        with cls._lock:
+            return dict(cls._stats)
+
+    @classmethod
+    def reset(cls):
+        with cls._lock:
+            cls._tokens = {}
+            cls._stats = Counter()
+
+    @staticmethod
+    def is_fresh(token: Token) -> bool:
+        return token.expired - AUTH_TOKEN_REFRESH_MARGIN > datetime.datetime.now().timestamp()
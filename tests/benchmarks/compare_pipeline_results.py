@@ -0,0 +1,39 @@
+"""
+Compares results of two runs of the nightly pipeline benchmark, see test_nightly_pipeline.py.
+Run with: python tests/benchmarks/compare_pipeline_results.py <before>.json <after>.json
+"""
+import json
+import sys
+
+METRICS = ("seconds", "queries", "peak_rss_mib")
+
+
+def _change(before: float, after: float) -> str:
+    if not before:
+        return "" if not after else "new"
+    return f"{(after - before) / before:+.0%}"
+
+
+def compare(before: dict, after: dict) -> list[str]:
+    lines = [
+        f"tier {before['tier']}: {before['commit']} -> {after['commit']}",
+        f"{'stage':<24}" + "".join(f"{metric:>30}" for metric in METRICS),
+    ]
+    if before["size"] != after["size"]:
+        lines.insert(1, f"sizes differ: {before['size']} -> {after['size']}")
+    for stage in dict.fromkeys([*before["stages"], *after["stages"]]):
+        before_stage = before["stages"].get(stage, {})
+        after_stage = after["stages"].get(stage, {})
+        line = f"{stage:<24}"
+        for metric in METRICS:
+            before_value, after_value = before_stage.get(metric, 0), after_stage.get(metric, 0)
+            line += f"{f'{before_value} -> {after_value} {_change(before_value, after_value)}':>30}"
+        lines.append(line)
+    return lines
+
+
+if __name__ == "__main__":
+    if len(sys.argv) != 3:
+        sys.exit(__doc__)
+    with open(sys.argv[1]) as before_file, open(sys.argv[2]) as after_file:
+        print("\n".join(compare(json.load(before_file), json.load(after_file))))
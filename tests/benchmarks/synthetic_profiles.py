@@ -0,0 +1,236 @@
+"""
+Synthetic managed profiles for benchmarks of the nightly pipeline.
+
+Entities of the profiles are served by the Ads API simulator and synced into the DB with the sync tasks,
+then the DB is filled with what earlier nightly runs would have left: MAX_DATA_TIMEFRAME_DAYS days
+of RecentReportData and its rollups, books of the campaigns and their daily prices.
+"""
+import datetime
+import json
+import random
+from dataclasses import dataclass
+from decimal import Decimal
+from typing import Iterable
+
+from requests import Response
+
+from apps.ads_api.constants import (
+    DEFAULT_BE_ACOS_KINDLE,
+    MAX_DATA_TIMEFRAME_DAYS,
+    SP_REPORT_TYPES,
+    AdStatus,
+    ServerLocation,
+    SpEndpoint,
+)
+from apps.ads_api.data_exchange import sync_keywords
+from apps.ads_api.entities.amazon_ads.reports import ReportEntity
+from apps.ads_api.factories.report_payload_factory import ReportPayloadFactory
+from apps.ads_api.models import Book, Campaign, DateBookPrice, Profile, ProductAd, RecentReportData
+from apps.ads_api.repositories.report.recent_report_data_bulk_repository import (
+    COLUMNS,
+    RecentReportDataBulkRepository,
+)
+from apps.ads_api.repositories.report.report_data_rollup_repository import ReportDataRollupRepository
+from apps.ads_api.services.amazon.reports.download_from_amazon_service import DownloadReportService
+from apps.ads_api.simulator.fixtures import SP_ENDPOINTS, SimulatorFixtures
+from apps.ads_api.simulator.reports import SimulatedReport
+from apps.ads_api.tasks import sync_ad_groups, sync_campaigns, sync_product_ads
+
+_CAMPAIGN_ID = COLUMNS.index("campaign_id")
+
+
+@dataclass(frozen=True)
+class ProfilesTier:
+    name: str
+    profiles: int
+    # per profile
+    campaigns: int
+    keywords_per_campaign: int
+    targets_per_campaign: int
+    campaigns_per_book: int = 4
+    # share of entities with impressions on a day, only they have rows in reports
+    active_share: float = 0.25
+    # share of entities updated on Amazon between nightly runs
+    changed_share: float = 0.1
+
+    def as_dict(self) -> dict:
+        return {
+            "profiles": self.profiles,
+            "campaigns": self.profiles * self.campaigns,
+            "keywords": self.profiles * self.campaigns // 2 * self.keywords_per_campaign,
+            "targets": self.profiles * (self.campaigns - self.campaigns // 2) * self.targets_per_campaign,
+            "report_days": MAX_DATA_TIMEFRAME_DAYS,
+        }
+
+
+# a small account, a typical one and the largest ones, ~50k, ~500k and ~2.5M rows of report data
+TIERS = {
+    "small": ProfilesTier(
+        "small", profiles=1, campaigns=50, keywords_per_campaign=20, targets_per_campaign=10
+    ),
+    "medium": ProfilesTier(
+        "medium", profiles=3, campaigns=200, keywords_per_campaign=20, targets_per_campaign=10
+    ),
+    "large": ProfilesTier(
+        "large",
+        profiles=6,
+        campaigns=500,
+        keywords_per_campaign=30,
+        targets_per_campaign=12,
+        active_share=0.2,
+    ),
+}
+
+
+def generate_fixtures(tier: ProfilesTier, seed: int = 0) -> SimulatorFixtures:
+    """Amazon side of the profiles, see SimulatorFixtures.generate"""
+    return SimulatorFixtures.generate(
+        range(1, tier.profiles + 1),
+        campaigns=tier.campaigns,
+        keywords_per_campaign=tier.keywords_per_campaign,
+        targets_per_campaign=tier.targets_per_campaign,
+        campaigns_per_book=tier.campaigns_per_book,
+        seed=seed,
+    )
+
+
+def create_profiles(fixtures: SimulatorFixtures, tier: ProfilesTier, seed: int = 0) -> list[int]:
+    """
+    Creates managed profiles of the fixtures and everything earlier nightly runs left in the DB,
+    adapters have to be pointed at a simulator serving the fixtures. Returns primary keys of the profiles
+    """
+    rng = random.Random(seed)
+    profiles = [
+        Profile.objects.create(
+            profile_id=profile_id,
+            entity_id=f"ENTITY{profile_id}",
+            nickname=f"{tier.name}-{profile_id}",
+            managed=True,
+            profile_server=ServerLocation.NORTH_AMERICA,
+        )
+        for profile_id in fixtures.profiles
+    ]
+    profile_pks = [profile.pk for profile in profiles]
+    sync_campaigns(profile_pks)
+    sync_ad_groups(profile_pks)
+    sync_product_ads(profile_pks)
+    _manage_campaigns(profiles, rng)
+    for endpoint in (SpEndpoint.KEYWORDS, SpEndpoint.TARGETS):
+        sync_keywords(endpoint=endpoint, profile_ids=profile_pks)
+
+    date_to = datetime.date.today() - datetime.timedelta(days=1)
+    date_from = date_to - datetime.timedelta(days=MAX_DATA_TIMEFRAME_DAYS - 1)
+    for profile in profiles:
+        _create_report_data(fixtures, profile, date_from, date_to, tier.active_share, rng)
+    ReportDataRollupRepository.refresh_all(date_from, date_to)
+    _create_book_prices(profile_pks, date_from, date_to, rng)
+    return profile_pks
+
+
+def change_entities(fixtures: SimulatorFixtures, share: float, seed: int = 0):
+    """Changes bids, budgets and states of a share of entities on Amazon, as advertisers do between runs"""
+    rng = random.Random(seed)
+    last_update = datetime.datetime.now(datetime.timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ")
+    for profile_id in fixtures.profiles:
+        for endpoint in SP_ENDPOINTS:
+            for entity in fixtures.entities(profile_id, endpoint):
+                if rng.random() >= share:
+                    continue
+                if "bid" in entity:
+                    entity["bid"] = round(rng.uniform(0.2, 1.5), 2)
+                elif "budget" in entity:
+                    entity["budget"]["budget"] = float(rng.choice((5, 10, 20)))
+                elif "defaultBid" in entity:
+                    entity["defaultBid"] = round(rng.uniform(0.2, 1.5), 2)
+                else:
+                    entity["state"] = rng.choice(("ENABLED", "PAUSED"))
+                entity["extendedData"]["lastUpdateDateTime"] = last_update
+
+
+def count_rows() -> dict:
+    return {
+        "report_rows": RecentReportData.objects.count(),
+        "book_prices": DateBookPrice.objects.count(),
+    }
+
+
+def _manage_campaigns(profiles: Iterable[Profile], rng: random.Random):
+    """Campaigns are managed and advertise a book each, books have several campaigns"""
+    campaigns = {campaign.pk: campaign for campaign in Campaign.objects.filter(profile__in=profiles)}
+    campaign_pks_per_book = {}
+    for campaign_pk, asin, profile_pk in ProductAd.objects.filter(
+        campaign_id__in=campaigns.keys()
+    ).values_list("campaign_id", "asin", "campaign__profile_id"):
+        campaigns[campaign_pk].managed = True
+        campaigns[campaign_pk].asins = [asin]
+        campaign_pks_per_book.setdefault((profile_pk, asin), []).append(campaign_pk)
+    Campaign.objects.bulk_update(campaigns.values(), ["managed", "asins"], batch_size=1000)
+
+    books = Book.objects.bulk_create(
+        Book(
+            profile_id=profile_pk,
+            asin=asin,
+            title=f"Synthetic Book {asin}: A Benchmark Story",
+            format="Kindle",
+            price=Decimal(rng.choice(("2.99", "3.99", "4.99"))),
+            be_acos=Decimal(str(DEFAULT_BE_ACOS_KINDLE)),
+            reviews=rng.randrange(0, 500),
+            managed=True,
+        )
+        for profile_pk, asin in campaign_pks_per_book
+    )
+    Book.campaigns.through.objects.bulk_create(
+        Book.campaigns.through(book_id=book.pk, campaign_id=campaign_pk)
+        for book in books
+        for campaign_pk in campaign_pks_per_book[(book.profile_id, book.asin)]
+    )
+
+
+def _create_report_data(
+    fixtures: SimulatorFixtures,
+    profile: Profile,
+    date_from: datetime.date,
+    date_to: datetime.date,
+    active_share: float,
+    rng: random.Random,
+):
+    """Saves report data of all report types as the nightly runs would have saved it from simulated reports"""
+    campaign_pks = dict(Campaign.objects.filter(profile=profile).values_list("campaign_id_amazon", "pk"))
+    download_service = DownloadReportService()
+    for report_type in SP_REPORT_TYPES:
+        request = ReportPayloadFactory(
+            report_type=report_type,
+            ad_status_filter=list(AdStatus.__members__.values()),
+            start_date=date_from,
+            end_date=date_to,
+        )
+        request = json.loads(json.dumps(request.create_payload().as_dict(), default=str))
+        report_file = SimulatedReport(
+            fixtures, profile.profile_id, request, seed=rng.randrange(2**32), active_share=active_share
+        ).to_gzip_json()
+        report = ReportEntity(report_id=f"synthetic-{report_type}", report_type=report_type)
+        for batch in download_service.parse_batches(report, _response(report_file)):
+            for row in batch:
+                row[_CAMPAIGN_ID] = campaign_pks[row[_CAMPAIGN_ID]]
+            RecentReportDataBulkRepository.upsert_rows(batch, recalculate_sales=False)
+
+
+def _create_book_prices(profile_pks: list[int], date_from: datetime.date, date_to: datetime.date, rng):
+    """Daily prices of the books, a price changes about once a month"""
+    prices = []
+    for book_pk, price in Book.objects.filter(profile_id__in=profile_pks).values_list("pk", "price"):
+        day = date_from
+        while day <= date_to:
+            if rng.random() < 1 / 30:
+                price = Decimal(rng.choice(("0.99", "2.99", "3.99", "4.99")))
+            prices.append(DateBookPrice(book_id=book_pk, date=day, price=price))
+            day += datetime.timedelta(days=1)
+    DateBookPrice.objects.bulk_create(prices, batch_size=5000)
+
+
+def _response(content: bytes) -> Response:
+    response = Response()
+    response.status_code = 200
+    response._content = content
+    response._content_consumed = True
+    return response
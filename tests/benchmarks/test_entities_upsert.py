@@ -0,0 +1,65 @@
+"""
+Benchmark of saving synced ad groups one by one and in bulk.
+Run with: RUN_BENCHMARKS=1 BENCHMARK_AD_GROUPS=5000 pytest -s tests/benchmarks/test_entities_upsert.py
+"""
+import os
+import time
+
+import pytest
+
+from apps.ads_api.constants import SpState
+from apps.ads_api.models import AdGroup, Campaign
+from apps.ads_api.repositories.amazon_entities_bulk_repository import AdGroupsBulkRepository
+
+AD_GROUPS = int(os.environ.get("BENCHMARK_AD_GROUPS", 5000))
+
+pytestmark = pytest.mark.skipif(not os.environ.get("RUN_BENCHMARKS"), reason="benchmarks are run on demand")
+
+
+def _ad_groups(campaigns: list[Campaign], bid: float) -> list[AdGroup]:
+    return [
+        AdGroup(
+            campaign=campaigns[i % len(campaigns)],
+            ad_group_id=i,
+            ad_group_name=f"ad group {i}",
+            state=SpState.ENABLED.value,
+            serving_status="AD_GROUP_STATUS_ENABLED",
+            last_updated_date_on_amazon=i,
+            # a tenth of the ad groups changed since the previous sync
+            default_bid=bid if i % 10 == 0 else 0.45,
+        )
+        for i in range(1, AD_GROUPS + 1)
+    ]
+
+
+def _update_or_create(ad_groups: list[AdGroup]):
+    for ad_group in ad_groups:
+        AdGroup.objects.update_or_create(
+            campaign_id=ad_group.campaign_id,
+            ad_group_id=ad_group.ad_group_id,
+            defaults={field: getattr(ad_group, field) for field in AdGroupsBulkRepository.update_fields},
+        )
+
+
+def _timed(func):
+    started_at = time.perf_counter()
+    result = func()
+    return result, time.perf_counter() - started_at
+
+
+@pytest.mark.django_db
+def test_ad_groups_are_upserted_faster_in_bulk():
+    campaigns = Campaign.objects.bulk_create(Campaign(campaign_id_amazon=i) for i in range(1, 101))
+
+    _, first_sync_seconds = _timed(lambda: _update_or_create(_ad_groups(campaigns, bid=0.45)))
+    _, one_by_one_seconds = _timed(lambda: _update_or_create(_ad_groups(campaigns, bid=0.5)))
+    counts, bulk_seconds = _timed(lambda: AdGroupsBulkRepository.upsert(_ad_groups(campaigns, bid=0.6)))
+
+    print(
+        f"\n{AD_GROUPS} ad groups\n"
+        f"created one by one:   {first_sync_seconds:.3f}s\n"
+        f"updated one by one:   {one_by_one_seconds:.3f}s\n"
+        f"upserted in bulk:     {bulk_seconds:.3f}s ({counts})"
+    )
+    assert counts.updated == AD_GROUPS // 10
+    assert bulk_seconds < one_by_one_seconds
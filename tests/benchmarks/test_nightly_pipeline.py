@@ -0,0 +1,244 @@
+"""
+End-to-end benchmark of the nightly pipeline on synthetic profiles served by the Ads API simulator.
+Stages of sync_sp_data and the entity syncs are run one after another like the chained tasks run them,
+each one is timed, its SQL queries are counted and peak RSS of the process is sampled while it runs.
+Results are written as JSON to BENCHMARK_RESULTS_DIR, compare them between commits with
+python tests/benchmarks/compare_pipeline_results.py <before>.json <after>.json
+
+Run with: RUN_BENCHMARKS=1 BENCHMARK_PIPELINE_TIERS=small,medium pytest -s tests/benchmarks/test_nightly_pipeline.py
+BENCHMARK_API_LATENCY delays every simulated Ads API response by the given seconds.
+"""
+import datetime
+import json
+import os
+import subprocess
+import threading
+import time
+from pathlib import Path
+
+import mock
+import pytest
+from django.db import connection
+from django.db.backends.signals import connection_created
+from django.test import override_settings
+from django.utils import timezone
+
+from apps.ads_api.adapters.amazon_ads.rate_limiter import AmazonAdsRateLimiter
+from apps.ads_api.authenticators.amazon_ads_authentificator import AmazonAuthenticator
+from apps.ads_api.constants import (
+    DEFAULT_REQUESTED_DATE_RANGE_FOR_REPORTS,
+    AuthURL,
+    BaseURL,
+    ServerLocation,
+    SpEndpoint,
+)
+from apps.ads_api.data_exchange import (
+    deduplicate_targets,
+    reset_gp_bids,
+    sync_keywords,
+    udpate_sp_placements,
+    update_sp_bids_status,
+)
+from apps.ads_api.entities.internal.token import Token
+from apps.ads_api.models import Profile
+from apps.ads_api.repositories.report.status_repository import ReportStatusRepository
+from apps.ads_api.services.reports.download_reports_service import DownloadReportsService
+from apps.ads_api.simulator.server import AdsApiSimulator, SimulatorConfig
+from apps.ads_api.tasks import sp_request_reports, sync_ad_groups, sync_campaigns, sync_product_ads
+from apps.utils.token_holder import TokenHolder
+from tests.benchmarks.synthetic_profiles import (
+    TIERS,
+    change_entities,
+    count_rows,
+    create_profiles,
+    generate_fixtures,
+)
+
+PIPELINE_TIERS = os.environ.get("BENCHMARK_PIPELINE_TIERS", "small").split(",")
+RESULTS_DIR = Path(os.environ.get("BENCHMARK_RESULTS_DIR", "benchmark-results"))
+API_LATENCY = float(os.environ.get("BENCHMARK_API_LATENCY", 0))
+LOCAL_CACHE = {"default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"}}
+RSS_SAMPLE_INTERVAL = 0.02
+REPORTS_TIMEOUT = 600
+
+pytestmark = pytest.mark.skipif(not os.environ.get("RUN_BENCHMARKS"), reason="benchmarks are run on demand")
+
+
+def _current_rss() -> int:
+    with open("/proc/self/statm") as statm:
+        return int(statm.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+
+
+class _StageMeter:
+    """
+    Counts SQL queries of the stage in all threads, connections opened while it runs are counted as well,
+    and samples RSS of the process in a background thread
+    """
+
+    def __init__(self):
+        self.queries = 0
+        self.peak_rss = 0
+        self._lock = threading.Lock()
+        self._stopped = threading.Event()
+        self._sampler = threading.Thread(target=self._sample_rss, daemon=True)
+
+    def __call__(self, execute, sql, params, many, context):
+        with self._lock:
+            self.queries += 1
+        return execute(sql, params, many, context)
+
+    def __enter__(self) -> "_StageMeter":
+        connection.execute_wrappers.append(self)
+        connection_created.connect(self._count_queries_of)
+        self._sampler.start()
+        return self
+
+    def __exit__(self, *exc_info):
+        self._stopped.set()
+        self._sampler.join()
+        connection_created.disconnect(self._count_queries_of)
+        connection.execute_wrappers.remove(self)
+
+    def _count_queries_of(self, sender, connection, **kwargs):
+        connection.execute_wrappers.append(self)
+
+    def _sample_rss(self):
+        while True:
+            self.peak_rss = max(self.peak_rss, _current_rss())
+            if self._stopped.wait(RSS_SAMPLE_INTERVAL):
+                return
+
+
+def _save_reports_data(profile_ids: list[int]):
+    """sp_poll_reports and the sp_download_report tasks it enqueues"""
+    service = DownloadReportsService()
+    deadline = time.monotonic() + REPORTS_TIMEOUT
+    while time.monotonic() < deadline:
+        pending = list(ReportStatusRepository.retrieve_reports_to_download_iterator(profile_ids))
+        if not pending:
+            return
+        for report in service.poll(pending):
+            service.download_report(report)
+    raise TimeoutError(f"Reports weren't downloaded in {REPORTS_TIMEOUT} seconds")
+
+
+def _request_reports(profile_ids: list[int]):
+    """Report requests chained by sync_sp_data"""
+    today = datetime.datetime.today()
+    sp_request_reports(
+        managed_profiles_ids=profile_ids,
+        start_date=(today - datetime.timedelta(days=DEFAULT_REQUESTED_DATE_RANGE_FOR_REPORTS)).isoformat(),
+        end_date=today.isoformat(),
+    )
+    sp_request_reports(
+        managed_profiles_ids=profile_ids,
+        start_date=(today - datetime.timedelta(days=30)).isoformat(),
+        end_date=(today - datetime.timedelta(days=30)).isoformat(),
+    )
+
+
+def _sync_keywords(profile_pks: list[int]):
+    # negative keywords and targets aren't simulated
+    for endpoint in (SpEndpoint.KEYWORDS, SpEndpoint.TARGETS):
+        sync_keywords(endpoint=endpoint, profile_ids=profile_pks)
+
+
+# stage name -> function of profile primary keys and Amazon profile ids, in the order of a nightly run
+STAGES = (
+    ("sync_campaigns", lambda pks, ids: sync_campaigns(pks)),
+    ("sync_ad_groups", lambda pks, ids: sync_ad_groups(pks)),
+    ("sync_product_ads", lambda pks, ids: sync_product_ads(pks)),
+    ("sync_keywords", lambda pks, ids: _sync_keywords(pks)),
+    ("request_reports", lambda pks, ids: _request_reports(ids)),
+    ("save_reports_data", lambda pks, ids: _save_reports_data(ids)),
+    ("update_sp_bids_status", lambda pks, ids: update_sp_bids_status(pks)),
+    ("update_sp_placements", lambda pks, ids: udpate_sp_placements(pks)),
+    ("reset_gp_bids", lambda pks, ids: reset_gp_bids(pks)),
+    ("deduplicate_targets", lambda pks, ids: deduplicate_targets(pks)),
+)
+
+
+def _commit() -> str:
+    try:
+        return subprocess.check_output(["git", "rev-parse", "--short=12", "HEAD"], text=True).strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+
+@pytest.fixture
+def simulator():
+    AmazonAdsRateLimiter.reset()
+    TokenHolder.reset()
+    started = []
+
+    def _start(fixtures, report_active_share: float) -> AdsApiSimulator:
+        config = SimulatorConfig(latency=API_LATENCY, report_active_share=report_active_share)
+        simulator = AdsApiSimulator(fixtures, config)
+        started.append(simulator.start())
+        base_urls, auth_urls = simulator.url_maps()
+        for patcher in (mock.patch.dict(BaseURL, base_urls), mock.patch.dict(AuthURL, auth_urls)):
+            patcher.start()
+        access_token, _, expired = AmazonAuthenticator(ServerLocation.NORTH_AMERICA).get_access_token()
+        TokenHolder.keep(
+            f"amazon_ads_{ServerLocation.NORTH_AMERICA}", Token(value=access_token, expired=expired)
+        )
+        return simulator
+
+    with override_settings(CACHES=LOCAL_CACHE):
+        yield _start
+    mock.patch.stopall()
+    for simulator in started:
+        simulator.stop()
+    AmazonAdsRateLimiter.reset()
+    TokenHolder.reset()
+
+
+@pytest.mark.parametrize("tier_name", PIPELINE_TIERS)
+@pytest.mark.django_db(transaction=True)
+def test_nightly_pipeline(simulator, tier_name):
+    tier = TIERS[tier_name]
+    fixtures = generate_fixtures(tier)
+    api = simulator(fixtures, tier.active_share)
+
+    generation_started_at = time.perf_counter()
+    profile_pks = create_profiles(fixtures, tier)
+    generation_seconds = time.perf_counter() - generation_started_at
+    profile_ids = list(Profile.objects.filter(pk__in=profile_pks).values_list("profile_id", flat=True))
+    change_entities(fixtures, tier.changed_share)
+    size = {**tier.as_dict(), **count_rows()}
+
+    stages = {}
+    api.stats.clear()
+    for name, stage in STAGES:
+        with _StageMeter() as meter:
+            started_at = time.perf_counter()
+            stage(profile_pks, profile_ids)
+            seconds = time.perf_counter() - started_at
+        stages[name] = {
+            "seconds": round(seconds, 3),
+            "queries": meter.queries,
+            "peak_rss_mib": round(meter.peak_rss / 2**20, 1),
+        }
+
+    results = {
+        "tier": tier.name,
+        "commit": _commit(),
+        "created_at": timezone.now().isoformat(),
+        "size": size,
+        "generation_seconds": round(generation_seconds, 3),
+        "api_requests": dict(api.stats),
+        "stages": stages,
+    }
+    RESULTS_DIR.mkdir(parents=True, exist_ok=True)
+    results_path = RESULTS_DIR / f"nightly-pipeline-{tier.name}-{results['commit']}.json"
+    results_path.write_text(json.dumps(results, indent=2))
+
+    print(f"\n{tier.name}: {size}, generated in {generation_seconds:.1f}s")
+    for name, stage_results in stages.items():
+        print(
+            f"{name:<24}{stage_results['seconds']:>9.3f}s{stage_results['queries']:>9} queries"
+            f"{stage_results['peak_rss_mib']:>9.1f} MiB"
+        )
+    print(f"results: {results_path}")
+    assert [name for name, _ in STAGES] == list(stages)
+    assert count_rows()["report_rows"] > 0
@@ -0,0 +1,100 @@
+"""
+Benchmark of planning placement updates of a synthetic profile with many campaigns.
+Run with: RUN_BENCHMARKS=1 BENCHMARK_PLACEMENT_CAMPAIGNS=500 pytest -s tests/benchmarks/test_placements_update.py
+"""
+import datetime
+import os
+import time
+
+import pytest
+
+from apps.ads_api.constants import (
+    MIN_SALES_FOR_BID_CHANGE_DATA,
+    PlacementsOnAmazon,
+    ServerLocation,
+    SpReportType,
+)
+from apps.ads_api.data_exchange import _get_placement_updates
+from apps.ads_api.models import Campaign, Profile, RecentReportData
+from apps.ads_api.repositories.report.placements_repository import PlacementsRepository
+
+CAMPAIGNS = int(os.environ.get("BENCHMARK_PLACEMENT_CAMPAIGNS", 500))
+DAYS = 90
+TODAY = datetime.date.today()
+DATE_MIN = TODAY - datetime.timedelta(days=7)
+PLACEMENTS = tuple(placement.value for placement in PlacementsOnAmazon)
+
+pytestmark = pytest.mark.skipif(not os.environ.get("RUN_BENCHMARKS"), reason="benchmarks are run on demand")
+
+
+def _seed_profile() -> Profile:
+    profile = Profile.objects.create(
+        profile_id=1, entity_id=1, managed=True, profile_server=ServerLocation.EUROPE
+    )
+    campaigns = Campaign.objects.bulk_create(
+        Campaign(
+            profile=profile,
+            managed=True,
+            campaign_id_amazon=i,
+            sponsoring_type="sponsoredProducts",
+            placement_tos_mult=i % 50,
+            placement_pp_mult=i % 30,
+        )
+        for i in range(1, CAMPAIGNS + 1)
+    )
+    RecentReportData.objects.bulk_create(
+        (
+            RecentReportData(
+                campaign_id=campaign.id,
+                report_type=SpReportType.PLACEMENT.value,
+                placement=placement,
+                date=TODAY - datetime.timedelta(days=day),
+                impressions=(campaign.id + day) % 500,
+                clicks=(campaign.id + day) % 9,
+                spend=round((campaign.id + day) % 7 * 0.3, 2),
+                sales=round((campaign.id * day) % 11 * 1.2, 2),
+                orders=int((campaign.id * day) % 11 > 8),
+            )
+            for campaign in campaigns
+            for placement in PLACEMENTS
+            for day in range(1, DAYS + 1)
+        ),
+        batch_size=10_000,
+    )
+    return profile
+
+
+def _timed(func):
+    started_at = time.perf_counter()
+    result = func()
+    return result, time.perf_counter() - started_at
+
+
+@pytest.mark.django_db
+def test_placement_slices_are_summed_in_database(django_assert_max_num_queries):
+    profile = _seed_profile()
+    campaign_ids = list(Campaign.objects.values_list("id", flat=True))
+    report_data = RecentReportData.objects.filter(
+        report_type=SpReportType.PLACEMENT,
+        campaign__profile=profile,
+        placement__in=PLACEMENTS[:2],
+    )
+    sql_sums, sql_seconds = _timed(
+        lambda: PlacementsRepository.get_slices_with_look_back(
+            campaign_ids,
+            PLACEMENTS[:2],
+            date_from=TODAY - datetime.timedelta(days=DAYS),
+            date_min=DATE_MIN,
+            min_orders=MIN_SALES_FOR_BID_CHANGE_DATA,
+        )
+    )
+    with django_assert_max_num_queries(3):
+        updates, planning_seconds = _timed(lambda: _get_placement_updates(profile))
+
+    rows = report_data.count()
+    print(
+        f"\n{CAMPAIGNS} campaigns, {rows} placement rows\n"
+        f"summed in database: {sql_seconds:.3f}s\n"
+        f"planned updates of {len(updates)} campaigns in {planning_seconds:.3f}s"
+    )
+    assert len(sql_sums) == CAMPAIGNS * 2
@@ -0,0 +1,88 @@
+"""
+Throughput benchmark of RecentReportData ingestion on synthetic rows.
+Run with: RUN_BENCHMARKS=1 BENCHMARK_INGESTION_ROWS=100000 pytest -s tests/benchmarks/test_report_data_ingestion.py
+"""
+import datetime
+import os
+import time
+
+import pytest
+
+from apps.ads_api.constants import SpReportType
+from apps.ads_api.models import RecentReportData
+from apps.ads_api.repositories.report.recent_report_data_bulk_repository import (
+    RecentReportDataBulkRepository,
+)
+
+INGESTION_ROWS = int(os.environ.get("BENCHMARK_INGESTION_ROWS", 20_000))
+# per row get/save is slow, its rate is measured on a sample
+PER_ROW_SAMPLE = min(INGESTION_ROWS, 2000)
+REPORT_DATE = datetime.date(2023, 7, 1)
+
+pytestmark = pytest.mark.skipif(not os.environ.get("RUN_BENCHMARKS"), reason="benchmarks are run on demand")
+
+
+def _synthetic_rows(campaign_id: int, rows: int, impressions: int) -> list[RecentReportData]:
+    return [
+        RecentReportData(
+            campaign_id=campaign_id,
+            date=REPORT_DATE,
+            report_type=SpReportType.KEYWORD_QUERY.value,
+            keyword_id=500_000 + i % 20_000,
+            query=f"synthetic search term {i}",
+            impressions=impressions,
+            clicks=i % 13,
+            spend=round(i % 11 * 0.1, 2),
+            sales=round(i % 7 * 1.5, 2),
+            orders=i % 2,
+            attributed_conversions_30d=i % 3,
+        )
+        for i in range(rows)
+    ]
+
+
+def _save_per_row(rows: list[RecentReportData]):
+    """Previous ingestion: lookup and save of every row"""
+    for row in rows:
+        stored = RecentReportData.objects.filter(
+            campaign_id=row.campaign_id,
+            date=row.date,
+            report_type=row.report_type,
+            keyword_id=row.keyword_id,
+            query=row.query,
+        ).first()
+        if stored:
+            row.id, row.created_at = stored.id, stored.created_at
+        row.save()
+
+
+def _rows_per_second(func, rows: list[RecentReportData]) -> float:
+    started_at = time.perf_counter()
+    func(rows)
+    return len(rows) / (time.perf_counter() - started_at)
+
+
+@pytest.mark.django_db
+def test_bulk_upsert_is_faster_than_per_row_save(campaign):
+    per_row_insert = _rows_per_second(_save_per_row, _synthetic_rows(campaign.id, PER_ROW_SAMPLE, 1))
+    per_row_update = _rows_per_second(_save_per_row, _synthetic_rows(campaign.id, PER_ROW_SAMPLE, 2))
+    RecentReportData.objects.all().delete()
+
+    bulk_insert = _rows_per_second(
+        lambda rows: RecentReportDataBulkRepository.upsert(rows, recalculate_sales=False),
+        _synthetic_rows(campaign.id, INGESTION_ROWS, 1),
+    )
+    bulk_update = _rows_per_second(
+        lambda rows: RecentReportDataBulkRepository.upsert(rows, recalculate_sales=False),
+        _synthetic_rows(campaign.id, INGESTION_ROWS, 2),
+    )
+
+    print(
+        f"\n{INGESTION_ROWS} rows\n"
+        f"per row save: insert {per_row_insert:.0f} rows/s, update {per_row_update:.0f} rows/s\n"
+        f"bulk upsert:  insert {bulk_insert:.0f} rows/s, update {bulk_update:.0f} rows/s"
+    )
+    assert RecentReportData.objects.count() == INGESTION_ROWS
+    assert not RecentReportData.objects.exclude(impressions=2).exists()
+    assert bulk_insert > per_row_insert
+    assert bulk_update > per_row_update
@@ -0,0 +1,103 @@
+"""
+Memory benchmark of report parsing on a synthetic report.
+Run with: RUN_BENCHMARKS=1 BENCHMARK_REPORT_ROWS=1000000 pytest -s tests/benchmarks/test_report_parser_memory.py
+"""
+import gzip
+import io
+import json
+import os
+import time
+import tracemalloc
+
+import pytest
+from pydantic import parse_obj_as
+from requests import Response
+
+from apps.ads_api.constants import SpReportType
+from apps.ads_api.entities.amazon_ads.reports import KeywordQueryReportDataEntity, ReportEntity
+from apps.ads_api.services.amazon.reports.download_from_amazon_service import DownloadReportService
+from apps.utils.gzip import GzipExtracter
+
+REPORT_ROWS = int(os.environ.get("BENCHMARK_REPORT_ROWS", 1_000_000))
+BATCH_SIZE = 5000
+# pydantic rows of one batch plus decompression buffers, doesn't depend on the report size
+STREAMING_PEAK_LIMIT = 64 * 2**20
+
+pytestmark = pytest.mark.skipif(not os.environ.get("RUN_BENCHMARKS"), reason="benchmarks are run on demand")
+
+
+def _synthetic_keyword_query_report(rows: int) -> bytes:
+    buffer = io.BytesIO()
+    compressor = gzip.GzipFile(fileobj=buffer, mode="wb")
+    compressor.write(b"[")
+    for i in range(rows):
+        row = {
+            "unitsSoldClicks30d": i % 3,
+            "sales30d": round(i % 7 * 1.5, 2),
+            "kindleEditionNormalizedPagesRoyalties14d": 0,
+            "campaignId": 100_000 + i % 500,
+            "cost": round(i % 11 * 0.1, 2),
+            "purchases30d": i % 2,
+            "impressions": i % 1000,
+            "clicks": i % 13,
+            "date": "2023-07-01",
+            "keywordId": 500_000 + i % 20_000,
+            "adGroupName": f"ad group {i % 500}",
+            "searchTerm": f"synthetic search term {i}",
+            "matchType": "EXACT",
+            "adGroupId": 200_000 + i % 500,
+            "keyword": f"keyword {i % 20_000}",
+        }
+        compressor.write((b"," if i else b"") + json.dumps(row).encode())
+    compressor.write(b"]")
+    compressor.close()
+    return buffer.getvalue()
+
+
+def _response(content: bytes) -> Response:
+    response = Response()
+    response.status_code = 200
+    response._content = content
+    response._content_consumed = True
+    return response
+
+
+def _measure(func):
+    tracemalloc.start()
+    started_at = time.perf_counter()
+    result = func()
+    elapsed = time.perf_counter() - started_at
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return result, peak, elapsed
+
+
+@pytest.fixture(scope="module")
+def report_content():
+    return _synthetic_keyword_query_report(REPORT_ROWS)
+
+
+def test_streaming_parser_memory_is_bounded_by_batch_size(report_content):
+    report = ReportEntity(report_id="benchmark", report_type=SpReportType.KEYWORD_QUERY)
+    service = DownloadReportService()
+
+    def whole_file():
+        rows = GzipExtracter(_response(report_content)).extract()
+        return len(parse_obj_as(list[KeywordQueryReportDataEntity], rows))
+
+    def streaming():
+        return sum(
+            len(batch) for batch in service.parse_batches(report, _response(report_content), BATCH_SIZE)
+        )
+
+    streamed_rows, streaming_peak, streaming_elapsed = _measure(streaming)
+    loaded_rows, whole_file_peak, whole_file_elapsed = _measure(whole_file)
+
+    print(
+        f"\n{REPORT_ROWS} rows, {len(report_content) / 2**20:.1f} MiB gzipped\n"
+        f"whole file: peak {whole_file_peak / 2**20:.1f} MiB, {whole_file_elapsed:.1f}s\n"
+        f"streaming:  peak {streaming_peak / 2**20:.1f} MiB, {streaming_elapsed:.1f}s"
+    )
+    assert streamed_rows == loaded_rows == REPORT_ROWS
+    assert streaming_peak < STREAMING_PEAK_LIMIT
+    assert streaming_peak < whole_file_peak
@@ -0,0 +1,108 @@
+"""
+Benchmark of decoding rows of downloaded reports into insert rows of RecentReportData.
+Run with: RUN_BENCHMARKS=1 BENCHMARK_REPORT_ROWS=50000 pytest -s tests/benchmarks/test_report_rows_decoder.py
+"""
+import os
+import time
+
+import pytest
+from pydantic import parse_obj_as
+
+from apps.ads_api.constants import SpReportType
+from apps.ads_api.converters.report_data_entity_converter import ReportDataEntityConverter
+from apps.ads_api.converters.report_rows_decoder import ReportRowsDecoder
+from apps.ads_api.entities.amazon_ads.reports import (
+    CampaignsReportDataEntity,
+    KeywordsReportDataEntity,
+    PlacementsReportDataEntity,
+    TargetsReportData,
+)
+from apps.ads_api.repositories.report.recent_report_data_bulk_repository import COLUMNS
+
+ROWS = int(os.environ.get("BENCHMARK_REPORT_ROWS", 50_000))
+
+pytestmark = pytest.mark.skipif(not os.environ.get("RUN_BENCHMARKS"), reason="benchmarks are run on demand")
+
+
+def _metrics(i: int) -> dict:
+    return {
+        "unitsSoldClicks30d": i % 3,
+        "sales30d": round(i % 17 * 1.5, 2),
+        "kindleEditionNormalizedPagesRoyalties14d": i % 5 - 1,
+        "campaignId": i % 300,
+        "cost": round(i % 13 * 0.21, 2),
+        "purchases30d": i % 3,
+        "impressions": i % 700,
+        "clicks": i % 9,
+        "date": f"2023-07-{i % 28 + 1:02d}",
+    }
+
+
+def _ad_group(i: int) -> dict:
+    return {"adGroupId": i % 900, "adGroupName": f"ABCDEFGHIJ-SP-Research-{i % 900}-B0BVD6FZ12-Paperback"}
+
+
+RAW_ROWS = {
+    SpReportType.CAMPAIGN: (
+        CampaignsReportDataEntity,
+        lambda i: {**_metrics(i), "topOfSearchImpressionShare": 0.1},
+    ),
+    SpReportType.KEYWORD: (
+        KeywordsReportDataEntity,
+        lambda i: {
+            **_metrics(i),
+            **_ad_group(i),
+            "keywordId": i,
+            "matchType": "EXACT",
+            "keyword": f"keyword {i}",
+        },
+    ),
+    SpReportType.PLACEMENT: (
+        PlacementsReportDataEntity,
+        lambda i: {**_metrics(i), "placementClassification": "Top of Search on-Amazon"},
+    ),
+    SpReportType.TARGET: (
+        TargetsReportData,
+        lambda i: {
+            **_metrics(i),
+            **_ad_group(i),
+            "keywordId": i,
+            "keyword": f'asin="B{i:09d}"',
+            "targeting": f'asin="B{i:09d}"',
+            "keywordType": "TARGETING_EXPRESSION",
+        },
+    ),
+}
+
+
+def _timed(func):
+    started_at = time.perf_counter()
+    result = func()
+    return result, time.perf_counter() - started_at
+
+
+def _validate_rows(entity_class, raw_rows) -> list[list]:
+    return [
+        [getattr(model, column) for column in COLUMNS]
+        for model in map(
+            ReportDataEntityConverter.convert_to_django_model, parse_obj_as(list[entity_class], raw_rows)
+        )
+    ]
+
+
+@pytest.mark.parametrize("report_type", RAW_ROWS.keys(), ids=lambda report_type: report_type.value)
+def test_rows_are_decoded_faster_than_validated(report_type):
+    entity_class, raw_row = RAW_ROWS[report_type]
+    raw_rows = [raw_row(i) for i in range(ROWS)]
+    decoder = ReportRowsDecoder.for_entity(entity_class)
+
+    validated, validated_seconds = _timed(lambda: _validate_rows(entity_class, raw_rows))
+    decoded, decoded_seconds = _timed(lambda: decoder.decode(raw_rows))
+
+    print(
+        f"\n{report_type.value}, {ROWS} rows\n"
+        f"validated entities: {ROWS / validated_seconds:,.0f} rows/s\n"
+        f"decoded rows:       {ROWS / decoded_seconds:,.0f} rows/s"
+    )
+    assert decoded == validated
+    assert decoded_seconds < validated_seconds
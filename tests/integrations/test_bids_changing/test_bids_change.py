@@ -1,3 +1,4 @@
+import datetime
 import os.path
 from csv import DictReader
 
@@ -9,6 +10,7 @@ from django.test import override_settings
 from apps.ads_api.constants import SpState
 from apps.ads_api.data_exchange import update_sp_bids_status
 from apps.ads_api.models import Profile, Campaign, Keyword, Book, Target, RecentReportData
+from apps.ads_api.repositories.report.report_data_rollup_repository import ReportDataRollupRepository
 
 
 @pytest.fixture
@@ -69,6 +71,7 @@ def load_keyword_data(data_files):
     for row in DictReader(open(data_files["report_data_keywords"])):
         report_data_keywords.append(RecentReportData(**row))
     RecentReportData.objects.bulk_create(report_data_keywords)
+    ReportDataRollupRepository.refresh_all(datetime.date(2022, 11, 1), datetime.date(2023, 2, 6))
 
 
 @pytest.fixture
@@ -82,6 +85,7 @@ def load_targets_data(data_files):
     for row in DictReader(open(data_files["report_data_targets"])):
         report_data_targets.append(RecentReportData(**row))
     RecentReportData.objects.bulk_create(report_data_targets)
+    ReportDataRollupRepository.refresh_all(datetime.date(2022, 11, 1), datetime.date(2023, 2, 6))
 
 
 @pytest.fixture
@@ -1,3 +1,6 @@
+import time
+from typing import Optional
+
 import mock
 import pytest
 from mock.mock import Mock, PropertyMock
@@ -6,6 +9,14 @@ from requests import Response
 from apps.ads_api.adapters.amazon_ads.sponsored_products.base_sp_adapter import (
     BaseSponsoredProductsAdapter,
 )
+from apps.ads_api.adapters.amazon_ads.sponsored_products.campaigns_adapter import CampaignAdapter
+from apps.ads_api.adapters.amazon_ads.sponsored_products.keywords_adapter import KeywordsAdapter
+from apps.ads_api.constants import ServerLocation
+from apps.ads_api.entities.amazon_ads.sponsored_products.search_filters import (
+    IdFilter,
+    KeywordSearchFilter,
+)
+from apps.ads_api.models import Profile
 
 
 @pytest.fixture
@@ -49,3 +60,81 @@ class TestBaseSpAdapter:
 
         assert len(errors) == 1
         assert errors[0]["errorType"] == "duplicateValueError"
+
+    def test_each_adapter_sends_scope_of_its_profile(self):
+        first_adapter = CampaignAdapter(Profile(profile_id=1, profile_server=ServerLocation.EUROPE))
+        second_adapter = CampaignAdapter(Profile(profile_id=2, profile_server=ServerLocation.EUROPE))
+
+        assert first_adapter.HEADERS["Amazon-Advertising-API-Scope"] == "1"
+        assert second_adapter.HEADERS["Amazon-Advertising-API-Scope"] == "2"
+        assert second_adapter.HEADERS["Accept"] == "application/vnd.spcampaign.v3+json"
+        assert "Amazon-Advertising-API-Scope" not in CampaignAdapter.HEADERS
+
+
+def _keywords_pages(campaign_id: str, pages: int) -> dict:
+    """Pages of keywords of the campaign by nextToken requesting them"""
+    next_tokens = [None] + [f"{campaign_id}-{page}" for page in range(1, pages)] + [None]
+    return {
+        next_tokens[page]: {
+            "keywords": [{"keywordId": f"{campaign_id}{page}", "campaignId": campaign_id}],
+            "nextToken": next_tokens[page + 1],
+        }
+        for page in range(pages)
+    }
+
+
+def _list_response(pages_per_campaign: dict, responses: Optional[list] = None):
+    def send_request(url, method, extra_headers, body):
+        campaign_id = body["campaignIdFilter"]["include"][0]
+        page = pages_per_campaign[campaign_id][body.get("nextToken")]
+        response = Mock(spec=Response, status_code=200)
+        response.json.return_value = page
+        if responses is not None:
+            responses.append(response)
+        return response
+
+    return send_request
+
+
+class TestListKeywords:
+    @pytest.fixture
+    def adapter(self):
+        return KeywordsAdapter(Profile(profile_id=1, profile_server=ServerLocation.EUROPE))
+
+    def test_list_follows_next_token_and_parses_each_page_once(self, adapter):
+        pages, responses = {"1": _keywords_pages("1", pages=3)}, []
+        with mock.patch.object(KeywordsAdapter, "send_request", side_effect=_list_response(pages, responses)):
+            keywords = adapter.list(KeywordSearchFilter(campaign_id_filter=IdFilter(include=["1"])))
+
+        assert [keyword.external_id for keyword in keywords] == ["10", "11", "12"]
+        assert [response.json.call_count for response in responses] == [1, 1, 1]
+
+    def test_filters_are_listed_concurrently(self, adapter):
+        pages = {campaign_id: _keywords_pages(campaign_id, pages=2) for campaign_id in ("1", "2", "3")}
+        search_filters = [
+            KeywordSearchFilter(campaign_id_filter=IdFilter(include=[campaign_id])) for campaign_id in pages
+        ]
+        with mock.patch.object(KeywordsAdapter, "send_request", side_effect=_list_response(pages)):
+            keywords = list(adapter.iter_list_concurrently(search_filters, workers=2))
+
+        assert sorted(keyword.external_id for keyword in keywords) == ["10", "11", "20", "21", "30", "31"]
+
+    def test_listing_error_is_raised_to_caller(self, adapter):
+        search_filters = [KeywordSearchFilter(campaign_id_filter=IdFilter(include=["1"]))]
+        with mock.patch.object(KeywordsAdapter, "send_request", side_effect=ValueError("broken page")):
+            with pytest.raises(ValueError):
+                list(adapter.iter_list_concurrently(search_filters))
+
+    def test_pages_are_received_ahead_of_caller_up_to_prefetch_limit(self, adapter):
+        pages, responses = {"1": _keywords_pages("1", pages=50)}, []
+        search_filters = [KeywordSearchFilter(campaign_id_filter=IdFilter(include=["1"]))]
+        with mock.patch.object(KeywordsAdapter, "send_request", side_effect=_list_response(pages, responses)):
+            keywords = adapter.iter_list_concurrently(search_filters, workers=1)
+            next(keywords)
+            time.sleep(0.2)
+            # one page given to the caller, two waiting in the queue and one the worker waits to put
+            requested_pages = len(responses)
+            keywords.close()
+
+        assert requested_pages == 4
+        assert len(responses) == 4
@@ -0,0 +1,75 @@
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import mock
+import pytest
+
+from apps.ads_api.adapters.amazon_ads.http_transport import AmazonAdsHttpTransport
+from apps.ads_api.constants import ServerLocation
+
+
+class _KeepAliveHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def do_GET(self):
+        self._respond()
+
+    def do_POST(self):
+        self.rfile.read(int(self.headers.get("Content-Length", 0)))
+        self._respond()
+
+    do_PUT = do_POST
+
+    def _respond(self):
+        body = b"{}"
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def local_server_url():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _KeepAliveHandler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{server.server_port}"
+    server.shutdown()
+    server.server_close()
+
+
+@pytest.fixture(autouse=True)
+def clean_transport():
+    AmazonAdsHttpTransport.close()
+    yield
+    AmazonAdsHttpTransport.close()
+
+
+def test_session_is_shared_per_region():
+    europe_session = AmazonAdsHttpTransport.get_session(ServerLocation.EUROPE)
+
+    assert AmazonAdsHttpTransport.get_session(ServerLocation.EUROPE) is europe_session
+    assert AmazonAdsHttpTransport.get_session(ServerLocation.NORTH_AMERICA) is not europe_session
+
+
+def test_session_is_recreated_in_forked_process():
+    session = AmazonAdsHttpTransport.get_session(ServerLocation.EUROPE)
+
+    with mock.patch("apps.ads_api.adapters.amazon_ads.http_transport.os.getpid", return_value=-1):
+        assert AmazonAdsHttpTransport.get_session(ServerLocation.EUROPE) is not session
+
+
+def test_connection_reused_for_all_verbs(local_server_url):
+    session = AmazonAdsHttpTransport.get_session(ServerLocation.EUROPE)
+
+    for _ in range(3):
+        session.get(local_server_url)
+    session.post(local_server_url, json={"a": 1})
+    session.put(local_server_url, json={"a": 1})
+
+    stats = AmazonAdsHttpTransport.get_host_stats(local_server_url)
+    assert stats == {"requests": 5, "connections": 1, "reused": 4}
@@ -0,0 +1,124 @@
+import mock
+import pytest
+import requests
+from mock.mock import Mock
+
+from apps.ads_api.adapters.amazon_ads.base_amazon_ads_adapter import BaseAmazonAdsAdapter
+from apps.ads_api.adapters.amazon_ads.rate_limiter import AmazonAdsRateLimiter, TokenBucket
+from apps.ads_api.constants import ServerLocation
+from apps.utils.token_holder import TokenHolder
+
+
+def _too_many_requests_response(headers=None):
+    response = requests.Response()
+    response.status_code = 429
+    response.headers.update(headers or {})
+    return response
+
+
+def _ok_response():
+    response = requests.Response()
+    response.status_code = 200
+    return response
+
+
+@pytest.fixture(autouse=True)
+def clean_rate_limiter():
+    AmazonAdsRateLimiter.reset()
+    TokenHolder.reset()
+    yield
+    AmazonAdsRateLimiter.reset()
+    TokenHolder.reset()
+
+
+class TestTokenBucket:
+    @mock.patch("apps.ads_api.adapters.amazon_ads.rate_limiter.time.sleep")
+    def test_burst_is_not_throttled(self, sleep_mock: Mock):
+        bucket = TokenBucket(rate=1, capacity=3)
+
+        for _ in range(3):
+            bucket.acquire()
+
+        sleep_mock.assert_not_called()
+
+    @mock.patch("apps.ads_api.adapters.amazon_ads.rate_limiter.time.sleep")
+    @mock.patch("apps.ads_api.adapters.amazon_ads.rate_limiter.time.monotonic")
+    def test_penalized_bucket_waits_before_next_token(self, monotonic_mock: Mock, sleep_mock: Mock):
+        clock = [100.0]
+        monotonic_mock.side_effect = lambda: clock[0]
+        sleep_mock.side_effect = lambda seconds: clock.__setitem__(0, clock[0] + seconds)
+        bucket = TokenBucket(rate=10, capacity=10)
+
+        bucket.penalize(7)
+        bucket.acquire()
+
+        assert clock[0] == pytest.approx(107)
+
+
+class TestRetryDelay:
+    def test_retry_after_seconds_header_is_used(self):
+        response = _too_many_requests_response({"Retry-After": "3"})
+
+        assert AmazonAdsRateLimiter.get_retry_delay(response, attempt=0) == 3.0
+
+    def test_backoff_grows_and_is_capped_without_header(self):
+        response = _too_many_requests_response()
+
+        with mock.patch("apps.ads_api.adapters.amazon_ads.rate_limiter.random.uniform") as uniform_mock:
+            uniform_mock.side_effect = lambda low, high: high
+            assert AmazonAdsRateLimiter.get_retry_delay(response, attempt=0) == 1
+            assert AmazonAdsRateLimiter.get_retry_delay(response, attempt=3) == 8
+            assert AmazonAdsRateLimiter.get_retry_delay(response, attempt=20) == 60
+
+
+@pytest.fixture
+def fake_clock():
+    clock = [100.0]
+    with mock.patch(
+        "apps.ads_api.adapters.amazon_ads.rate_limiter.time.monotonic"
+    ) as monotonic_mock, mock.patch("apps.ads_api.adapters.amazon_ads.rate_limiter.time.sleep") as sleep_mock:
+        monotonic_mock.side_effect = lambda: clock[0]
+        sleep_mock.side_effect = lambda seconds: clock.__setitem__(0, clock[0] + seconds)
+        yield clock
+
+
+@pytest.mark.usefixtures("fake_clock")
+@mock.patch("apps.ads_api.mixins.auth.jwt_storable_mixin.JWTStorableMixin.get_access_token")
+@mock.patch("apps.utils.jwt_auth.JWTAuth.check_token_expired")
+class TestSendRequestThrottling:
+    @mock.patch("requests.sessions.Session.post")
+    def test_throttled_request_is_retried(
+        self, post_mock: Mock, check_token_expired_mock: Mock, get_access_token_mock: Mock, fake_clock
+    ):
+        post_mock.side_effect = [
+            _too_many_requests_response({"Retry-After": "2"}),
+            _too_many_requests_response({"Retry-After": "1"}),
+            _ok_response(),
+        ]
+        get_access_token_mock.return_value = Mock(value="access_token")
+        adapter = BaseAmazonAdsAdapter(ServerLocation.EUROPE)
+
+        response = adapter.send_request(
+            url="http://some/test/url",
+            method="POST",
+            extra_headers={"Amazon-Advertising-API-Scope": "1"},
+            body={},
+        )
+
+        assert response.status_code == 200
+        assert post_mock.call_count == 3
+        assert fake_clock[0] == pytest.approx(103)
+
+    @mock.patch("apps.ads_api.adapters.amazon_ads.base_amazon_ads_adapter.ADS_API_RATE_LIMIT_MAX_RETRIES", 2)
+    @mock.patch("requests.sessions.Session.get")
+    def test_none_returned_after_max_retries(
+        self, get_mock: Mock, check_token_expired_mock: Mock, get_access_token_mock: Mock
+    ):
+        get_mock.return_value = _too_many_requests_response({"Retry-After": "1"})
+        get_access_token_mock.return_value = Mock(value="access_token")
+        adapter = BaseAmazonAdsAdapter(ServerLocation.EUROPE)
+
+        response = adapter.send_request(url="http://some/test/url", method="GET")
+
+        assert response is None
+        assert get_mock.call_count == 3
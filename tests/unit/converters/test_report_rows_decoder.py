@@ -0,0 +1,121 @@
+import datetime
+
+import pytest
+
+from apps.ads_api.constants import SpReportType
+from apps.ads_api.converters.report_data_entity_converter import ReportDataEntityConverter
+from apps.ads_api.converters.report_rows_decoder import InvalidReportRow, ReportRowsDecoder
+from apps.ads_api.entities.amazon_ads.reports import (
+    CampaignsReportDataEntity,
+    KeywordQueryReportDataEntity,
+    KeywordsReportDataEntity,
+    PlacementsReportDataEntity,
+    ProductAdsReportData,
+    TargetQueryReportDataEntity,
+    TargetsReportData,
+)
+from apps.ads_api.repositories.report.recent_report_data_bulk_repository import COLUMNS
+
+METRICS = {
+    "unitsSoldClicks30d": 2,
+    "sales30d": "10.5",
+    "kindleEditionNormalizedPagesRoyalties14d": -3,
+    "campaignId": 11,
+    "cost": 2,
+    "purchases30d": 1,
+    "impressions": 100,
+    "clicks": -1,
+    "date": "2023-07-01",
+}
+AD_GROUP = {"adGroupId": 21, "adGroupName": "ABCDEFGHIJ-SP-Research-1-B0BVD6FZ12-Paperback"}
+RAW_ROWS = {
+    CampaignsReportDataEntity: [{**METRICS, "topOfSearchImpressionShare": 0.25}, METRICS],
+    KeywordsReportDataEntity: [
+        {**METRICS, **AD_GROUP, "keywordId": 31, "matchType": "EXACT", "keyword": "dragons"},
+        {**METRICS, **AD_GROUP, "keywordId": 32, "matchType": "BROAD"},
+    ],
+    KeywordQueryReportDataEntity: [
+        {**METRICS, **AD_GROUP, "keywordId": 31, "matchType": "EXACT", "searchTerm": "red dragons"},
+        {**METRICS, **AD_GROUP, "keywordId": 31, "matchType": "EXACT"},
+    ],
+    PlacementsReportDataEntity: [{**METRICS, "placementClassification": "Top of Search on-Amazon"}],
+    ProductAdsReportData: [
+        {**METRICS, **AD_GROUP, "adId": 41, "advertisedAsin": "B000000001"},
+        {**METRICS, **AD_GROUP, "adId": 42},
+        # asin of the stored product ad, see the product_ad fixture
+        {**METRICS, "adGroupId": 21, "adGroupName": "ad group", "adId": 1},
+    ],
+    TargetQueryReportDataEntity: [
+        {
+            **METRICS,
+            **AD_GROUP,
+            "keywordId": 51,
+            "searchTerm": "b000000002",
+            "keyword": 'asin="B000000002"',
+            "targeting": 'asin="B000000002"',
+            "keywordType": "TARGETING_EXPRESSION",
+        }
+    ],
+    TargetsReportData: [
+        {
+            **METRICS,
+            **AD_GROUP,
+            "keywordId": 51,
+            "keyword": "close-match",
+            "targeting": "close-match",
+            "keywordType": "TARGETING_EXPRESSION_PREDEFINED",
+        }
+    ],
+}
+
+
+def _validated_rows(entity_class, raw_rows) -> list[list]:
+    """Rows as saved before: validated entities converted into models"""
+    return [
+        [
+            getattr(
+                ReportDataEntityConverter.convert_to_django_model(entity_class.parse_obj(raw_row)), column
+            )
+            for column in COLUMNS
+        ]
+        for raw_row in raw_rows
+    ]
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize("entity_class", RAW_ROWS.keys(), ids=lambda entity_class: entity_class.__name__)
+def test_decoded_rows_match_validated_entities(entity_class, product_ad):
+
+    rows = ReportRowsDecoder.for_entity(entity_class).decode(RAW_ROWS[entity_class])
+
+    assert rows == _validated_rows(entity_class, RAW_ROWS[entity_class])
+
+
+def test_values_are_converted_and_clamped():
+    row = dict(
+        zip(
+            COLUMNS,
+            ReportRowsDecoder.for_entity(KeywordsReportDataEntity).decode(
+                RAW_ROWS[KeywordsReportDataEntity][:1], report_type=SpReportType.KEYWORD.value
+            )[0],
+        )
+    )
+
+    assert row["date"] == datetime.date(2023, 7, 1)
+    assert row["sales"] == 10.5
+    assert (row["kenp_royalties"], row["clicks"]) == (0, 0)
+    assert row["match_type"] == "exact"
+    assert row["report_type"] == SpReportType.KEYWORD.value
+
+
+@pytest.mark.parametrize(
+    "raw_row",
+    [
+        {key: value for key, value in METRICS.items() if key != "campaignId"},
+        {**METRICS, "impressions": None},
+        {**METRICS, "clicks": "many"},
+    ],
+)
+def test_invalid_rows_are_rejected(raw_row):
+    with pytest.raises(InvalidReportRow):
+        ReportRowsDecoder.for_entity(CampaignsReportDataEntity).decode([METRICS, raw_row])
@@ -0,0 +1,64 @@
+from decimal import Decimal
+
+import pytest
+
+from apps.ads_api.entities.internal.keywords_snapshot import KeywordsSnapshot
+from apps.ads_api.models import Keyword
+
+
+@pytest.fixture
+def snapshot():
+    snapshot = KeywordsSnapshot()
+    snapshot.append(10, 1, "ENABLED", "TARGETING_CLAUSE_STATUS_LIVE", Decimal("0.50"), 1000)
+    snapshot.append(11, 2, "PAUSED", None, None, None)
+    return snapshot
+
+
+def test_rows_are_looked_up_by_amazon_id(snapshot):
+    assert len(snapshot) == 2
+    assert 10 in snapshot
+    assert snapshot.get_pk(11) == 2
+    assert snapshot.get_pk(12) is None
+
+
+@pytest.mark.parametrize(
+    "changes, differs",
+    [
+        ({}, False),
+        ({"bid": 0.505}, False),
+        ({"bid": None}, False),
+        ({"bid": 0.52}, True),
+        ({"state": "PAUSED"}, True),
+        ({"serving_status": "TARGETING_CLAUSE_ARCHIVED"}, True),
+        ({"last_updated": 2000}, True),
+    ],
+)
+def test_differs_compares_amazon_values_with_stored_ones(snapshot, changes, differs):
+    values = {
+        "state": "ENABLED",
+        "serving_status": "TARGETING_CLAUSE_STATUS_LIVE",
+        "last_updated": 1000,
+        "bid": 0.5,
+        **changes,
+    }
+
+    assert snapshot.differs(10, **values) is differs
+
+
+def test_missing_stored_bid_is_zero(snapshot):
+    assert snapshot.differs(11, state="PAUSED", serving_status=None, last_updated=0, bid=0) is False
+    assert snapshot.differs(11, state="PAUSED", serving_status=None, last_updated=0, bid=0.3) is True
+
+
+@pytest.mark.django_db
+def test_snapshot_is_loaded_from_queryset(campaign):
+    keyword = Keyword.objects.create(
+        keyword_id=10, campaign=campaign, bid=0.5, state="ENABLED", last_updated_date_on_amazon=1000
+    )
+
+    snapshot = KeywordsSnapshot.from_queryset(Keyword.objects.all(), id_field="keyword_id")
+
+    assert snapshot.get_pk(10) == keyword.pk
+    assert not snapshot.differs(
+        10, state="ENABLED", serving_status="TARGETING_CLAUSE_STATUS_LIVE", last_updated=1000, bid=0.5
+    )
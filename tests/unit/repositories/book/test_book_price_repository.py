@@ -2,7 +2,8 @@ import datetime
 
 import pytest
 
-from apps.ads_api.models import DateBookPrice
+from apps.ads_api.constants import DEFAULT_BOOK_PRICE
+from apps.ads_api.models import Book, DateBookPrice
 from apps.ads_api.repositories.book.price_repository import BookPriceRepository
 
 
@@ -72,3 +73,22 @@ def test_set_book_price_updates_price_correctly(book):
     book_price_repo.set_book_price_for_date(for_date=today_date, price=15.99)
 
     assert 15.99 == book_price_repo.get_book_price_for_date(datetime.datetime.today())
+
+
+@pytest.mark.django_db
+def test_actual_prices_returns_latest_price_per_book_and_default_for_missing(book):
+    book_without_price = Book.objects.create(title="no_price", asin="nopriceasin")
+    DateBookPrice.objects.filter(book=book_without_price).delete()
+    book_price_repo = BookPriceRepository(book_id=book.id)
+    book_price_repo.set_book_price_for_date(
+        for_date=datetime.datetime.today() - datetime.timedelta(days=3), price=10.0
+    )
+    book_price_repo.set_book_price_for_date(
+        for_date=datetime.datetime.today() - datetime.timedelta(days=1), price=12.5
+    )
+
+    prices = BookPriceRepository.get_actual_prices([book.id, book_without_price.id, None])
+
+    assert prices[book.id] == 12.5
+    assert prices[book_without_price.id] == DEFAULT_BOOK_PRICE
+    assert DateBookPrice.objects.filter(book=book_without_price).exists()
@@ -0,0 +1,128 @@
+import datetime
+import random
+
+import pytest
+
+from apps.ads_api.constants import PlacementsOnAmazon, SpReportType
+from apps.ads_api.entities.internal.ad_slice import AdSlice
+from apps.ads_api.models import Campaign, RecentReportData
+from apps.ads_api.repositories.report.placements_repository import PlacementsRepository
+
+TODAY = datetime.date(2023, 7, 31)
+DATE_MIN = TODAY - datetime.timedelta(days=7)
+PLACEMENTS = (PlacementsOnAmazon.TOS.value, PlacementsOnAmazon.PP.value)
+
+
+def _placement_row(campaign, placement, days_ago, orders, kenp_royalties=0):
+    return RecentReportData(
+        campaign_id=campaign.id,
+        report_type=SpReportType.PLACEMENT.value,
+        placement=placement,
+        date=TODAY - datetime.timedelta(days=days_ago),
+        orders=orders,
+        sales=orders * 5,
+        spend=1,
+        clicks=2,
+        impressions=10,
+        kenp_royalties=kenp_royalties,
+        attributed_conversions_30d=orders,
+    )
+
+
+def _sum_rows_with_look_back(rows, min_orders=3):
+    """Sums rows newest first one by one, as placements were summed before the repository"""
+    slices = {}
+    for row in sorted(rows, key=lambda row: row.date, reverse=True):
+        key = (row.campaign_id, row.placement)
+        if key in slices and row.date < DATE_MIN and slices[key].orders >= min_orders:
+            continue
+        ad_slice = slices.setdefault(key, AdSlice(0.0, 0.0, 0, 0, 0, 0))
+        for metric in AdSlice.__dataclass_fields__:
+            setattr(ad_slice, metric, getattr(ad_slice, metric) + getattr(row, metric))
+    return slices
+
+
+def _get_slices(campaign_ids, date_from=TODAY - datetime.timedelta(days=60), min_orders=3):
+    return PlacementsRepository.get_slices_with_look_back(
+        campaign_ids, PLACEMENTS, date_from=date_from, date_min=DATE_MIN, min_orders=min_orders
+    )
+
+
+@pytest.mark.django_db
+def test_older_days_are_added_while_placement_has_few_orders(campaign):
+    RecentReportData.objects.bulk_create(
+        [
+            _placement_row(campaign, PlacementsOnAmazon.TOS.value, days_ago=1, orders=1),
+            _placement_row(campaign, PlacementsOnAmazon.TOS.value, days_ago=10, orders=1),
+            _placement_row(campaign, PlacementsOnAmazon.TOS.value, days_ago=20, orders=1),
+            _placement_row(campaign, PlacementsOnAmazon.TOS.value, days_ago=30, orders=1),
+            # placements with no recent data are judged on their last day
+            _placement_row(campaign, PlacementsOnAmazon.PP.value, days_ago=40, orders=0),
+            _placement_row(campaign, PlacementsOnAmazon.PP.value, days_ago=50, orders=5),
+            _placement_row(campaign, PlacementsOnAmazon.OTHER.value, days_ago=1, orders=5),
+        ]
+    )
+
+    slices = _get_slices([campaign.id])
+
+    assert slices == {
+        (campaign.id, PlacementsOnAmazon.TOS.value): AdSlice(
+            sales=15.0, spend=3.0, impressions=30, clicks=6, orders=3, attributed_conversions_30d=3
+        ),
+        (campaign.id, PlacementsOnAmazon.PP.value): AdSlice(
+            sales=25.0, spend=2.0, impressions=20, clicks=4, orders=5, attributed_conversions_30d=5
+        ),
+    }
+
+
+@pytest.mark.django_db
+def test_days_before_look_back_window_are_not_considered(campaign):
+    RecentReportData.objects.bulk_create(
+        [
+            _placement_row(campaign, PlacementsOnAmazon.TOS.value, days_ago=1, orders=0),
+            _placement_row(campaign, PlacementsOnAmazon.TOS.value, days_ago=90, orders=5),
+        ]
+    )
+
+    slices = _get_slices([campaign.id], date_from=TODAY - datetime.timedelta(days=60))
+
+    assert slices[(campaign.id, PlacementsOnAmazon.TOS.value)].orders == 0
+
+
+@pytest.mark.django_db
+def test_slices_match_aggregation_of_report_data_rows():
+    random.seed(7)
+    campaigns = [Campaign.objects.create(campaign_id_amazon=i) for i in range(1, 6)]
+    rows = RecentReportData.objects.bulk_create(
+        _placement_row(campaign, placement, days_ago=days_ago, orders=random.choice((0, 0, 0, 1, 2)))
+        for campaign in campaigns
+        for placement in PLACEMENTS
+        for days_ago in random.sample(range(60), 30)
+    )
+
+    assert _get_slices([campaign.id for campaign in campaigns]) == _sum_rows_with_look_back(rows)
+
+
+@pytest.mark.django_db
+def test_counts_and_royalties_are_summed_as_integers(campaign):
+    RecentReportData.objects.bulk_create(
+        [
+            _placement_row(campaign, PlacementsOnAmazon.TOS.value, days_ago=1, orders=2),
+            _placement_row(campaign, PlacementsOnAmazon.TOS.value, days_ago=2, orders=2, kenp_royalties=3),
+        ]
+    )
+
+    ad_slice = _get_slices([campaign.id])[(campaign.id, PlacementsOnAmazon.TOS.value)]
+
+    # _campaign_adjust subtracts royalties from the float spend
+    assert ad_slice.spend - ad_slice.kenp_royalties == -1.0
+    assert {
+        type(value)
+        for value in (
+            ad_slice.kenp_royalties,
+            ad_slice.impressions,
+            ad_slice.clicks,
+            ad_slice.orders,
+            ad_slice.attributed_conversions_30d,
+        )
+    } == {int}
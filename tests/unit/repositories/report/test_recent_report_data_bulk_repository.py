@@ -0,0 +1,91 @@
+import datetime
+from decimal import Decimal
+
+import mock
+import pytest
+from django.db import connection
+
+from apps.ads_api.constants import DEFAULT_BOOK_PRICE, SpReportType
+from apps.ads_api.models import DateBookPrice, Keyword, RecentReportData
+from apps.ads_api.repositories.report.recent_report_data_bulk_repository import (
+    RecentReportDataBulkRepository,
+)
+
+REPORT_DATE = datetime.date(2023, 7, 1)
+
+
+@pytest.fixture(params=["postgresql", "sqlite"])
+def database_vendor(request):
+    if request.param == "postgresql":
+        yield request.param
+    else:
+        with mock.patch.object(connection, "vendor", request.param):
+            yield request.param
+
+
+def _keyword_row(campaign, keyword_id, **kwargs):
+    fields = {
+        "campaign_id": campaign.id,
+        "date": REPORT_DATE,
+        "report_type": SpReportType.KEYWORD.value,
+        "keyword_id": keyword_id,
+        "impressions": 10,
+        "clicks": 1,
+        "spend": 0.5,
+        "sales": 0,
+        "attributed_conversions_30d": 0,
+        **kwargs,
+    }
+    return RecentReportData(**fields)
+
+
+@pytest.mark.django_db
+def test_rows_are_created_and_updated_without_duplicates(database_vendor, campaign):
+    RecentReportDataBulkRepository.upsert([_keyword_row(campaign, 1), _keyword_row(campaign, 2)])
+
+    RecentReportDataBulkRepository.upsert(
+        [
+            _keyword_row(campaign, 1, impressions=30, keyword_text='new "text", with comma'),
+            _keyword_row(campaign, 3),
+            _keyword_row(campaign, 3, impressions=50),
+        ]
+    )
+
+    assert RecentReportData.objects.count() == 3
+    updated = RecentReportData.objects.get(keyword_id=1)
+    assert updated.impressions == 30
+    assert updated.keyword_text == 'new "text", with comma'
+    assert updated.ad_id is None
+    assert RecentReportData.objects.get(keyword_id=2).impressions == 10
+    assert RecentReportData.objects.get(keyword_id=3).impressions == 50
+
+
+@pytest.mark.django_db
+def test_sales_recalculated_with_actual_book_price(database_vendor, campaign, book):
+    book.campaigns.add(campaign)
+    Keyword.objects.create(keyword_id=1, campaign=campaign)
+    Keyword.objects.create(keyword_id=2, campaign=campaign)
+    DateBookPrice.objects.filter(book=book).delete()
+    DateBookPrice.objects.create(book=book, date=datetime.date(2023, 1, 1), price=5)
+    DateBookPrice.objects.create(book=book, date=datetime.date.today(), price=7.5)
+
+    RecentReportDataBulkRepository.upsert(
+        [
+            _keyword_row(campaign, 1, sales=0, attributed_conversions_30d=2),
+            _keyword_row(campaign, 2, sales=100, attributed_conversions_30d=2),
+            _keyword_row(campaign, 3, sales=0, attributed_conversions_30d=1),
+        ]
+    )
+
+    assert RecentReportData.objects.get(keyword_id=1).sales == Decimal("15.00")
+    assert RecentReportData.objects.get(keyword_id=2).sales == Decimal("100.00")
+    assert RecentReportData.objects.get(keyword_id=3).sales == Decimal(str(DEFAULT_BOOK_PRICE))
+
+
+@pytest.mark.django_db
+def test_sales_kept_without_recalculation(database_vendor, campaign):
+    RecentReportDataBulkRepository.upsert(
+        [_keyword_row(campaign, 1, sales=1, attributed_conversions_30d=2)], recalculate_sales=False
+    )
+
+    assert RecentReportData.objects.get(keyword_id=1).sales == Decimal("1.00")
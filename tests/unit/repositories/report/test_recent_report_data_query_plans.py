@@ -0,0 +1,219 @@
+import datetime
+import json
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from apps.ads_api.constants import SpReportType
+from apps.ads_api.data_exchange import (
+    _get_keywords_and_report_data_for_bids,
+    _get_placement_updates,
+    _sum_search_terms_per_book,
+    get_converting_search_terms,
+)
+from apps.ads_api.entities.amazon_ads.reports import ReportEntity
+from apps.ads_api.models import (
+    Book,
+    Campaign,
+    Keyword,
+    Profile,
+    RecentReportData,
+    ReportDataDailyRollup,
+    Target,
+)
+from apps.ads_api.repositories.report.recent_report_data_bulk_repository import (
+    COLUMNS,
+    RecentReportDataBulkRepository,
+)
+from apps.ads_api.repositories.report.report_data_rollup_repository import (
+    ReportDataRollupRepository,
+)
+from apps.ads_api.services.reports.download_reports_service import DownloadReportsService
+
+PROFILES = 20
+CAMPAIGNS_PER_PROFILE = 10
+ENTITIES_PER_CAMPAIGN = 5
+DAYS = 30
+TODAY = datetime.date(2023, 7, 20)
+DATE_FROM = datetime.datetime(2023, 7, 6)
+ASIN = "B000000001"
+
+pytestmark = pytest.mark.skipif(connection.vendor != "postgresql", reason="query plans of PostgreSQL")
+
+
+def _seed_report_data():
+    """
+    Seeds campaigns of many profiles with a few months of keyword, target, placement and search term data,
+    so the planner has real statistics to choose between index and sequential scans
+    """
+    profiles = Profile.objects.bulk_create(
+        Profile(profile_id=i, entity_id=i, nickname=f"profile {i}", monthly_budget=10, research_percentage=20)
+        for i in range(1, PROFILES + 1)
+    )
+    campaigns = Campaign.objects.bulk_create(
+        Campaign(
+            profile=profile,
+            managed=True,
+            campaign_id_amazon=profile.profile_id * 100 + i,
+            campaign_name=f"campaign {profile.profile_id}-{i}",
+            asins=[ASIN if profile == profiles[0] else f"B{profile.profile_id:09}"],
+        )
+        for profile in profiles
+        for i in range(CAMPAIGNS_PER_PROFILE)
+    )
+    target_profile_campaigns = [campaign for campaign in campaigns if campaign.profile == profiles[0]]
+    Keyword.objects.bulk_create(
+        Keyword(keyword_id=campaign.id * 100 + i, campaign=campaign, bid=0.5)
+        for campaign in target_profile_campaigns
+        for i in range(ENTITIES_PER_CAMPAIGN)
+    )
+    Target.objects.bulk_create(
+        Target(target_id=campaign.id * 100 + i, campaign=campaign, bid=0.5)
+        for campaign in target_profile_campaigns
+        for i in range(ENTITIES_PER_CAMPAIGN)
+    )
+    book = Book.objects.create(profile=profiles[0], asin=ASIN, title="book")
+
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f"""
+            INSERT INTO {RecentReportData._meta.db_table} (
+                campaign_id, date, report_type, keyword_id, target_id, query, placement,
+                impressions, clicks, spend, sales, orders, kenp_royalties, units_sold_14d,
+                attributed_conversions_30d, top_of_search_impression_share, ad_group_name, keyword_text,
+                match_type, asin, target_expression, target_text, target_type, created_at, updated_at
+            )
+            SELECT
+                c.id, %(today)s::date - days.day, types.report_type,
+                CASE WHEN types.report_type IN (%(keyword)s, %(keyword_query)s) THEN c.id * 100 + entity.i END,
+                CASE WHEN types.report_type = %(target)s THEN c.id * 100 + entity.i END,
+                CASE WHEN types.report_type = %(keyword_query)s THEN 'search term ' || entity.i ELSE '' END,
+                CASE WHEN types.report_type = %(placement)s THEN 'Other on-Amazon' ELSE '' END,
+                10, 1, 0.5, 0, 0, 0, 0, 0, 0, '', '', '', '', '', '', '', now(), now()
+            FROM {Campaign._meta.db_table} c
+            CROSS JOIN generate_series(0, %(days)s - 1) AS days(day)
+            CROSS JOIN unnest(ARRAY[%(keyword)s, %(target)s, %(placement)s, %(keyword_query)s])
+                AS types(report_type)
+            CROSS JOIN generate_series(0, %(entities)s - 1) AS entity(i)
+            """,
+            {
+                "today": TODAY,
+                "days": DAYS,
+                "entities": ENTITIES_PER_CAMPAIGN,
+                "keyword": SpReportType.KEYWORD.value,
+                "target": SpReportType.TARGET.value,
+                "placement": SpReportType.PLACEMENT.value,
+                "keyword_query": SpReportType.KEYWORD_QUERY.value,
+            },
+        )
+        cursor.execute(f"ANALYZE {RecentReportData._meta.db_table}")
+        cursor.execute(f"ANALYZE {Campaign._meta.db_table}")
+    return profiles[0], book, target_profile_campaigns
+
+
+def _sequential_scans(sql: str, table: str) -> list[dict]:
+    with connection.cursor() as cursor:
+        cursor.execute(f"EXPLAIN (FORMAT JSON) {sql}")
+        plan = cursor.fetchone()[0]
+    if isinstance(plan, str):
+        plan = json.loads(plan)
+
+    nodes = [plan[0]["Plan"]]
+    scans = []
+    while nodes:
+        node = nodes.pop()
+        if node["Node Type"] == "Seq Scan" and node.get("Relation Name") == table:
+            scans.append(node)
+        nodes.extend(node.get("Plans", []))
+    return scans
+
+
+def assert_report_data_queries_use_indexes(queries: list[dict], model=RecentReportData):
+    """Fails if any of the captured queries reads the report data model with a sequential scan"""
+    table = model._meta.db_table
+    report_data_queries = [query["sql"] for query in queries if table in query["sql"]]
+    assert report_data_queries, "No queries of report data were captured"
+    for sql in report_data_queries:
+        # plain EXPLAIN doesn't execute the statement, so deletes are explained as well
+        assert not _sequential_scans(sql, table), f"Sequential scan of {table} in: {sql}"
+
+
+@pytest.fixture
+def seeded_report_data(db):
+    return _seed_report_data()
+
+
+@pytest.mark.freeze_time(TODAY.isoformat())
+def test_bid_queries_use_indexes(seeded_report_data):
+    profile, _, _ = seeded_report_data
+    ReportDataRollupRepository.refresh_all(TODAY - datetime.timedelta(days=DAYS), TODAY)
+    with connection.cursor() as cursor:
+        cursor.execute(f"ANALYZE {ReportDataDailyRollup._meta.db_table}")
+
+    with CaptureQueriesContext(connection) as context:
+        _, report_data_per_keyword = _get_keywords_and_report_data_for_bids(profile, DATE_FROM, 1)
+        for report_data in report_data_per_keyword.values():
+            list(report_data)
+
+    assert_report_data_queries_use_indexes(context.captured_queries, ReportDataDailyRollup)
+
+
+@pytest.mark.freeze_time(TODAY.isoformat())
+def test_placement_queries_use_indexes(seeded_report_data):
+    profile, _, _ = seeded_report_data
+
+    with CaptureQueriesContext(connection) as context:
+        _get_placement_updates(profile)
+
+    assert_report_data_queries_use_indexes(context.captured_queries)
+
+
+@pytest.mark.freeze_time(TODAY.isoformat())
+def test_search_term_queries_use_indexes(seeded_report_data):
+    profile, book, _ = seeded_report_data
+
+    with CaptureQueriesContext(connection) as context:
+        get_converting_search_terms(book)
+        _sum_search_terms_per_book(profile, [ASIN])
+
+    assert_report_data_queries_use_indexes(context.captured_queries)
+
+
+@pytest.mark.freeze_time(TODAY.isoformat())
+def test_existing_report_data_removal_uses_indexes(seeded_report_data):
+    _, _, campaigns = seeded_report_data
+    report = ReportEntity(
+        report_id="1",
+        report_type=SpReportType.KEYWORD,
+        start_date=DATE_FROM.date(),
+        end_date=TODAY,
+    )
+
+    with CaptureQueriesContext(connection) as context:
+        DownloadReportsService()._delete_existing_report_data(report, [campaign.id for campaign in campaigns])
+
+    assert_report_data_queries_use_indexes(context.captured_queries)
+
+
+def test_report_data_upsert_uses_indexes(seeded_report_data):
+    _, _, campaigns = seeded_report_data
+    rows = [
+        [getattr(report_data, column) for column in COLUMNS]
+        for report_data in RecentReportData.objects.filter(
+            campaign__in=campaigns[:2], report_type=SpReportType.KEYWORD, date=TODAY
+        )
+    ]
+    new_row = list(rows[0])
+    new_row[COLUMNS.index("date")] = TODAY + datetime.timedelta(days=1)
+    rows.append(new_row)
+
+    with CaptureQueriesContext(connection) as context:
+        RecentReportDataBulkRepository.upsert_rows(rows, recalculate_sales=False)
+
+    # staging tables are dropped only when the test's transaction ends, so the merge can be explained
+    merge_queries = [
+        query for query in context.captured_queries if query["sql"].startswith(("UPDATE", "INSERT"))
+    ]
+    assert len(merge_queries) == 2
+    assert_report_data_queries_use_indexes(merge_queries)
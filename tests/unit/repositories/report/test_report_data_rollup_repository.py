@@ -0,0 +1,145 @@
+import datetime
+import importlib
+
+import pytest
+from django.apps import apps as django_apps
+from django.db import connection
+from freezegun import freeze_time
+
+from apps.ads_api.constants import SpReportType
+from apps.ads_api.converters.report_rows_decoder import ReportRowsDecoder
+from apps.ads_api.entities.amazon_ads.reports import KeywordsReportDataEntity, ReportEntity
+from apps.ads_api.models import RecentReportData, ReportDataDailyRollup
+from apps.ads_api.repositories.report.report_data_rollup_repository import (
+    METRIC_FIELDS,
+    ReportDataRollupRepository,
+)
+from apps.ads_api.services.reports.download_reports_service import DownloadReportsService
+
+AS_OF = datetime.date(2023, 7, 20)
+
+
+def _report_data(campaign, date, report_type=SpReportType.KEYWORD, **kwargs):
+    fields = {
+        "campaign": campaign,
+        "date": date,
+        "report_type": report_type.value,
+        "impressions": 10,
+        "clicks": 2,
+        "spend": 1.5,
+        "sales": 5,
+        "orders": 1,
+        **kwargs,
+    }
+    return RecentReportData.objects.create(**fields)
+
+
+@pytest.mark.django_db
+def test_daily_rollups_sum_report_data_per_entity_and_day(campaign):
+    _report_data(campaign, AS_OF, keyword_id=1, ad_id=1)
+    _report_data(campaign, AS_OF, keyword_id=1, ad_id=2)
+    _report_data(campaign, AS_OF - datetime.timedelta(days=1), keyword_id=1)
+    _report_data(campaign, AS_OF, keyword_id=2)
+    _report_data(campaign, AS_OF, SpReportType.TARGET, target_id=1)
+
+    created = ReportDataRollupRepository.refresh(
+        [campaign.id], SpReportType.KEYWORD, AS_OF - datetime.timedelta(days=1), AS_OF
+    )
+
+    assert created == 3
+    rollup = ReportDataDailyRollup.objects.get(keyword_id=1, date=AS_OF)
+    assert rollup.impressions == 20
+    assert rollup.spend == 3
+    assert rollup.report_type == SpReportType.KEYWORD.value
+    assert not ReportDataDailyRollup.objects.filter(report_type=SpReportType.TARGET).exists()
+
+
+@pytest.mark.django_db
+def test_search_terms_and_placements_are_not_rolled_up(campaign):
+    _report_data(campaign, AS_OF, SpReportType.KEYWORD_QUERY, keyword_id=1, query="search term")
+    _report_data(campaign, AS_OF, SpReportType.PLACEMENT, placement="Top of Search on-Amazon")
+
+    for report_type in (SpReportType.KEYWORD_QUERY, SpReportType.PLACEMENT):
+        assert ReportDataRollupRepository.refresh([campaign.id], report_type, AS_OF, AS_OF) == 0
+    assert not ReportDataDailyRollup.objects.exists()
+
+
+@pytest.mark.django_db
+def test_refresh_replaces_rollups_of_refreshed_dates_only(campaign):
+    old_date = AS_OF - datetime.timedelta(days=5)
+    _report_data(campaign, old_date, keyword_id=1)
+    report_data = _report_data(campaign, AS_OF, keyword_id=1)
+    ReportDataRollupRepository.refresh([campaign.id], SpReportType.KEYWORD, old_date, AS_OF)
+
+    report_data.impressions = 100
+    report_data.save()
+    ReportDataRollupRepository.refresh([campaign.id], SpReportType.KEYWORD, AS_OF, AS_OF)
+
+    assert ReportDataDailyRollup.objects.get(date=AS_OF).impressions == 100
+    assert ReportDataDailyRollup.objects.get(date=old_date).impressions == 10
+
+
+@pytest.mark.django_db
+def test_rollups_are_pruned_with_their_report_data(campaign):
+    for days_ago in (0, 90, 91):
+        _report_data(campaign, AS_OF - datetime.timedelta(days=days_ago), keyword_id=1)
+    ReportDataRollupRepository.refresh(
+        [campaign.id], SpReportType.KEYWORD, AS_OF - datetime.timedelta(days=91), AS_OF
+    )
+
+    deleted = ReportDataRollupRepository.prune(AS_OF - datetime.timedelta(days=90))
+
+    assert deleted == 2
+    assert list(ReportDataDailyRollup.objects.values_list("date", flat=True)) == [AS_OF]
+
+
+@pytest.mark.django_db
+@freeze_time(AS_OF.isoformat())
+def test_migration_backfills_rollups_of_stored_report_data(campaign):
+    _report_data(campaign, AS_OF, keyword_id=1, ad_id=1)
+    _report_data(campaign, AS_OF, keyword_id=1, ad_id=2)
+    _report_data(campaign, AS_OF, SpReportType.KEYWORD_QUERY, keyword_id=1, query="search term")
+    _report_data(campaign, AS_OF - datetime.timedelta(days=1), SpReportType.TARGET, target_id=1)
+    _report_data(campaign, AS_OF, SpReportType.PLACEMENT, placement="Top of Search on-Amazon")
+    _report_data(campaign, AS_OF, SpReportType.CAMPAIGN)
+    _report_data(campaign, AS_OF - datetime.timedelta(days=100), keyword_id=1)
+    ReportDataRollupRepository.refresh_all(AS_OF - datetime.timedelta(days=90), AS_OF)
+    fields = ("campaign_id", "report_type", "date", "keyword_id", "target_id")
+    expected = set(ReportDataDailyRollup.objects.values_list(*fields, *METRIC_FIELDS))
+    ReportDataDailyRollup.objects.all().delete()
+
+    migration = importlib.import_module("apps.ads_api.migrations.0077_backfill_report_data_rollups")
+    with connection.schema_editor() as schema_editor:
+        migration.backfill_daily_rollups(django_apps, schema_editor)
+
+    assert len(expected) == 2
+    assert set(ReportDataDailyRollup.objects.values_list(*fields, *METRIC_FIELDS)) == expected
+
+
+@pytest.mark.django_db
+def test_rollups_are_refreshed_after_report_is_saved(campaign):
+    report = ReportEntity(report_id="1", report_type=SpReportType.KEYWORD, start_date=AS_OF, end_date=AS_OF)
+    rows = ReportRowsDecoder.for_entity(KeywordsReportDataEntity).decode(
+        [
+            {
+                "unitsSoldClicks30d": 1,
+                "sales30d": 10,
+                "kindleEditionNormalizedPagesRoyalties14d": 0,
+                "campaignId": campaign.campaign_id_amazon,
+                "cost": 2.5,
+                "purchases30d": 1,
+                "impressions": 100,
+                "clicks": 4,
+                "date": AS_OF.isoformat(),
+                "keywordId": 7,
+                "adGroupName": "ad group",
+                "matchType": "EXACT",
+                "adGroupId": 1,
+            }
+        ]
+    )
+
+    DownloadReportsService()._save_reports_data([rows], report)
+
+    rollup = ReportDataDailyRollup.objects.get()
+    assert (rollup.keyword_id, rollup.date, rollup.impressions) == (7, AS_OF, 100)
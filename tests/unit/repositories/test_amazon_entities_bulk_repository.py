@@ -0,0 +1,66 @@
+from decimal import Decimal
+
+import pytest
+
+from apps.ads_api.constants import SpState
+from apps.ads_api.models import AdGroup, ProductAd
+from apps.ads_api.repositories.amazon_entities_bulk_repository import (
+    AdGroupsBulkRepository,
+    ProductAdsBulkRepository,
+    UpsertCounts,
+)
+
+
+def _ad_group(campaign, ad_group_id, **kwargs) -> AdGroup:
+    return AdGroup(
+        campaign=campaign,
+        ad_group_id=ad_group_id,
+        ad_group_name=f"ad group {ad_group_id}",
+        state=SpState.ENABLED.value,
+        serving_status="AD_GROUP_STATUS_ENABLED",
+        last_updated_date_on_amazon=1,
+        default_bid=0.45,
+        **kwargs,
+    )
+
+
+@pytest.mark.django_db
+def test_entities_are_created_updated_or_left_unchanged(campaign, django_assert_num_queries):
+    AdGroup.objects.bulk_create([_ad_group(campaign, 1), _ad_group(campaign, 2)])
+    ad_groups = [_ad_group(campaign, 1), _ad_group(campaign, 2), _ad_group(campaign, 3)]
+    ad_groups[1].default_bid = 0.5
+
+    with django_assert_num_queries(2):
+        counts = AdGroupsBulkRepository.upsert(ad_groups)
+
+    assert counts == UpsertCounts(created=1, updated=1, unchanged=1)
+    assert dict(AdGroup.objects.values_list("ad_group_id", "default_bid")) == {
+        1: Decimal("0.45"),
+        2: Decimal("0.5"),
+        3: Decimal("0.45"),
+    }
+
+
+@pytest.mark.django_db
+def test_unchanged_entities_are_not_written(campaign):
+    AdGroup.objects.bulk_create([_ad_group(campaign, 1)])
+    updated_at = AdGroup.objects.get().updated_at
+
+    # Amazon ids are returned as strings
+    counts = AdGroupsBulkRepository.upsert([_ad_group(campaign, "1")])
+
+    assert counts == UpsertCounts(unchanged=1)
+    assert AdGroup.objects.get().updated_at == updated_at
+
+
+@pytest.mark.django_db
+def test_last_of_duplicated_entities_is_saved(campaign, ad_group):
+    product_ads = [
+        ProductAd(campaign=campaign, ad_group=ad_group, product_ad_id=7, asin=asin)
+        for asin in ("B000000001", "B000000002")
+    ]
+
+    counts = ProductAdsBulkRepository.upsert(product_ads)
+
+    assert counts == UpsertCounts(created=1)
+    assert list(ProductAd.objects.values_list("product_ad_id", "asin")) == [(7, "B000000002")]
@@ -1,7 +1,13 @@
 import pytest
 
-from apps.ads_api.constants import AdStatus, SpState
-from apps.ads_api.models import CampaignPurpose, ProductAd
+from apps.ads_api.constants import (
+    AD_GROUP_INVALID_STATUSES,
+    PRODUCT_AD_INVALID_STATUSES,
+    PRODUCT_AD_VALID_STATUSES,
+    AdStatus,
+    SpState,
+)
+from apps.ads_api.models import AdGroup, Campaign, CampaignPurpose, ProductAd
 from apps.ads_api.repositories.book.book_repository import BookRepository
 from apps.ads_api.repositories.campaign_repository import CampaignRepository
 from apps.ads_api.repositories.product_ad_repository import ProductAdRepository
@@ -85,3 +91,34 @@ def test_books_were_updated_by_contained_product_ads(
 
 def _assert_all_asins_in_campaign(campaign, expected_asins):
     assert set(campaign.books.values_list("asin", flat=True)) == set(expected_asins)
+
+
+@pytest.mark.django_db
+def test_ads_serving_status_counts_are_annotated(campaign, ad_group):
+    second_ad_group = AdGroup.objects.create(
+        ad_group_id=2, campaign=campaign, serving_status=AD_GROUP_INVALID_STATUSES[0]
+    )
+    for product_ad_id, serving_status in enumerate(
+        (PRODUCT_AD_INVALID_STATUSES[0], PRODUCT_AD_INVALID_STATUSES[1], PRODUCT_AD_VALID_STATUSES[0])
+    ):
+        ProductAd.objects.create(
+            product_ad_id=product_ad_id,
+            campaign=campaign,
+            ad_group=second_ad_group,
+            serving_status=serving_status,
+        )
+    Campaign.objects.create(campaign_id_amazon=456)
+
+    campaigns = CampaignRepository.annotate_ads_serving_status_counts(
+        Campaign.objects.order_by("campaign_id_amazon"),
+        ad_group_statuses=AD_GROUP_INVALID_STATUSES,
+        product_ad_statuses=PRODUCT_AD_INVALID_STATUSES,
+    ).values_list(
+        "campaign_id_amazon",
+        "ad_groups_in_statuses",
+        "other_ad_groups",
+        "product_ads_in_statuses",
+        "other_product_ads",
+    )
+
+    assert list(campaigns) == [(123, 1, 1, 2, 1), (456, 0, 0, 0, 0)]
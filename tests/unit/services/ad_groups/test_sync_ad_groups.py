@@ -1,4 +1,5 @@
 import datetime
+from decimal import Decimal
 
 import mock
 import pytest
@@ -6,14 +7,14 @@ from mock.mock import Mock
 
 from apps.ads_api.constants import SpState
 from apps.ads_api.entities.amazon_ads.sponsored_products.ad_group import AdGroupEntity
+from apps.ads_api.models import AdGroup
 from apps.ads_api.services.ad_groups.sync_ad_groups_service import SyncAdGroupsService
 
 
 @pytest.mark.django_db
 @mock.patch("apps.ads_api.adapters.amazon_ads.sponsored_products.ad_group_adapter.AdGroupAdapter.list")
-@mock.patch("apps.ads_api.services.ad_groups.sync_ad_groups_service.SyncAdGroupsService._update_or_create")
 class TestSyncAdGroupsService:
-    def test_update_or_create_not_called_if_no_campaign_exists(self, update_create_mock: Mock, ad_group_list_mock: Mock, profile, campaign):
+    def test_ad_group_not_created_if_no_campaign_exists(self, ad_group_list_mock: Mock, profile, campaign):
         sync_service = SyncAdGroupsService([profile.id])
         ad_group_list_mock.return_value = [AdGroupEntity(**{
             "campaign_id": "123456789",
@@ -29,10 +30,9 @@ class TestSyncAdGroupsService:
 
         sync_service.sync()
 
-        update_create_mock.assert_not_called()
+        assert not AdGroup.objects.exists()
 
-    def test_update_or_create_called_if_campaign_exists(self, update_create_mock: Mock, ad_group_list_mock: Mock, profile,
-                                                        campaign):
+    def test_ad_group_created_if_campaign_exists(self, ad_group_list_mock: Mock, profile, campaign):
         campaign.campaign_id_amazon = 123456789
         campaign.profile = profile
         campaign.save()
@@ -52,4 +52,34 @@ class TestSyncAdGroupsService:
 
         sync_service.sync()
 
-        update_create_mock.assert_called_once_with(ad_group=ad_group_entity)
+        ad_group = AdGroup.objects.get()
+        assert ad_group.campaign_id == campaign.id
+        assert ad_group.ad_group_id == 987654321
+        assert ad_group.ad_group_name == "Example Ad Group"
+        assert ad_group.default_bid == Decimal("1.5")
+
+    def test_existing_ad_group_updated(self, ad_group_list_mock: Mock, profile, campaign, ad_group):
+        campaign.campaign_id_amazon = 123456789
+        campaign.profile = profile
+        campaign.save()
+        ad_group.ad_group_id = 987654321
+        ad_group.save()
+        ad_group_list_mock.return_value = [AdGroupEntity(**{
+            "campaign_id": "123456789",
+            "external_id": "987654321",
+            "name": "Renamed Ad Group",
+            "state": SpState.PAUSED,
+            "extended_data": {
+                "serving_status": "servable",
+                "last_update_date_time": datetime.datetime.now()
+            },
+            "bid": 0.45
+        })]
+
+        SyncAdGroupsService([profile.id]).sync()
+
+        updated_ad_group = AdGroup.objects.get()
+        assert updated_ad_group.id == ad_group.id
+        assert updated_ad_group.ad_group_name == "Renamed Ad Group"
+        assert updated_ad_group.state == SpState.PAUSED.value
+        assert updated_ad_group.default_bid == Decimal("0.45")
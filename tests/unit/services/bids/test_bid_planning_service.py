@@ -0,0 +1,159 @@
+import datetime
+from unittest import mock
+
+import pytest
+
+from apps.ads_api.constants import BookData, SpReportType
+from apps.ads_api.data_exchange import _get_keywords_and_report_data_for_bids
+from apps.ads_api.models import DateBookPrice, Keyword, RecentReportData, Target
+from apps.ads_api.repositories.report.report_data_rollup_repository import (
+    ReportDataRollupRepository,
+)
+from apps.ads_api.services.bids.bid_planning_service import BidPlanningService
+
+DATE_FROM = datetime.datetime(2023, 7, 1)
+DATE_TO = datetime.date(2023, 7, 20)
+# (external_id, bid_change, pause, is_proven) in planning order, as decided by the former per keyword planning
+EXPECTED_KEYWORD_DECISIONS = [
+    (12, 0.0, False, True),
+    (9, -0.26, False, True),
+    (6, -0.23, False, True),
+    (3, -0.2, False, True),
+    (4, -0.43, False, False),
+    (8, -0.47, False, False),
+    (5, -0.44, False, False),
+    (10, -0.49, False, False),
+    (2, -0.41, False, False),
+    (7, -0.46, False, False),
+    (11, -0.5, False, False),
+    (1, -0.4, True, False),
+]
+EXPECTED_TARGET_DECISIONS = [
+    (12, 0.0, False, True),
+    (9, -0.16, False, True),
+    (6, -0.13, False, True),
+    (3, -0.1, False, True),
+    (8, 0.0, False, False),
+    (4, 0.0, False, False),
+    (1, -0.3, False, False),
+    (5, -0.34, False, False),
+    (10, -0.39, False, False),
+    (2, -0.31, False, False),
+    (7, -0.36, False, False),
+    (11, -0.4, False, False),
+]
+
+
+def _seed_keywords_and_targets(campaign, count):
+    for i in range(1, count + 1):
+        keyword = Keyword.objects.create(keyword_id=i, campaign=campaign, bid=0.5 + i / 100)
+        target = Target.objects.create(target_id=i, campaign=campaign, bid=0.4 + i / 100)
+        for model_field, entity, report_type in [
+            ("keyword_id", keyword, SpReportType.KEYWORD),
+            ("target_id", target, SpReportType.TARGET),
+        ]:
+            RecentReportData.objects.create(
+                date=datetime.datetime(2023, 7, 18),
+                report_type=report_type,
+                campaign=campaign,
+                spend=(i % 4) * 2.5,
+                clicks=i % 5,
+                impressions=i * 30,
+                sales=20 if i % 3 == 0 else 0,
+                orders=1 if i % 3 == 0 else 0,
+                **{model_field: getattr(entity, model_field)},
+            )
+
+
+@pytest.fixture
+def managed_profile_with_book(profile, campaign, book):
+    campaign.profile = profile
+    campaign.save()
+    book.profile = profile
+    book.price = 12
+    book.be_acos = 0.4
+    book.reviews = 3
+    book.save()
+    book.campaigns.add(campaign)
+    DateBookPrice.objects.create(book=book, date=datetime.date(2023, 7, 10), price=14.99)
+    be_acos_per_book = {
+        book.asin: BookData(asin=book.asin, price=float(book.price), be_acos=float(book.be_acos), reviews=3)
+    }
+    return profile, be_acos_per_book
+
+
+@pytest.mark.freeze_time("2023-07-20")
+@pytest.mark.django_db
+@mock.patch(
+    "apps.ads_api.services.profiles.proven_budget_service.ProvenBudgetService.calculate",
+    return_value=2,
+)
+@mock.patch(
+    "apps.ads_api.services.profiles.remaining_daily_budget_service.RemainingDailyBudgetService.calculate",
+    return_value=5,
+)
+def test_planned_bids_of_keywords_and_targets(
+    remaining_budget_mock, proven_budget_mock, managed_profile_with_book, campaign
+):
+    profile, be_acos_per_book = managed_profile_with_book
+    _seed_keywords_and_targets(campaign, count=12)
+    RecentReportData.objects.create(
+        date=datetime.datetime(2023, 7, 19),
+        report_type=SpReportType.KEYWORD,
+        campaign=campaign,
+        spend=30,
+        clicks=10,
+        keyword_id=1,
+    )
+    ReportDataRollupRepository.refresh_all(DATE_FROM.date(), DATE_TO)
+
+    keywords, report_data_per_keyword = _get_keywords_and_report_data_for_bids(profile, DATE_FROM, 1)
+    planned = BidPlanningService(profile, be_acos_per_book, report_data_per_keyword, keywords).plan()
+
+    for identifier_amazon, expected_decisions in [
+        ("keywordId", EXPECTED_KEYWORD_DECISIONS),
+        ("targetId", EXPECTED_TARGET_DECISIONS),
+    ]:
+        decisions = [
+            (
+                planned_bid["external_id"],
+                planned_bid["bid_change"],
+                planned_bid["pause"],
+                planned_bid["is_proven"],
+            )
+            for planned_bid in planned[identifier_amazon]
+        ]
+        assert decisions == [
+            (external_id, pytest.approx(bid_change), pause, is_proven)
+            for external_id, bid_change, pause, is_proven in expected_decisions
+        ]
+    # spend over the remaining daily budget leaves no surplus
+    assert profile.surplus_budget == 0
+
+
+@pytest.mark.freeze_time("2023-07-20")
+@pytest.mark.django_db
+@pytest.mark.parametrize("count", [6, 60])
+@mock.patch(
+    "apps.ads_api.services.profiles.proven_budget_service.ProvenBudgetService.calculate",
+    return_value=2,
+)
+@mock.patch(
+    "apps.ads_api.services.profiles.remaining_daily_budget_service.RemainingDailyBudgetService.calculate",
+    return_value=5,
+)
+def test_planning_queries_do_not_grow_with_keywords_count(
+    remaining_budget_mock,
+    proven_budget_mock,
+    count,
+    managed_profile_with_book,
+    campaign,
+    django_assert_max_num_queries,
+):
+    profile, be_acos_per_book = managed_profile_with_book
+    _seed_keywords_and_targets(campaign, count=count)
+    ReportDataRollupRepository.refresh_all(DATE_FROM.date(), DATE_TO)
+
+    keywords, report_data_per_keyword = _get_keywords_and_report_data_for_bids(profile, DATE_FROM, 1)
+    with django_assert_max_num_queries(15):
+        BidPlanningService(profile, be_acos_per_book, report_data_per_keyword, keywords).plan()
@@ -0,0 +1,64 @@
+import datetime
+
+import pytest
+
+from apps.ads_api.constants import DEFAULT_BOOK_PRICE
+from apps.ads_api.models import Book, DateBookPrice
+from apps.ads_api.services.books.book_prices_service import BookPricesService
+
+TODAY = datetime.date.today()
+
+
+@pytest.fixture
+def books_with_prices():
+    books = [Book.objects.create(title=f"book {i}", asin=f"asin{i}") for i in range(3)]
+    DateBookPrice.objects.all().delete()
+    DateBookPrice.objects.bulk_create(
+        [
+            DateBookPrice(book=books[0], date=TODAY - datetime.timedelta(days=10), price=5),
+            DateBookPrice(book=books[0], date=TODAY - datetime.timedelta(days=4), price=6),
+            DateBookPrice(book=books[0], date=TODAY + datetime.timedelta(days=1), price=7),
+            DateBookPrice(book=books[1], date=TODAY - datetime.timedelta(days=2), price=9.99),
+        ]
+    )
+    return books
+
+
+@pytest.mark.django_db
+def test_prices_of_all_books_are_resolved_with_one_query(books_with_prices, django_assert_num_queries):
+    first, second, without_price = books_with_prices
+    service = BookPricesService()
+
+    # the price query and the insert of the missing default price
+    with django_assert_num_queries(2):
+        prices = service.get_prices([first.id, second.id, without_price.id, None])
+
+    assert prices == {first.id: 6.0, second.id: 9.99, without_price.id: float(DEFAULT_BOOK_PRICE)}
+    assert DateBookPrice.objects.get(book=without_price).date == TODAY
+
+
+@pytest.mark.django_db
+def test_prices_are_cached_for_the_life_of_the_service(books_with_prices, django_assert_num_queries):
+    first, second, _ = books_with_prices
+    service = BookPricesService()
+    service.get_prices([first.id])
+
+    with django_assert_num_queries(1):
+        prices = service.get_prices([first.id, second.id])
+
+    assert prices == {first.id: 6.0, second.id: 9.99}
+
+
+@pytest.mark.django_db
+def test_prices_for_range_follow_price_changes(books_with_prices):
+    first, second, without_price = books_with_prices
+    date_from = TODAY - datetime.timedelta(days=5)
+
+    prices = BookPricesService(store_defaults=False).get_prices_for_range(
+        [first.id, second.id, without_price.id], date_from, TODAY - datetime.timedelta(days=1)
+    )
+
+    assert list(prices[first.id].values()) == [5.0, 6.0, 6.0, 6.0, 6.0]
+    assert list(prices[second.id].values()) == [DEFAULT_BOOK_PRICE] * 3 + [9.99, 9.99]
+    assert set(prices[without_price.id].values()) == {DEFAULT_BOOK_PRICE}
+    assert not DateBookPrice.objects.filter(book=without_price).exists()
@@ -4,6 +4,7 @@ from mock.mock import Mock
 
 from apps.ads_api.constants import CAMPAIGN_VALID_STATUSES, PRODUCT_AD_INVALID_STATUSES, AD_GROUP_INVALID_STATUSES, \
     CampaignServingStatus, SpState, AD_GROUP_VALID_STATUSES, PRODUCT_AD_VALID_STATUSES
+from apps.ads_api.models import AdGroup, Campaign, ProductAd, Profile
 from apps.ads_api.services.campaigns.clean_up_service import CleanUpCampaignsService
 
 
@@ -102,3 +103,40 @@ class TestCleanUpService:
         CleanUpCampaignsService.clean_up()
 
         adapter_update_mock.assert_not_called()
+
+    @mock.patch(
+        "apps.ads_api.adapters.amazon_ads.sponsored_products.campaigns_adapter.CampaignAdapter.batch_update",
+        return_value=([], [])
+    )
+    def test_campaigns_are_paused_once_with_a_batch_per_profile(self, adapter_update_mock: Mock, profile,
+                                                                django_assert_max_num_queries):
+        profiles = [profile, Profile.objects.create(profile_id=2, entity_id=2)]
+        for campaign_id, campaign_profile in enumerate(profiles + [profile], start=1):
+            campaign_profile.managed = True
+            campaign_profile.save()
+            campaign = Campaign.objects.create(
+                profile=campaign_profile,
+                managed=True,
+                campaign_id_amazon=campaign_id,
+                serving_status=CAMPAIGN_VALID_STATUSES[0],
+            )
+            for ad_group_id in range(2):
+                ad_group = AdGroup.objects.create(
+                    ad_group_id=ad_group_id, campaign=campaign, serving_status=AD_GROUP_INVALID_STATUSES[0]
+                )
+                ProductAd.objects.create(
+                    product_ad_id=ad_group_id,
+                    campaign=campaign,
+                    ad_group=ad_group,
+                    serving_status=PRODUCT_AD_VALID_STATUSES[0],
+                )
+
+        with django_assert_max_num_queries(3):
+            CleanUpCampaignsService.clean_up()
+
+        paused_per_call = [
+            sorted(campaign["campaignId"] for campaign in call.args[0])
+            for call in adapter_update_mock.call_args_list
+        ]
+        assert sorted(paused_per_call) == [["1", "3"], ["2"]]
+        assert not Campaign.objects.filter(managed=True).exists()
@@ -0,0 +1,84 @@
+import datetime
+
+import pytest
+
+from apps.ads_api.constants import SpReportType
+from apps.ads_api.models import Campaign, CampaignPurpose, Keyword, ReportDataDailyRollup
+from apps.ads_api.services.keywords.duplicate_targets_service import DuplicateTargetsService
+
+ASIN = "B000000001"
+
+
+def _keyword(campaign: Campaign, keyword_id: int, text: str, sales: float = 0, spend: float = 0) -> Keyword:
+    keyword = Keyword.objects.create(
+        keyword_id=keyword_id,
+        campaign=campaign,
+        keyword_text=text,
+        match_type="exact",
+        serving_status="TARGETING_CLAUSE_STATUS_LIVE",
+    )
+    for day in (1, 2):
+        ReportDataDailyRollup.objects.create(
+            campaign=campaign,
+            date=datetime.date(2023, 7, day),
+            report_type=SpReportType.KEYWORD.value,
+            keyword_id=keyword_id,
+            sales=sales / 2,
+            spend=spend / 2,
+        )
+    return keyword
+
+
+@pytest.fixture
+def campaigns(profile):
+    return [
+        Campaign.objects.create(
+            profile=profile, campaign_id_amazon=i, campaign_name=f"campaign {i}", asins=[ASIN]
+        )
+        for i in range(3)
+    ]
+
+
+@pytest.mark.django_db
+def test_best_selling_duplicate_is_kept(profile, campaigns):
+    _keyword(campaigns[0], 1, "best sales", sales=20, spend=10)
+    _keyword(campaigns[1], 2, "best sales", sales=30, spend=12)
+    _keyword(campaigns[2], 3, "best sales", sales=10, spend=1)
+    _keyword(campaigns[0], 4, "not duplicated", sales=0, spend=10)
+
+    assert sorted(DuplicateTargetsService(profile, Keyword).get_ids_to_pause()) == [1, 3]
+
+
+@pytest.mark.django_db
+def test_sales_ties_are_broken_by_spend(profile, campaigns):
+    _keyword(campaigns[0], 1, "same sales", sales=30, spend=12)
+    _keyword(campaigns[1], 2, "same sales", sales=30, spend=8)
+    # without sales the one which spent most keeps the data it gathered
+    _keyword(campaigns[0], 3, "no sales", spend=1)
+    _keyword(campaigns[1], 4, "no sales", spend=5)
+    _keyword(campaigns[0], 5, "nothing at all")
+    _keyword(campaigns[1], 6, "nothing at all")
+
+    assert sorted(DuplicateTargetsService(profile, Keyword).get_ids_to_pause()) == [1, 3, 6]
+
+
+@pytest.mark.django_db
+def test_single_campaign_keyword_is_kept(profile, campaigns):
+    campaigns[2].campaign_purpose = CampaignPurpose.Exact_Scale_Single
+    campaigns[2].save()
+    _keyword(campaigns[0], 1, "single", sales=30)
+    _keyword(campaigns[1], 2, "single", sales=20)
+    _keyword(campaigns[2], 3, "single")
+
+    assert sorted(DuplicateTargetsService(profile, Keyword).get_ids_to_pause()) == [1, 2]
+
+
+@pytest.mark.django_db
+def test_duplicates_are_found_with_two_queries(profile, campaigns, django_assert_num_queries):
+    for keyword_id in range(50):
+        _keyword(campaigns[keyword_id % 3], keyword_id + 1, f"text {keyword_id % 10}", sales=keyword_id)
+
+    with django_assert_num_queries(2):
+        ids_to_pause = DuplicateTargetsService(profile, Keyword).get_ids_to_pause()
+
+    assert len(ids_to_pause) == 40
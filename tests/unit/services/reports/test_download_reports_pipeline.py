@@ -0,0 +1,160 @@
+import datetime
+import threading
+
+import pytest
+from mock.mock import Mock, patch
+
+from apps.ads_api.constants import ReportStatus, ServerLocation, SpReportType
+from apps.ads_api.converters.report_rows_decoder import ReportRowsDecoder
+from apps.ads_api.entities.amazon_ads.reports import CampaignsReportDataEntity, ReportEntity
+from apps.ads_api.exceptions.ads_api.reports import NoReportDataReturned
+from apps.ads_api.models import Campaign, RecentReportData, Report
+from apps.ads_api.services.reports.download_reports_service import DownloadReportsService
+
+
+CAMPAIGN_REPORT_ROW = {
+    "unitsSoldClicks30d": 1,
+    "sales30d": 10.5,
+    "kindleEditionNormalizedPagesRoyalties14d": 0,
+    "campaignId": 1,
+    "cost": 2.5,
+    "purchases30d": 1,
+    "impressions": 100,
+    "clicks": 4,
+    "date": "2023-07-01",
+}
+
+
+def _create_pending_report(report_id: str, profile_id: int = 1):
+    return Report.objects.create(
+        report_id=report_id,
+        profile_id=profile_id,
+        report_type=SpReportType.CAMPAIGN.value,
+        report_status=ReportStatus.PENDING.value,
+        report_server=ServerLocation.EUROPE.value,
+        start_date=datetime.date(2023, 7, 1),
+        end_date=datetime.date(2023, 7, 1),
+    )
+
+
+def _refreshed_report(report_id: str, status: ReportStatus) -> ReportEntity:
+    return ReportEntity(
+        report_id=report_id,
+        report_status=status.value,
+        report_location=f"https://reports/{report_id}",
+        report_size=100,
+        start_date=datetime.date(2023, 7, 1),
+        end_date=datetime.date(2023, 7, 1),
+    )
+
+
+@pytest.mark.django_db(transaction=True)
+@patch(
+    "apps.ads_api.services.amazon.reports.download_from_amazon_service.DownloadReportService.parse_batches"
+)
+@patch("apps.ads_api.services.amazon.reports.download_from_amazon_service.DownloadReportService.fetch")
+@patch("apps.ads_api.services.amazon.reports.fetch_from_amazon_service.FetchReportDetailsService.fetch")
+def test_reports_are_saved_as_soon_as_completed(fetch_details_mock, fetch_mock, parse_mock):
+    Campaign.objects.create(campaign_id_amazon=CAMPAIGN_REPORT_ROW["campaignId"])
+    _create_pending_report("ready", profile_id=1)
+    _create_pending_report("slow", profile_id=2)
+    statuses = {
+        "ready": iter([ReportStatus.COMPLETED]),
+        "slow": iter([ReportStatus.PENDING, ReportStatus.PROCESSING, ReportStatus.COMPLETED]),
+    }
+    fetch_details_mock.side_effect = lambda report_id, profile_id: _refreshed_report(
+        report_id, next(statuses[report_id])
+    )
+    fetch_mock.return_value = Mock()
+    parse_mock.side_effect = lambda report, response: iter(
+        [ReportRowsDecoder.for_entity(CampaignsReportDataEntity).decode([CAMPAIGN_REPORT_ROW])]
+    )
+
+    service = DownloadReportsService(poll_interval_min=0.01, poll_interval_max=0.05, poll_timeout=10)
+    service.download()
+
+    assert fetch_details_mock.call_count == 4
+    assert fetch_mock.call_count == 2
+    assert set(Report.objects.values_list("report_status", flat=True)) == {
+        ReportStatus.INTERNAL_PROCESSED.value
+    }
+    assert RecentReportData.objects.filter(report_type=SpReportType.CAMPAIGN).count() == 1
+
+
+@pytest.mark.django_db(transaction=True)
+@patch("apps.ads_api.services.amazon.reports.fetch_from_amazon_service.FetchReportDetailsService.fetch")
+def test_polling_stops_after_timeout(fetch_details_mock):
+    _create_pending_report("never_ready")
+    fetch_details_mock.side_effect = lambda report_id, profile_id: _refreshed_report(
+        report_id, ReportStatus.PENDING
+    )
+
+    service = DownloadReportsService(poll_interval_min=0.01, poll_interval_max=0.02, poll_timeout=0.2)
+    service.download()
+
+    assert fetch_details_mock.call_count > 1
+    assert Report.objects.get(report_id="never_ready").report_status == ReportStatus.PENDING.value
+
+
+@pytest.mark.django_db(transaction=True)
+@patch(
+    "apps.ads_api.services.amazon.reports.download_from_amazon_service.DownloadReportService.parse_batches"
+)
+@patch("apps.ads_api.services.amazon.reports.download_from_amazon_service.DownloadReportService.fetch")
+@patch("apps.ads_api.services.amazon.reports.fetch_from_amazon_service.FetchReportDetailsService.fetch")
+def test_report_marked_as_failed_if_stream_is_broken(fetch_details_mock, fetch_mock, parse_mock):
+    campaign = Campaign.objects.create(campaign_id_amazon=CAMPAIGN_REPORT_ROW["campaignId"])
+    stored = RecentReportData.objects.create(
+        campaign=campaign,
+        report_type=SpReportType.CAMPAIGN.value,
+        date=datetime.date(2023, 7, 1),
+        impressions=50,
+        clicks=2,
+    )
+    _create_pending_report("broken")
+    fetch_details_mock.side_effect = lambda report_id, profile_id: _refreshed_report(
+        report_id, ReportStatus.COMPLETED
+    )
+    fetch_mock.return_value = Mock()
+
+    def broken_stream(report, response):
+        yield ReportRowsDecoder.for_entity(CampaignsReportDataEntity).decode([CAMPAIGN_REPORT_ROW])
+        raise NoReportDataReturned()
+
+    parse_mock.side_effect = broken_stream
+
+    service = DownloadReportsService(poll_interval_min=0.01, poll_interval_max=0.02, poll_timeout=10)
+    service.download()
+
+    assert Report.objects.get(report_id="broken").report_status == ReportStatus.INTERNAL_FAILURE.value
+    # stored data isn't replaced by the part of the report streamed before it broke
+    assert list(RecentReportData.objects.values_list("id", "impressions")) == [(stored.id, 50)]
+
+
+@pytest.mark.django_db(transaction=True)
+@patch("apps.ads_api.services.reports.download_reports_service.DownloadReportsService._save_reports_data")
+@patch(
+    "apps.ads_api.services.amazon.reports.download_from_amazon_service.DownloadReportService.parse_batches"
+)
+@patch("apps.ads_api.services.amazon.reports.download_from_amazon_service.DownloadReportService.fetch")
+@patch("apps.ads_api.services.amazon.reports.fetch_from_amazon_service.FetchReportDetailsService.fetch")
+def test_parsing_stops_if_report_data_is_not_saved(fetch_details_mock, fetch_mock, parse_mock, save_mock):
+    _create_pending_report("unsaved")
+    fetch_details_mock.side_effect = lambda report_id, profile_id: _refreshed_report(
+        report_id, ReportStatus.COMPLETED
+    )
+    fetch_mock.return_value = Mock()
+    parse_mock.side_effect = lambda report, response: iter(
+        [ReportRowsDecoder.for_entity(CampaignsReportDataEntity).decode([CAMPAIGN_REPORT_ROW])] * 10
+    )
+    save_mock.side_effect = Exception("DB is gone")
+
+    service = DownloadReportsService(
+        poll_interval_min=0.01, poll_interval_max=0.02, poll_timeout=10, queue_size=2
+    )
+    download = threading.Thread(target=service.download, daemon=True)
+    download.start()
+    download.join(timeout=10)
+
+    assert not download.is_alive()
+    assert Report.objects.get(report_id="unsaved").report_status == ReportStatus.INTERNAL_FAILURE.value
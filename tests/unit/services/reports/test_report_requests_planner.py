@@ -0,0 +1,114 @@
+import datetime
+
+import pytest
+from django.utils import timezone
+from freezegun import freeze_time
+
+from apps.ads_api.constants import ReportStatus, SpReportType
+from apps.ads_api.models import RecentReportData, Report
+from apps.ads_api.services.reports.report_requests_planner import (
+    PlannedReportRequest,
+    ReportRequestsPlanner,
+)
+
+NOW = "2023-07-20T12:00:00Z"
+
+
+def _date(month: int, day: int) -> datetime.date:
+    return datetime.date(2023, month, day)
+
+
+def _at(month: int, day: int, hour: int = 0) -> datetime.datetime:
+    return timezone.make_aware(datetime.datetime(2023, month, day, hour))
+
+
+def _report(profile_id, start_date, end_date, requested_at, status=ReportStatus.INTERNAL_PROCESSED) -> Report:
+    report = Report.objects.create(
+        report_id=f"{profile_id}-{start_date}-{end_date}",
+        profile_id=profile_id,
+        report_type=SpReportType.CAMPAIGN.value,
+        report_status=status.value,
+        start_date=start_date,
+        end_date=end_date,
+    )
+    Report.objects.filter(pk=report.pk).update(updated_at=requested_at)
+    return report
+
+
+def _plan(profile, start_date, end_date) -> list[PlannedReportRequest]:
+    return ReportRequestsPlanner().plan([profile.profile_id], [SpReportType.CAMPAIGN], start_date, end_date)
+
+
+@pytest.mark.django_db
+@freeze_time(NOW)
+def test_missing_days_are_requested_in_windows_of_at_most_31_days(profile):
+    assert [
+        (request.start_date, request.end_date) for request in _plan(profile, _date(4, 16), _date(7, 20))
+    ] == [
+        (_date(4, 16), _date(5, 16)),
+        (_date(5, 17), _date(6, 16)),
+        (_date(6, 17), _date(7, 17)),
+        (_date(7, 18), _date(7, 20)),
+    ]
+
+
+@pytest.mark.django_db
+@freeze_time(NOW)
+def test_final_days_are_not_requested_again(profile, campaign):
+    campaign.profile = profile
+    campaign.save()
+
+    # requested when the days couldn't get more conversions attributed
+    _report(profile.profile_id, _date(6, 1), _date(6, 15), requested_at=_at(7, 19))
+    # downloaded a few days after, more conversions could be attributed since then
+    RecentReportData.objects.create(
+        campaign=campaign, date=_date(6, 25), report_type=SpReportType.CAMPAIGN.value
+    )
+    RecentReportData.objects.filter(date=_date(6, 25)).update(created_at=_at(7, 1))
+
+    assert _plan(profile, _date(6, 1), _date(6, 30)) == [
+        PlannedReportRequest(profile.profile_id, SpReportType.CAMPAIGN, _date(6, 16), _date(6, 30))
+    ]
+
+
+@pytest.mark.django_db
+@freeze_time(NOW)
+def test_overlapping_windows_are_requested_once_per_run(profile):
+    _report(
+        profile.profile_id,
+        _date(7, 6),
+        _date(7, 20),
+        requested_at=_at(7, 20, hour=11),
+        status=ReportStatus.PENDING,
+    )
+    _report(
+        profile.profile_id,
+        _date(7, 1),
+        _date(7, 5),
+        requested_at=_at(7, 20, hour=11),
+        status=ReportStatus.FAILURE,
+    )
+
+    assert _plan(profile, _date(7, 17), _date(7, 20)) == []
+    assert [
+        (request.start_date, request.end_date) for request in _plan(profile, _date(7, 1), _date(7, 20))
+    ] == [(_date(7, 1), _date(7, 5))]
+
+
+@pytest.mark.django_db
+@freeze_time(NOW)
+def test_days_of_reports_not_saved_are_requested_again(profile):
+    # requested long enough after the days, but stuck at Amazon or never downloaded
+    _report(
+        profile.profile_id, _date(6, 1), _date(6, 5), requested_at=_at(7, 19), status=ReportStatus.PENDING
+    )
+    _report(
+        profile.profile_id, _date(6, 6), _date(6, 10), requested_at=_at(7, 19), status=ReportStatus.COMPLETED
+    )
+    _report(
+        profile.profile_id, _date(6, 11), _date(6, 15), requested_at=_at(7, 19), status=ReportStatus.EMPTY
+    )
+
+    assert _plan(profile, _date(6, 1), _date(6, 15)) == [
+        PlannedReportRequest(profile.profile_id, SpReportType.CAMPAIGN, _date(6, 1), _date(6, 10))
+    ]
@@ -0,0 +1,171 @@
+import datetime
+import gzip
+import json
+import time
+
+import mock
+import pytest
+import requests
+
+from apps.ads_api.adapters.amazon_ads.rate_limiter import AmazonAdsRateLimiter
+from apps.ads_api.adapters.amazon_ads.reports_adapter import ReportsAdapter
+from apps.ads_api.adapters.amazon_ads.sponsored_products.campaigns_adapter import CampaignAdapter
+from apps.ads_api.adapters.amazon_ads.sponsored_products.keywords_adapter import KeywordsAdapter
+from apps.ads_api.adapters.amazon_ads.sponsored_products.targets_adapter import TargetsAdapter
+from apps.ads_api.authenticators.amazon_ads_authentificator import AmazonAuthenticator
+from apps.ads_api.constants import AuthURL, BaseURL, ServerLocation, SpReportType
+from apps.ads_api.entities.amazon_ads.sponsored_products.search_filters import IdFilter, TargetSearchFilter
+from apps.ads_api.entities.internal.token import Token
+from apps.ads_api.models import Profile
+from apps.ads_api.services.amazon.reports.download_from_amazon_service import DownloadReportService
+from apps.ads_api.services.amazon.reports.fetch_from_amazon_service import FetchReportDetailsService
+from apps.ads_api.simulator.fixtures import SimulatorFixtures
+from apps.ads_api.simulator.server import AdsApiSimulator, SimulatorConfig
+from apps.utils.token_holder import TokenHolder
+
+PROFILE_ID = 1
+
+
+@pytest.fixture(autouse=True)
+def clean_rate_limiter():
+    AmazonAdsRateLimiter.reset()
+    TokenHolder.reset()
+    yield
+    AmazonAdsRateLimiter.reset()
+    TokenHolder.reset()
+
+
+@pytest.fixture
+def fixtures() -> SimulatorFixtures:
+    return SimulatorFixtures.generate(
+        [PROFILE_ID], campaigns=4, keywords_per_campaign=5, targets_per_campaign=6, seed=1
+    )
+
+
+@pytest.fixture
+def start_simulator(fixtures):
+    """Starts the simulator with the given config and points adapters of all regions at it"""
+    started = []
+
+    def _start(**config) -> AdsApiSimulator:
+        simulator = AdsApiSimulator(fixtures, SimulatorConfig(**config)).start()
+        started.append(simulator)
+        base_urls, auth_urls = simulator.url_maps()
+        for patcher in (mock.patch.dict(BaseURL, base_urls), mock.patch.dict(AuthURL, auth_urls)):
+            patcher.start()
+        access_token, _, expired = AmazonAuthenticator(ServerLocation.NORTH_AMERICA).get_access_token()
+        TokenHolder.keep(
+            f"amazon_ads_{ServerLocation.NORTH_AMERICA}", Token(value=access_token, expired=expired)
+        )
+        return simulator
+
+    yield _start
+    mock.patch.stopall()
+    for simulator in started:
+        simulator.stop()
+
+
+@pytest.fixture
+def profile() -> Profile:
+    return Profile(profile_id=PROFILE_ID, profile_server=ServerLocation.NORTH_AMERICA)
+
+
+def test_lists_are_paginated_with_next_token(start_simulator, profile):
+    simulator = start_simulator(page_size=3)
+
+    keywords = KeywordsAdapter(profile).list()
+
+    # 2 keyword campaigns with 5 keywords each
+    assert len(keywords) == 10
+    assert len({keyword.external_id for keyword in keywords}) == 10
+    assert simulator.stats["POST /sp/keywords/list"] == 4
+
+
+def test_lists_are_filtered_by_ids(start_simulator, profile, fixtures):
+    start_simulator()
+    campaign_id = fixtures.entities(PROFILE_ID, "campaigns")[1]["campaignId"]
+
+    targets = TargetsAdapter(profile).list(
+        TargetSearchFilter(campaignIdFilter=IdFilter(include=[campaign_id]))
+    )
+
+    assert len(targets) == 6
+    assert {target.campaign_id for target in targets} == {campaign_id}
+
+
+def test_updates_are_applied_to_fixtures(start_simulator, profile, fixtures):
+    start_simulator()
+    campaign_id = fixtures.entities(PROFILE_ID, "campaigns")[0]["campaignId"]
+
+    success, errors = CampaignAdapter(profile).batch_update(
+        [{"campaignId": campaign_id, "state": "PAUSED"}, {"campaignId": "404", "state": "PAUSED"}]
+    )
+
+    assert success == [campaign_id]
+    assert len(errors) == 1
+    assert fixtures.entities(PROFILE_ID, "campaigns")[0]["state"] == "PAUSED"
+
+
+@mock.patch("apps.ads_api.adapters.amazon_ads.rate_limiter.ADS_API_RATE_LIMIT_BURST", 100)
+@mock.patch("apps.ads_api.adapters.amazon_ads.rate_limiter.ADS_API_REQUESTS_PER_SECOND", 1000)
+def test_throttled_requests_are_retried_after_quota_refills(start_simulator, profile):
+    simulator = start_simulator(page_size=1, requests_per_second=20, burst=2, retry_after=0.1)
+
+    keywords = KeywordsAdapter(profile).list()
+
+    assert len(keywords) == 10
+    assert simulator.stats["throttled"] > 0
+    assert simulator.stats["POST /sp/keywords/list"] == 10 + simulator.stats["throttled"]
+
+
+def test_reports_are_generated_and_downloaded(start_simulator):
+    start_simulator(report_generation_seconds=0.2)
+    adapter = ReportsAdapter(
+        report_type=SpReportType.KEYWORD,
+        server=ServerLocation.NORTH_AMERICA,
+        start_date=datetime.date(2023, 7, 1),
+        end_date=datetime.date(2023, 7, 2),
+    )
+
+    report = adapter.create_report_request_for_profile(PROFILE_ID)
+    fetched = FetchReportDetailsService(ServerLocation.NORTH_AMERICA).fetch(report.report_id, PROFILE_ID)
+    assert fetched.report_status == "PENDING"
+    time.sleep(0.2)
+    fetched = FetchReportDetailsService(ServerLocation.NORTH_AMERICA).fetch(report.report_id, PROFILE_ID)
+    assert fetched.report_status == "COMPLETED"
+
+    report.report_location = fetched.report_location
+    rows = DownloadReportService().download(report)
+
+    # 2 days of 10 keywords
+    assert len(rows) == 20
+
+
+def test_report_files_are_gzipped_json_arrays(start_simulator, fixtures):
+    simulator = start_simulator()
+    request = {
+        "startDate": "2023-07-01",
+        "endDate": "2023-07-03",
+        "configuration": {
+            "reportTypeId": "spCampaigns",
+            "groupBy": ["campaign", "campaignPlacement"],
+            "columns": ["date", "campaignId", "placementClassification", "impressions", "clicks"],
+        },
+    }
+
+    report = simulator.create_report(PROFILE_ID, request)
+    report = simulator.get_report(report["reportId"], simulator.url)
+    rows = json.loads(gzip.decompress(simulator.get_report_file(report["reportId"])))
+
+    # 3 days of 4 campaigns on 3 placements
+    assert len(rows) == 36
+    assert report["fileSize"] == len(simulator.get_report_file(report["reportId"]))
+    assert set(rows[0]) == {"date", "campaignId", "placementClassification", "impressions", "clicks"}
+
+
+def test_requests_without_token_are_unauthorized(start_simulator):
+    simulator = start_simulator()
+
+    response = requests.post(f"{simulator.url}/sp/campaigns/list", json={})
+
+    assert response.status_code == 401
@@ -0,0 +1,71 @@
+import datetime
+
+import pytest
+
+from apps.ads_api.constants import QUERY_TYPES, BookData, SpReportType
+from apps.ads_api.data_exchange import _move_search_terms
+from apps.ads_api.models import Book, Campaign, Keyword, RecentReportData
+
+KEYWORD_QUERY = QUERY_TYPES[0]
+TODAY = datetime.date(2023, 7, 20)
+
+
+def _search_term(campaign: Campaign, query: str, sales: float, spend: float, days_ago: int = 0):
+    return RecentReportData(
+        campaign=campaign,
+        date=TODAY - datetime.timedelta(days=days_ago),
+        report_type=SpReportType.KEYWORD_QUERY.value,
+        query=query,
+        sales=sales,
+        spend=spend,
+        clicks=1,
+        impressions=10,
+    )
+
+
+@pytest.fixture
+def books_search_terms(profile):
+    for asin in ("B000000001", "B000000002"):
+        Book.objects.create(profile=profile, asin=asin, title=asin)
+    single_book = Campaign.objects.create(profile=profile, campaign_id_amazon=1, asins=["B000000001"])
+    both_books = Campaign.objects.create(
+        profile=profile, campaign_id_amazon=2, asins=["B000000001", "B000000002"]
+    )
+    RecentReportData.objects.bulk_create(
+        [
+            _search_term(single_book, "good term", sales=15, spend=2.5),
+            _search_term(single_book, "good term", sales=15, spend=2.5, days_ago=1),
+            _search_term(single_book, "bad term", sales=25, spend=20),
+            _search_term(single_book, "no sales term", sales=0, spend=12),
+            _search_term(single_book, "known negative", sales=0, spend=12),
+            _search_term(single_book, "known positive", sales=30, spend=5),
+            _search_term(single_book, "b000000009", sales=0, spend=12),
+            _search_term(both_books, "shared term", sales=30, spend=5),
+        ]
+    )
+    Keyword.objects.create(
+        keyword_id=1, campaign=single_book, keyword_type="Negative", keyword_text="known negative"
+    )
+    Keyword.objects.create(
+        keyword_id=2,
+        campaign=single_book,
+        keyword_text="known positive",
+        match_type="exact",
+        serving_status="TARGETING_CLAUSE_STATUS_LIVE",
+    )
+
+
+@pytest.mark.django_db
+def test_search_terms_of_all_books_graduate_with_constant_number_of_queries(
+    profile, books_search_terms, django_assert_num_queries
+):
+    book_data = [
+        BookData(asin=asin, price=10, be_acos=0.5, reviews=0) for asin in ("B000000001", "B000000002")
+    ]
+
+    # search terms, existing negatives and existing positives of all books
+    with django_assert_num_queries(3):
+        positives, negatives = _move_search_terms(profile=profile, book_data=book_data, query=KEYWORD_QUERY)
+
+    assert positives == {"B000000001": ["good term", "shared term"], "B000000002": ["shared term"]}
+    assert negatives == {"B000000001": ["bad term", "no sales term"]}
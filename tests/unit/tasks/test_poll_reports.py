@@ -0,0 +1,133 @@
+import datetime
+
+import mock
+import pytest
+from celery.exceptions import Retry
+from django.utils import timezone
+
+from apps.ads_api.constants import ReportStatus, ServerLocation, SpReportType
+from apps.ads_api.converters.report_rows_decoder import ReportRowsDecoder
+from apps.ads_api.entities.amazon_ads.reports import CampaignsReportDataEntity, ReportEntity
+from apps.ads_api.models import Campaign, RecentReportData, Report
+from apps.ads_api.tasks import sp_download_report, sp_poll_reports
+
+CAMPAIGN_REPORT_ROW = {
+    "unitsSoldClicks30d": 1,
+    "sales30d": 10.5,
+    "kindleEditionNormalizedPagesRoyalties14d": 0,
+    "campaignId": 1,
+    "cost": 2.5,
+    "purchases30d": 1,
+    "impressions": 100,
+    "clicks": 4,
+    "date": "2023-07-01",
+}
+ON_COMPLETE = {"task": "apps.ads_api.tasks.sync_sp_data", "args": [], "kwargs": {}, "options": {}}
+
+
+def _create_pending_report(report_id: str, profile_id: int):
+    return Report.objects.create(
+        report_id=report_id,
+        profile_id=profile_id,
+        report_type=SpReportType.CAMPAIGN.value,
+        report_status=ReportStatus.PENDING.value,
+        report_server=ServerLocation.EUROPE.value,
+    )
+
+
+def _refreshed_report(report_id: str, status: ReportStatus) -> ReportEntity:
+    return ReportEntity(
+        report_id=report_id,
+        report_status=status.value,
+        report_location=f"https://reports/{report_id}",
+        report_size=100,
+        start_date=datetime.date(2023, 7, 1),
+        end_date=datetime.date(2023, 7, 1),
+    )
+
+
+def _poll(requested_at: datetime.datetime):
+    with mock.patch.object(sp_poll_reports, "retry", side_effect=Retry()) as retry_mock:
+        with mock.patch("apps.ads_api.tasks.maybe_signature") as signature_mock:
+            sp_poll_reports.apply(
+                kwargs={
+                    "managed_profiles_ids": [1, 2],
+                    "requested_at": requested_at.isoformat(),
+                    "on_complete": ON_COMPLETE,
+                }
+            )
+    return retry_mock, signature_mock
+
+
+@pytest.mark.django_db(transaction=True)
+@mock.patch.object(
+    sp_download_report, "delay", side_effect=lambda report: sp_download_report.apply(args=(report,))
+)
+@mock.patch(
+    "apps.ads_api.services.amazon.reports.download_from_amazon_service.DownloadReportService.parse_batches"
+)
+@mock.patch("apps.ads_api.services.amazon.reports.download_from_amazon_service.DownloadReportService.fetch")
+@mock.patch("apps.ads_api.services.amazon.reports.fetch_from_amazon_service.FetchReportDetailsService.fetch")
+def test_bids_are_triggered_once_reports_of_all_profiles_are_saved(
+    fetch_details_mock, fetch_mock, parse_mock, download_mock
+):
+    Campaign.objects.create(campaign_id_amazon=CAMPAIGN_REPORT_ROW["campaignId"])
+    _create_pending_report("ready", profile_id=1)
+    _create_pending_report("slow", profile_id=2)
+    statuses = {
+        "ready": iter([ReportStatus.COMPLETED]),
+        "slow": iter([ReportStatus.PROCESSING, ReportStatus.COMPLETED]),
+    }
+    fetch_details_mock.side_effect = lambda report_id, profile_id: _refreshed_report(
+        report_id, next(statuses[report_id])
+    )
+    parse_mock.side_effect = lambda report, response: iter(
+        [ReportRowsDecoder.for_entity(CampaignsReportDataEntity).decode([CAMPAIGN_REPORT_ROW])]
+    )
+    requested_at = timezone.now()
+
+    retry_mock, signature_mock = _poll(requested_at)
+
+    assert download_mock.call_count == 1
+    assert Report.objects.get(report_id="ready").report_status == ReportStatus.INTERNAL_PROCESSED.value
+    retry_mock.assert_called_once()
+    signature_mock.assert_not_called()
+
+    retry_mock, signature_mock = _poll(requested_at)
+
+    assert download_mock.call_count == 2
+    assert set(Report.objects.values_list("report_status", flat=True)) == {
+        ReportStatus.INTERNAL_PROCESSED.value
+    }
+    assert RecentReportData.objects.count() == 1
+    retry_mock.assert_not_called()
+    signature_mock.assert_called_once_with(ON_COMPLETE, app=mock.ANY)
+    signature_mock.return_value.apply_async.assert_called_once()
+
+
+@pytest.mark.django_db(transaction=True)
+@mock.patch("apps.ads_api.tasks.REPORTS_POLL_TIMEOUT", 3600)
+@mock.patch("apps.ads_api.services.amazon.reports.fetch_from_amazon_service.FetchReportDetailsService.fetch")
+def test_bids_are_triggered_when_reports_are_still_pending_after_timeout(fetch_details_mock):
+    _create_pending_report("slow", profile_id=1)
+    fetch_details_mock.side_effect = lambda report_id, profile_id: _refreshed_report(
+        report_id, ReportStatus.PROCESSING
+    )
+
+    retry_mock, signature_mock = _poll(timezone.now() - datetime.timedelta(hours=2))
+
+    retry_mock.assert_not_called()
+    signature_mock.return_value.apply_async.assert_called_once()
+
+
+@pytest.mark.django_db
+@mock.patch("apps.ads_api.services.amazon.reports.download_from_amazon_service.DownloadReportService.fetch")
+def test_failed_download_is_not_waited_for(fetch_mock):
+    _create_pending_report("broken", profile_id=1)
+    Report.objects.update(report_status=ReportStatus.COMPLETED.value)
+    fetch_mock.side_effect = ConnectionError()
+
+    result = sp_download_report.apply(args=(_refreshed_report("broken", ReportStatus.COMPLETED).json(),))
+
+    assert isinstance(result.result, ConnectionError)
+    assert Report.objects.get().report_status == ReportStatus.INTERNAL_FAILURE.value
@@ -140,6 +140,32 @@ class TestRetryServiceForCampaignsWithInvalidStatus:
             4,
         }
 
+    @pytest.mark.django_db
+    def test_campaign_is_retrieved_once_with_its_product_ad_to_retry(self, invalid_ad_groups, profile):
+        campaign = Campaign.objects.get(campaign_id_amazon=3)
+        ad_group = AdGroup.objects.create(ad_group_id=5, ad_group_name="second_ad_group", campaign=campaign)
+        for product_ad_id in (0, 5):
+            ProductAd.objects.create(
+                product_ad_id=product_ad_id,
+                campaign=campaign,
+                ad_group=ad_group,
+                serving_status=ProductAdServingStatus.ADVERTISER_STATUS_ENABLED.value,
+            )
+
+        retry_service = RetryServiceForCampaignsWithInvalidStatus([profile])
+        invalid_campaigns = [
+            invalid_campaign
+            for invalid_campaign in retry_service._retrieve_invalid_campaigns(profile)
+            if invalid_campaign["campaign_id_amazon"] == 3
+        ]
+
+        assert len(invalid_campaigns) == 1
+        assert invalid_campaigns[0]["product_ads__product_ad_id"] == 1
+        assert (
+            invalid_campaigns[0]["product_ads__serving_status"]
+            == ProductAdServingStatus.AD_MISSING_DECORATION.value
+        )
+
     @pytest.mark.parametrize("campaign_to_recreate", campaigns_to_fill_up_with_keywords_strategy)
     @mock.patch("apps.ads_api.tasks.RetryServiceForCampaignsWithInvalidStatus._fill_campaign_with_keywords")
     def test_retry_strategy_fill_up_with_keywords_called(
@@ -0,0 +1,137 @@
+from decimal import Decimal
+
+import mock
+import pytest
+from freezegun import freeze_time
+
+from apps.ads_api.constants import SpEndpoint
+from apps.ads_api.data_exchange import sync_keywords
+from apps.ads_api.entities.amazon_ads.sponsored_products.keywords import KeywordEntity
+from apps.ads_api.models import AdGroup, Campaign, Keyword, SyncWatermark
+
+FIRST_SYNC = "2023-07-20T10:00:00Z"
+SECOND_SYNC = "2023-07-20T12:00:00Z"
+
+
+def _keyword_entity(keyword_id: int, campaign_id: int, bid: float, last_updated: str) -> KeywordEntity:
+    return KeywordEntity.parse_obj(
+        {
+            "keywordId": str(keyword_id),
+            "campaignId": str(campaign_id),
+            "adGroupId": str(campaign_id),
+            "keywordText": f"keyword {keyword_id}",
+            "matchType": "EXACT",
+            "state": "ENABLED",
+            "bid": bid,
+            "extendedData": {
+                "lastUpdateDateTime": last_updated,
+                "servingStatus": "TARGETING_CLAUSE_STATUS_LIVE",
+            },
+        }
+    )
+
+
+@pytest.fixture
+def managed_campaigns(profile):
+    campaigns = []
+    for campaign_id in (1, 2):
+        campaign = Campaign.objects.create(
+            profile=profile,
+            managed=True,
+            campaign_id_amazon=campaign_id,
+            sponsoring_type="sponsoredProducts",
+        )
+        AdGroup.objects.create(ad_group_id=campaign_id, campaign=campaign)
+        campaigns.append(campaign)
+    return campaigns
+
+
+def _sync_keywords(profile, keywords: list[KeywordEntity]):
+    with mock.patch("apps.ads_api.data_exchange.KeywordsAdapter") as adapter_mock:
+        adapter_mock.return_value.iter_list_concurrently.side_effect = lambda search_filters: iter(keywords)
+        sync_keywords(endpoint=SpEndpoint.KEYWORDS, profile_ids=[profile.id])
+
+
+@pytest.mark.django_db
+def test_first_sync_is_full_and_sets_watermark(profile, managed_campaigns):
+    with freeze_time(FIRST_SYNC):
+        _sync_keywords(
+            profile,
+            [
+                _keyword_entity(10, campaign_id=1, bid=0.5, last_updated="2023-07-19T08:00:00Z"),
+                _keyword_entity(11, campaign_id=1, bid=0.6, last_updated="2023-07-20T09:00:00Z"),
+            ],
+        )
+
+    assert Keyword.objects.count() == 2
+    watermark = SyncWatermark.objects.get(profile=profile, endpoint=SpEndpoint.KEYWORDS.value)
+    assert watermark.last_updated_date_on_amazon == 1689843600000
+    assert watermark.full_synced_at is not None
+
+
+@pytest.mark.django_db
+def test_incremental_sync_processes_only_keywords_updated_since_watermark(profile, managed_campaigns):
+    with freeze_time(FIRST_SYNC):
+        _sync_keywords(
+            profile,
+            [
+                _keyword_entity(10, campaign_id=1, bid=0.5, last_updated="2023-07-19T08:00:00Z"),
+                _keyword_entity(11, campaign_id=1, bid=0.6, last_updated="2023-07-20T09:00:00Z"),
+            ],
+        )
+    # local changes of keywords not updated on Amazon are left to the full sync
+    Keyword.objects.filter(keyword_id=10).update(bid=1)
+
+    with freeze_time(SECOND_SYNC):
+        _sync_keywords(
+            profile,
+            [
+                _keyword_entity(10, campaign_id=1, bid=0.5, last_updated="2023-07-19T08:00:00Z"),
+                _keyword_entity(11, campaign_id=1, bid=0.9, last_updated="2023-07-20T11:00:00Z"),
+                # campaign 2 had no keywords synced yet, its keywords are new regardless of their updates
+                _keyword_entity(20, campaign_id=2, bid=0.7, last_updated="2023-07-01T08:00:00Z"),
+            ],
+        )
+
+    assert dict(Keyword.objects.values_list("keyword_id", "bid")) == {
+        10: Decimal("1.00"),
+        11: Decimal("0.90"),
+        20: Decimal("0.70"),
+    }
+    assert SyncWatermark.objects.get().last_updated_date_on_amazon == 1689850800000
+
+
+@pytest.mark.django_db
+@mock.patch("apps.ads_api.repositories.sync_watermark_repository.SYNC_KEYWORDS_FULL_RESYNC_HOURS", 24)
+def test_full_sync_is_done_when_last_one_is_older_than_resync_period(profile, managed_campaigns):
+    keywords = [_keyword_entity(10, campaign_id=1, bid=0.5, last_updated="2023-07-19T08:00:00Z")]
+    with freeze_time(FIRST_SYNC):
+        _sync_keywords(profile, keywords)
+    Keyword.objects.filter(keyword_id=10).update(bid=1)
+
+    with freeze_time("2023-07-21T11:00:00Z"):
+        _sync_keywords(profile, keywords)
+
+    assert Keyword.objects.get().bid == Decimal("0.50")
+
+
+@pytest.mark.django_db
+def test_unchanged_keywords_are_not_updated(profile, managed_campaigns):
+    keywords = [
+        _keyword_entity(10, campaign_id=1, bid=0.5, last_updated="2023-07-19T08:00:00Z"),
+        _keyword_entity(11, campaign_id=2, bid=0.6, last_updated="2023-07-19T08:00:00Z"),
+    ]
+    _sync_keywords(profile, keywords)
+    keywords[1] = _keyword_entity(11, campaign_id=2, bid=0.8, last_updated="2023-07-19T09:00:00Z")
+
+    with mock.patch("apps.ads_api.data_exchange.SyncWatermarkRepository.get_last_updated", return_value=None):
+        with mock.patch.object(
+            Keyword.objects, "bulk_update", wraps=Keyword.objects.bulk_update
+        ) as update_mock:
+            _sync_keywords(profile, keywords)
+
+    assert [keyword.keyword_id for keyword in update_mock.call_args[0][0]] == [11]
+    assert dict(Keyword.objects.values_list("keyword_id", "bid")) == {
+        10: Decimal("0.50"),
+        11: Decimal("0.80"),
+    }
@@ -0,0 +1,63 @@
+import mock
+import pytest
+from celery.canvas import _chord
+from celery.exceptions import Retry
+from django.test import override_settings
+
+from apps.ads_api.constants import ServerLocation
+from apps.ads_api.models import Campaign, Keyword, Profile, Target
+from apps.ads_api.tasks import sync_sp_data, update_sp_bids_status_shard
+from apps.utils.celery_task_locker import CeleryTaskSemaphore
+
+LOCAL_CACHE = {"default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"}}
+
+
+def _managed_profile(profile_id: int, keywords: int, server=ServerLocation.EUROPE) -> Profile:
+    profile = Profile.objects.create(
+        profile_id=profile_id, entity_id=profile_id, managed=True, profile_server=server
+    )
+    campaign = Campaign.objects.create(profile=profile, campaign_id_amazon=profile_id)
+    Keyword.objects.bulk_create(Keyword(keyword_id=i, campaign=campaign) for i in range(keywords))
+    Target.objects.create(target_id=profile_id, campaign=campaign)
+    return profile
+
+
+@pytest.mark.django_db
+@mock.patch("apps.ads_api.tasks.SYNC_SP_BIDS_SHARDS_PER_REGION", 2)
+@mock.patch("apps.ads_api.tasks.chain")
+def test_bids_are_updated_in_weighted_shards_per_region_after_reports_are_saved(chain_mock):
+    heavy = _managed_profile(1, keywords=10)
+    light = [_managed_profile(profile_id, keywords=2) for profile_id in (2, 3, 4)]
+    far_east = _managed_profile(5, keywords=1, server=ServerLocation.FAR_EAST)
+
+    sync_sp_data([ServerLocation.EUROPE, ServerLocation.FAR_EAST])
+
+    poll_reports = chain_mock.call_args[0][0].tasks[-1]
+    assert poll_reports.name.rsplit(".", 1)[-1] == "sp_poll_reports"
+    bids_chord = poll_reports.kwargs["on_complete"]
+    assert isinstance(bids_chord, _chord)
+    shards = [(task.args[1], sorted(task.args[0])) for task in bids_chord.tasks]
+    assert shards == [
+        (ServerLocation.EUROPE, [heavy.pk]),
+        (ServerLocation.EUROPE, sorted(profile.pk for profile in light)),
+        (ServerLocation.FAR_EAST, [far_east.pk]),
+    ]
+    assert {task.name.rsplit(".", 1)[-1] for task in bids_chord.body.tasks} == {
+        "udpate_sp_placements",
+        "reset_gp_bids",
+    }
+
+
+@override_settings(CACHES=LOCAL_CACHE)
+@mock.patch("apps.ads_api.tasks.SYNC_SP_BIDS_REGION_CONCURRENCY", 1)
+@mock.patch("apps.ads_api.data_exchange.update_sp_bids_status")
+def test_shard_is_retried_while_region_concurrency_is_exhausted(update_mock):
+    semaphore_name = f"{update_sp_bids_status_shard.__name__}-{ServerLocation.EUROPE}"
+
+    with CeleryTaskSemaphore(semaphore_name, limit=1, oid="other shard"):
+        with mock.patch.object(update_sp_bids_status_shard, "retry", side_effect=Retry()) as retry_mock:
+            update_sp_bids_status_shard.apply(args=([1], ServerLocation.EUROPE))
+    update_sp_bids_status_shard.apply(args=([1], ServerLocation.EUROPE))
+
+    retry_mock.assert_called_once()
+    update_mock.assert_called_once_with([1])
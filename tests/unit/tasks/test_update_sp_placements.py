@@ -0,0 +1,83 @@
+import datetime
+
+import mock
+import pytest
+
+from apps.ads_api.constants import PlacementsOnAmazon, ServerLocation, SpReportType
+from apps.ads_api.data_exchange import udpate_sp_placements
+from apps.ads_api.exceptions.ads_api.base import BaseAmazonAdsException
+from apps.ads_api.models import Campaign, Profile, RecentReportData
+
+
+def _profile_with_campaign(profile_id: int, server: ServerLocation) -> Profile:
+    profile = Profile.objects.create(
+        profile_id=profile_id, entity_id=profile_id, managed=True, profile_server=server
+    )
+    campaign = Campaign.objects.create(
+        profile=profile,
+        managed=True,
+        campaign_id_amazon=profile_id,
+        sponsoring_type="sponsoredProducts",
+        placement_tos_mult=50,
+        placement_pp_mult=50,
+    )
+    RecentReportData.objects.bulk_create(
+        RecentReportData(
+            campaign=campaign,
+            report_type=SpReportType.PLACEMENT.value,
+            placement=placement,
+            date=datetime.date.today() - datetime.timedelta(days=days_ago),
+            spend=1,
+            sales=10,
+            orders=1,
+            clicks=10,
+            impressions=1000,
+        )
+        for placement in (PlacementsOnAmazon.TOS.value, PlacementsOnAmazon.PP.value)
+        for days_ago in range(1, 4)
+    )
+    return profile
+
+
+@pytest.fixture
+def adapter_mock():
+    with mock.patch("apps.ads_api.data_exchange.CampaignAdapter") as adapter_mock:
+        updated_campaigns = {}
+
+        def adapter(profile):
+            def batch_update(campaigns):
+                if profile.profile_id == 3:
+                    return [], ["throttled"]
+                updated_campaigns[profile.profile_id] = [campaign["campaignId"] for campaign in campaigns]
+                return updated_campaigns[profile.profile_id], []
+
+            return mock.Mock(batch_update=batch_update)
+
+        adapter_mock.side_effect = adapter
+        adapter_mock.updated_campaigns = updated_campaigns
+        yield adapter_mock
+
+
+@pytest.mark.django_db(transaction=True)
+def test_placements_of_profiles_of_all_regions_are_updated(adapter_mock):
+    profiles = [
+        _profile_with_campaign(1, ServerLocation.EUROPE),
+        _profile_with_campaign(2, ServerLocation.NORTH_AMERICA),
+    ]
+
+    udpate_sp_placements([profile.pk for profile in profiles])
+
+    assert adapter_mock.updated_campaigns == {1: ["1"], 2: ["2"]}
+
+
+@pytest.mark.django_db(transaction=True)
+def test_failed_profile_does_not_stop_updates_of_other_profiles(adapter_mock):
+    profiles = [
+        _profile_with_campaign(3, ServerLocation.EUROPE),
+        _profile_with_campaign(4, ServerLocation.EUROPE),
+    ]
+
+    with pytest.raises(BaseAmazonAdsException, match=r"\[3\]"):
+        udpate_sp_placements([profile.pk for profile in profiles])
+
+    assert adapter_mock.updated_campaigns == {4: ["4"]}
@@ -0,0 +1,12 @@
+from apps.utils.chunks import split_weighted
+
+
+def test_split_weighted_balances_total_weight():
+    shards = split_weighted(["a", "b", "c", "d", "e"], [10, 4, 3, 3, 1], 2)
+
+    assert shards == [["a", "e"], ["b", "c", "d"]]
+
+
+def test_split_weighted_does_not_return_empty_shards():
+    assert split_weighted(["a", "b"], [1, 1], 4) == [["a"], ["b"]]
+    assert split_weighted([], [], 4) == []
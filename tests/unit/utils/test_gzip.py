@@ -0,0 +1,52 @@
+import gzip
+import json
+
+import pytest
+
+from apps.utils.gzip import GzipJsonArrayStream, JsonArrayStreamParser
+
+
+def _chunks(data: bytes, size: int):
+    return [data[pos : pos + size] for pos in range(0, len(data), size)]
+
+
+ROWS = [
+    {"campaignId": 1, "cost": 0.5, "searchTerm": "über [books], {1}"},
+    {"campaignId": 2, "cost": 10, "nested": {"a": [1, 2, "]"]}},
+    {"campaignId": 3, "cost": 0},
+]
+
+
+@pytest.mark.parametrize("chunk_size", [1, 3, 64, 10_000])
+def test_gzipped_array_parsed_from_any_chunks(chunk_size):
+    data = gzip.compress(json.dumps(ROWS).encode())
+
+    assert list(GzipJsonArrayStream(_chunks(data, chunk_size))) == ROWS
+
+
+@pytest.mark.parametrize("chunk_size", [1, 7])
+def test_plain_json_array_parsed(chunk_size):
+    data = json.dumps(ROWS, indent=2).encode()
+
+    assert list(GzipJsonArrayStream(_chunks(data, chunk_size))) == ROWS
+
+
+def test_scalar_split_between_chunks_is_not_cut():
+    parser = JsonArrayStreamParser()
+
+    items = (
+        list(parser.feed("[12")) + list(parser.feed("34, 5")) + list(parser.feed("]")) + list(parser.close())
+    )
+
+    assert items == [1234, 5]
+
+
+def test_empty_array():
+    assert list(GzipJsonArrayStream([gzip.compress(b"[]")])) == []
+
+
+def test_truncated_array_raises_error():
+    data = json.dumps(ROWS).encode()[:-10]
+
+    with pytest.raises(json.JSONDecodeError):
+        list(GzipJsonArrayStream(_chunks(data, 16)))
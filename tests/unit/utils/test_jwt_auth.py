@@ -5,11 +5,49 @@ import mock
 import pytest
 from mock.mock import Mock
 
+from django.core.cache import cache
+from django.test import override_settings
+
 from apps.ads_api.adapters.amazon_ads.base_amazon_ads_adapter import BaseAmazonAdsAdapter
 from apps.ads_api.constants import ServerLocation
 from apps.ads_api.entities.internal.token import Token
 from apps.ads_api.exceptions.auth.token import TokenExpiredException, AuthFailed
+from apps.ads_api.interfaces.auth.authenticatable_interface import AuthenticatableInterface
+from apps.ads_api.interfaces.auth.jwt_auth_interface import JWTAuthInterface
+from apps.ads_api.interfaces.auth.token_id_interface import TokenIdInterface
+from apps.utils.celery_task_locker import memcache_lock
 from apps.utils.jwt_auth import JWTAuth
+from apps.utils.token_holder import TokenHolder
+
+LOCAL_CACHE = {"default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"}}
+
+
+@pytest.fixture(autouse=True)
+def reset_token_holder():
+    TokenHolder.reset()
+    yield
+    TokenHolder.reset()
+
+
+class FakeAdapter(AuthenticatableInterface, TokenIdInterface):
+    def __init__(self):
+        self._authenticator = Mock(spec=JWTAuthInterface)
+
+    @property
+    def authenticator(self):
+        return self._authenticator
+
+    @property
+    def token_id(self):
+        return "fake"
+
+    @JWTAuth.auth_required()
+    def send_request(self, access_token: Token = None):
+        return access_token.value
+
+
+def _expires_in(seconds: int) -> int:
+    return int(datetime.datetime.now().timestamp()) + seconds
 
 
 class TestJWTAuth:
@@ -79,3 +117,44 @@ class TestJWTAuth:
 
         response = adapter.send_request(url="http://some/test/url", method="GET")
         assert response.json() == {"response_ok": True}
+
+
+@pytest.fixture
+def local_cache():
+    with override_settings(CACHES=LOCAL_CACHE):
+        cache.clear()
+        yield cache
+
+
+@pytest.mark.usefixtures("local_cache")
+class TestTokenRefresh:
+    def test_token_is_kept_in_memory_after_first_cache_read(self):
+        JWTAuth.store_access_token("fake", "cached", _expires_in(3600))
+        adapter = FakeAdapter()
+
+        tokens = [adapter.send_request() for _ in range(3)]
+
+        assert tokens == ["cached"] * 3
+        assert TokenHolder.get_stats() == {"cache_hits": 1, "memory_hits": 2}
+        adapter.authenticator.get_access_token.assert_not_called()
+
+    def test_token_is_refreshed_before_it_expires(self):
+        JWTAuth.store_access_token("fake", "stale", _expires_in(10))
+        adapter = FakeAdapter()
+        adapter.authenticator.refresh_access_token.return_value = ("new", "refresh", _expires_in(3600))
+
+        assert adapter.send_request() == "new"
+        assert JWTAuth.get_access_token("fake").value == "new"
+        assert TokenHolder.get_stats()["refreshes"] == 1
+
+    @mock.patch("apps.utils.jwt_auth.time.sleep")
+    def test_waits_for_token_refreshed_by_other_worker(self, sleep_mock):
+        adapter = FakeAdapter()
+        sleep_mock.side_effect = lambda _: JWTAuth.store_access_token("fake", "other", _expires_in(3600))
+
+        with memcache_lock("refresh_lock_fake", "other worker"):
+            token = adapter.send_request()
+
+        assert token == "other"
+        adapter.authenticator.get_access_token.assert_not_called()
+        assert TokenHolder.get_stats() == {"refresh_waits": 1, "cache_hits": 1}